@@ -0,0 +1,84 @@
+"""
+Measures SQLiteStateStore under concurrent processes: RateLimiter.acquire()
+and a budget reserve + settle pair, each against one shared database file.
+
+    PYTHONPATH=src python benchmarks/state_store.py --processes 1 4 8 32
+
+Prints the mean time per operation and the total operations per second
+over all processes, plus the MemoryStateStore acquire for comparison.
+Limits are set high enough that no call ever waits.
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+from llm_api_adapter.limits import MemoryStateStore, RateLimiter, SQLiteStateStore
+
+
+def run_worker(path: str, ops: int) -> Tuple[float, float, float, float]:
+    """
+    (start, seconds for ops acquires, seconds for ops reserve + settle
+    pairs, end); start and end are wall-clock times.
+    """
+    store = SQLiteStateStore(path)
+    start = time.time()
+    limiter = RateLimiter("bench", requests_per_minute=1e12, tokens_per_minute=1e15, store=store)
+    started = time.perf_counter()
+    for _ in range(ops):
+        limiter.acquire(100)
+    acquire_s = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(ops):
+        store.reserve_budget("bench", 0.01, 1e12)
+        store.settle_budget("bench", 0.01, 0.005)
+    return start, acquire_s, time.perf_counter() - started, time.time()
+
+
+def run(processes: int, ops: int) -> Tuple[float, float, float]:
+    """(mean acquire s, mean reserve + settle s, operations per second)."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "limits.db")
+        # Spawned, so no worker inherits SQLite state from this process.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(processes, mp_context=context) as pool:
+            results = list(pool.map(run_worker, [path] * processes, [ops] * processes))
+    acquire = sum(r[1] for r in results) / (processes * ops)
+    reserve_settle = sum(r[2] for r in results) / (processes * ops)
+    # Process start-up is left out; an acquire and a reserve + settle pair
+    # count as two operations.
+    busy_s = max(r[3] for r in results) - min(r[0] for r in results)
+    return acquire, reserve_settle, 2 * processes * ops / busy_s
+
+
+def memory_acquire(ops: int) -> float:
+    limiter = RateLimiter("bench", requests_per_minute=1e12, tokens_per_minute=1e15, store=MemoryStateStore())
+    started = time.perf_counter()
+    for _ in range(ops):
+        limiter.acquire(100)
+    return (time.perf_counter() - started) / ops
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4, 8, 32])
+    parser.add_argument("--ops", type=int, default=2000, help="operations per process")
+    args = parser.parse_args(argv)
+    print(f"cpus: {os.cpu_count()}, ops per process: {args.ops}")
+    print(f"{'processes':>9}  {'acquire':>9}  {'reserve+settle':>14}  {'total':>11}")
+    for processes in args.processes:
+        acquire, reserve_settle, rate = run(processes, args.ops)
+        print(
+            f"{processes:>9}  {acquire * 1e6:>7.0f}us  {reserve_settle * 1e6:>12.0f}us  "
+            f"{rate:>7.0f} ops/s"
+        )
+    print(f"MemoryStateStore acquire: {memory_acquire(args.ops * 10) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
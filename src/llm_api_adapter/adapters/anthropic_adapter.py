@@ -2,16 +2,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import warnings
 
-from ..adapters.base_adapter import LLMAdapterBase
+from ..adapters.base_adapter import LLMAdapterBase, candidate_fallback
 from ..errors.llm_api_error import LLMAPIError
 from ..errors.config_errors import LLMReasoningLevelError
+from ..llms.anthropic.stream import AnthropicStreamAccumulator
 from ..llms.anthropic.sync_client import ClaudeSyncClient
 from ..models.messages.chat_message import Message, Messages
-from ..models.responses.chat_response import ChatResponse
+from ..models.responses.chat_response import ChatResponse, LazyChatResponse
+from ..models.responses.chat_stream import StreamEvent
 from ..models.tools.tool_spec import ToolSpec
+from ..models.tools.toolset import Toolset
+from ..tokens.token_counter import TokenCount, estimate_json_tokens
+from ..utils.deadline import Deadline, request_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +25,7 @@ logger = logging.getLogger(__name__)
 class AnthropicAdapter(LLMAdapterBase):
     company: str = "anthropic"
 
+    @candidate_fallback
     def chat(
         self,
         messages: List[Message] | Messages,
@@ -29,13 +35,24 @@ class AnthropicAdapter(LLMAdapterBase):
         reasoning_level: Optional[str | int] = None,
         timeout_s: Optional[float] = None,
         *,
-        tools: Optional[List[ToolSpec]] = None,
+        tools: Optional[List[ToolSpec] | Toolset] = None,
         tool_choice: Optional[str | dict] = None,
         parallel_tool_calls: Optional[bool] = None,
         previous_response: Optional[ChatResponse] = None,
         json_schema: Optional[dict] = None,
         response_model: Optional[Any] = None,
+        validate_json: bool = False,
+        on_stream: Optional[Callable[[StreamEvent], None]] = None,
+        connect_timeout_s: Optional[float] = None,
+        deadline_s: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        n: Optional[int] = None,
+        service_tier: Optional[str] = None,
+        prediction: Optional[str | dict] = None,
+        lazy: bool = False,
     ) -> ChatResponse:
+        deadline = Deadline.resolve(deadline, deadline_s)
+        n = self._validate_n(n, on_stream)
         temperature = self._validate_parameter("temperature", temperature, 0, 2)
         top_p = self._validate_parameter("top_p", top_p, 0, 1)
         try:
@@ -55,14 +72,15 @@ class AnthropicAdapter(LLMAdapterBase):
                 "temperature": temperature,
                 "top_p": top_p,
                 "system": system_prompt,
-                "timeout_s": timeout_s,
+                "timeout_s": request_timeout(timeout_s, connect_timeout_s, deadline),
+                "deadline": deadline,
                 "is_adaptive_thinking": self.is_adaptive_thinking,
+                "service_tier": self._service_tier(service_tier),
             }
             if validated_tools:
-                params["tools"] = [
-                    self._to_anthropic_tool(tool)
-                    for tool in validated_tools
-                ]
+                params["tools"] = self._map_tools(
+                    validated_tools, "anthropic", self._map_tools_to_anthropic
+                )
             if normalized_tool_choice is not None:
                 params["tool_choice"] = self._to_anthropic_tool_choice(
                     normalized_tool_choice
@@ -75,7 +93,9 @@ class AnthropicAdapter(LLMAdapterBase):
                 params["output_config"] = {
                     "format": {
                         "type": "json_schema",
-                        "schema": self._enforce_strict_schema(effective_schema),
+                        "schema": self._compile_schema(
+                            "strict", effective_schema, self._enforce_strict_schema
+                        ),
                     }
                 }
             if reasoning_level:
@@ -96,17 +116,21 @@ class AnthropicAdapter(LLMAdapterBase):
                         params["effort"] = effort
             params = {k: v for k, v in params.items() if v is not None}
             _ = previous_response
-            client = ClaudeSyncClient(api_key=self.api_key)
-            response = client.chat_completion(**params)
-            chat_response = ChatResponse.from_anthropic_response(response)
-            chat_response.parsed_json = self._parse_json_response(chat_response.content, effective_schema)
-            chat_response.parsed_model = self._parse_response_model(chat_response.parsed_json, response_model)
-            if self.pricing:
-                chat_response.apply_pricing(
-                    price_input_per_token=self.pricing.in_per_token,
-                    price_output_per_token=self.pricing.out_per_token,
-                    currency=self.pricing.currency,
+            _ = self._prediction(prediction)
+            client = ClaudeSyncClient(api_key=self.api_key, session=self._session)
+            response_cls = LazyChatResponse if lazy else ChatResponse
+            if on_stream is not None:
+                accumulator = AnthropicStreamAccumulator(
+                    on_stream, parse_json=effective_schema is not None
                 )
+                response = accumulator.consume(client.stream_chat_completion(**params))
+            else:
+                response = client.chat_completion(**params)
+            chat_response = response_cls.from_anthropic_response(response)
+            self._parse_structured(
+                chat_response, effective_schema, response_model, validate=validate_json
+            )
+            self._apply_pricing(chat_response, service_tier)
             return chat_response
         except LLMAPIError as e:
             self.handle_error(e)
@@ -114,6 +138,38 @@ class AnthropicAdapter(LLMAdapterBase):
             error_message = getattr(e, "text", None) or str(e)
             self.handle_error(error=e, error_message=error_message)
 
+    def _count_tokens_remote(
+        self,
+        messages: Messages,
+        tools: Optional[List[ToolSpec]],
+        json_schema: Optional[dict],
+        timeout_s: Optional[float],
+    ) -> Optional[TokenCount]:
+        system_prompt, transformed_messages = messages.to_anthropic()
+        params: Dict[str, Any] = {"messages": transformed_messages, "system": system_prompt}
+        if tools:
+            params["tools"] = self._map_tools_to_anthropic(tools)
+        params = {k: v for k, v in params.items() if v is not None}
+        client = ClaudeSyncClient(api_key=self.api_key, session=self._session)
+        input_tokens = client.count_tokens(model=self.model, timeout_s=timeout_s, **params)
+        # The endpoint does not take output_config, so the schema is estimated.
+        schema_tokens = estimate_json_tokens(json_schema) if json_schema is not None else 0
+        return TokenCount(
+            input_tokens=input_tokens + schema_tokens,
+            schema_tokens=schema_tokens,
+            source="remote",
+        )
+
+    # Anthropic serves priority capacity under "auto" when the organization
+    # has it; "standard_only" keeps requests off it.
+    _SERVICE_TIERS = {"auto": "auto", "priority": "auto", "default": "standard_only"}
+
+    def _map_service_tier(self, service_tier: str) -> Optional[str]:
+        return self._SERVICE_TIERS.get(service_tier)
+
+    def _map_tools_to_anthropic(self, tools: List[ToolSpec]) -> List[Dict[str, Any]]:
+        return [self._to_anthropic_tool(tool) for tool in tools]
+
     def _to_anthropic_tool(self, tool: ToolSpec) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "name": tool.name,
@@ -1,19 +1,45 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import partial, wraps
+import inspect
 import json
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 import warnings
 
-from ..errors.llm_api_error import InvalidToolSchemaError, JSONSchemaError, ToolChoiceError
-from ..llm_registry.llm_registry import Pricing, LLM_REGISTRY
-from ..models.messages.chat_message import Messages
-from ..models.responses.chat_response import ChatResponse
-from ..models.tools import ToolSpec
+import requests
+
+from ..errors.llm_api_error import (
+    InvalidToolSchemaError,
+    JSONSchemaError,
+    LLMAPIClientError,
+    LLMAPIError,
+    ToolChoiceError,
+)
+from ..llm_registry.llm_registry import EmbeddingModelSpec, Pricing, LLM_REGISTRY
+from ..llms.http_session import new_session
+from ..models.messages.chat_message import Message, Messages
+from ..models.responses.chat_response import ChatResponse, LazyChatResponse, Usage
+from ..models.responses.chat_stream import ChatStream
+from ..models.responses.embedding_response import EmbeddingResponse, float32_matrix
+from ..models.tools import ToolSpec, Toolset
+from ..tokens.cost_estimate import CostEstimate
+from ..tokens.token_counter import (
+    REMOTE_TOKEN_COUNTS,
+    TOKEN_ESTIMATOR,
+    TokenCount,
+    request_key,
+)
+from ..tool_loop import ToolResultCache, run_tool_loop
+from ..utils.deadline import Deadline, RequestTimeout, request_timeout, resolve_deadline
+from ..utils.json_tools import extract_json, locate_json_text
+from ..utils.json_validator import JSONValidationError, validate_json
+from ..utils.schema_cache import cached_model_schema, cached_schema_transform
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +50,31 @@ REASONING_LEVELS_DEFAULT = {
     "high": 10000,
 }
 
+SERVICE_TIERS = ("auto", "default", "flex", "priority")
+
 TOOL_NAME_RE = re.compile(r"^[a-zA-Z0-9_-]{1,64}$")
 
 
+def candidate_fallback(chat: Callable[..., ChatResponse]) -> Callable[..., ChatResponse]:
+    """
+    Decorates an adapter's chat(): n > 1 on a model without native n is
+    sent through LLMAdapterBase._chat_candidates with the caller's own
+    arguments, so every chat() parameter reaches each candidate call.
+    """
+    signature = inspect.signature(chat)
+
+    @wraps(chat)
+    def wrapper(self: "LLMAdapterBase", *args: Any, **kwargs: Any) -> ChatResponse:
+        n = self._validate_n(kwargs.get("n"), kwargs.get("on_stream"))
+        if n is None or self.supports_native_n:
+            return chat(self, *args, **kwargs)
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        del arguments["self"]
+        return self._chat_candidates(n, arguments)
+
+    return wrapper
+
+
 @dataclass
 class LLMAdapterBase(ABC):
     api_key: str
@@ -35,14 +83,30 @@ class LLMAdapterBase(ABC):
     pricing: Optional[Pricing] = None
     is_reasoning: bool = False
     is_adaptive_thinking: bool = False
+    context_window: Optional[int] = None
+    max_output: Optional[int] = None
     reasoning_levels: Dict[str, int] = field(
         default_factory=lambda: REASONING_LEVELS_DEFAULT.copy()
     )
+    # Shared by every request this adapter sends, so connections are reused.
+    _session: requests.Session = field(
+        default_factory=new_session, init=False, repr=False, compare=False
+    )
 
     def __repr__(self) -> str:
         masked = f"{self.api_key[:8]}...{self.api_key[-4:]}" if len(self.api_key) > 12 else "***"
         return f"{self.__class__.__name__}(company='{self.company}', model='{self.model}', api_key='{masked}')"
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # A copy (e.g. in a worker process) opens its own connections.
+        state = dict(self.__dict__)
+        del state["_session"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._session = new_session()
+
     def __post_init__(self):
         if not self.api_key:
             error_message = "api_key must be a non-empty string"
@@ -65,6 +129,8 @@ class LLMAdapterBase(ABC):
             self.pricing = deepcopy(base_pricing) if base_pricing else None
             self.is_reasoning = getattr(model_spec, "is_reasoning", False)
             self.is_adaptive_thinking = getattr(model_spec, "is_adaptive_thinking", False)
+            self.context_window = getattr(model_spec, "context_window", None)
+            self.max_output = getattr(model_spec, "max_output", None)
 
     @abstractmethod
     def chat(self, **kwargs) -> ChatResponse:
@@ -73,6 +139,243 @@ class LLMAdapterBase(ABC):
         """
         raise NotImplementedError
 
+    def chat_with_tools(
+        self,
+        messages: Any,
+        tools: List[ToolSpec] | Toolset,
+        handlers: Optional[Dict[str, Callable[..., Any]]] = None,
+        max_steps: int = 10,
+        max_parallel: int = 8,
+        deadline_s: Optional[float] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+        **kwargs,
+    ) -> ChatResponse:
+        """
+        Calls chat() and executes requested tools until the model answers
+        without tool calls. Returns the final response with usage and cost
+        aggregated over all steps; see ToolLoop for details.
+        handlers defaults to Toolset.handlers when tools is a Toolset.
+        """
+        return run_tool_loop(
+            self.chat,
+            messages,
+            tools,
+            handlers=handlers,
+            max_steps=max_steps,
+            max_parallel=max_parallel,
+            deadline_s=deadline_s,
+            tool_cache=tool_cache,
+            **kwargs,
+        )
+
+    def chat_stream(self, **kwargs) -> ChatStream:
+        """
+        Streams a chat() call. Iterate the returned ChatStream for text
+        deltas, completed structured-output fields ("json_item") and tool
+        call arguments; its response attribute holds the final ChatResponse.
+        """
+        return ChatStream(self.chat, **kwargs)
+
+    def embed(
+        self,
+        texts: Sequence[str] | str,
+        model: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        dimensions: Optional[int] = None,
+        max_parallel: int = 8,
+        timeout_s: Optional[float] = None,
+        deadline_s: Optional[float] = None,
+    ) -> EmbeddingResponse:
+        """
+        Embeds texts with an embedding model of this provider (default: the
+        first one in the registry). Texts are sent in batches of
+        batch_size, capped at the model's max_batch, up to max_parallel
+        batches at a time; the vectors come back as one float32 matrix in
+        input order, priced at the registry's embedding prices. Raises
+        LLMAPIClientError for providers without an embeddings API.
+        """
+        if not self.supports_embeddings:
+            error_message = f"Provider '{self.company}' has no embeddings API"
+            logger.error(error_message)
+            raise LLMAPIClientError(detail=error_message)
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        spec = self._embedding_spec(model)
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be >= 1")
+        size = min(batch_size or spec.max_batch, spec.max_batch)
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        deadline = Deadline.resolve(None, deadline_s)
+        timeout = request_timeout(timeout_s, None, deadline)
+
+        def run(chunk: List[str]) -> Tuple[List[List[float]], int]:
+            vectors, tokens = self._embed_batch(spec.name, chunk, dimensions, timeout, deadline)
+            if len(vectors) != len(chunk):
+                raise LLMAPIError(
+                    f"{self.company} embeddings API returned malformed response",
+                    detail=f"{len(vectors)} embeddings for {len(chunk)} inputs",
+                )
+            return vectors, tokens
+
+        try:
+            if len(chunks) <= 1:
+                results = [run(chunk) for chunk in chunks]
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_parallel, len(chunks))) as pool:
+                    results = list(pool.map(run, chunks))
+        except LLMAPIError as e:
+            self.handle_error(e)
+        except Exception as e:
+            self.handle_error(error=e, error_message=getattr(e, "text", None) or str(e))
+        matrix, count, width = float32_matrix([vectors for vectors, _ in results])
+        batch_usage = [Usage(input_tokens=tokens, total_tokens=tokens) for _, tokens in results]
+        total_tokens = sum(usage.input_tokens for usage in batch_usage)
+        pricing = spec.pricing
+        return EmbeddingResponse(
+            model=spec.name,
+            embeddings=matrix,
+            count=count,
+            dimensions=width,
+            usage=Usage(input_tokens=total_tokens, total_tokens=total_tokens),
+            batches=len(chunks),
+            currency=pricing.currency if pricing else None,
+            cost_total=(
+                sum(usage.input_tokens * pricing.in_per_token for usage in batch_usage)
+                if pricing else None
+            ),
+            batch_usage=batch_usage,
+        )
+
+    def _embedding_spec(self, model: Optional[str]) -> EmbeddingModelSpec:
+        provider = LLM_REGISTRY.providers.get(self.company)
+        models = provider.embedding_models if provider else {}
+        if model is None:
+            if not models:
+                raise ValueError(f"No embedding model is registered for '{self.company}'; pass model=")
+            return next(iter(models.values()))
+        spec = models.get(model)
+        if spec is None:
+            warnings.warn(
+                f"Embedding model '{model}' is not verified for the {self.company} adapter.",
+                UserWarning,
+            )
+            spec = EmbeddingModelSpec(name=model)
+        return spec
+
+    def _embed_batch(
+        self,
+        model: str,
+        texts: List[str],
+        dimensions: Optional[int],
+        timeout: RequestTimeout,
+        deadline: Optional[Deadline],
+    ) -> Tuple[List[List[float]], int]:
+        """
+        Vectors of one batch, in order, and its input tokens. Adapters whose
+        supports_embeddings is True implement it.
+        """
+        raise LLMAPIClientError(detail=f"Provider '{self.company}' has no embeddings API")
+
+    def count_tokens(
+        self,
+        messages: List[Message] | Messages,
+        tools: Optional[List[ToolSpec] | Toolset] = None,
+        json_schema: Optional[dict] = None,
+        response_model: Optional[Any] = None,
+        remote: bool = False,
+        timeout_s: Optional[float] = None,
+    ) -> TokenCount:
+        """
+        Input tokens of a request, before sending it. By default an offline
+        estimate (text heuristic plus the provider's image-token formula).
+        remote=True asks the provider's count endpoint where one exists;
+        remote counts are cached per request content.
+        """
+        normalized_messages = self._normalize_messages(messages)
+        tool_list = list(tools.tools) if isinstance(tools, Toolset) else tools
+        schema = self._resolve_json_schema(json_schema, response_model, None)
+        if remote:
+            key = request_key(
+                self.company, self.model, normalized_messages.items, tool_list, schema
+            )
+            cached = REMOTE_TOKEN_COUNTS.get(key) if key is not None else None
+            if cached is None:
+                cached = self._count_tokens_remote(
+                    normalized_messages, tool_list, schema, timeout_s
+                )
+                if cached is not None and key is not None:
+                    REMOTE_TOKEN_COUNTS.set(key, cached)
+            if cached is not None:
+                return replace(cached)
+        return TOKEN_ESTIMATOR.estimate(
+            self.company, normalized_messages.items, tool_list, schema
+        )
+
+    def estimate_cost(
+        self,
+        messages: List[Message] | Messages,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[ToolSpec] | Toolset] = None,
+        json_schema: Optional[dict] = None,
+        response_model: Optional[Any] = None,
+        n: Optional[int] = None,
+        service_tier: Optional[str] = None,
+    ) -> CostEstimate:
+        """
+        Worst-case cost of a request before sending it: the offline input
+        token estimate at the input price plus max_tokens (or the model's
+        max_output when not given) at the output price. With n candidates
+        the output is counted n times, and the input too where the
+        provider needs one call per candidate. service_tier selects that
+        tier's prices where the registry has them.
+        """
+        count = self.count_tokens(
+            messages, tools=tools, json_schema=json_schema, response_model=response_model
+        )
+        candidates = n or 1
+        input_tokens = count.input_tokens * (1 if self.supports_native_n else candidates)
+        max_output_tokens = (max_tokens or self.max_output or 0) * candidates
+        pricing = self._tier_pricing(service_tier) if self.pricing else None
+        return CostEstimate.from_pricing(input_tokens, max_output_tokens, pricing)
+
+    @property
+    def supports_native_n(self) -> bool:
+        """True when n candidates come from one request sharing the input tokens."""
+        return False
+
+    @property
+    def supports_embeddings(self) -> bool:
+        """True when the provider has an embeddings endpoint (see embed())."""
+        return False
+
+    @property
+    def supports_previous_response(self) -> bool:
+        """True when previous_response continues a conversation stored by the provider."""
+        return False
+
+    @property
+    def supports_prediction(self) -> bool:
+        """True when the provider takes a predicted output (OpenAI Chat Completions)."""
+        return False
+
+    def _count_tokens_remote(
+        self,
+        messages: Messages,
+        tools: Optional[List[ToolSpec]],
+        json_schema: Optional[dict],
+        timeout_s: Optional[float],
+    ) -> Optional[TokenCount]:
+        """Provider token count; None when the provider has no count endpoint."""
+        warnings.warn(
+            f"Provider '{self.company}' has no token counting endpoint; "
+            f"returning the local estimate.",
+            UserWarning,
+        )
+        return None
+
     @abstractmethod
     def _normalize_reasoning_level(self, level: str | int) -> int | str:
         """
@@ -100,15 +403,24 @@ class LLMAdapterBase(ABC):
             return Messages(messages)
         raise TypeError("messages must be a list or Messages instance")
 
-    def _validate_tools(self, tools: Optional[List[ToolSpec]]) -> None:
+    def _validate_tools(self, tools: Optional[List[ToolSpec] | Toolset]) -> None:
         """
         Contract-level validation only.
         Provider-specific constraints are handled in provider adapters.
+        A Toolset is validated once; the result is cached on it.
         """
         if tools is None:
             return
+        if isinstance(tools, Toolset):
+            if not tools.is_validated:
+                self._validate_tool_list(list(tools.tools))
+                tools.mark_validated()
+            return
         if not isinstance(tools, list):
             raise InvalidToolSchemaError(detail="tools must be a list[ToolSpec] or None")
+        self._validate_tool_list(tools)
+
+    def _validate_tool_list(self, tools: List[ToolSpec]) -> None:
         seen: set[str] = set()
         for t in tools:
             if not isinstance(t, ToolSpec):
@@ -134,6 +446,17 @@ class LLMAdapterBase(ABC):
                     detail=f"Tool {t.name!r}: json_schema must be a dict"
                 )
 
+    def _map_tools(
+        self,
+        tools: Optional[List[ToolSpec] | Toolset],
+        key: str,
+        mapper: Callable[[Any], Any],
+    ) -> Any:
+        """Map tools to a provider payload, reusing the payload cached on a Toolset."""
+        if isinstance(tools, Toolset):
+            return tools.payload(key, mapper)
+        return mapper(tools)
+
     def _normalize_tool_choice(
         self,
         tool_choice: Any,
@@ -232,20 +555,129 @@ class LLMAdapterBase(ABC):
             detail="tool_choice='required' is not supported; use 'any'"
         )
 
-    def _enforce_strict_schema(self, schema: dict) -> dict:
-        """Recursively add additionalProperties: false to all object types — required by OpenAI and Anthropic strict mode."""
-        schema = dict(schema)
-        if schema.get("type") == "object":
+    def _compile_schema(
+        self,
+        kind: str,
+        schema: dict,
+        transform: Callable[[dict], dict],
+    ) -> dict:
+        """
+        Return transform(schema), memoized per adapter class, kind and schema
+        content. The returned dict is shared and must not be mutated.
+        """
+        return cached_schema_transform(
+            f"{type(self).__name__}.{kind}", schema, transform
+        )
+
+    def _enforce_strict_schema(self, schema: dict, require_all: bool = False) -> dict:
+        """
+        Recursively add additionalProperties: false to all object types — required by OpenAI and Anthropic strict mode.
+
+        Walks properties, items, anyOf/oneOf/allOf and $defs, drops keywords
+        next to $ref (rejected in strict mode) and prunes unreferenced $defs.
+        require_all lists every property in required and makes the
+        originally optional ones nullable, as OpenAI strict mode demands.
+        """
+        result = self._strict_schema_node(schema, require_all)
+        return self._prune_unused_defs(result)
+
+    def _strict_schema_node(self, schema: dict, require_all: bool) -> dict:
+        if "$ref" in schema:
+            # Strict mode rejects keywords next to $ref.
+            schema = {
+                k: v for k, v in schema.items()
+                if k in ("$ref", "$defs", "definitions")
+            }
+        else:
+            schema = dict(schema)
+        schema_type = schema.get("type")
+        if schema_type == "object" or (isinstance(schema_type, list) and "object" in schema_type):
             schema["additionalProperties"] = False
             if "properties" in schema:
-                schema["properties"] = {
-                    k: self._enforce_strict_schema(v) if isinstance(v, dict) else v
+                properties = {
+                    k: self._strict_schema_node(v, require_all) if isinstance(v, dict) else v
                     for k, v in schema["properties"].items()
                 }
-        if "items" in schema and isinstance(schema["items"], dict):
-            schema["items"] = self._enforce_strict_schema(schema["items"])
+                if require_all:
+                    required = set(schema.get("required") or [])
+                    properties = {
+                        k: v if k in required or not isinstance(v, dict) else self._make_nullable(v)
+                        for k, v in properties.items()
+                    }
+                    schema["required"] = list(properties)
+                schema["properties"] = properties
+        if isinstance(schema.get("items"), dict):
+            schema["items"] = self._strict_schema_node(schema["items"], require_all)
+        for key in ("anyOf", "oneOf", "allOf", "prefixItems", "items"):
+            if isinstance(schema.get(key), list):
+                schema[key] = [
+                    self._strict_schema_node(v, require_all) if isinstance(v, dict) else v
+                    for v in schema[key]
+                ]
+        if require_all and "oneOf" in schema:
+            schema["anyOf"] = schema.pop("oneOf")
+        for key in ("$defs", "definitions"):
+            if isinstance(schema.get(key), dict):
+                schema[key] = {
+                    k: self._strict_schema_node(v, require_all) if isinstance(v, dict) else v
+                    for k, v in schema[key].items()
+                }
         return schema
 
+    def _make_nullable(self, schema: dict) -> dict:
+        schema_type = schema.get("type")
+        if isinstance(schema_type, str) and "$ref" not in schema:
+            if schema_type == "null":
+                return schema
+            return {**schema, "type": [schema_type, "null"]}
+        if isinstance(schema_type, list):
+            if "null" in schema_type:
+                return schema
+            return {**schema, "type": [*schema_type, "null"]}
+        if isinstance(schema.get("anyOf"), list):
+            if any(v == {"type": "null"} for v in schema["anyOf"]):
+                return schema
+            return {**schema, "anyOf": [*schema["anyOf"], {"type": "null"}]}
+        return {"anyOf": [schema, {"type": "null"}]}
+
+    def _prune_unused_defs(self, schema: dict) -> dict:
+        defs_keys = [k for k in ("$defs", "definitions") if isinstance(schema.get(k), dict)]
+        if not defs_keys:
+            return schema
+        body = {k: v for k, v in schema.items() if k not in defs_keys}
+        used: set[str] = set()
+        pending = self._collect_refs(body)
+        while pending:
+            ref = pending.pop()
+            if ref in used:
+                continue
+            used.add(ref)
+            for key in defs_keys:
+                prefix = f"#/{key}/"
+                if ref.startswith(prefix) and ref[len(prefix):] in schema[key]:
+                    pending |= self._collect_refs(schema[key][ref[len(prefix):]])
+        for key in defs_keys:
+            kept = {
+                name: value for name, value in schema[key].items()
+                if f"#/{key}/{name}" in used
+            }
+            if kept:
+                body[key] = kept
+        return body
+
+    def _collect_refs(self, node: Any) -> set[str]:
+        refs: set[str] = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                ref = current.get("$ref")
+                if isinstance(ref, str):
+                    refs.add(ref)
+                stack.extend(current.values())
+            elif isinstance(current, list):
+                stack.extend(current)
+        return refs
 
     def _resolve_json_schema(
         self,
@@ -261,7 +693,7 @@ class LLMAdapterBase(ABC):
             raise JSONSchemaError(detail="json_schema and tools cannot be used together")
         if response_model is not None:
             try:
-                return response_model.model_json_schema()
+                return cached_model_schema(response_model)
             except AttributeError:
                 try:
                     import pydantic  # noqa
@@ -275,29 +707,135 @@ class LLMAdapterBase(ABC):
         return json_schema
 
     def _strip_json_fences(self, content: str) -> str:
-        text = content.strip()
-        fence_match = re.match(r'^```(?:json)?\s*([\s\S]*?)\s*```$', text, re.IGNORECASE)
-        if fence_match:
-            return fence_match.group(1).strip()
-        block_match = re.search(r'(\{[\s\S]*\}|\[[\s\S]*\])', text)
-        if block_match:
-            return block_match.group(1)
-        return text
+        return locate_json_text(content)
 
     def _parse_json_response(
         self,
         content: Optional[str],
         json_schema: Optional[dict],
+        validate: bool = False,
     ) -> Optional[dict]:
         if json_schema is None or content is None:
             return None
+        root_type = json_schema.get("type")
         try:
-            return json.loads(content)
-        except json.JSONDecodeError:
+            parsed = extract_json(
+                content,
+                root_type=root_type if root_type in ("object", "array") else None,
+            )
+        except json.JSONDecodeError as e:
+            raise JSONSchemaError(detail=f"Model response is not valid JSON: {e}")
+        if validate:
             try:
-                return json.loads(self._strip_json_fences(content))
-            except json.JSONDecodeError as e:
-                raise JSONSchemaError(detail=f"Model response is not valid JSON: {e}")
+                validate_json(parsed, json_schema)
+            except JSONValidationError as e:
+                raise JSONSchemaError(detail=f"Response does not match json_schema: {e}")
+        return parsed
+
+    def _parse_structured(
+        self,
+        response: ChatResponse,
+        json_schema: Optional[dict],
+        response_model: Optional[Any],
+        validate: bool = False,
+    ) -> None:
+        """
+        Sets parsed_json / parsed_model on the response and each of its
+        candidates. A LazyChatResponse gets parsed_json on first access
+        unless it has to be validated now.
+        """
+        for target in [response, *(response.candidates or [])]:
+            if json_schema is None and response_model is None:
+                target.parsed_json = None
+                target.parsed_model = None
+                continue
+            if isinstance(target, LazyChatResponse) and response_model is None and not validate:
+                target.defer_parsed_json(partial(self._parse_json_response, json_schema=json_schema))
+                target.parsed_model = None
+                continue
+            target.parsed_json = self._parse_json_response(
+                target.content, json_schema, validate=validate
+            )
+            target.parsed_model = self._parse_response_model(target.parsed_json, response_model)
+
+    def _prediction(self, prediction: Optional[str | dict]) -> Optional[dict]:
+        """
+        Predicted output payload: a string becomes {"type": "content",
+        "content": ...}. None, with a warning, when the provider has none.
+        """
+        if prediction is None:
+            return None
+        if isinstance(prediction, str):
+            prediction = {"type": "content", "content": prediction}
+        if not isinstance(prediction, dict):
+            raise ValueError("prediction must be a string or a dict")
+        if not self.supports_prediction:
+            warnings.warn(
+                f"Model '{self.model}' of provider '{self.company}' does not support "
+                f"predicted outputs; prediction ignored.",
+                UserWarning,
+            )
+            return None
+        return prediction
+
+    def _service_tier(self, service_tier: Optional[str]) -> Optional[str]:
+        """
+        Provider value for a service_tier of SERVICE_TIERS; None (nothing
+        sent) when the provider has no matching option.
+        """
+        if service_tier is None:
+            return None
+        if service_tier not in SERVICE_TIERS:
+            raise ValueError(f"service_tier must be one of {SERVICE_TIERS}")
+        mapped = self._map_service_tier(service_tier)
+        if mapped is None:
+            warnings.warn(
+                f"Provider '{self.company}' does not support service_tier={service_tier!r}; "
+                f"using its standard tier.",
+                UserWarning,
+            )
+        return mapped
+
+    def _map_service_tier(self, service_tier: str) -> Optional[str]:
+        return None
+
+    def _apply_pricing(self, response: ChatResponse, service_tier: Optional[str] = None) -> None:
+        """Prices the response at the served tier's rates (else the requested tier's)."""
+        if not self.pricing:
+            return
+        pricing = self._tier_pricing(response.service_tier or service_tier)
+        response.apply_pricing(
+            price_input_per_token=pricing.in_per_token,
+            price_output_per_token=pricing.out_per_token,
+            currency=pricing.currency,
+        )
+
+    def _tier_pricing(self, service_tier: Optional[str]) -> Any:
+        if service_tier is None:
+            return self.pricing
+        return self.pricing.for_tier(service_tier)
+
+    def _validate_n(self, n: Optional[int], on_stream: Any) -> Optional[int]:
+        """n when more than one candidate is requested, else None."""
+        if n is None:
+            return None
+        if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+            raise ValueError("n must be a positive integer")
+        if n == 1:
+            return None
+        if on_stream is not None:
+            raise ValueError("n > 1 cannot be combined with on_stream")
+        return n
+
+    def _chat_candidates(self, n: int, kwargs: Dict[str, Any]) -> ChatResponse:
+        """
+        n candidates from n parallel chat(**kwargs, n=None) calls sharing
+        one deadline, for providers without native n.
+        """
+        kwargs = dict(resolve_deadline(kwargs), n=None)
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            futures = [pool.submit(self.chat, **kwargs) for _ in range(n)]
+            return ChatResponse.from_candidates([future.result() for future in futures])
 
     def _parse_response_model(
         self,
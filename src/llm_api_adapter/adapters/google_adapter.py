@@ -2,15 +2,19 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import warnings
 
-from ..adapters.base_adapter import LLMAdapterBase
+from ..adapters.base_adapter import LLMAdapterBase, candidate_fallback
 from ..errors.llm_api_error import LLMAPIError
+from ..llms.google.stream import GoogleStreamAccumulator
 from ..llms.google.sync_client import GeminiSyncClient
 from ..models.messages.chat_message import Message, Messages
-from ..models.responses.chat_response import ChatResponse
-from ..models.tools import ToolSpec
+from ..models.responses.chat_response import ChatResponse, LazyChatResponse
+from ..models.responses.chat_stream import StreamEvent
+from ..models.tools import ToolSpec, Toolset
+from ..tokens.token_counter import TokenCount, estimate_text_tokens
+from ..utils.deadline import Deadline, RequestTimeout, request_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,7 @@ logger = logging.getLogger(__name__)
 class GoogleAdapter(LLMAdapterBase):
     company: str = "google"
 
+    @candidate_fallback
     def chat(
         self,
         messages: List[Message] | Messages,
@@ -28,13 +33,24 @@ class GoogleAdapter(LLMAdapterBase):
         reasoning_level: Optional[str | int] = None,
         timeout_s: Optional[float] = None,
         *,
-        tools: Optional[List[ToolSpec]] = None,
+        tools: Optional[List[ToolSpec] | Toolset] = None,
         tool_choice: Optional[str | dict] = None,
         parallel_tool_calls: Optional[bool] = None,
         previous_response: Optional[ChatResponse] = None,
         json_schema: Optional[dict] = None,
         response_model: Optional[Any] = None,
+        validate_json: bool = False,
+        on_stream: Optional[Callable[[StreamEvent], None]] = None,
+        connect_timeout_s: Optional[float] = None,
+        deadline_s: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        n: Optional[int] = None,
+        service_tier: Optional[str] = None,
+        prediction: Optional[str | dict] = None,
+        lazy: bool = False,
     ) -> ChatResponse:
+        deadline = Deadline.resolve(deadline, deadline_s)
+        n = self._validate_n(n, on_stream)
         temperature = self._validate_parameter(
             name="temperature",
             value=temperature,
@@ -57,15 +73,21 @@ class GoogleAdapter(LLMAdapterBase):
             )
             normalized_messages = self._normalize_messages(messages)
             _ = previous_response
+            _ = self._service_tier(service_tier)
+            _ = self._prediction(prediction)
             system_prompt, transformed_messages = normalized_messages.to_google()
             generation_config: Dict[str, Any] = {
                 "maxOutputTokens": max_tokens,
                 "temperature": temperature,
                 "topP": top_p,
             }
+            if n is not None:
+                generation_config["candidateCount"] = n
             if effective_schema is not None:
                 generation_config["responseMimeType"] = "application/json"
-                generation_config["responseSchema"] = self._to_google_schema(effective_schema)
+                generation_config["responseSchema"] = self._compile_schema(
+                    "google", effective_schema, self._to_google_schema
+                )
             if reasoning_level:
                 normalized_reasoning_level = self._normalize_reasoning_level(
                     reasoning_level
@@ -84,33 +106,40 @@ class GoogleAdapter(LLMAdapterBase):
                     "parts": [{"text": system_prompt}]
                 }
             if validated_tools:
-                payload["tools"] = [
-                    {
-                        "functionDeclarations": [
-                            self._to_google_function_declaration(tool)
-                            for tool in validated_tools
-                        ]
-                    }
-                ]
+                payload["tools"] = self._map_tools(
+                    validated_tools, "google", self._map_tools_to_google
+                )
             tool_config = self._to_google_tool_config(normalized_tool_choice)
             if tool_config is not None:
                 payload["toolConfig"] = tool_config
             _ = parallel_tool_calls
-            client = GeminiSyncClient(self.api_key)
-            response_json = client.chat_completion(
-                model=self.model,
-                timeout_s=timeout_s,
-                **payload,
-            )
-            chat_response = ChatResponse.from_google_response(response_json)
-            chat_response.parsed_json = self._parse_json_response(chat_response.content, effective_schema)
-            chat_response.parsed_model = self._parse_response_model(chat_response.parsed_json, response_model)
-            if self.pricing:
-                chat_response.apply_pricing(
-                    price_input_per_token=self.pricing.in_per_token,
-                    price_output_per_token=self.pricing.out_per_token,
-                    currency=self.pricing.currency,
+            client = GeminiSyncClient(self.api_key, session=self._session)
+            timeout = request_timeout(timeout_s, connect_timeout_s, deadline)
+            response_cls = LazyChatResponse if lazy else ChatResponse
+            if on_stream is not None:
+                accumulator = GoogleStreamAccumulator(
+                    on_stream, parse_json=effective_schema is not None
+                )
+                response_json = accumulator.consume(
+                    client.stream_chat_completion(
+                        model=self.model,
+                        timeout_s=timeout,
+                        deadline=deadline,
+                        **payload,
+                    )
                 )
+            else:
+                response_json = client.chat_completion(
+                    model=self.model,
+                    timeout_s=timeout,
+                    deadline=deadline,
+                    **payload,
+                )
+            chat_response = response_cls.from_google_response(response_json)
+            self._parse_structured(
+                chat_response, effective_schema, response_model, validate=validate_json
+            )
+            self._apply_pricing(chat_response, service_tier)
             return chat_response
         except LLMAPIError as e:
             self.handle_error(e)
@@ -118,23 +147,129 @@ class GoogleAdapter(LLMAdapterBase):
             error_message = getattr(e, "text", None) or str(e)
             self.handle_error(error=e, error_message=error_message)
 
+    def _count_tokens_remote(
+        self,
+        messages: Messages,
+        tools: Optional[List[ToolSpec]],
+        json_schema: Optional[dict],
+        timeout_s: Optional[float],
+    ) -> Optional[TokenCount]:
+        system_prompt, transformed_messages = messages.to_google()
+        payload: Dict[str, Any] = {"contents": transformed_messages}
+        if system_prompt:
+            payload["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+        if tools:
+            payload["tools"] = self._map_tools_to_google(tools)
+        if json_schema is not None:
+            payload["generationConfig"] = {
+                "responseMimeType": "application/json",
+                "responseSchema": self._compile_schema(
+                    "google", json_schema, self._to_google_schema
+                ),
+            }
+        client = GeminiSyncClient(self.api_key, session=self._session)
+        total_tokens = client.count_tokens(model=self.model, timeout_s=timeout_s, **payload)
+        return TokenCount(input_tokens=total_tokens, source="remote")
+
+    @property
+    def supports_embeddings(self) -> bool:
+        return True
+
+    def _embed_batch(
+        self,
+        model: str,
+        texts: List[str],
+        dimensions: Optional[int],
+        timeout: RequestTimeout,
+        deadline: Optional[Deadline],
+    ) -> Tuple[List[List[float]], int]:
+        params: Dict[str, Any] = {"outputDimensionality": dimensions}
+        params = {k: v for k, v in params.items() if v is not None}
+        client = GeminiSyncClient(self.api_key, session=self._session)
+        response = client.batch_embed_contents(
+            model=model, texts=texts, timeout_s=timeout, deadline=deadline, **params
+        )
+        vectors = [item["values"] for item in response.get("embeddings") or []]
+        # batchEmbedContents reports no token usage; it is estimated.
+        return vectors, sum(estimate_text_tokens(text) for text in texts)
+
+    @property
+    def supports_native_n(self) -> bool:
+        """Gemini returns n candidates for one request via candidateCount."""
+        return True
+
     # Fields not supported by Google's responseSchema subset of JSON Schema.
-    _GOOGLE_SCHEMA_UNSUPPORTED = frozenset({"additionalProperties", "$schema", "$id", "$ref"})
+    _GOOGLE_SCHEMA_UNSUPPORTED = frozenset(
+        {"additionalProperties", "$schema", "$id", "$ref", "$defs", "definitions"}
+    )
 
     def _to_google_schema(self, schema: dict) -> dict:
-        """Convert standard JSON Schema to Google's format (type uppercase, unsupported fields stripped)."""
+        """
+        Convert standard JSON Schema to Google's format (type uppercase, unsupported fields stripped).
+
+        $ref is resolved by inlining the referenced $defs entry (recursive
+        references are cut to a bare OBJECT), and null alternatives in
+        anyOf or type lists become nullable: true.
+        """
+        defs = {**(schema.get("definitions") or {}), **(schema.get("$defs") or {})}
+        return self._to_google_schema_node(schema, defs, ())
+
+    def _to_google_schema_node(self, schema: dict, defs: dict, ref_stack: tuple) -> dict:
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            name = ref.rsplit("/", 1)[-1]
+            if name in defs and name not in ref_stack:
+                siblings = {k: v for k, v in schema.items() if k != "$ref"}
+                return self._to_google_schema_node(
+                    {**defs[name], **siblings}, defs, ref_stack + (name,)
+                )
+            if name in ref_stack:
+                return {"type": "OBJECT"}
         schema = {k: v for k, v in schema.items() if k not in self._GOOGLE_SCHEMA_UNSUPPORTED}
-        if "type" in schema and isinstance(schema["type"], str):
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            non_null = [t for t in schema_type if t != "null"]
+            if len(non_null) < len(schema_type):
+                schema["nullable"] = True
+            schema_type = non_null[0] if len(non_null) == 1 else None
+            if schema_type is None:
+                schema.pop("type")
+            else:
+                schema["type"] = schema_type
+        if isinstance(schema.get("type"), str):
             schema["type"] = schema["type"].upper()
         if "properties" in schema:
             schema["properties"] = {
-                k: self._to_google_schema(v) if isinstance(v, dict) else v
+                k: self._to_google_schema_node(v, defs, ref_stack) if isinstance(v, dict) else v
                 for k, v in schema["properties"].items()
             }
         if "items" in schema and isinstance(schema["items"], dict):
-            schema["items"] = self._to_google_schema(schema["items"])
+            schema["items"] = self._to_google_schema_node(schema["items"], defs, ref_stack)
+        for key in ("anyOf", "oneOf"):
+            if isinstance(schema.get(key), list):
+                options = [v for v in schema.pop(key) if isinstance(v, dict)]
+                non_null = [v for v in options if v.get("type") != "null"]
+                if len(non_null) < len(options):
+                    schema["nullable"] = True
+                converted = [
+                    self._to_google_schema_node(v, defs, ref_stack) for v in non_null
+                ]
+                if len(converted) == 1:
+                    schema = {**converted[0], **schema}
+                elif converted:
+                    schema["anyOf"] = converted
         return schema
 
+    def _map_tools_to_google(self, tools: List[ToolSpec]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "functionDeclarations": [
+                    self._to_google_function_declaration(tool)
+                    for tool in tools
+                ]
+            }
+        ]
+
     def _to_google_function_declaration(self, tool: ToolSpec) -> Dict[str, Any]:
         declaration: Dict[str, Any] = {
             "name": tool.name,
@@ -2,15 +2,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import warnings
 
-from ..adapters.base_adapter import LLMAdapterBase
+from ..adapters.base_adapter import LLMAdapterBase, candidate_fallback
 from ..errors.llm_api_error import LLMAPIError
+from ..llms.openai.stream import (
+    OpenAIChatStreamAccumulator,
+    OpenAIResponsesStreamAccumulator,
+)
 from ..llms.openai.sync_client import OpenAISyncClient
 from ..models.messages.chat_message import Message, Messages
-from ..models.responses.chat_response import ChatResponse
-from ..models.tools import ToolSpec
+from ..models.responses.chat_response import ChatResponse, LazyChatResponse
+from ..models.responses.chat_stream import StreamEvent
+from ..models.tools import ToolSpec, Toolset
+from ..utils.deadline import Deadline, RequestTimeout, request_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +25,7 @@ logger = logging.getLogger(__name__)
 class OpenAIAdapter(LLMAdapterBase):
     company: str = "openai"
 
+    @candidate_fallback
     def chat(
         self,
         messages: List[Message] | Messages,
@@ -27,13 +34,24 @@ class OpenAIAdapter(LLMAdapterBase):
         top_p: float = 1.0,
         reasoning_level: Optional[str | int] = None,
         timeout_s: Optional[float] = None,
-        tools: Optional[List[ToolSpec]] = None,
+        tools: Optional[List[ToolSpec] | Toolset] = None,
         tool_choice: Any = None,
         parallel_tool_calls: Optional[bool] = None,
         previous_response: Optional[ChatResponse] = None,
         json_schema: Optional[dict] = None,
         response_model: Optional[Any] = None,
+        validate_json: bool = False,
+        on_stream: Optional[Callable[[StreamEvent], None]] = None,
+        connect_timeout_s: Optional[float] = None,
+        deadline_s: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        n: Optional[int] = None,
+        service_tier: Optional[str] = None,
+        prediction: Optional[str | dict] = None,
+        lazy: bool = False,
     ) -> ChatResponse:
+        deadline = Deadline.resolve(deadline, deadline_s)
+        n = self._validate_n(n, on_stream)
         temperature = self._validate_parameter(
             name="temperature",
             value=temperature,
@@ -51,7 +69,8 @@ class OpenAIAdapter(LLMAdapterBase):
         normalized_tool_choice = self._normalize_tool_choice(tool_choice, tools)
 
         try:
-            client = OpenAISyncClient(api_key=self.api_key)
+            client = OpenAISyncClient(api_key=self.api_key, session=self._session)
+            timeout = request_timeout(timeout_s, connect_timeout_s, deadline)
             normalized_messages = self._normalize_messages(messages)
             use_responses_api = client._should_use_responses_api(self.model)
             normalized_reasoning_level = self._normalize_reasoning_level(
@@ -65,14 +84,16 @@ class OpenAIAdapter(LLMAdapterBase):
             if use_responses_api:
                 transformed_messages = normalized_messages.to_openai_responses_input()
                 instructions = normalized_messages.to_openai_responses_instructions()
-                openai_tools = self._map_tools_to_openai_responses(tools)
+                openai_tools = self._map_tools(
+                    tools, "openai_responses", self._map_tools_to_openai_responses
+                )
                 openai_tool_choice = self._map_tool_choice_to_openai_responses(
                     normalized_tool_choice
                 )
             else:
                 transformed_messages = normalized_messages.to_openai()
                 instructions = None
-                openai_tools = self._map_tools_to_openai(tools)
+                openai_tools = self._map_tools(tools, "openai", self._map_tools_to_openai)
                 openai_tool_choice = self._map_tool_choice_to_openai(
                     normalized_tool_choice
                 )
@@ -85,9 +106,17 @@ class OpenAIAdapter(LLMAdapterBase):
                 "reasoning_effort": normalized_reasoning_level,
                 "tools": openai_tools,
                 "tool_choice": openai_tool_choice,
+                "service_tier": self._service_tier(service_tier),
             }
 
+            strict_schema = None
+            if effective_schema is not None:
+                strict_schema = self._compile_schema(
+                    "strict", effective_schema, self._enforce_openai_strict_schema
+                )
+
             if use_responses_api:
+                _ = self._prediction(prediction)
                 params["input"] = transformed_messages
                 if instructions is not None:
                     params["instructions"] = instructions
@@ -99,39 +128,49 @@ class OpenAIAdapter(LLMAdapterBase):
                             "type": "json_schema",
                             "name": "response",
                             "strict": True,
-                            "schema": self._enforce_strict_schema(effective_schema),
+                            "schema": strict_schema,
                         }
                     }
             else:
                 params["messages"] = transformed_messages
                 params["parallel_tool_calls"] = parallel_tool_calls
+                params["n"] = n
+                params["prediction"] = self._prediction(prediction)
                 if effective_schema is not None:
                     params["response_format"] = {
                         "type": "json_schema",
                         "json_schema": {
                             "name": "response",
                             "strict": True,
-                            "schema": self._enforce_strict_schema(effective_schema),
+                            "schema": strict_schema,
                         },
                     }
 
             params = {k: v for k, v in params.items() if v is not None}
-            response = client.complete(timeout=timeout_s, **params)
+            response_cls = LazyChatResponse if lazy else ChatResponse
+            if on_stream is not None:
+                accumulator_cls = (
+                    OpenAIResponsesStreamAccumulator
+                    if use_responses_api
+                    else OpenAIChatStreamAccumulator
+                )
+                accumulator = accumulator_cls(on_stream, parse_json=effective_schema is not None)
+                response = accumulator.consume(
+                    client.stream_complete(timeout=timeout, deadline=deadline, **params)
+                )
+            else:
+                response = client.complete(timeout=timeout, deadline=deadline, **params)
 
             if use_responses_api:
-                chat_response = ChatResponse.from_openai_responses_response(response)
+                chat_response = response_cls.from_openai_responses_response(response)
             else:
-                chat_response = ChatResponse.from_openai_response(response)
+                chat_response = response_cls.from_openai_response(response)
 
-            chat_response.parsed_json = self._parse_json_response(chat_response.content, effective_schema)
-            chat_response.parsed_model = self._parse_response_model(chat_response.parsed_json, response_model)
+            self._parse_structured(
+                chat_response, effective_schema, response_model, validate=validate_json
+            )
 
-            if self.pricing:
-                chat_response.apply_pricing(
-                    price_input_per_token=self.pricing.in_per_token,
-                    price_output_per_token=self.pricing.out_per_token,
-                    currency=self.pricing.currency,
-                )
+            self._apply_pricing(chat_response, service_tier)
 
             return chat_response
 
@@ -141,6 +180,49 @@ class OpenAIAdapter(LLMAdapterBase):
             error_message = getattr(e, "text", None) or str(e)
             self.handle_error(error=e, error_message=error_message)
 
+    @property
+    def supports_embeddings(self) -> bool:
+        return True
+
+    def _embed_batch(
+        self,
+        model: str,
+        texts: List[str],
+        dimensions: Optional[int],
+        timeout: RequestTimeout,
+        deadline: Optional[Deadline],
+    ) -> Tuple[List[List[float]], int]:
+        params: Dict[str, Any] = {"dimensions": dimensions}
+        params = {k: v for k, v in params.items() if v is not None}
+        client = OpenAISyncClient(api_key=self.api_key, session=self._session)
+        response = client.embeddings(
+            model=model, input=texts, timeout=timeout, deadline=deadline, **params
+        )
+        data = sorted(response.get("data") or [], key=lambda item: item.get("index", 0))
+        usage = response.get("usage") or {}
+        return [item["embedding"] for item in data], usage.get("prompt_tokens", 0)
+
+    @property
+    def supports_native_n(self) -> bool:
+        """Chat Completions takes n; the Responses API does not."""
+        return not OpenAISyncClient(api_key=self.api_key)._should_use_responses_api(self.model)
+
+    @property
+    def supports_previous_response(self) -> bool:
+        """The Responses API stores responses and takes previous_response_id."""
+        return not self.supports_native_n
+
+    @property
+    def supports_prediction(self) -> bool:
+        """Predicted outputs are a Chat Completions feature."""
+        return self.supports_native_n
+
+    def _map_service_tier(self, service_tier: str) -> Optional[str]:
+        return service_tier
+
+    def _enforce_openai_strict_schema(self, schema: dict) -> dict:
+        return self._enforce_strict_schema(schema, require_all=True)
+
     def _map_tools_to_openai(
         self,
         tools: Optional[List[ToolSpec]],
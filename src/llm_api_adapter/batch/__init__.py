@@ -0,0 +1,4 @@
+from .process_pool import AdapterChat
+from .runner import BatchRunner, BatchSummary, ChunkResult, RowProcessor
+
+__all__ = ["AdapterChat", "BatchRunner", "BatchSummary", "ChunkResult", "RowProcessor"]
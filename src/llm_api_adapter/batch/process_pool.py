@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..limits.rate_limiter import RateLimiter
+from ..models.responses.chat_response import ChatResponse
+from ..routing.key_pool import KeyPool
+from ..universal_adapter import UniversalLLMAPIAdapter
+from .runner import ChunkResult, chunk_result
+
+# Per-process state, set by _init_worker in each worker process.
+_process: Optional[Callable[[int, str], Dict[str, Any]]] = None
+_threads: Optional[ThreadPoolExecutor] = None
+
+
+@dataclass
+class AdapterChat:
+    """
+    Picklable chat callable that builds its adapter on first use.
+
+    Pickling drops the adapter, so every worker process that receives a
+    copy creates its own adapter (and KeyPool, connection pool, circuit
+    breakers and rate limit state) instead of sharing the parent's. Several api_keys form a
+    KeyPool. A rate_limiter backed by a SQLiteStateStore keeps all the
+    processes under one quota. adapter_factory(organization, model)
+    replaces UniversalLLMAPIAdapter and must be picklable too.
+    """
+    organization: str
+    model: str
+    api_keys: Sequence[str] = ()
+    rate_limiter: Optional[RateLimiter] = None
+    adapter_factory: Optional[Callable[[str, str], Any]] = None
+
+    def __post_init__(self) -> None:
+        self._adapter: Any = None
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs: Any) -> ChatResponse:
+        return self.adapter.chat(**kwargs)
+
+    @property
+    def adapter(self) -> Any:
+        if self._adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    self._adapter = self._make_adapter()
+        return self._adapter
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_adapter"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _make_adapter(self) -> Any:
+        if self.adapter_factory is not None:
+            return self.adapter_factory(self.organization, self.model)
+        keys = list(self.api_keys)
+        if not keys:
+            raise ValueError(f"No API key for {self.organization!r}")
+        return UniversalLLMAPIAdapter(
+            organization=self.organization,
+            model=self.model,
+            api_key=keys[0],
+            key_pool=KeyPool(keys) if len(keys) > 1 else None,
+            rate_limiter=self.rate_limiter,
+        )
+
+
+def make_process_executor(
+    process: Callable[[int, str], Dict[str, Any]], processes: int, threads: int
+) -> ProcessPoolExecutor:
+    """Process pool whose workers each hold a copy of process and threads threads."""
+    return ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker, initargs=(process, threads)
+    )
+
+
+def run_worker_chunk(rows: List[Tuple[int, str]]) -> ChunkResult:
+    """Runs rows concurrently on the worker's threads; executes in the worker process."""
+    if _process is None or _threads is None:
+        raise RuntimeError("run_worker_chunk() called outside a batch worker process")
+    process = _process
+    records = list(_threads.map(lambda row: process(*row), rows))
+    return chunk_result(records)
+
+
+def _init_worker(process: Callable[[int, str], Dict[str, Any]], threads: int) -> None:
+    global _process, _threads
+    _process = process
+    _threads = ThreadPoolExecutor(threads, thread_name_prefix="llm-batch-worker")
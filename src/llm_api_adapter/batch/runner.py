@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import math
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..gateway.openai_format import parse_chat_completions
+from ..models.responses.chat_response import ChatResponse
+from ..utils.retry import call_with_retries
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class BatchSummary:
+    """Totals of a batch run; counts and costs include resumed runs."""
+    succeeded: int = 0
+    failed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_total: float = 0.0
+    currency: Optional[str] = None
+    elapsed_s: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def requests_per_s(self) -> float:
+        return self.completed / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def output_tokens_per_s(self) -> float:
+        return self.output_tokens / self.elapsed_s if self.elapsed_s else 0.0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        if record.get("status") != "ok":
+            self.failed += 1
+            return
+        self.succeeded += 1
+        usage = record.get("usage") or {}
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.cost_total += record.get("cost_total") or 0.0
+        self.currency = self.currency or record.get("currency")
+
+    def merge(self, other: "BatchSummary") -> None:
+        """Adds the counts of other (e.g. a worker's chunk) to this summary."""
+        self.succeeded += other.succeeded
+        self.failed += other.failed
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cost_total += other.cost_total
+        self.currency = self.currency or other.currency
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "completed": self.completed,
+            "requests_per_s": round(self.requests_per_s, 3),
+            "output_tokens_per_s": round(self.output_tokens_per_s, 3),
+        }
+
+
+def response_record(line: int, row_id: Any, response: ChatResponse, latency_s: float) -> Dict[str, Any]:
+    """Output line for a successful row."""
+    usage = response.usage
+    record: Dict[str, Any] = {
+        "line": line,
+        "id": row_id,
+        "status": "ok",
+        "model": response.model,
+        "content": response.content,
+        "finish_reason": response.finish_reason,
+        "usage": {
+            "input_tokens": usage.input_tokens if usage else 0,
+            "output_tokens": usage.output_tokens if usage else 0,
+        },
+        "cost_total": response.cost_total,
+        "currency": response.currency,
+        "latency_s": round(latency_s, 3),
+    }
+    if response.tool_calls:
+        record["tool_calls"] = [
+            {"name": t.name, "arguments": t.arguments, "call_id": t.call_id}
+            for t in response.tool_calls
+        ]
+    if response.parsed_json is not None:
+        record["parsed_json"] = response.parsed_json
+    return record
+
+
+def error_record(line: int, row_id: Any, error: Exception) -> Dict[str, Any]:
+    """Output line for a failed row."""
+    return {
+        "line": line,
+        "id": row_id,
+        "status": "error",
+        "error_type": type(error).__name__,
+        "error": str(error),
+    }
+
+
+@dataclass
+class ChunkResult:
+    """
+    Finished rows of one chunk in compact form: their line numbers, the
+    encoded output lines and their totals. Picklable, so process workers
+    return it instead of ChatResponse objects.
+    """
+    lines: List[int]
+    data: bytes
+    summary: BatchSummary
+
+
+def chunk_result(records: List[Dict[str, Any]]) -> ChunkResult:
+    summary = BatchSummary()
+    for record in records:
+        summary.add(record)
+    data = b"".join(
+        json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n" for record in records
+    )
+    return ChunkResult([record["line"] for record in records], data, summary)
+
+
+def run_chunk(process: Callable[[int, str], Dict[str, Any]], rows: List[Tuple[int, str]]) -> ChunkResult:
+    return chunk_result([process(line, text) for line, text in rows])
+
+
+@dataclass
+class RowProcessor:
+    """
+    Turns one input line into one output record by calling chat.
+
+    Rows are Chat Completions request bodies, optionally wrapped as OpenAI
+    Batch API lines ({"custom_id": ..., "body": {...}}); the row id is
+    custom_id or id, else the line number. Errors, including malformed
+    rows, become error records instead of raising.
+    """
+    chat: Callable[..., ChatResponse]
+    defaults: Dict[str, Any] = field(default_factory=dict)
+    retries: int = 2
+    retry_backoff_s: float = 1.0
+
+    def __call__(self, line: int, text: str) -> Dict[str, Any]:
+        row_id: Any = line
+        try:
+            row = json.loads(text)
+            if not isinstance(row, dict):
+                raise ValueError("each line must be a JSON object")
+            row_id = row.get("custom_id", row.get("id", line))
+            body = row.get("body", row)
+            if not isinstance(body, dict):
+                raise ValueError("body must be a JSON object")
+            kwargs = {**self.defaults, **parse_chat_completions(body)}
+            started = time.monotonic()
+            response = call_with_retries(
+                lambda: self.chat(**kwargs),
+                retries=self.retries,
+                backoff_s=self.retry_backoff_s,
+            )
+            return response_record(line, row_id, response, time.monotonic() - started)
+        except Exception as e:
+            # Any bad row becomes an error record; it must not stop the run.
+            return error_record(line, row_id, e)
+
+
+@dataclass
+class BatchRunner:
+    """
+    Runs a JSONL file of chat requests with bounded concurrency.
+
+    Input is streamed line by line; at most 2 * concurrency rows are in
+    flight. Each finished row is appended to the output JSONL at once
+    (completion order, with its input line number). Every
+    checkpoint_every rows the output is flushed and
+    "<output>.checkpoint" records the contiguous completed line
+    watermark, the completed lines past it and the output size, so a
+    rerun skips finished rows instead of paying for them again; rows
+    written after the last checkpoint are recovered from the output.
+
+    process(line, text) returns the record for one line. With processes
+    > 0 rows are sharded over a process pool instead of threads: process
+    must then be picklable, each worker process gets its own copy (and
+    so its own adapter) and runs concurrency / processes rows at a time
+    on its own threads; see process_pool.
+    """
+    process: Callable[[int, str], Dict[str, Any]]
+    concurrency: int = 16
+    checkpoint_every: int = 100
+    processes: int = 0
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if self.checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be >= 1")
+        if self.processes < 0:
+            raise ValueError("processes must be >= 0")
+
+    @property
+    def chunk_size(self) -> int:
+        """Rows per submitted task: 1 for threads, a worker's thread count for processes."""
+        if not self.processes:
+            return 1
+        return math.ceil(self.concurrency / self.processes)
+
+    def run(self, input_path: str, output_path: str, resume: bool = True) -> BatchSummary:
+        state = _RunState(input_path, output_path, resume)
+        executor, submit = self._executor()
+        pending: Dict[Future, int] = {}
+        in_flight = 0
+        rows: List[Tuple[int, str]] = []
+        try:
+            with open(input_path, encoding="utf-8") as source:
+                for line, text in enumerate(source, 1):
+                    if state.is_done(line):
+                        continue
+                    if not text.strip():
+                        state.mark_done(line)
+                        continue
+                    rows.append((line, text))
+                    if len(rows) < self.chunk_size:
+                        continue
+                    while in_flight >= 2 * self.concurrency:
+                        in_flight -= self._drain(pending, state)
+                    pending[submit(rows)] = len(rows)
+                    in_flight += len(rows)
+                    rows = []
+            if rows:
+                pending[submit(rows)] = len(rows)
+            while pending:
+                self._drain(pending, state)
+        finally:
+            executor.shutdown(wait=not pending, cancel_futures=True)
+            state.close()
+        return state.summary
+
+    def _executor(self) -> Tuple[Any, Callable[[List[Tuple[int, str]]], Future]]:
+        if self.processes:
+            from .process_pool import make_process_executor, run_worker_chunk
+
+            executor = make_process_executor(self.process, self.processes, self.chunk_size)
+            return executor, lambda rows: executor.submit(run_worker_chunk, rows)
+        executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="llm-batch")
+        return executor, lambda rows: executor.submit(run_chunk, self.process, rows)
+
+    def _drain(self, pending: Dict[Future, int], state: "_RunState") -> int:
+        """Writes finished chunks; returns the number of rows they held."""
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        finished = 0
+        for future in done:
+            finished += pending.pop(future)
+            state.write(future.result())
+            if state.unsaved >= self.checkpoint_every:
+                state.checkpoint()
+                logger.info("%d rows completed, %d failed", state.summary.completed, state.summary.failed)
+        return finished
+
+
+class _RunState:
+    """Output file, completed-line bookkeeping and checkpointing of one run."""
+
+    def __init__(self, input_path: str, output_path: str, resume: bool) -> None:
+        self.input_path = os.path.abspath(input_path)
+        self.checkpoint_path = output_path + ".checkpoint"
+        self.summary = BatchSummary()
+        self.watermark = 0
+        self.done: Set[int] = set()
+        self.unsaved = 0
+        offset = 0
+        if resume and os.path.exists(self.checkpoint_path):
+            offset = self._load_checkpoint()
+        elif not resume and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        mode = "r+b" if resume and os.path.exists(output_path) else "w+b"
+        self.output = open(output_path, mode)
+        self._recover(offset)
+        self._started = time.monotonic()
+        self._base_elapsed = self.summary.elapsed_s
+
+    def is_done(self, line: int) -> bool:
+        return line <= self.watermark or line in self.done
+
+    def mark_done(self, line: int) -> None:
+        self.done.add(line)
+        while self.watermark + 1 in self.done:
+            self.watermark += 1
+            self.done.discard(self.watermark)
+
+    def write(self, result: ChunkResult) -> None:
+        self.output.write(result.data)
+        self.summary.merge(result.summary)
+        for line in result.lines:
+            self.mark_done(line)
+        self.unsaved += len(result.lines)
+
+    def checkpoint(self) -> None:
+        self.summary.elapsed_s = self._base_elapsed + time.monotonic() - self._started
+        self.output.flush()
+        os.fsync(self.output.fileno())
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "input": self.input_path,
+            "watermark": self.watermark,
+            "done": sorted(self.done),
+            "output_offset": self.output.tell(),
+            "summary": asdict(self.summary),
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.checkpoint_path)
+        self.unsaved = 0
+
+    def close(self) -> None:
+        try:
+            self.checkpoint()
+        finally:
+            self.output.close()
+
+    def _load_checkpoint(self) -> int:
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self.checkpoint_path}")
+        if data.get("input") != self.input_path:
+            logger.warning(
+                "Checkpoint %s was written for %s; resuming anyway",
+                self.checkpoint_path, data.get("input"),
+            )
+        self.watermark = data["watermark"]
+        self.done = set(data["done"])
+        self.summary = BatchSummary(**data["summary"])
+        return data["output_offset"]
+
+    def _recover(self, offset: int) -> None:
+        """Counts records written after the checkpoint; drops a torn last line."""
+        self.output.seek(offset)
+        end = offset
+        for raw in self.output:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                break
+            self.summary.add(record)
+            self.mark_done(record["line"])
+            end += len(raw)
+        self.output.seek(end)
+        self.output.truncate()
@@ -0,0 +1,3 @@
+from .budget import Budget, run_within_budgets
+
+__all__ = ["Budget", "run_within_budgets"]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import math
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from ..errors.llm_api_error import LLMAPIBudgetExceededError
+from ..limits.state_store import StateStore
+from ..models.responses.chat_response import ChatResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Budget:
+    """
+    Spending limit in the pricing currency, shared by every adapter or call
+    it is passed to (one per adapter, per tenant, or one global instance).
+
+    Before each call the worst-case cost (see estimate_cost()) is reserved;
+    after the response the reservation is replaced by the actual cost_total,
+    so concurrent calls cannot overrun the limit together. When a call does
+    not fit it is rejected with LLMAPIBudgetExceededError, or, with
+    downgrade_to, sent to that cheaper model of the same provider instead;
+    downgraded calls are still charged and stop at hard_limit (if set).
+
+    With a store (e.g. SQLiteStateStore) spent and reserved live there
+    under name, so every Budget with that name and store, in any process,
+    draws on the same total; spent/reserved then mirror the last value
+    seen by this instance.
+    """
+    limit: float
+    downgrade_to: Optional[str] = None
+    hard_limit: Optional[float] = None
+    name: str = "budget"
+    store: Optional[StateStore] = None
+    spent: float = field(default=0.0, init=False)
+    reserved: float = field(default=0.0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.limit < 0:
+            raise ValueError("limit must be >= 0")
+        if self.hard_limit is not None and self.hard_limit < self.limit:
+            raise ValueError("hard_limit must be >= limit")
+
+    @property
+    def remaining(self) -> float:
+        spent, reserved = self._totals()
+        return max(0.0, self.limit - spent - reserved)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._totals()[0] >= self.limit
+
+    def reserve(self, amount: float, downgraded: bool = False) -> bool:
+        """Reserves amount if it fits under the (hard, when downgraded) limit."""
+        ceiling = self.limit
+        if downgraded and self.downgrade_to is not None:
+            ceiling = self.hard_limit if self.hard_limit is not None else math.inf
+        if self.store is not None:
+            granted, spent, reserved = self.store.reserve_budget(self.name, amount, ceiling)
+            self._mirror(spent, reserved)
+            return granted
+        with self._lock:
+            if self.spent >= ceiling or self.spent + self.reserved + amount > ceiling:
+                return False
+            self.reserved += amount
+            return True
+
+    def settle(self, reserved: float, cost: Optional[float]) -> None:
+        """Releases a reservation and charges the actual cost."""
+        if self.store is not None:
+            self._mirror(*self.store.settle_budget(self.name, reserved, cost or 0.0))
+            return
+        with self._lock:
+            self.reserved = max(0.0, self.reserved - reserved)
+            self.spent += cost or 0.0
+
+    def charge(self, cost: Optional[float]) -> None:
+        self.settle(0.0, cost)
+
+    def reset(self) -> None:
+        if self.store is not None:
+            self.store.reset_budget(self.name)
+        self._mirror(0.0, 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        spent, reserved = self._totals()
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "spent": spent,
+            "reserved": reserved,
+            "remaining": max(0.0, self.limit - spent - reserved),
+        }
+
+    def exceeded_error(self, required: float) -> LLMAPIBudgetExceededError:
+        spent = self._totals()[0]
+        error_message = (
+            f"budget {self.name!r} spent {spent:.6f} of {self.limit}; "
+            f"the request may cost up to {required:.6f}"
+        )
+        logger.error(error_message)
+        return LLMAPIBudgetExceededError(
+            detail=error_message,
+            budget=self.name,
+            spent=spent,
+            limit=self.limit,
+            required=required,
+        )
+
+    def _totals(self) -> Tuple[float, float]:
+        if self.store is not None:
+            self._mirror(*self.store.budget_totals(self.name))
+        with self._lock:
+            return self.spent, self.reserved
+
+    def _mirror(self, spent: float, reserved: float) -> None:
+        with self._lock:
+            self.spent = spent
+            self.reserved = reserved
+
+
+def run_within_budgets(
+    budgets: Sequence[Budget],
+    estimate: Callable[[Optional[str]], float],
+    call: Callable[[Optional[str]], ChatResponse],
+) -> ChatResponse:
+    """
+    Reserves estimate(model) in every budget, runs call(model) and charges
+    the response's cost_total. model is None for the requested model, or
+    the downgrade_to model of the first budget the request does not fit.
+    """
+    model: Optional[str] = None
+    amount = estimate(None)
+    failed = _reserve_all(budgets, amount, downgraded=False)
+    if failed is not None:
+        if failed.downgrade_to is None:
+            raise failed.exceeded_error(amount)
+        model = failed.downgrade_to
+        amount = estimate(model)
+        logger.warning("Budget %r exhausted, downgrading to %s", failed.name, model)
+        failed = _reserve_all(budgets, amount, downgraded=True)
+        if failed is not None:
+            raise failed.exceeded_error(amount)
+    try:
+        response = call(model)
+    except BaseException:
+        for budget in budgets:
+            budget.settle(amount, 0.0)
+        raise
+    if response.cost_total is None:
+        logger.warning("Response has no cost_total (model without pricing); budget not charged")
+    for budget in budgets:
+        budget.settle(amount, response.cost_total)
+    return response
+
+
+def _reserve_all(
+    budgets: Sequence[Budget], amount: float, downgraded: bool
+) -> Optional[Budget]:
+    """Reserves amount in all budgets; on failure undoes them and returns the culprit."""
+    reserved = []
+    for budget in budgets:
+        if not budget.reserve(amount, downgraded=downgraded):
+            for done in reserved:
+                done.settle(amount, 0.0)
+            return budget
+        reserved.append(budget)
+    return None
@@ -0,0 +1,3 @@
+from .conversation import Conversation, llm_summarizer
+
+__all__ = ["Conversation", "llm_summarizer"]
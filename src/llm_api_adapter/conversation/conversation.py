@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import logging
+from typing import Any, Callable, List, Optional, Tuple
+
+from ..errors.llm_api_error import LLMAPIClientError, LLMAPITokenLimitError
+from ..models.messages.chat_message import (
+    AIMessage,
+    Message,
+    Messages,
+    Prompt,
+    ToolMessage,
+    UserMessage,
+)
+from ..models.responses.chat_response import ChatResponse
+from ..tokens.token_counter import TOKEN_ESTIMATOR
+
+logger = logging.getLogger(__name__)
+
+Summarizer = Callable[[List[Message], Optional[str]], str]
+
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+
+
+@dataclass
+class Conversation:
+    """
+    Message history that is trimmed to the model's context window before
+    each request.
+
+    The history is split into turns, each starting at a UserMessage, so an
+    AIMessage with tool calls always stays together with its ToolMessage
+    results. The oldest turns are left out until the estimated input plus
+    the reserved output (max_tokens, or the model's max_output) and
+    headroom fit context_window; the system prompt and the latest turn are
+    always sent. With summarize, left-out turns are condensed into a
+    summary appended to the system prompt instead of being lost; each turn
+    is summarized once. The history itself is never modified by trimming.
+
+    With stateful=True and an adapter that keeps responses server-side
+    (supports_previous_response, the OpenAI Responses API), each request
+    references the last response and sends only the system prompt and
+    the messages added since. The trimmed history is sent in full instead,
+    starting a new chain from its reply, when trimming leaves out a turn
+    the stored chain still holds, or, once, when the server no longer has
+    the stored response.
+    """
+    adapter: Any
+    messages: List[Message] = field(default_factory=list)
+    context_window: Optional[int] = None
+    headroom: float = 0.05
+    summarize: Optional[Summarizer] = None
+    summary_tokens: int = 1024
+    stateful: bool = False
+    summary: Optional[str] = field(default=None, init=False)
+    _summarized_turns: int = field(default=0, init=False, repr=False)
+    _server_response: Optional[ChatResponse] = field(default=None, init=False, repr=False)
+    _server_messages: int = field(default=0, init=False, repr=False)
+    _server_head: Optional[Message] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.headroom < 1:
+            raise ValueError("headroom must be in [0, 1)")
+        self.messages = Messages(list(self.messages)).items
+
+    def add(self, *messages: Any) -> None:
+        """Appends messages (Message instances, OpenAI-style dicts or user text)."""
+        items = [UserMessage(m) if isinstance(m, str) else m for m in messages]
+        self.messages.extend(Messages(items).items)
+
+    def add_response(self, response: ChatResponse) -> AIMessage:
+        message = AIMessage(content=response.content or "", tool_calls=response.tool_calls)
+        self.messages.append(message)
+        return message
+
+    def chat(self, message: Any = None, **kwargs: Any) -> ChatResponse:
+        """
+        Adds message (if given), sends the trimmed history with
+        adapter.chat(**kwargs) and records the assistant reply.
+        """
+        if message is not None:
+            self.add(message)
+        messages = self.fit(
+            max_tokens=kwargs.get("max_tokens"),
+            tools=kwargs.get("tools"),
+            json_schema=kwargs.get("json_schema"),
+            response_model=kwargs.get("response_model"),
+        )
+        previous_response = self._previous_response(messages)
+        head = self._server_head
+        if previous_response is None:
+            response = self.adapter.chat(messages=messages, **kwargs)
+            head = _first_turn_message(messages)
+        else:
+            new_messages = [
+                m for m in self.messages[self._server_messages:] if not isinstance(m, Prompt)
+            ]
+            system = [m for m in messages if isinstance(m, Prompt)]
+            try:
+                response = self.adapter.chat(
+                    messages=system + new_messages,
+                    previous_response=previous_response,
+                    **kwargs,
+                )
+            except LLMAPIClientError as e:
+                if not _is_missing_response(e):
+                    raise
+                logger.info(
+                    "Stored response %s is gone; resending the history",
+                    previous_response.response_id,
+                )
+                response = self.adapter.chat(messages=messages, **kwargs)
+                head = _first_turn_message(messages)
+        self.add_response(response)
+        self._server_response = response if self.stateful and response.response_id else None
+        self._server_messages = len(self.messages)
+        self._server_head = head if self._server_response is not None else None
+        return response
+
+    def input_limit(self, max_tokens: Optional[int] = None) -> int:
+        window = self.context_window or getattr(self.adapter, "context_window", None)
+        if not window:
+            raise ValueError(
+                "context_window is unknown for this model; pass Conversation(context_window=...)"
+            )
+        reserve = max_tokens or getattr(self.adapter, "max_output", None) or 0
+        return int(window * (1 - self.headroom)) - reserve
+
+    def fit(
+        self,
+        max_tokens: Optional[int] = None,
+        tools: Any = None,
+        json_schema: Optional[dict] = None,
+        response_model: Optional[Any] = None,
+    ) -> List[Message]:
+        """Messages to send: system prompt, summary and the newest turns that fit."""
+        limit = self.input_limit(max_tokens)
+        system, turns = self._split_turns()
+        provider = self.adapter.company
+        turn_tokens = [
+            sum(sum(TOKEN_ESTIMATOR.message_tokens(provider, m)) for m in turn) for turn in turns
+        ]
+        first = min(self._summarized_turns, max(len(turns) - 1, 0))
+        reserve = self.summary_tokens if self.summarize is not None else 0
+        fixed = self._fixed_tokens(system, tools, json_schema, response_model)
+        total = fixed + sum(turn_tokens[first:])
+        while total > limit and first < len(turns) - 1:
+            if first == self._summarized_turns and reserve:
+                total += reserve
+                reserve = 0
+            total -= turn_tokens[first]
+            first += 1
+        if self.summarize is not None and first > self._summarized_turns:
+            dropped = [m for turn in turns[self._summarized_turns:first] for m in turn]
+            self.summary = self.summarize(dropped, self.summary)
+            self._summarized_turns = first
+            total = self._fixed_tokens(system, tools, json_schema, response_model)
+            total += sum(turn_tokens[first:])
+            while total > limit and first < len(turns) - 1:
+                logger.warning("Summary larger than summary_tokens; dropping a turn unsummarized")
+                total -= turn_tokens[first]
+                first += 1
+                self._summarized_turns = first
+        if total > limit:
+            error_message = (
+                f"the latest turn needs ~{total} input tokens, over the limit of {limit}"
+            )
+            logger.error(error_message)
+            raise LLMAPITokenLimitError(detail=error_message)
+        if first:
+            logger.debug("Conversation trimmed: %d of %d turns left out", first, len(turns))
+        return self._system_messages(system) + [m for turn in turns[first:] for m in turn]
+
+    def _previous_response(self, messages: List[Message]) -> Optional[ChatResponse]:
+        """
+        The response to continue from, when the server holds exactly the
+        turns that would be sent: the chain started at the first message
+        of the full request that began it.
+        """
+        if (
+            self._server_response is None
+            or not getattr(self.adapter, "supports_previous_response", False)
+            or self._server_messages > len(self.messages)
+        ):
+            return None
+        if _first_turn_message(messages) is not self._server_head:
+            logger.debug("Conversation trimmed; resending the history without the stored response")
+            return None
+        return self._server_response
+
+    def _split_turns(self) -> Tuple[Optional[Prompt], List[List[Message]]]:
+        system: Optional[Prompt] = None
+        turns: List[List[Message]] = []
+        for message in self.messages:
+            if isinstance(message, Prompt):
+                system = message
+            elif isinstance(message, UserMessage) or not turns:
+                turns.append([message])
+            else:
+                turns[-1].append(message)
+        return system, turns
+
+    def _system_messages(self, system: Optional[Prompt]) -> List[Message]:
+        if self.summary is None:
+            return [system] if system is not None else []
+        parts = [system.content] if system is not None else []
+        parts.append(f"{SUMMARY_HEADER}\n{self.summary}")
+        return [Prompt("\n\n".join(parts))]
+
+    def _fixed_tokens(
+        self,
+        system: Optional[Prompt],
+        tools: Any,
+        json_schema: Optional[dict],
+        response_model: Optional[Any],
+    ) -> int:
+        count = self.adapter.count_tokens(
+            self._system_messages(system),
+            tools=tools,
+            json_schema=json_schema,
+            response_model=response_model,
+        )
+        return count.input_tokens
+
+
+def _first_turn_message(messages: List[Message]) -> Optional[Message]:
+    return next((m for m in messages if not isinstance(m, Prompt)), None)
+
+
+def _is_missing_response(error: LLMAPIClientError) -> bool:
+    detail = str(error).lower()
+    return "previous response" in detail or "previous_response_id" in detail
+
+
+def llm_summarizer(adapter: Any, max_tokens: int = 1024, **chat_kwargs: Any) -> Summarizer:
+    """A Conversation summarize callable that asks adapter for the summary."""
+
+    def summarize(messages: List[Message], previous: Optional[str]) -> str:
+        lines = [f"Previous summary: {previous}"] if previous else []
+        for message in messages:
+            if isinstance(message, ToolMessage):
+                lines.append(f"tool result ({message.tool_call_id}): {message.content}")
+                continue
+            lines.append(f"{message.role}: {message.content}")
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                lines.append(f"tool call {tool_call.name}({json.dumps(tool_call.arguments)})")
+        response = adapter.chat(
+            messages=[
+                Prompt(
+                    "Summarize the conversation below for a model that continues it. "
+                    "Keep facts, decisions, open questions and tool results that are still relevant."
+                ),
+                UserMessage("\n".join(lines)),
+            ],
+            max_tokens=max_tokens,
+            **chat_kwargs,
+        )
+        return response.content or ""
+
+    return summarize
@@ -8,6 +8,9 @@ from .llm_api_error import (
     LLMAPITimeoutError,
     LLMAPIUsageLimitError,
     JSONSchemaError,
+    ToolLoopError,
+    LLMAPICircuitOpenError,
+    LLMAPIBudgetExceededError,
 )
 
 __all__ = [
@@ -20,4 +23,7 @@ __all__ = [
     "LLMAPITimeoutError",
     "LLMAPIUsageLimitError",
     "JSONSchemaError",
+    "ToolLoopError",
+    "LLMAPICircuitOpenError",
+    "LLMAPIBudgetExceededError",
 ]
@@ -66,8 +66,12 @@ class LLMAPIServerError(LLMAPIError):
 
 @dataclass
 class LLMAPITimeoutError(LLMAPIError):
-    """Raised when a request times out."""
+    """
+    Raised when a request times out. phase is "connect" or "read" for a
+    socket timeout and "deadline" when the end-to-end deadline expired.
+    """
     message: str = "Request timed out."
+    phase: Optional[str] = None
     openai_api_errors = ["TimeoutError"]
     google_api_errors = ["DEADLINE_EXCEEDED"]
     anthropic_api_errors = []
@@ -104,3 +108,27 @@ class ToolChoiceError(LLMAPIClientError):
 class JSONSchemaError(LLMAPIClientError):
     """Raised when json_schema usage is invalid or the model response fails schema validation."""
     message: str = "JSON schema error."
+
+
+@dataclass
+class ToolLoopError(LLMAPIError):
+    """Raised when the tool loop exhausts its step budget."""
+    message: str = "Tool loop step budget exhausted."
+
+
+@dataclass
+class LLMAPICircuitOpenError(LLMAPIServerError):
+    """Raised without sending the request while the endpoint's circuit breaker is open."""
+    message: str = "Circuit breaker is open."
+    endpoint: Optional[str] = None
+    retry_after_s: Optional[float] = None
+
+
+@dataclass
+class LLMAPIBudgetExceededError(LLMAPIUsageLimitError):
+    """Raised without sending the request when a Budget cannot cover its worst-case cost."""
+    message: str = "Budget exceeded."
+    budget: Optional[str] = None
+    spent: Optional[float] = None
+    limit: Optional[float] = None
+    required: Optional[float] = None
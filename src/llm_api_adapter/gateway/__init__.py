@@ -0,0 +1,4 @@
+from .mock import MockAdapter, mock_adapter_factory
+from .server import Gateway
+
+__all__ = ["Gateway", "MockAdapter", "mock_adapter_factory"]
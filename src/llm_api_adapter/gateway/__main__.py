@@ -0,0 +1,94 @@
+"""
+Runs the OpenAI-compatible gateway:
+
+    python -m llm_api_adapter.gateway --port 8000
+
+Provider keys are read from OPENAI_API_KEY, ANTHROPIC_API_KEY and
+GOOGLE_API_KEY (GEMINI_API_KEY); several comma-separated keys form a
+KeyPool. --rate-limit openai=500:200000 keeps all calls to a provider
+under 500 requests and 200000 tokens per minute (either part may be left
+empty). --mock-latency-s serves every model from MockAdapter instead.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Dict, List, Optional, Union
+
+from ..limits.rate_limiter import RateLimiter
+from ..routing.key_pool import KeyPool
+from ..routing.single_flight import SingleFlight
+from ..utils.bounded_cache import BoundedCache
+from .mock import mock_adapter_factory
+from .server import Gateway
+
+KEY_ENV = {
+    "openai": ("OPENAI_API_KEY",),
+    "anthropic": ("ANTHROPIC_API_KEY",),
+    "google": ("GOOGLE_API_KEY", "GEMINI_API_KEY"),
+}
+
+
+def api_keys_from_env() -> Dict[str, Union[str, KeyPool]]:
+    keys: Dict[str, Union[str, KeyPool]] = {}
+    for organization, names in KEY_ENV.items():
+        value = next((os.environ[name] for name in names if os.environ.get(name)), None)
+        if not value:
+            continue
+        values = [v.strip() for v in value.split(",") if v.strip()]
+        keys[organization] = values[0] if len(values) == 1 else KeyPool(values)
+    return keys
+
+
+def rate_limiters_from_args(specs: Optional[List[str]]) -> Dict[str, RateLimiter]:
+    limiters: Dict[str, RateLimiter] = {}
+    for spec in specs or []:
+        organization, _, limits = spec.partition("=")
+        requests, _, tokens = limits.partition(":")
+        if not organization or not (requests or tokens):
+            raise ValueError(f"--rate-limit expects ORG=RPM[:TPM], got {spec!r}")
+        limiters[organization] = RateLimiter(
+            organization,
+            requests_per_minute=float(requests) if requests else None,
+            tokens_per_minute=float(tokens) if tokens else None,
+        )
+    return limiters
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m llm_api_adapter.gateway")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--cache-size", type=int, default=0, help="cache identical requests (0 = off)")
+    parser.add_argument("--coalesce", action="store_true", help="share identical concurrent requests")
+    parser.add_argument(
+        "--rate-limit", action="append", help="per-provider limit ORG=RPM[:TPM] (repeatable)"
+    )
+    parser.add_argument("--auth-token", action="append", help="accepted bearer token (repeatable)")
+    parser.add_argument("--mock-latency-s", type=float, default=None, help="serve from MockAdapter")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0)
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+    gateway = Gateway(
+        api_keys=api_keys_from_env(),
+        auth_tokens=args.auth_token,
+        max_in_flight=args.max_in_flight,
+        retries=args.retries,
+        cache=BoundedCache(max_entries=args.cache_size) if args.cache_size else None,
+        single_flight=SingleFlight() if args.coalesce else None,
+        rate_limiters=rate_limiters_from_args(args.rate_limit),
+        adapter_factory=(
+            mock_adapter_factory(args.mock_latency_s, args.mock_error_rate)
+            if args.mock_latency_s is not None
+            else None
+        ),
+    )
+    gateway.serve_forever(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+import random
+import time
+from typing import Any, Callable, Optional
+import uuid
+
+from ..errors.llm_api_error import LLMAPIServerError
+from ..models.messages.chat_message import Messages, UserMessage
+from ..models.responses.chat_response import ChatResponse, Usage
+from ..tokens.token_counter import TOKEN_ESTIMATOR, estimate_text_tokens
+
+
+@dataclass
+class MockAdapter:
+    """
+    Provider stand-in for local load tests: answers with the last user
+    message after latency_s, without network I/O, and fails with
+    LLMAPIServerError at error_rate.
+    """
+    model: str = "mock"
+    latency_s: float = 0.0
+    error_rate: float = 0.0
+
+    def chat(self, messages: Any, max_tokens: Optional[int] = None, **kwargs: Any) -> ChatResponse:
+        items = Messages(list(messages)).items
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        if self.error_rate and random.random() < self.error_rate:
+            raise LLMAPIServerError(detail="mock upstream failure")
+        content = next(
+            (m.content for m in reversed(items) if isinstance(m, UserMessage)), ""
+        )
+        if max_tokens:
+            content = content[: max_tokens * 4]
+        input_tokens = TOKEN_ESTIMATOR.estimate("openai", items).input_tokens
+        output_tokens = estimate_text_tokens(content)
+        return ChatResponse(
+            model=self.model,
+            response_id=f"mock-{uuid.uuid4().hex}",
+            timestamp=int(time.time()),
+            usage=Usage(input_tokens, output_tokens, input_tokens + output_tokens),
+            content=content,
+            finish_reason="stop",
+        )
+
+
+def mock_adapter_factory(
+    latency_s: float = 0.0, error_rate: float = 0.0
+) -> Callable[[str, str], MockAdapter]:
+    """
+    Gateway adapter_factory that serves every model with a MockAdapter;
+    picklable, so it also works for process-pool batch runs.
+    """
+    return partial(_mock_adapter, latency_s=latency_s, error_rate=error_rate)
+
+
+def _mock_adapter(organization: str, model: str, latency_s: float, error_rate: float) -> MockAdapter:
+    return MockAdapter(model=model, latency_s=latency_s, error_rate=error_rate)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, List
+import uuid
+
+from ..errors.llm_api_error import LLMAPIClientError
+from ..models.messages.chat_message import AIMessage, Message, Messages, Prompt, ToolMessage
+from ..models.responses.chat_response import ChatResponse
+from ..models.tools import ToolCall, ToolSpec
+
+# Provider finish reasons mapped to OpenAI's.
+FINISH_REASONS = {
+    "stop": "stop",
+    "end_turn": "stop",
+    "stop_sequence": "stop",
+    "STOP": "stop",
+    "completed": "stop",
+    "length": "length",
+    "max_tokens": "length",
+    "MAX_TOKENS": "length",
+    "incomplete": "length",
+    "SAFETY": "content_filter",
+    "content_filter": "content_filter",
+}
+
+EMPTY_PARAMETERS = {"type": "object", "properties": {}}
+
+
+def parse_chat_completions(body: Dict[str, Any]) -> Dict[str, Any]:
+    """chat() keyword arguments for a /v1/chat/completions request body."""
+    messages = body.get("messages")
+    if not isinstance(messages, list) or not messages:
+        raise LLMAPIClientError(detail="messages must be a non-empty list")
+    kwargs: Dict[str, Any] = {"messages": _normalize(messages)}
+    kwargs["max_tokens"] = body.get("max_completion_tokens") or body.get("max_tokens")
+    _common_params(body, kwargs)
+    if body.get("reasoning_effort"):
+        kwargs["reasoning_level"] = body["reasoning_effort"]
+    if body.get("n") is not None:
+        kwargs["n"] = body["n"]
+    if body.get("prediction") is not None:
+        kwargs["prediction"] = body["prediction"]
+    tools = body.get("tools")
+    if tools:
+        kwargs["tools"] = [_tool_spec(tool.get("function") or {}) for tool in tools]
+    if body.get("tool_choice") is not None:
+        kwargs["tool_choice"] = _tool_choice(body["tool_choice"])
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        kwargs["json_schema"] = (response_format.get("json_schema") or {}).get("schema")
+    elif response_format.get("type") == "json_object":
+        kwargs["json_schema"] = {"type": "object"}
+    return kwargs
+
+
+def parse_responses(body: Dict[str, Any]) -> Dict[str, Any]:
+    """chat() keyword arguments for a /v1/responses request body."""
+    if body.get("previous_response_id"):
+        raise LLMAPIClientError(
+            detail="previous_response_id is not supported by the gateway; send the full input"
+        )
+    raw_input = body.get("input")
+    if isinstance(raw_input, str):
+        items: List[Any] = [{"role": "user", "content": raw_input}]
+    elif isinstance(raw_input, list) and raw_input:
+        items = [_responses_item(item) for item in raw_input]
+    else:
+        raise LLMAPIClientError(detail="input must be a string or a non-empty list")
+    messages = _normalize(items)
+    if body.get("instructions"):
+        messages.insert(0, Prompt(body["instructions"]))
+    kwargs: Dict[str, Any] = {"messages": messages, "max_tokens": body.get("max_output_tokens")}
+    _common_params(body, kwargs)
+    effort = (body.get("reasoning") or {}).get("effort")
+    if effort:
+        kwargs["reasoning_level"] = effort
+    tools = [tool for tool in body.get("tools") or [] if tool.get("type") == "function"]
+    if tools:
+        kwargs["tools"] = [_tool_spec(tool) for tool in tools]
+    if body.get("tool_choice") is not None:
+        kwargs["tool_choice"] = _tool_choice(body["tool_choice"])
+    text_format = (body.get("text") or {}).get("format") or {}
+    if text_format.get("type") == "json_schema":
+        kwargs["json_schema"] = text_format.get("schema")
+    elif text_format.get("type") == "json_object":
+        kwargs["json_schema"] = {"type": "object"}
+    return kwargs
+
+
+def chat_completion_body(response: ChatResponse, model: str) -> Dict[str, Any]:
+    usage = response.usage
+    body = {
+        "id": response.response_id or f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": response.timestamp or int(time.time()),
+        "model": response.model or model,
+        "choices": [
+            {"index": index, "message": _message(candidate), "finish_reason": _finish_reason(candidate)}
+            for index, candidate in enumerate(response.candidates or [response])
+        ],
+        "usage": {
+            "prompt_tokens": usage.input_tokens if usage else 0,
+            "completion_tokens": usage.output_tokens if usage else 0,
+            "total_tokens": usage.total_tokens if usage else 0,
+        },
+        "service_tier": response.service_tier,
+    }
+    if usage and (usage.accepted_prediction_tokens or usage.rejected_prediction_tokens):
+        body["usage"]["completion_tokens_details"] = {
+            "accepted_prediction_tokens": usage.accepted_prediction_tokens,
+            "rejected_prediction_tokens": usage.rejected_prediction_tokens,
+        }
+    return body
+
+
+def responses_body(response: ChatResponse, model: str) -> Dict[str, Any]:
+    output: List[Dict[str, Any]] = []
+    if response.content:
+        output.append({
+            "type": "message",
+            "id": f"msg_{uuid.uuid4().hex}",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": response.content, "annotations": []}],
+        })
+    for tool_call in response.tool_calls or []:
+        output.append({
+            "type": "function_call",
+            "id": f"fc_{uuid.uuid4().hex}",
+            "call_id": tool_call.call_id,
+            "name": tool_call.name,
+            "arguments": json.dumps(tool_call.arguments),
+            "status": "completed",
+        })
+    usage = response.usage
+    return {
+        "id": response.response_id or f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": response.timestamp or int(time.time()),
+        "model": response.model or model,
+        "status": "incomplete" if _finish_reason(response) == "length" else "completed",
+        "output": output,
+        "output_text": response.content or "",
+        "usage": {
+            "input_tokens": usage.input_tokens if usage else 0,
+            "output_tokens": usage.output_tokens if usage else 0,
+            "total_tokens": usage.total_tokens if usage else 0,
+        },
+        "service_tier": response.service_tier,
+    }
+
+
+def _message(response: ChatResponse) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"role": "assistant", "content": response.content}
+    if response.tool_calls:
+        message["tool_calls"] = [
+            {
+                "id": tool_call.call_id,
+                "type": "function",
+                "function": {
+                    "name": tool_call.name,
+                    "arguments": json.dumps(tool_call.arguments),
+                },
+            }
+            for tool_call in response.tool_calls
+        ]
+    return message
+
+
+def _normalize(items: List[Any]) -> List[Message]:
+    try:
+        return Messages(items).items
+    except (TypeError, ValueError, KeyError) as e:
+        raise LLMAPIClientError(detail=f"Invalid messages: {e}")
+
+
+def _common_params(body: Dict[str, Any], kwargs: Dict[str, Any]) -> None:
+    for name in ("temperature", "top_p", "service_tier"):
+        if body.get(name) is not None:
+            kwargs[name] = body[name]
+    if body.get("parallel_tool_calls") is not None:
+        kwargs["parallel_tool_calls"] = body["parallel_tool_calls"]
+    if kwargs.get("max_tokens") is None:
+        del kwargs["max_tokens"]
+
+
+def _tool_spec(function: Dict[str, Any]) -> ToolSpec:
+    if not function.get("name"):
+        raise LLMAPIClientError(detail="every tool needs a function name")
+    return ToolSpec(
+        name=function["name"],
+        description=function.get("description") or "",
+        json_schema=function.get("parameters") or dict(EMPTY_PARAMETERS),
+    )
+
+
+def _tool_choice(tool_choice: Any) -> Any:
+    if tool_choice == "required":
+        return "any"
+    if isinstance(tool_choice, dict):
+        name = (tool_choice.get("function") or {}).get("name") or tool_choice.get("name")
+        if name:
+            return name
+    return tool_choice
+
+
+def _responses_item(item: Any) -> Any:
+    """One Responses API input item as a Messages item."""
+    if not isinstance(item, dict):
+        raise LLMAPIClientError(detail="input items must be objects")
+    item_type = item.get("type")
+    if item_type == "function_call":
+        arguments = item.get("arguments") or "{}"
+        return AIMessage(
+            content="",
+            tool_calls=[ToolCall(
+                name=item.get("name", ""),
+                arguments=json.loads(arguments) if isinstance(arguments, str) else arguments,
+                call_id=item.get("call_id"),
+            )],
+        )
+    if item_type == "function_call_output":
+        return ToolMessage(content=str(item.get("output", "")), tool_call_id=str(item.get("call_id")))
+    content = item.get("content")
+    if isinstance(content, list):
+        parts = []
+        for part in content:
+            if part.get("type") in ("input_text", "output_text"):
+                part = {"type": "text", "text": part.get("text", "")}
+            parts.append(part)
+        if item.get("role") != "user":
+            content = " ".join(p["text"] for p in parts if p.get("type") == "text")
+        else:
+            content = parts
+    role = "system" if item.get("role") == "developer" else item.get("role")
+    return {"role": role, "content": content}
+
+
+def _finish_reason(response: ChatResponse) -> str:
+    if response.tool_calls:
+        return "tool_calls"
+    return FINISH_REASONS.get(response.finish_reason or "", "stop")
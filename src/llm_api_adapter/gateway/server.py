@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hmac
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+from ..budget import Budget
+from ..errors.llm_api_error import (
+    LLMAPIAuthorizationError,
+    LLMAPIBudgetExceededError,
+    LLMAPICircuitOpenError,
+    LLMAPIClientError,
+    LLMAPIError,
+    LLMAPIRateLimitError,
+    LLMAPIServerError,
+    LLMAPITimeoutError,
+    LLMAPITokenLimitError,
+    LLMAPIUsageLimitError,
+)
+from ..limits.rate_limiter import RateLimiter
+from ..llm_registry.llm_registry import LLM_REGISTRY
+from ..models.responses.chat_response import ChatResponse
+from ..routing.key_pool import KeyPool
+from ..routing.single_flight import SingleFlight
+from ..universal_adapter import UniversalLLMAPIAdapter
+from ..utils.bounded_cache import BoundedCache
+from ..utils.canonical import canonical_hash
+from ..utils.retry import call_with_retries
+from .openai_format import (
+    chat_completion_body,
+    parse_chat_completions,
+    parse_responses,
+    responses_body,
+)
+
+logger = logging.getLogger(__name__)
+
+Reply = Tuple[int, Dict[str, str], Dict[str, Any]]
+
+# Most specific first: (error type, HTTP status, OpenAI error type).
+ERROR_STATUS = (
+    (LLMAPIAuthorizationError, 401, "authentication_error"),
+    (LLMAPIBudgetExceededError, 429, "insufficient_quota"),
+    (LLMAPIRateLimitError, 429, "rate_limit_exceeded"),
+    (LLMAPIUsageLimitError, 429, "insufficient_quota"),
+    (LLMAPITokenLimitError, 400, "context_length_exceeded"),
+    (LLMAPIClientError, 400, "invalid_request_error"),
+    (LLMAPITimeoutError, 504, "timeout"),
+    (LLMAPICircuitOpenError, 503, "service_unavailable"),
+    (LLMAPIServerError, 502, "upstream_error"),
+    (LLMAPIError, 502, "upstream_error"),
+)
+
+# Anthropic requires max_tokens; OpenAI clients usually leave it out.
+DEFAULT_ANTHROPIC_MAX_TOKENS = 4096
+
+ROUTES = {
+    "/v1/chat/completions": (parse_chat_completions, chat_completion_body),
+    "/v1/responses": (parse_responses, responses_body),
+}
+
+
+@dataclass
+class Gateway:
+    """
+    OpenAI-compatible HTTP front for UniversalLLMAPIAdapter, so services
+    call one internal endpoint instead of holding provider keys.
+
+    Serves POST /v1/chat/completions and /v1/responses (non-streaming),
+    GET /v1/models and GET /health. model is "organization/model" or a
+    registry model name. Bodies are parsed with the Messages normalization
+    and dispatched to one adapter per model, which carries the shared
+    KeyPool (api_keys values), SingleFlight and Budget, and the
+    organization's RateLimiter from rate_limiters, which keeps all callers
+    under that provider's requests and tokens per minute. Rate-limit,
+    server and timeout errors are retried with exponential backoff; at
+    most max_in_flight requests run at once, further ones get 429. With a
+    cache, identical request bodies are answered from it.
+
+    adapter_factory(organization, model) replaces the provider adapters,
+    e.g. with mock_adapter_factory() for local load tests.
+    """
+    api_keys: Dict[str, Union[str, KeyPool]] = field(default_factory=dict)
+    auth_tokens: Optional[Sequence[str]] = None
+    max_in_flight: int = 64
+    retries: int = 2
+    retry_backoff_s: float = 0.5
+    cache: Optional[BoundedCache] = None
+    single_flight: Optional[SingleFlight] = None
+    budget: Optional[Budget] = None
+    rate_limiters: Dict[str, RateLimiter] = field(default_factory=dict)
+    adapter_factory: Optional[Callable[[str, str], Any]] = None
+    max_body_bytes: int = 32 * 1024 * 1024
+
+    def __post_init__(self) -> None:
+        if self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if self.retries < 0:
+            raise ValueError("retries must be >= 0")
+        self._adapters: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._stats = {"requests": 0, "errors": 0, "rejected": 0, "retries": 0, "cache_hits": 0}
+
+    def handle(self, method: str, path: str, headers: Mapping[str, str], body: bytes) -> Reply:
+        """Transport-independent request handling: (status, headers, JSON body)."""
+        path = path.split("?", 1)[0].rstrip("/")
+        if self.auth_tokens is not None and not self._authorized(headers):
+            return self._error(401, "authentication_error", "Invalid or missing bearer token")
+        if method == "GET" and path == "/health":
+            return 200, {}, {"status": "ok", **self.stats()}
+        if method == "GET" and path == "/v1/models":
+            return 200, {}, self._models()
+        if method != "POST" or path not in ROUTES:
+            return self._error(404, "not_found", f"No route for {method} {path}")
+        if len(body) > self.max_body_bytes:
+            return self._error(413, "invalid_request_error", "Request body too large")
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            return 429, {"Retry-After": "1"}, _error_body(
+                "rate_limit_exceeded", "Gateway is at max_in_flight; retry later"
+            )
+        try:
+            self._count("requests")
+            return 200, {}, self._dispatch(path, body)
+        except LLMAPIError as e:
+            self._count("errors")
+            status, error_type = _error_status(e)
+            return self._error(status, error_type, str(e))
+        except (ValueError, TypeError) as e:
+            self._count("errors")
+            return self._error(400, "invalid_request_error", str(e))
+        except Exception as e:
+            self._count("errors")
+            logger.exception("Gateway request failed")
+            return self._error(500, "server_error", str(e))
+        finally:
+            self._slots.release()
+
+    def resolve_model(self, model: Any) -> Tuple[str, str]:
+        """(organization, model) for "organization/model" or a registry model name."""
+        if not model or not isinstance(model, str):
+            raise LLMAPIClientError(detail="model is required")
+        if "/" in model:
+            organization, name = model.split("/", 1)
+            return organization, name
+        for organization, provider in LLM_REGISTRY.providers.items():
+            if model in provider.models:
+                return organization, model
+        raise LLMAPIClientError(detail=f"Unknown model {model!r}; use 'organization/model'")
+
+    def adapter(self, organization: str, model: str) -> Any:
+        with self._lock:
+            adapter = self._adapters.get((organization, model))
+            if adapter is None:
+                adapter = self._make_adapter(organization, model)
+                self._adapters[(organization, model)] = adapter
+            return adapter
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def make_server(self, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+        handler = type("GatewayRequestHandler", (_GatewayRequestHandler,), {"gateway": self})
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        return server
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        server = self.make_server(host, port)
+        logger.info("Gateway listening on http://%s:%s", *server.server_address[:2])
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+    def _dispatch(self, path: str, body: bytes) -> Dict[str, Any]:
+        parse, render = ROUTES[path]
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            raise LLMAPIClientError(detail=f"Invalid JSON body: {e}")
+        if not isinstance(payload, dict):
+            raise LLMAPIClientError(detail="Request body must be a JSON object")
+        if payload.get("stream"):
+            raise LLMAPIClientError(detail="stream is not supported by the gateway")
+        organization, model = self.resolve_model(payload.get("model"))
+        kwargs = parse(payload)
+        if organization == "anthropic" and "max_tokens" not in kwargs:
+            kwargs["max_tokens"] = DEFAULT_ANTHROPIC_MAX_TOKENS
+        response = self._cached_chat(path, organization, model, kwargs)
+        return render(response, payload["model"])
+
+    def _cached_chat(
+        self, path: str, organization: str, model: str, kwargs: Dict[str, Any]
+    ) -> ChatResponse:
+        key = None
+        if self.cache is not None:
+            try:
+                key = canonical_hash([path, organization, model, kwargs])
+            except TypeError:
+                key = None
+            cached = self.cache.get(key) if key is not None else None
+            if cached is not None:
+                self._count("cache_hits")
+                return cached
+        response = self._chat_with_retries(self.adapter(organization, model), kwargs)
+        if key is not None:
+            self.cache.set(key, response)
+        return response
+
+    def _chat_with_retries(self, adapter: Any, kwargs: Dict[str, Any]) -> ChatResponse:
+        return call_with_retries(
+            lambda: adapter.chat(**kwargs),
+            retries=self.retries,
+            backoff_s=self.retry_backoff_s,
+            on_retry=lambda error: self._count("retries"),
+        )
+
+    def _make_adapter(self, organization: str, model: str) -> Any:
+        if self.adapter_factory is not None:
+            return self.adapter_factory(organization, model)
+        key = self.api_keys.get(organization)
+        if not key:
+            raise LLMAPIClientError(detail=f"No API key configured for {organization!r}")
+        return UniversalLLMAPIAdapter(
+            organization=organization,
+            model=model,
+            api_key=key if isinstance(key, str) else "",
+            key_pool=key if isinstance(key, KeyPool) else None,
+            single_flight=self.single_flight,
+            budget=self.budget,
+            rate_limiter=self.rate_limiters.get(organization),
+        )
+
+    def _authorized(self, headers: Mapping[str, str]) -> bool:
+        authorization = headers.get("Authorization") or headers.get("authorization") or ""
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer":
+            return False
+        # Constant-time comparison; bytes, since str must be ASCII.
+        token_bytes = token.encode("utf-8")
+        return any(
+            hmac.compare_digest(token_bytes, t.encode("utf-8")) for t in self.auth_tokens or ()
+        )
+
+    def _models(self) -> Dict[str, Any]:
+        data = [
+            {"id": f"{organization}/{model}", "object": "model", "owned_by": organization}
+            for organization, provider in LLM_REGISTRY.providers.items()
+            for model in provider.models
+        ]
+        return {"object": "list", "data": data}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _error(self, status: int, error_type: str, message: str) -> Reply:
+        return status, {}, _error_body(error_type, message)
+
+
+class _GatewayRequestHandler(BaseHTTPRequestHandler):
+    gateway: Gateway
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._respond(b"")
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._write(*self.gateway._error(400, "invalid_request_error", "Invalid Content-Length"))
+            self.close_connection = True
+            return
+        if length > self.gateway.max_body_bytes:
+            self._write(*self.gateway._error(413, "invalid_request_error", "Request body too large"))
+            self.close_connection = True
+            return
+        self._respond(self.rfile.read(length))
+
+    def _respond(self, body: bytes) -> None:
+        self._write(*self.gateway.handle(self.command, self.path, self.headers, body))
+
+    def _write(self, status: int, headers: Dict[str, str], payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def _error_status(error: LLMAPIError) -> Tuple[int, str]:
+    for error_class, status, error_type in ERROR_STATUS:
+        if isinstance(error, error_class):
+            return status, error_type
+    return 502, "upstream_error"
+
+
+def _error_body(error_type: str, message: str) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": error_type, "code": error_type}}
@@ -0,0 +1,4 @@
+from .rate_limiter import RateLimiter
+from .state_store import Bucket, MemoryStateStore, SQLiteStateStore, StateStore
+
+__all__ = ["Bucket", "MemoryStateStore", "RateLimiter", "SQLiteStateStore", "StateStore"]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import random
+import time
+from typing import List, Optional
+
+from ..errors.llm_api_error import LLMAPIRateLimitError
+from ..utils.deadline import Deadline
+from .state_store import Bucket, MemoryStateStore, StateStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimiter:
+    """
+    Client-side token-bucket limiter for requests and tokens per minute,
+    so callers stay under a provider quota instead of collecting 429s.
+
+    Limiters with the same name and store share their buckets; with a
+    SQLiteStateStore that includes every process on the machine using
+    the same file. Each bucket holds one minute's worth, so a minute's
+    quota may be used as a burst. acquire() blocks until the request
+    fits and raises LLMAPIRateLimitError when that would take longer
+    than max_wait_s or the call's deadline.
+    """
+    name: str
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    store: StateStore = field(default_factory=MemoryStateStore)
+    max_wait_s: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        for value in (self.requests_per_minute, self.tokens_per_minute):
+            if value is not None and value <= 0:
+                raise ValueError("rate limits must be > 0")
+
+    @property
+    def limits_tokens(self) -> bool:
+        return self.tokens_per_minute is not None
+
+    def acquire(self, tokens: int = 0, deadline: Optional[Deadline] = None) -> float:
+        """Takes one request and tokens from the buckets; returns the seconds waited."""
+        buckets = self._buckets(1, tokens)
+        if not buckets:
+            return 0.0
+        started = time.monotonic()
+        while True:
+            wait_s = self.store.acquire_buckets(buckets)
+            if wait_s <= 0:
+                return time.monotonic() - started
+            waited = time.monotonic() - started
+            limit_s = self.max_wait_s
+            if deadline is not None:
+                remaining = deadline.remaining()
+                limit_s = remaining if limit_s is None else min(limit_s, remaining)
+            if limit_s is not None and waited + wait_s > limit_s:
+                error_message = (
+                    f"rate limiter {self.name!r} needs {wait_s:.2f}s more for "
+                    f"{tokens} tokens; waited {waited:.2f}s"
+                )
+                logger.error(error_message)
+                raise LLMAPIRateLimitError(detail=error_message)
+            time.sleep(wait_s * random.uniform(1.0, 1.1))
+
+    def refund(self, tokens: int) -> None:
+        """Returns tokens that were acquired but not used."""
+        if tokens > 0:
+            self.adjust(tokens)
+
+    def adjust(self, delta: int) -> None:
+        """
+        Settles acquired tokens against actual usage: a positive delta is
+        returned to the bucket, a negative one is taken at once without
+        waiting (the bucket may go into debt, which later acquires wait off).
+        """
+        if delta and self.tokens_per_minute is not None:
+            self.store.acquire_buckets(self._buckets(0, -delta), force=True)
+
+    def _buckets(self, requests: int, tokens: int) -> List[Bucket]:
+        buckets = []
+        if self.requests_per_minute is not None and requests:
+            buckets.append(Bucket(
+                f"{self.name}:requests", requests,
+                self.requests_per_minute, self.requests_per_minute / 60,
+            ))
+        if self.tokens_per_minute is not None and tokens:
+            buckets.append(Bucket(
+                f"{self.name}:tokens", tokens,
+                self.tokens_per_minute, self.tokens_per_minute / 60,
+            ))
+        return buckets
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BudgetTotals = Tuple[float, float]
+
+
+@dataclass(frozen=True)
+class Bucket:
+    """
+    One token bucket to take amount from: it holds up to capacity and
+    refills at refill_per_s. A negative amount returns tokens.
+    """
+    key: str
+    amount: float
+    capacity: float
+    refill_per_s: float
+
+
+class StateStore(ABC):
+    """
+    Backend holding rate-limiter buckets and budget totals.
+
+    Every method is one atomic step, so limiters and budgets that share a
+    store (in one process, or across processes for SQLiteStateStore)
+    cannot overrun it together. Another shared service (e.g. Redis with
+    a script per method) can implement the same five methods.
+    """
+
+    @abstractmethod
+    def acquire_buckets(self, buckets: Sequence[Bucket], force: bool = False) -> float:
+        """
+        Takes amount from every bucket or from none; 0.0 on success, else
+        seconds until all fit. force=True takes it at once, even into debt.
+        """
+
+    @abstractmethod
+    def reserve_budget(self, name: str, amount: float, ceiling: float) -> Tuple[bool, float, float]:
+        """Adds amount to reserved if spent + reserved + amount <= ceiling: (granted, spent, reserved)."""
+
+    @abstractmethod
+    def settle_budget(self, name: str, reserved: float, cost: float) -> BudgetTotals:
+        """Releases a reservation and adds cost to spent: (spent, reserved)."""
+
+    @abstractmethod
+    def budget_totals(self, name: str) -> BudgetTotals:
+        """(spent, reserved); zeros for an unknown budget."""
+
+    @abstractmethod
+    def reset_budget(self, name: str) -> None:
+        """Sets spent and reserved back to zero."""
+
+
+class MemoryStateStore(StateStore):
+    """StateStore for one process; the default of RateLimiter."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._budgets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire_buckets(self, buckets: Sequence[Bucket], force: bool = False) -> float:
+        with self._lock:
+            now = time.time()
+            levels = [_refill(self._buckets.get(b.key), b, now) for b in buckets]
+            wait_s = 0.0 if force else _wait_s(buckets, levels)
+            if wait_s == 0.0:
+                for bucket, level in zip(buckets, levels):
+                    self._buckets[bucket.key] = (_take(level, bucket), now)
+            return wait_s
+
+    def reserve_budget(self, name: str, amount: float, ceiling: float) -> Tuple[bool, float, float]:
+        with self._lock:
+            spent, reserved = self._budgets.get(name, (0.0, 0.0))
+            if not _fits(spent, reserved, amount, ceiling):
+                return False, spent, reserved
+            self._budgets[name] = (spent, reserved + amount)
+            return True, spent, reserved + amount
+
+    def settle_budget(self, name: str, reserved: float, cost: float) -> BudgetTotals:
+        with self._lock:
+            spent, current = self._budgets.get(name, (0.0, 0.0))
+            totals = (spent + cost, max(0.0, current - reserved))
+            self._budgets[name] = totals
+            return totals
+
+    def budget_totals(self, name: str) -> BudgetTotals:
+        with self._lock:
+            return self._budgets.get(name, (0.0, 0.0))
+
+    def reset_budget(self, name: str) -> None:
+        with self._lock:
+            self._budgets.pop(name, None)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    StateStore in a local SQLite file (WAL mode), shared by every process
+    on the machine that opens the same path.
+
+    Each operation is one BEGIN IMMEDIATE transaction, so processes
+    serialize on SQLite's write lock and wait for it up to timeout_s.
+    Connections are per thread and per process (a forked child opens its
+    own), and the store pickles as its path, so it can be handed to
+    process-pool workers. Reservations of a process that dies before
+    settling stay reserved until reset_budget().
+    """
+
+    def __init__(self, path: str, timeout_s: float = 30.0) -> None:
+        self.path = path
+        self.timeout_s = timeout_s
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS buckets (
+                key TEXT PRIMARY KEY, level REAL NOT NULL, updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS budgets (
+                name TEXT PRIMARY KEY, spent REAL NOT NULL, reserved REAL NOT NULL
+            );
+            """
+        )
+
+    def __repr__(self) -> str:
+        return f"SQLiteStateStore(path={self.path!r})"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "timeout_s": self.timeout_s}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.path = state["path"]
+        self.timeout_s = state["timeout_s"]
+        self._local = threading.local()
+
+    def acquire_buckets(self, buckets: Sequence[Bucket], force: bool = False) -> float:
+        with self._transaction() as cursor:
+            now = time.time()
+            levels = []
+            for bucket in buckets:
+                row = cursor.execute(
+                    "SELECT level, updated FROM buckets WHERE key = ?", (bucket.key,)
+                ).fetchone()
+                levels.append(_refill(row, bucket, now))
+            wait_s = 0.0 if force else _wait_s(buckets, levels)
+            if wait_s == 0.0:
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO buckets (key, level, updated) VALUES (?, ?, ?)",
+                    [(b.key, _take(level, b), now) for b, level in zip(buckets, levels)],
+                )
+            return wait_s
+
+    def reserve_budget(self, name: str, amount: float, ceiling: float) -> Tuple[bool, float, float]:
+        with self._transaction() as cursor:
+            spent, reserved = self._totals(cursor, name)
+            if not _fits(spent, reserved, amount, ceiling):
+                return False, spent, reserved
+            self._store_totals(cursor, name, spent, reserved + amount)
+            return True, spent, reserved + amount
+
+    def settle_budget(self, name: str, reserved: float, cost: float) -> BudgetTotals:
+        with self._transaction() as cursor:
+            spent, current = self._totals(cursor, name)
+            totals = (spent + cost, max(0.0, current - reserved))
+            self._store_totals(cursor, name, *totals)
+            return totals
+
+    def budget_totals(self, name: str) -> BudgetTotals:
+        return self._totals(self._connection().cursor(), name)
+
+    def reset_budget(self, name: str) -> None:
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM budgets WHERE name = ?", (name,))
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection())
+
+    @staticmethod
+    def _totals(cursor: sqlite3.Cursor, name: str) -> BudgetTotals:
+        row = cursor.execute(
+            "SELECT spent, reserved FROM budgets WHERE name = ?", (name,)
+        ).fetchone()
+        return (row[0], row[1]) if row else (0.0, 0.0)
+
+    @staticmethod
+    def _store_totals(cursor: sqlite3.Cursor, name: str, spent: float, reserved: float) -> None:
+        cursor.execute(
+            "INSERT OR REPLACE INTO budgets (name, spent, reserved) VALUES (?, ?, ?)",
+            (name, spent, reserved),
+        )
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error) around one operation."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Cursor:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection.cursor()
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.connection.execute("COMMIT")
+        elif self.connection.in_transaction:
+            # After some errors (e.g. disk I/O) SQLite has already rolled back.
+            self.connection.execute("ROLLBACK")
+
+
+def _refill(row: Optional[Tuple[float, float]], bucket: Bucket, now: float) -> float:
+    if row is None:
+        return bucket.capacity
+    level, updated = row
+    return min(bucket.capacity, level + max(0.0, now - updated) * bucket.refill_per_s)
+
+
+def _take(level: float, bucket: Bucket) -> float:
+    return min(bucket.capacity, level - bucket.amount)
+
+
+def _wait_s(buckets: Sequence[Bucket], levels: List[float]) -> float:
+    wait_s = 0.0
+    for bucket, level in zip(buckets, levels):
+        missing = min(bucket.amount, bucket.capacity) - level
+        if missing > 0:
+            wait_s = max(wait_s, missing / bucket.refill_per_s)
+    return wait_s
+
+
+def _fits(spent: float, reserved: float, amount: float, ceiling: float) -> bool:
+    return spent < ceiling and spent + reserved + amount <= ceiling
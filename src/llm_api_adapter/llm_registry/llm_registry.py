@@ -11,6 +11,19 @@ class Pricing:
     in_per_token: float
     out_per_token: float
     currency: str = "USD"
+    tiers: Dict[str, "Pricing"] = field(default_factory=dict, compare=False, hash=False)
+
+    def for_tier(self, service_tier: Optional[str]) -> "Pricing":
+        """Prices of service_tier (e.g. "flex", "priority"); the standard prices otherwise."""
+        return self.tiers.get(service_tier or "", self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Pricing":
+        return cls(
+            in_per_token=d["in_per_1m"] / 1_000_000,
+            out_per_token=d["out_per_1m"] / 1_000_000,
+            tiers={tier: cls.from_dict(prices) for tier, prices in (d.get("tiers") or {}).items()},
+        )
 
     def set_in_per_1m(self, value: float) -> None:
         object.__setattr__(self, "in_per_token", value / 1_000_000)
@@ -20,6 +33,8 @@ class Pricing:
 
     def set_currency(self, value: str) -> None:
         object.__setattr__(self, "currency", value)
+        for tier in self.tiers.values():
+            tier.set_currency(value)
 
 
 @dataclass(frozen=True)
@@ -28,25 +43,54 @@ class ModelSpec:
     pricing: Optional[Pricing] = None
     is_reasoning: bool = False
     is_adaptive_thinking: bool = False
+    context_window: Optional[int] = None
+    max_output: Optional[int] = None
 
     @classmethod
     def from_dict(cls, name: str, d: Dict[str, Any]) -> "ModelSpec":
         pricing_data = d.get("pricing")
-        if pricing_data:
-            in_per_token = pricing_data["in_per_1m"] / 1_000_000
-            out_per_token = pricing_data["out_per_1m"] / 1_000_000
-            pricing = Pricing(in_per_token, out_per_token)
-        else:
-            pricing = None
+        pricing = Pricing.from_dict(pricing_data) if pricing_data else None
         is_reasoning = bool(d.get("is_reasoning", False))
         is_adaptive_thinking = bool(d.get("is_adaptive_thinking", False))
-        return cls(name=name, pricing=pricing, is_reasoning=is_reasoning, is_adaptive_thinking=is_adaptive_thinking)
+        context_window = d.get("context_window")
+        max_output = d.get("max_output")
+        return cls(
+            name=name,
+            pricing=pricing,
+            is_reasoning=is_reasoning,
+            is_adaptive_thinking=is_adaptive_thinking,
+            context_window=int(context_window) if context_window is not None else None,
+            max_output=int(max_output) if max_output is not None else None,
+        )
+
+
+@dataclass(frozen=True)
+class EmbeddingModelSpec:
+    name: str
+    pricing: Optional[Pricing] = None
+    dimensions: Optional[int] = None
+    max_batch: int = 100
+    max_input_tokens: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, name: str, d: Dict[str, Any]) -> "EmbeddingModelSpec":
+        pricing_data = d.get("pricing")
+        dimensions = d.get("dimensions")
+        max_input_tokens = d.get("max_input_tokens")
+        return cls(
+            name=name,
+            pricing=Pricing.from_dict(pricing_data) if pricing_data else None,
+            dimensions=int(dimensions) if dimensions is not None else None,
+            max_batch=int(d.get("max_batch", 100)),
+            max_input_tokens=int(max_input_tokens) if max_input_tokens is not None else None,
+        )
 
 
 @dataclass(frozen=True)
 class ProviderSpec:
     name: str
     models: Dict[str, ModelSpec] = field(default_factory=dict)
+    embedding_models: Dict[str, EmbeddingModelSpec] = field(default_factory=dict)
     
     @classmethod
     def from_dict(cls, name: str, d: Dict[str, Any]) -> "ProviderSpec":
@@ -54,7 +98,11 @@ class ProviderSpec:
             model_name: ModelSpec.from_dict(model_name, model_spec)
             for model_name, model_spec in (d.get("models") or {}).items()
         }
-        return cls(name=name, models=models)
+        embedding_models = {
+            model_name: EmbeddingModelSpec.from_dict(model_name, model_spec)
+            for model_name, model_spec in (d.get("embedding_models") or {}).items()
+        }
+        return cls(name=name, models=models, embedding_models=embedding_models)
 
 
 @dataclass(frozen=True, init=False)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from ...errors.llm_api_error import InvalidToolArgumentsError
+from ...utils.json_tools import json_loads
+from ..streaming import StreamAccumulator
+
+
+class AnthropicStreamAccumulator(StreamAccumulator):
+    """Accumulates Messages API stream events into a message dict."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._message: Dict[str, Any] = {}
+        self._blocks: Dict[int, Dict[str, Any]] = {}
+        self._parts: Dict[int, List[str]] = {}
+
+    def feed(self, event: dict) -> None:
+        event_type = event.get("type")
+        if event_type == "message_start":
+            self._message = dict(event.get("message") or {})
+        elif event_type == "content_block_start":
+            index = event.get("index", len(self._blocks))
+            block = dict(event.get("content_block") or {})
+            self._blocks[index] = block
+            self._parts[index] = []
+            if block.get("type") == "tool_use":
+                self._tool_call(index, block.get("name"), block.get("id"))
+            elif block.get("type") == "text" and block.get("text"):
+                self._parts[index].append(block["text"])
+                self._text(block["text"])
+        elif event_type == "content_block_delta":
+            self._feed_delta(event.get("index", 0), event.get("delta") or {})
+        elif event_type == "message_delta":
+            delta = event.get("delta") or {}
+            if "stop_reason" in delta:
+                self._message["stop_reason"] = delta["stop_reason"]
+            usage = event.get("usage") or {}
+            if usage:
+                self._message["usage"] = {**(self._message.get("usage") or {}), **usage}
+        elif event_type == "error":
+            error = event.get("error") or {}
+            self._stream_error(str(error.get("message") or error))
+
+    def _feed_delta(self, index: int, delta: dict) -> None:
+        block = self._blocks.get(index)
+        if block is None:
+            return
+        delta_type = delta.get("type")
+        if delta_type == "text_delta":
+            self._parts[index].append(delta.get("text") or "")
+            self._text(delta.get("text"))
+        elif delta_type == "input_json_delta":
+            fragment = delta.get("partial_json") or ""
+            self._parts[index].append(fragment)
+            self._tool_arguments(index, block.get("name"), fragment)
+
+    def result(self) -> dict:
+        content: List[Dict[str, Any]] = []
+        for index, block in sorted(self._blocks.items()):
+            text = "".join(self._parts.get(index) or [])
+            if block.get("type") == "text":
+                content.append({**block, "text": text})
+            elif block.get("type") == "tool_use":
+                content.append({**block, "input": self._tool_input(block.get("name"), text)})
+        return {**self._message, "content": content}
+
+    def _tool_input(self, name: Optional[str], text: str) -> Any:
+        if not text.strip():
+            return {}
+        try:
+            return json_loads(text)
+        except ValueError as e:
+            raise InvalidToolArgumentsError(
+                detail=f"Anthropic streamed tool input JSON parse failed for tool={name!r}: {e}"
+            )
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 import logging
+from typing import Iterator, Optional
 
 import requests
 
@@ -9,8 +10,11 @@ from ...errors.llm_api_error import (
     LLMAPITokenLimitError,
     LLMAPIClientError,
     LLMAPIServerError,
-    LLMAPITimeoutError,
 )
+from ...utils.deadline import Deadline, RequestTimeout, read_body, timeout_error
+from ..circuit_breaker import CIRCUIT_BREAKERS
+from ..rate_limits import RATE_LIMITS
+from ..streaming import iter_sse_events
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,7 @@ class ClaudeSyncClient:
     api_key: str
     endpoint: str = "https://api.anthropic.com/v1"
     api_version: str = "2023-06-01"
+    session: Optional[requests.Session] = None
 
     def __repr__(self) -> str:
         masked = f"{self.api_key[:8]}...{self.api_key[-4:]}" if len(self.api_key) > 12 else "***"
@@ -31,12 +36,38 @@ class ClaudeSyncClient:
             "Content-Type": "application/json"
         }
 
-    def chat_completion(self, model: str, timeout_s: float | None = None, **kwargs):
+    def chat_completion(
+        self,
+        model: str,
+        timeout_s: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ):
         url = f"{self.endpoint}/messages"
         payload = self._prepare_chat_payload_for_model(model, kwargs)
-        response = self._send_request(url, payload, timeout_s)
+        response = self._send_request(url, payload, timeout_s, deadline=deadline)
         return response.json()
 
+    def stream_chat_completion(
+        self,
+        model: str,
+        timeout_s: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """Like chat_completion(), but yields the server-sent event payloads."""
+        url = f"{self.endpoint}/messages"
+        payload = self._prepare_chat_payload_for_model(model, kwargs)
+        payload["stream"] = True
+        response = self._send_request(url, payload, timeout_s, stream=True, deadline=deadline)
+        yield from iter_sse_events(response, deadline)
+
+    def count_tokens(self, model: str, timeout_s: RequestTimeout = None, **kwargs) -> int:
+        """Input tokens of a messages request, from the count_tokens endpoint."""
+        url = f"{self.endpoint}/messages/count_tokens"
+        response = self._send_request(url, {"model": model, **kwargs}, timeout_s)
+        return response.json()["input_tokens"]
+
     def _prepare_chat_payload_for_model(self, model: str, kwargs: dict) -> dict:
         budget_tokens = kwargs.pop("budget_tokens", None)
         effort = kwargs.pop("effort", None)
@@ -56,21 +87,34 @@ class ClaudeSyncClient:
                 kwargs["thinking"] = {"type": "enabled", "budget_tokens": budget_tokens}
         return {"model": model, **kwargs}
 
-    def _send_request(self, url: str, payload: dict, timeout_s: float | None = None):
-        try:
-            response = requests.post(
-                url, headers=self._headers(), json=payload, timeout=timeout_s,
-            )
-            response.raise_for_status()
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Request timed out: {e}")
-            raise LLMAPITimeoutError(detail=str(e))
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred: {http_err}")
-            self._handle_http_error(http_err)
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request exception: {e}")
-            raise LLMAPIClientError(detail=str(e))
+    def _send_request(
+        self,
+        url: str,
+        payload: dict,
+        timeout_s: RequestTimeout = None,
+        stream: bool = False,
+        deadline: Deadline | None = None,
+    ):
+        with CIRCUIT_BREAKERS.guard(url):
+            try:
+                post = self.session.post if self.session is not None else requests.post
+                response = post(
+                    url, headers=self._headers(), json=payload, timeout=timeout_s,
+                    stream=stream or deadline is not None,
+                )
+                RATE_LIMITS.update(self.api_key, response.headers)
+                response.raise_for_status()
+                if deadline is not None and not stream:
+                    read_body(response, deadline)
+            except requests.exceptions.Timeout as e:
+                logger.error(f"Request timed out: {e}")
+                raise timeout_error(e, deadline)
+            except requests.exceptions.HTTPError as http_err:
+                logger.error(f"HTTP error occurred: {http_err}")
+                self._handle_http_error(http_err)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request exception: {e}")
+                raise LLMAPIClientError(detail=str(e))
         return response
 
     def _handle_http_error(self, http_err):
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+import requests
+
+from ..errors.llm_api_error import (
+    LLMAPICircuitOpenError,
+    LLMAPIClientError,
+    LLMAPIServerError,
+    LLMAPITimeoutError,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Circuit breaker for one provider endpoint.
+
+    The last window_size calls are tracked. Once at least min_calls are in
+    the window, the breaker opens when the failure rate (server errors,
+    timeouts, connection errors) reaches failure_rate_threshold, or when
+    the share of calls slower than slow_call_duration_s reaches
+    slow_call_rate_threshold. While open, calls fail fast with
+    LLMAPICircuitOpenError. After open_duration_s the breaker lets
+    half_open_max_calls trial calls through: if they all succeed it closes,
+    and any failure opens it again.
+    """
+    endpoint: str = ""
+    failure_rate_threshold: float = 0.5
+    slow_call_rate_threshold: float = 1.0
+    slow_call_duration_s: Optional[float] = None
+    window_size: int = 20
+    min_calls: int = 10
+    open_duration_s: float = 30.0
+    half_open_max_calls: int = 3
+    _state: str = field(default=CLOSED, init=False)
+    _calls: Deque[Tuple[bool, bool]] = field(default_factory=deque, init=False, repr=False)
+    _opened_at: float = field(default=0.0, init=False, repr=False)
+    _half_open_started: int = field(default=0, init=False, repr=False)
+    _half_open_succeeded: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0 < self.failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if not 0 < self.slow_call_rate_threshold <= 1:
+            raise ValueError("slow_call_rate_threshold must be in (0, 1]")
+        if self.min_calls < 1 or self.window_size < self.min_calls:
+            raise ValueError("window_size must be >= min_calls >= 1")
+        if self.half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be >= 1")
+        self._calls = deque(maxlen=self.window_size)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise LLMAPICircuitOpenError unless a call may be sent now."""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._half_open_started < self.half_open_max_calls:
+                self._half_open_started += 1
+                return
+            retry_after = None
+            if self._state == OPEN:
+                retry_after = max(0.0, self._opened_at + self.open_duration_s - now)
+        error_message = f"Circuit breaker for {self.endpoint} is {self._state}"
+        logger.warning(error_message)
+        raise LLMAPICircuitOpenError(
+            detail=error_message, endpoint=self.endpoint, retry_after_s=retry_after
+        )
+
+    def record(self, duration_s: float, failed: bool) -> None:
+        slow = (
+            self.slow_call_duration_s is not None
+            and duration_s >= self.slow_call_duration_s
+        )
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open(time.monotonic())
+                    return
+                self._half_open_succeeded += 1
+                if self._half_open_succeeded >= self.half_open_max_calls:
+                    self._transition(CLOSED)
+                    self._calls.clear()
+                return
+            if self._state == OPEN:
+                return
+            self._calls.append((failed, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            failures = sum(1 for f, _ in self._calls if f)
+            slow_calls = sum(1 for _, s in self._calls if s)
+            if (
+                failures / len(self._calls) >= self.failure_rate_threshold
+                or slow_calls / len(self._calls) >= self.slow_call_rate_threshold
+            ):
+                self._open(time.monotonic())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._transition(CLOSED)
+            self._calls.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh(time.monotonic())
+            calls = len(self._calls)
+            return {
+                "state": self._state,
+                "calls": calls,
+                "failure_rate": sum(1 for f, _ in self._calls if f) / calls if calls else 0.0,
+                "slow_call_rate": sum(1 for _, s in self._calls if s) / calls if calls else 0.0,
+            }
+
+    def _refresh(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.open_duration_s:
+            self._transition(HALF_OPEN)
+            self._half_open_started = 0
+            self._half_open_succeeded = 0
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._calls.clear()
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            logger.warning(
+                "Circuit breaker for %s: %s -> %s", self.endpoint, self._state, state
+            )
+            self._state = state
+
+
+@dataclass
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers keyed by endpoint URL (without query string), created
+    on first use with the registry's settings. Disabled until enable() is
+    called, in which case guard() is a no-op.
+    """
+    enabled: bool = False
+    settings: Dict[str, Any] = field(default_factory=dict)
+    _breakers: Dict[str, CircuitBreaker] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def enable(self, **settings: Any) -> None:
+        """Turn breakers on; settings are CircuitBreaker fields for new breakers."""
+        CircuitBreaker(**settings)  # validate eagerly
+        with self._lock:
+            self.enabled = True
+            self.settings = dict(settings)
+            self._breakers.clear()
+
+    def disable(self) -> None:
+        with self._lock:
+            self.enabled = False
+            self._breakers.clear()
+
+    def get(self, url: str) -> Optional[CircuitBreaker]:
+        if not self.enabled:
+            return None
+        endpoint = url.split("?", 1)[0]
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(endpoint=endpoint, **self.settings)
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """State, window size, failure rate and slow-call rate per endpoint."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.endpoint: breaker.snapshot() for breaker in breakers}
+
+    @contextmanager
+    def guard(self, url: str) -> Iterator[None]:
+        breaker = self.get(url)
+        if breaker is None:
+            yield
+            return
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            breaker.record(time.monotonic() - started, failed=_is_failure(e))
+            raise
+        breaker.record(time.monotonic() - started, failed=False)
+
+
+def _is_failure(error: BaseException) -> bool:
+    if isinstance(error, LLMAPITimeoutError):
+        # An expired caller deadline says nothing about the endpoint's health.
+        return error.phase != "deadline"
+    if isinstance(error, LLMAPIServerError):
+        return True
+    # Connection errors surface as LLMAPIClientError raised from the requests exception.
+    return isinstance(error, LLMAPIClientError) and isinstance(
+        error.__context__, requests.exceptions.ConnectionError
+    )
+
+
+CIRCUIT_BREAKERS = CircuitBreakerRegistry()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+from ..streaming import StreamAccumulator
+
+
+class GoogleStreamAccumulator(StreamAccumulator):
+    """
+    Accumulates streamGenerateContent chunks into a generateContent dict.
+    Text parts are concatenated; function calls arrive whole in one chunk,
+    so their arguments are reported at once.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._text_parts: List[str] = []
+        self._call_parts: List[Dict[str, Any]] = []
+        self._finish_reason: Optional[str] = None
+        self._usage: Optional[dict] = None
+        self._meta: Dict[str, Any] = {}
+
+    def feed(self, event: dict) -> None:
+        if event.get("error"):
+            error = event["error"]
+            self._stream_error(str(error.get("message") or error))
+        if event.get("usageMetadata"):
+            self._usage = event["usageMetadata"]
+        for key in ("modelVersion", "responseId"):
+            if key in event:
+                self._meta[key] = event[key]
+        candidate = (event.get("candidates") or [None])[0] or {}
+        if candidate.get("finishReason"):
+            self._finish_reason = candidate["finishReason"]
+        for part in (candidate.get("content") or {}).get("parts") or []:
+            if not isinstance(part, dict) or part.get("thought"):
+                continue
+            if "text" in part:
+                self._text_parts.append(part["text"] or "")
+                self._text(part["text"])
+            function_call = part.get("functionCall") or part.get("function_call")
+            if isinstance(function_call, dict) and function_call:
+                self._feed_function_call(part, function_call)
+
+    def _feed_function_call(self, part: dict, function_call: dict) -> None:
+        index = len(self._call_parts)
+        name = function_call.get("name")
+        self._call_parts.append(part)
+        self._tool_call(index, name, name)
+        args = function_call.get("args")
+        if isinstance(args, dict):
+            self._tool_arguments(index, name, json.dumps(args))
+
+    def result(self) -> dict:
+        parts: List[Dict[str, Any]] = []
+        if self._text_parts:
+            parts.append({"text": "".join(self._text_parts)})
+        parts.extend(self._call_parts)
+        candidate: Dict[str, Any] = {"content": {"role": "model", "parts": parts}}
+        if self._finish_reason is not None:
+            candidate["finishReason"] = self._finish_reason
+        return {
+            **self._meta,
+            "candidates": [candidate],
+            "usageMetadata": self._usage or {},
+        }
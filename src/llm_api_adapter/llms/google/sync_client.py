@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 import logging
+from typing import Iterator, Optional
 
 import requests
 
@@ -8,8 +9,11 @@ from ...errors.llm_api_error import (
     LLMAPIRateLimitError,
     LLMAPIClientError,
     LLMAPIServerError,
-    LLMAPITimeoutError,
 )
+from ...utils.deadline import Deadline, RequestTimeout, read_body, timeout_error
+from ..circuit_breaker import CIRCUIT_BREAKERS
+from ..rate_limits import RATE_LIMITS
+from ..streaming import iter_sse_events
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +21,7 @@ logger = logging.getLogger(__name__)
 class GeminiSyncClient:
     api_key: str
     endpoint: str = "https://generativelanguage.googleapis.com/v1beta"
+    session: Optional[requests.Session] = None
 
     def __repr__(self) -> str:
         masked = f"{self.api_key[:8]}...{self.api_key[-4:]}" if len(self.api_key) > 12 else "***"
@@ -28,10 +33,55 @@ class GeminiSyncClient:
             "Content-Type": "application/json"
         }
 
-    def chat_completion(self, model: str, timeout_s: float | None = None, **kwargs):
+    def chat_completion(
+        self,
+        model: str,
+        timeout_s: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ):
         url = f"{self.endpoint}/models/{model}:generateContent"
         payload = self._prepare_chat_payload_for_model(model, kwargs)
+        response = self._send_request(url, payload, timeout_s, deadline=deadline)
+        return response.json()
+
+    def stream_chat_completion(
+        self,
+        model: str,
+        timeout_s: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """Like chat_completion(), but yields the server-sent event payloads."""
+        url = f"{self.endpoint}/models/{model}:streamGenerateContent?alt=sse"
+        payload = self._prepare_chat_payload_for_model(model, kwargs)
+        response = self._send_request(url, payload, timeout_s, stream=True, deadline=deadline)
+        yield from iter_sse_events(response, deadline)
+
+    def count_tokens(self, model: str, timeout_s: RequestTimeout = None, **kwargs) -> int:
+        """Input tokens of a generateContent request, from the countTokens endpoint."""
+        url = f"{self.endpoint}/models/{model}:countTokens"
+        payload = {"generateContentRequest": {"model": f"models/{model}", **kwargs}}
         response = self._send_request(url, payload, timeout_s)
+        return response.json()["totalTokens"]
+
+    def batch_embed_contents(
+        self,
+        model: str,
+        texts: list,
+        timeout_s: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ):
+        """One embedding per text; kwargs (e.g. outputDimensionality) apply to each."""
+        url = f"{self.endpoint}/models/{model}:batchEmbedContents"
+        payload = {
+            "requests": [
+                {"model": f"models/{model}", "content": {"parts": [{"text": text}]}, **kwargs}
+                for text in texts
+            ]
+        }
+        response = self._send_request(url, payload, timeout_s, deadline=deadline)
         return response.json()
 
     def _prepare_chat_payload_for_model(self, model: str, kwargs: dict) -> dict:
@@ -52,21 +102,34 @@ class GeminiSyncClient:
                 thinking_config["thinkingBudget"] = min_budget
         return {"model": model, **kwargs}
 
-    def _send_request(self, url: str, payload: dict, timeout_s: float | None = None):
-        try:
-            response = requests.post(
-                url, headers=self._headers(), json=payload,  timeout=timeout_s,
-            )
-            response.raise_for_status()
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Request timeout: {e}")
-            raise LLMAPITimeoutError(detail=str(e))
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred: {http_err}")
-            self._handle_http_error(http_err)
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request exception: {e}")
-            raise LLMAPIClientError(detail=str(e))
+    def _send_request(
+        self,
+        url: str,
+        payload: dict,
+        timeout_s: RequestTimeout = None,
+        stream: bool = False,
+        deadline: Deadline | None = None,
+    ):
+        with CIRCUIT_BREAKERS.guard(url):
+            try:
+                post = self.session.post if self.session is not None else requests.post
+                response = post(
+                    url, headers=self._headers(), json=payload, timeout=timeout_s,
+                    stream=stream or deadline is not None,
+                )
+                RATE_LIMITS.update(self.api_key, response.headers)
+                response.raise_for_status()
+                if deadline is not None and not stream:
+                    read_body(response, deadline)
+            except requests.exceptions.Timeout as e:
+                logger.error(f"Request timeout: {e}")
+                raise timeout_error(e, deadline)
+            except requests.exceptions.HTTPError as http_err:
+                logger.error(f"HTTP error occurred: {http_err}")
+                self._handle_http_error(http_err)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request exception: {e}")
+                raise LLMAPIClientError(detail=str(e))
         return response
 
     def _handle_http_error(self, http_err):
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept open per host; concurrent calls beyond it open extra ones.
+POOL_MAXSIZE = 32
+
+
+def new_session() -> requests.Session:
+    """
+    Session for the provider clients. Its connection pool keeps up to
+    POOL_MAXSIZE connections per host open, so calls made through the same
+    session reuse them instead of paying a TCP and TLS handshake each time.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from ..streaming import StreamAccumulator
+
+
+class OpenAIChatStreamAccumulator(StreamAccumulator):
+    """Accumulates Chat Completions chunks into a chat.completion dict."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._meta: Dict[str, Any] = {}
+        self._content: List[str] = []
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+        self._finish_reason: Optional[str] = None
+        self._usage: Optional[dict] = None
+
+    def feed(self, event: dict) -> None:
+        if event.get("error"):
+            self._stream_error(str((event["error"] or {}).get("message") or event["error"]))
+        for key in ("id", "model", "created"):
+            if key in event and key not in self._meta:
+                self._meta[key] = event[key]
+        if event.get("usage"):
+            self._usage = event["usage"]
+        for choice in event.get("choices") or []:
+            if choice.get("index", 0) != 0:
+                continue
+            delta = choice.get("delta") or {}
+            content = delta.get("content")
+            if content:
+                self._content.append(content)
+                self._text(content)
+            for tool_delta in delta.get("tool_calls") or []:
+                self._feed_tool_call(tool_delta)
+            if choice.get("finish_reason"):
+                self._finish_reason = choice["finish_reason"]
+
+    def _feed_tool_call(self, tool_delta: dict) -> None:
+        index = tool_delta.get("index", len(self._tool_calls))
+        function = tool_delta.get("function") or {}
+        call = self._tool_calls.get(index)
+        if call is None:
+            call = {"id": tool_delta.get("id"), "name": function.get("name"), "arguments": []}
+            self._tool_calls[index] = call
+            self._tool_call(index, call["name"], call["id"])
+        fragment = function.get("arguments")
+        if fragment:
+            call["arguments"].append(fragment)
+            self._tool_arguments(index, call["name"], fragment)
+
+    def result(self) -> dict:
+        message: Dict[str, Any] = {
+            "role": "assistant",
+            "content": "".join(self._content) if self._content else None,
+        }
+        if self._tool_calls:
+            message["tool_calls"] = [
+                {
+                    "id": call["id"],
+                    "type": "function",
+                    "function": {
+                        "name": call["name"],
+                        "arguments": "".join(call["arguments"]),
+                    },
+                }
+                for _, call in sorted(self._tool_calls.items())
+            ]
+        return {
+            **self._meta,
+            "object": "chat.completion",
+            "choices": [
+                {"index": 0, "message": message, "finish_reason": self._finish_reason}
+            ],
+            "usage": self._usage or {},
+        }
+
+
+class OpenAIResponsesStreamAccumulator(StreamAccumulator):
+    """
+    Accumulates Responses API events. The final "response.completed" event
+    carries the full response object, which is returned as is; deltas are
+    only used for incremental events.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._response: Optional[dict] = None
+        self._tool_names: Dict[int, Optional[str]] = {}
+
+    def feed(self, event: dict) -> None:
+        event_type = event.get("type")
+        if event_type == "response.output_text.delta":
+            self._text(event.get("delta"))
+        elif event_type == "response.output_item.added":
+            item = event.get("item") or {}
+            if item.get("type") == "function_call":
+                index = event.get("output_index", len(self._tool_names))
+                self._tool_names[index] = item.get("name")
+                self._tool_call(index, item.get("name"), item.get("call_id"))
+        elif event_type == "response.function_call_arguments.delta":
+            index = event.get("output_index", 0)
+            self._tool_arguments(index, self._tool_names.get(index), event.get("delta"))
+        elif event_type in ("response.completed", "response.incomplete"):
+            self._response = event.get("response") or {}
+        elif event_type in ("response.failed", "error"):
+            error = (event.get("response") or {}).get("error") or event
+            self._stream_error(str(error.get("message") or error))
+
+    def result(self) -> dict:
+        if self._response is None:
+            self._stream_error("Responses stream ended before response.completed")
+        return self._response
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 import logging
+from typing import Iterator, Optional
+
 import requests
 import warnings
 
@@ -9,8 +11,11 @@ from ...errors.llm_api_error import (
     LLMAPITokenLimitError,
     LLMAPIClientError,
     LLMAPIServerError,
-    LLMAPITimeoutError,
 )
+from ...utils.deadline import Deadline, RequestTimeout, read_body, timeout_error
+from ..circuit_breaker import CIRCUIT_BREAKERS
+from ..rate_limits import RATE_LIMITS
+from ..streaming import iter_sse_events
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +24,7 @@ logger = logging.getLogger(__name__)
 class OpenAISyncClient:
     api_key: str
     endpoint: str = "https://api.openai.com/v1"
+    session: Optional[requests.Session] = None
 
     def __repr__(self) -> str:
         masked = f"{self.api_key[:8]}...{self.api_key[-4:]}" if len(self.api_key) > 12 else "***"
@@ -30,23 +36,73 @@ class OpenAISyncClient:
             "Content-Type": "application/json",
         }
 
-    def complete(self, model: str, timeout: float | None = None, **kwargs):
+    def complete(
+        self,
+        model: str,
+        timeout: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ):
         if self._should_use_responses_api(model):
-            return self.responses(model=model, timeout=timeout, **kwargs)
-        return self.chat_completion(model=model, timeout=timeout, **kwargs)
+            return self.responses(model=model, timeout=timeout, deadline=deadline, **kwargs)
+        return self.chat_completion(model=model, timeout=timeout, deadline=deadline, **kwargs)
 
-    def chat_completion(self, model: str, timeout: float | None = None, **kwargs):
+    def chat_completion(
+        self,
+        model: str,
+        timeout: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ):
         url = f"{self.endpoint}/chat/completions"
         payload = self._prepare_chat_payload_for_model(model, kwargs)
-        response = self._send_request(url, payload, timeout)
+        response = self._send_request(url, payload, timeout, deadline=deadline)
         return response.json()
 
-    def responses(self, model: str, timeout: float | None = None, **kwargs):
+    def responses(
+        self,
+        model: str,
+        timeout: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ):
         url = f"{self.endpoint}/responses"
         payload = self._prepare_responses_payload_for_model(model, kwargs)
-        response = self._send_request(url, payload, timeout)
+        response = self._send_request(url, payload, timeout, deadline=deadline)
+        return response.json()
+
+    def embeddings(
+        self,
+        model: str,
+        input: list,
+        timeout: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ):
+        url = f"{self.endpoint}/embeddings"
+        payload = {"model": model, "input": input, **kwargs}
+        response = self._send_request(url, payload, timeout, deadline=deadline)
         return response.json()
 
+    def stream_complete(
+        self,
+        model: str,
+        timeout: RequestTimeout = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """Like complete(), but yields the server-sent event payloads."""
+        if self._should_use_responses_api(model):
+            url = f"{self.endpoint}/responses"
+            payload = self._prepare_responses_payload_for_model(model, kwargs)
+        else:
+            url = f"{self.endpoint}/chat/completions"
+            payload = self._prepare_chat_payload_for_model(model, kwargs)
+            payload["stream_options"] = {"include_usage": True}
+        payload["stream"] = True
+        response = self._send_request(url, payload, timeout, stream=True, deadline=deadline)
+        yield from iter_sse_events(response, deadline)
+
     def _should_use_responses_api(self, model: str) -> bool:
         return model.startswith("gpt-5")
 
@@ -77,21 +133,34 @@ class OpenAISyncClient:
             payload.pop("top_p")
         return payload
 
-    def _send_request(self, url: str, payload: dict, timeout: float | None = None):
-        try:
-            response = requests.post(
-                url, headers=self._headers(), json=payload, timeout=timeout
-            )
-            response.raise_for_status()
-        except requests.exceptions.Timeout as e:
-            logger.error("Timeout error: %s", e)
-            raise LLMAPITimeoutError(detail=str(e))
-        except requests.exceptions.HTTPError as http_err:
-            logger.error("HTTP error: %s", http_err)
-            self._handle_http_error(http_err)
-        except requests.exceptions.RequestException as e:
-            logger.error("Request exception: %s", e)
-            raise LLMAPIClientError(detail=str(e))
+    def _send_request(
+        self,
+        url: str,
+        payload: dict,
+        timeout: RequestTimeout = None,
+        stream: bool = False,
+        deadline: Deadline | None = None,
+    ):
+        with CIRCUIT_BREAKERS.guard(url):
+            try:
+                post = self.session.post if self.session is not None else requests.post
+                response = post(
+                    url, headers=self._headers(), json=payload, timeout=timeout,
+                    stream=stream or deadline is not None,
+                )
+                RATE_LIMITS.update(self.api_key, response.headers)
+                response.raise_for_status()
+                if deadline is not None and not stream:
+                    read_body(response, deadline)
+            except requests.exceptions.Timeout as e:
+                logger.error("Timeout error: %s", e)
+                raise timeout_error(e, deadline)
+            except requests.exceptions.HTTPError as http_err:
+                logger.error("HTTP error: %s", http_err)
+                self._handle_http_error(http_err)
+            except requests.exceptions.RequestException as e:
+                logger.error("Request exception: %s", e)
+                raise LLMAPIClientError(detail=str(e))
         return response
 
     def _handle_http_error(self, http_err):
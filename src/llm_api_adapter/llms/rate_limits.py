@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Set
+
+REMAINING_REQUESTS_HEADERS = (
+    "x-ratelimit-remaining-requests",
+    "anthropic-ratelimit-requests-remaining",
+)
+REMAINING_TOKENS_HEADERS = (
+    "x-ratelimit-remaining-tokens",
+    "anthropic-ratelimit-tokens-remaining",
+)
+RESET_REQUESTS_HEADERS = (
+    "x-ratelimit-reset-requests",
+    "anthropic-ratelimit-requests-reset",
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+@dataclass
+class RateLimitState:
+    """Last rate-limit headers seen for one API key (monotonic timestamps)."""
+    remaining_requests: Optional[int] = None
+    remaining_tokens: Optional[int] = None
+    reset_at: Optional[float] = None
+    retry_after_s: Optional[float] = None
+    updated_at: float = 0.0
+
+    def is_current(self, now: Optional[float] = None) -> bool:
+        """False once the reported request window has reset."""
+        now = time.monotonic() if now is None else now
+        return self.reset_at is None or now < self.reset_at
+
+
+@dataclass
+class RateLimitTracker:
+    """
+    Records provider rate-limit headers per API key. Only keys registered
+    with watch() are tracked, so keys that nobody balances on are never
+    kept in memory.
+    """
+    _watched: Set[str] = field(default_factory=set, init=False, repr=False)
+    _states: Dict[str, RateLimitState] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def watch(self, api_key: str) -> None:
+        with self._lock:
+            self._watched.add(api_key)
+
+    def unwatch(self, api_key: str) -> None:
+        with self._lock:
+            self._watched.discard(api_key)
+            self._states.pop(api_key, None)
+
+    def update(self, api_key: str, headers: Any) -> None:
+        if api_key not in self._watched or not isinstance(headers, Mapping):
+            return
+        lowered = {str(k).lower(): v for k, v in headers.items()}
+        now = time.monotonic()
+        state = RateLimitState(
+            remaining_requests=_parse_int(_first(lowered, REMAINING_REQUESTS_HEADERS)),
+            remaining_tokens=_parse_int(_first(lowered, REMAINING_TOKENS_HEADERS)),
+            reset_at=_parse_reset(_first(lowered, RESET_REQUESTS_HEADERS), now),
+            retry_after_s=_parse_retry_after(lowered),
+            updated_at=now,
+        )
+        with self._lock:
+            if api_key in self._watched:
+                self._states[api_key] = state
+
+    def get(self, api_key: str) -> Optional[RateLimitState]:
+        with self._lock:
+            return self._states.get(api_key)
+
+
+def _first(headers: Dict[str, Any], names: tuple) -> Optional[str]:
+    for name in names:
+        if name in headers:
+            return headers[name]
+    return None
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_retry_after(headers: Dict[str, Any]) -> Optional[float]:
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except (TypeError, ValueError):
+            pass
+    try:
+        return float(headers["retry-after"]) if "retry-after" in headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(value: Optional[str], now: float) -> Optional[float]:
+    """OpenAI sends durations ("6m0s", "20ms"); Anthropic sends RFC 3339 times."""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return now + sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    try:
+        reset = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset.tzinfo is None:
+        reset = reset.replace(tzinfo=timezone.utc)
+    return now + max(0.0, (reset - datetime.now(timezone.utc)).total_seconds())
+
+
+RATE_LIMITS = RateLimitTracker()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from ..errors.llm_api_error import LLMAPIClientError, LLMAPIServerError
+from ..models.responses.chat_stream import StreamEvent
+from ..utils.deadline import Deadline, is_read_timeout, iter_until, timeout_error
+from ..utils.incremental_json import IncrementalJSONParser
+from ..utils.json_tools import json_loads
+
+logger = logging.getLogger(__name__)
+
+
+def iter_sse_events(response: Any, deadline: Optional[Deadline] = None) -> Iterator[dict]:
+    """
+    Yield the JSON payloads of a server-sent events response.
+
+    Multi-line data fields are joined, comments and non-data fields are
+    skipped, and the OpenAI "[DONE]" sentinel ends the stream. Network
+    errors while reading are mapped like in the clients' _send_request,
+    and the response is closed when iteration stops. With a deadline,
+    LLMAPITimeoutError is raised once it expires between events.
+    """
+    try:
+        yield from iter_until(_iter_sse_payloads(response), deadline)
+    except requests.exceptions.RequestException as e:
+        if isinstance(e, requests.exceptions.Timeout) or is_read_timeout(e):
+            logger.error("Stream timeout: %s", e)
+            raise timeout_error(e, deadline)
+        logger.error("Stream read failed: %s", e)
+        raise LLMAPIClientError(detail=str(e))
+    finally:
+        close = getattr(response, "close", None)
+        if close is not None:
+            close()
+
+
+def _iter_sse_payloads(response: Any) -> Iterator[dict]:
+    data_lines: List[str] = []
+    for raw_line in response.iter_lines():
+        line = raw_line.decode("utf-8") if isinstance(raw_line, bytes) else raw_line
+        if line:
+            name, _, value = line.partition(":")
+            if name == "data":
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+            continue
+        if not data_lines:
+            continue
+        data = "\n".join(data_lines)
+        data_lines = []
+        if data == "[DONE]":
+            return
+        yield json_loads(data)
+    if data_lines and "\n".join(data_lines) != "[DONE]":
+        yield json_loads("\n".join(data_lines))
+
+
+class StreamAccumulator(ABC):
+    """
+    Rebuilds a provider's non-streamed response from its stream events.
+
+    Subclasses call _text() and _tool_arguments() with deltas as they
+    arrive; with parse_json the text is fed to an IncrementalJSONParser and
+    completed top-level members are reported as "json_item" events. Tool
+    call arguments always get the same treatment. result() returns a dict
+    in the provider's regular response format, so the usual ChatResponse
+    parser applies.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[StreamEvent], None],
+        parse_json: bool = False,
+    ) -> None:
+        self._on_event = on_event
+        self._json_parser = IncrementalJSONParser() if parse_json else None
+        self._tool_parsers: Dict[int, IncrementalJSONParser] = {}
+
+    @abstractmethod
+    def feed(self, event: dict) -> None:
+        ...
+
+    @abstractmethod
+    def result(self) -> dict:
+        ...
+
+    def consume(self, events: Iterator[dict]) -> dict:
+        for event in events:
+            self.feed(event)
+        return self.result()
+
+    def _text(self, text: Optional[str]) -> None:
+        if not text:
+            return
+        self._on_event(StreamEvent(type="text", text=text))
+        if self._json_parser is None:
+            return
+        for key, value in self._json_parser.feed(text):
+            self._on_event(StreamEvent(type="json_item", key=key, value=value))
+
+    def _tool_call(self, index: int, name: Optional[str], call_id: Optional[str]) -> None:
+        self._tool_parsers[index] = IncrementalJSONParser()
+        self._on_event(
+            StreamEvent(type="tool_call", index=index, tool_name=name, call_id=call_id)
+        )
+
+    def _tool_arguments(self, index: int, name: Optional[str], fragment: Optional[str]) -> None:
+        parser = self._tool_parsers.get(index)
+        if not fragment or parser is None:
+            return
+        for key, value in parser.feed(fragment):
+            self._on_event(
+                StreamEvent(
+                    type="tool_arguments_item",
+                    key=key,
+                    value=value,
+                    index=index,
+                    tool_name=name,
+                )
+            )
+
+    def _stream_error(self, detail: str) -> None:
+        logger.error("Stream error: %s", detail)
+        raise LLMAPIServerError(detail=detail)
@@ -1,17 +1,66 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 import json
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional, Tuple
 import warnings
 
 from ...errors.llm_api_error import InvalidToolArgumentsError, LLMAPIError
 from ...models.tools import ToolCall
 
 
+BodyParser = Callable[[dict], Tuple[Optional[str], Optional[List[ToolCall]]]]
+
+# Anthropic reports the served tier as usage.service_tier.
+ANTHROPIC_SERVICE_TIERS = {"standard": "default"}
+
+
 @dataclass
 class Usage:
     input_tokens: int = 0
     output_tokens: int = 0
     total_tokens: int = 0
+    # Predicted-output tokens (OpenAI); both are already in output_tokens.
+    accepted_prediction_tokens: int = 0
+    rejected_prediction_tokens: int = 0
+
+
+@dataclass
+class ToolLoopInfo:
+    """
+    Summary of a chat_with_tools() run attached to the final response.
+
+    usage/cost fields of the final response are aggregated over all steps;
+    responses keeps the per-step originals.
+    """
+    steps: int = 0
+    tool_calls: int = 0
+    cache_hits: int = 0
+    messages: List[Any] = field(default_factory=list)
+    responses: List["ChatResponse"] = field(default_factory=list)
+
+
+@dataclass
+class RouteInfo:
+    """
+    Target that served a RoutedAdapter call; errors lists the failed
+    attempts on earlier targets as "organization:model: error".
+    """
+    organization: str
+    model: str
+    attempts: int = 1
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class HedgeInfo:
+    """
+    Outcome of a hedged chat() call: winner is 0 for the first attempt and
+    1 for the hedge. extra_cost is added when the abandoned attempt
+    completes, so it can grow after the response has been returned.
+    """
+    winner: int = 0
+    attempts: int = 1
+    delay_s: float = 0.0
+    extra_cost: float = 0.0
 
 
 @dataclass
@@ -29,15 +78,81 @@ class ChatResponse:
     finish_reason: Optional[str] = None
     parsed_json: Optional[dict] = None
     parsed_model: Optional[Any] = None
+    tool_loop: Optional[ToolLoopInfo] = None
+    route: Optional[RouteInfo] = None
+    hedge: Optional[HedgeInfo] = None
+    candidates: Optional[List["ChatResponse"]] = None
+    service_tier: Optional[str] = None
+
+    @classmethod
+    def from_candidates(cls, responses: List["ChatResponse"]) -> "ChatResponse":
+        """
+        Combines separate responses (one per candidate) into one: the
+        first candidate's fields, with usage and cost summed over all of
+        them, since each call paid for its own input.
+        """
+        usage = Usage()
+        for response in responses:
+            if response.usage is not None:
+                usage.input_tokens += response.usage.input_tokens
+                usage.output_tokens += response.usage.output_tokens
+                usage.total_tokens += response.usage.total_tokens
+                usage.accepted_prediction_tokens += response.usage.accepted_prediction_tokens
+                usage.rejected_prediction_tokens += response.usage.rejected_prediction_tokens
+        costs = {
+            name: sum(getattr(r, name) for r in responses)
+            if all(getattr(r, name) is not None for r in responses)
+            else None
+            for name in ("cost_input", "cost_output", "cost_total")
+        }
+        return replace(responses[0], usage=usage, candidates=list(responses), **costs)
+
+    def _with_candidates(self, candidates: List["ChatResponse"]) -> "ChatResponse":
+        """Attaches the candidates of one multi-candidate response; usage stays on self."""
+        if len(candidates) > 1:
+            for candidate in candidates:
+                candidate.usage = None
+            self.candidates = candidates
+        return self
+
+    @classmethod
+    def _build(cls, api_response: dict, parse_body: BodyParser, **fields: Any) -> "ChatResponse":
+        """The response with content and tool_calls parsed from api_response."""
+        content, tool_calls = parse_body(api_response)
+        return cls(content=content, tool_calls=tool_calls, **fields)
 
     @classmethod
     def from_openai_response(cls, api_response: dict) -> "ChatResponse":
+        choices = api_response.get("choices") or []
+        if len(choices) > 1:
+            candidates = [
+                cls.from_openai_response({**api_response, "choices": [choice]})
+                for choice in sorted(choices, key=lambda c: (c or {}).get("index", 0))
+            ]
+            return replace(candidates[0])._with_candidates(candidates)
         u = api_response.get("usage", {}) or {}
+        details = u.get("completion_tokens_details") or {}
         usage = Usage(
             input_tokens=u.get("prompt_tokens", 0),
             output_tokens=u.get("completion_tokens", 0),
             total_tokens=u.get("total_tokens", 0),
+            accepted_prediction_tokens=details.get("accepted_prediction_tokens") or 0,
+            rejected_prediction_tokens=details.get("rejected_prediction_tokens") or 0,
         )
+        choice0 = (api_response.get("choices") or [None])[0] or {}
+        return cls._build(
+            api_response,
+            cls._openai_body,
+            model=api_response.get("model"),
+            response_id=api_response.get("id"),
+            timestamp=api_response.get("created"),
+            usage=usage,
+            finish_reason=choice0.get("finish_reason"),
+            service_tier=api_response.get("service_tier"),
+        )
+
+    @staticmethod
+    def _openai_body(api_response: dict) -> Tuple[Optional[str], Optional[List[ToolCall]]]:
         choice0 = (api_response.get("choices") or [None])[0] or {}
         message = choice0.get("message") or {}
         text = message.get("content")
@@ -95,15 +210,7 @@ class ChatResponse:
                     UserWarning,
                 )
 
-        return cls(
-            model=api_response.get("model"),
-            response_id=api_response.get("id"),
-            timestamp=api_response.get("created"),
-            usage=usage,
-            content=text,
-            tool_calls=parsed_tool_calls,
-            finish_reason=choice0.get("finish_reason"),
-        )
+        return text, parsed_tool_calls
 
     @classmethod
     def from_openai_responses_response(cls, api_response: dict) -> "ChatResponse":
@@ -113,6 +220,19 @@ class ChatResponse:
             output_tokens=u.get("output_tokens", 0),
             total_tokens=u.get("total_tokens", 0),
         )
+        return cls._build(
+            api_response,
+            cls._openai_responses_body,
+            model=api_response.get("model"),
+            response_id=api_response.get("id"),
+            timestamp=api_response.get("created_at"),
+            usage=usage,
+            finish_reason=api_response.get("status"),
+            service_tier=api_response.get("service_tier"),
+        )
+
+    @staticmethod
+    def _openai_responses_body(api_response: dict) -> Tuple[Optional[str], Optional[List[ToolCall]]]:
         parsed_tool_calls: Optional[List[ToolCall]] = None
         text_parts: List[str] = []
         output_items = api_response.get("output") or []
@@ -163,15 +283,7 @@ class ChatResponse:
                 "OpenAI Responses API returned empty content and no tool calls.",
                 UserWarning,
             )
-        return cls(
-            model=api_response.get("model"),
-            response_id=api_response.get("id"),
-            timestamp=api_response.get("created_at"),
-            usage=usage,
-            content=text,
-            tool_calls=parsed_tool_calls,
-            finish_reason=api_response.get("status"),
-        )
+        return text, parsed_tool_calls
 
     @classmethod
     def from_anthropic_response(cls, api_response: dict) -> "ChatResponse":
@@ -181,6 +293,18 @@ class ChatResponse:
             output_tokens=u.get("output_tokens", 0),
             total_tokens=u.get("input_tokens", 0) + u.get("output_tokens", 0),
         )
+        return cls._build(
+            api_response,
+            cls._anthropic_body,
+            model=api_response.get("model"),
+            response_id=api_response.get("id"),
+            usage=usage,
+            finish_reason=api_response.get("stop_reason"),
+            service_tier=ANTHROPIC_SERVICE_TIERS.get(u.get("service_tier"), u.get("service_tier")),
+        )
+
+    @staticmethod
+    def _anthropic_body(api_response: dict) -> Tuple[Optional[str], Optional[List[ToolCall]]]:
         blocks = api_response.get("content", []) or []
         parsed_tool_calls: Optional[List[ToolCall]] = None
         text_content: Optional[str] = None
@@ -204,17 +328,17 @@ class ChatResponse:
                         call_id=block.get("id"),
                     )
                 )
-        return cls(
-            model=api_response.get("model"),
-            response_id=api_response.get("id"),
-            usage=usage,
-            content=text_content,
-            tool_calls=parsed_tool_calls,
-            finish_reason=api_response.get("stop_reason"),
-        )
+        return text_content, parsed_tool_calls
 
     @classmethod
     def from_google_response(cls, api_response: dict) -> "ChatResponse":
+        google_candidates = api_response.get("candidates") or []
+        if len(google_candidates) > 1:
+            candidates = [
+                cls.from_google_response({**api_response, "candidates": [candidate]})
+                for candidate in google_candidates
+            ]
+            return replace(candidates[0])._with_candidates(candidates)
         u = api_response.get("usageMetadata", {}) or {}
         thoughts_tokens = u.get("thoughtsTokenCount", 0)
         usage = Usage(
@@ -225,6 +349,16 @@ class ChatResponse:
         first_candidate = (api_response.get("candidates") or [None])[0] or {}
         finish_reason = first_candidate.get("finishReason")
         finish_reason_str = str(finish_reason) if finish_reason is not None else None
+        return cls._build(
+            api_response,
+            cls._google_body,
+            usage=usage,
+            finish_reason=finish_reason_str,
+        )
+
+    @staticmethod
+    def _google_body(api_response: dict) -> Tuple[Optional[str], Optional[List[ToolCall]]]:
+        first_candidate = (api_response.get("candidates") or [None])[0] or {}
         content_obj = first_candidate.get("content") or {}
         parts = content_obj.get("parts") or []
         if not isinstance(parts, list):
@@ -269,12 +403,7 @@ class ChatResponse:
                         provider_data=provider_data,
                     )
                 )
-        return cls(
-            usage=usage,
-            content=text_content,
-            tool_calls=parsed_tool_calls,
-            finish_reason=finish_reason_str,
-        )
+        return text_content, parsed_tool_calls
 
     def apply_pricing(
         self,
@@ -288,3 +417,76 @@ class ChatResponse:
         self.cost_input = self.usage.input_tokens * price_input_per_token
         self.cost_output = self.usage.output_tokens * price_output_per_token
         self.cost_total = self.cost_input + self.cost_output
+
+
+_LAZY_FIELDS = ("content", "tool_calls", "parsed_json")
+
+
+def _lazy_field(name: str) -> property:
+    def get(self: "LazyChatResponse") -> Any:
+        values = self.__dict__["_lazy_values"]
+        if name not in values:
+            self._resolve(name)
+        return values[name]
+
+    def set(self: "LazyChatResponse", value: Any) -> None:
+        self.__dict__["_lazy_values"][name] = value
+
+    return property(get, set)
+
+
+class LazyChatResponse(ChatResponse):
+    """
+    ChatResponse that keeps the decoded provider payload and builds
+    content, tool_calls and parsed_json from it on first access, so
+    callers that only read usage or costs never walk the output items or
+    decode tool arguments. Parse errors (e.g. invalid tool arguments)
+    surface on that first access. Assigning a field replaces its lazy
+    value; the payload is released once content and tool_calls are built.
+    """
+    content = _lazy_field("content")
+    tool_calls = _lazy_field("tool_calls")
+    parsed_json = _lazy_field("parsed_json")
+
+    def __init__(
+        self,
+        *args: Any,
+        raw_response: Optional[dict] = None,
+        parse_body: Optional[BodyParser] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.__dict__["_lazy_values"] = {}
+        super().__init__(*args, **kwargs)
+        self._raw_response = raw_response
+        self._parse_body = parse_body
+        self._parse_json: Optional[Callable[[Optional[str]], Optional[dict]]] = None
+        if parse_body is not None:
+            for name in _LAZY_FIELDS:
+                self._lazy_values.pop(name, None)
+
+    @classmethod
+    def _build(cls, api_response: dict, parse_body: BodyParser, **fields: Any) -> "ChatResponse":
+        return cls(raw_response=api_response, parse_body=parse_body, **fields)
+
+    @property
+    def is_parsed(self) -> bool:
+        """True once content and tool_calls have been built."""
+        return "content" in self._lazy_values and "tool_calls" in self._lazy_values
+
+    def defer_parsed_json(self, parse_json: Callable[[Optional[str]], Optional[dict]]) -> None:
+        """Computes parsed_json as parse_json(content) on first access."""
+        self._lazy_values.pop("parsed_json", None)
+        self._parse_json = parse_json
+
+    def _resolve(self, name: str) -> None:
+        values = self._lazy_values
+        if name == "parsed_json":
+            parse_json = self._parse_json
+            values.setdefault("parsed_json", parse_json(self.content) if parse_json else None)
+            return
+        content, tool_calls = (
+            self._parse_body(self._raw_response) if self._parse_body else (None, None)
+        )
+        values.setdefault("content", content)
+        values.setdefault("tool_calls", tool_calls)
+        self._raw_response = None
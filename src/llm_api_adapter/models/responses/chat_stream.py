@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import queue
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+from .chat_response import ChatResponse
+
+
+@dataclass
+class StreamEvent:
+    """
+    One event of a streamed chat() call.
+
+    type is one of:
+        "text"                - a text delta, in text
+        "json_item"           - a completed top-level field (key is the name)
+                                or array item (key is the index) of the
+                                structured output, in key/value
+        "tool_call"           - a tool call started: index, tool_name, call_id
+        "tool_arguments_item" - a completed top-level argument of the tool
+                                call at index, in key/value
+    """
+    type: str
+    text: Optional[str] = None
+    key: Any = None
+    value: Any = None
+    index: Optional[int] = None
+    tool_name: Optional[str] = None
+    call_id: Optional[str] = None
+
+
+@dataclass
+class _StreamEnd:
+    response: Optional[ChatResponse] = None
+    error: Optional[BaseException] = None
+
+
+class ChatStream:
+    """
+    Iterator over the StreamEvents of a chat() call.
+
+    The call runs in a background thread with on_stream feeding a queue;
+    iterating yields events as they arrive and re-raises the call's error,
+    if any. response holds the final ChatResponse (with parsed_json and
+    parsed_model) once iteration has finished.
+    """
+
+    def __init__(self, chat: Callable[..., ChatResponse], **chat_kwargs: Any) -> None:
+        self.response: Optional[ChatResponse] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._finished = False
+        self._thread = threading.Thread(
+            target=self._run, args=(chat, chat_kwargs), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, chat: Callable[..., ChatResponse], chat_kwargs: dict) -> None:
+        try:
+            response = chat(on_stream=self._queue.put, **chat_kwargs)
+        except BaseException as e:
+            self._queue.put(_StreamEnd(error=e))
+            return
+        self._queue.put(_StreamEnd(response=response))
+
+    def __iter__(self) -> Iterator[StreamEvent]:
+        while not self._finished:
+            item = self._queue.get()
+            if isinstance(item, _StreamEnd):
+                self._finished = True
+                if item.error is not None:
+                    raise item.error
+                self.response = item.response
+                return
+            yield item
+
+    def result(self) -> Optional[ChatResponse]:
+        """Consume the remaining events and return the final response."""
+        for _ in self:
+            pass
+        return self.response
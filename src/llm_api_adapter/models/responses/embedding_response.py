@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+from .chat_response import Usage
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional matrix backend
+    numpy = None
+
+
+@dataclass
+class EmbeddingResponse:
+    """
+    Result of embed(): one float32 row per input text, in input order.
+
+    embeddings is a (count, dimensions) NumPy array when NumPy is
+    installed, otherwise a flat array.array("f") of count * dimensions
+    values; vector(i) returns row i for either. usage and the costs are
+    summed over the provider batches.
+    """
+    model: str
+    embeddings: Any
+    count: int = 0
+    dimensions: int = 0
+    usage: Optional[Usage] = None
+    batches: int = 0
+    currency: Optional[str] = None
+    cost_total: Optional[float] = None
+    batch_usage: List[Usage] = field(default_factory=list, repr=False)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def vector(self, index: int) -> Sequence[float]:
+        if not -self.count <= index < self.count:
+            raise IndexError("embedding index out of range")
+        if numpy is not None and isinstance(self.embeddings, numpy.ndarray):
+            return self.embeddings[index]
+        start = (index % self.count) * self.dimensions
+        return self.embeddings[start:start + self.dimensions]
+
+
+def float32_matrix(batches: Sequence[Sequence[Sequence[float]]]) -> tuple[Any, int, int]:
+    """
+    Copies batches of vectors into one contiguous float32 matrix:
+    (matrix, rows, dimensions).
+    """
+    rows = sum(len(batch) for batch in batches)
+    dimensions = next((len(batch[0]) for batch in batches if batch), 0)
+    for batch in batches:
+        if any(len(vector) != dimensions for vector in batch):
+            raise ValueError("embeddings of one request must have the same dimensions")
+    if numpy is not None:
+        matrix = numpy.empty((rows, dimensions), dtype=numpy.float32)
+        offset = 0
+        for batch in batches:
+            if batch:
+                matrix[offset:offset + len(batch)] = batch
+                offset += len(batch)
+        return matrix, rows, dimensions
+    matrix = array("f")
+    for batch in batches:
+        for vector in batch:
+            matrix.extend(vector)
+    return matrix, rows, dimensions
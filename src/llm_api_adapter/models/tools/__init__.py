@@ -1,4 +1,6 @@
 from .tool_spec import ToolSpec
 from .tool_call import ToolCall
+from .tool_builder import tool, tool_spec_from_function
+from .toolset import Toolset
 
-__all__ = ["ToolSpec", "ToolCall"]
\ No newline at end of file
+__all__ = ["ToolSpec", "ToolCall", "Toolset", "tool", "tool_spec_from_function"]
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import enum
+import inspect
+import re
+import types
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+from ...errors.llm_api_error import InvalidToolSchemaError
+from .tool_spec import ToolSpec
+
+_PRIMITIVE_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+}
+_ARGS_SECTION_RE = re.compile(r"^\s*(Args|Arguments|Parameters)\s*:\s*$")
+_SECTION_RE = re.compile(r"^\s*[A-Z][A-Za-z ]*\s*:\s*$")
+_GOOGLE_PARAM_RE = re.compile(r"^\s*(\*{0,2}\w+)\s*(?:\([^)]*\))?\s*:\s*(.*)$")
+_SPHINX_PARAM_RE = re.compile(r"^\s*:param\s+(?:[^:]*\s)?(\w+)\s*:\s*(.*)$")
+
+
+def tool_spec_from_function(
+    fn: Callable[..., Any],
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    idempotent: bool = False,
+    cache_ttl_s: Optional[float] = None,
+) -> ToolSpec:
+    """
+    Build a ToolSpec from a function signature.
+
+    Parameter types come from type hints, the tool description from the
+    first paragraph of the docstring, and parameter descriptions from a
+    Google-style "Args:" section or Sphinx ":param" lines.
+    """
+    try:
+        hints = get_type_hints(fn)
+    except Exception as e:
+        raise InvalidToolSchemaError(
+            detail=f"Cannot resolve type hints of {fn.__name__!r}: {e}"
+        )
+    summary, param_docs = _parse_docstring(inspect.getdoc(fn) or "")
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    defs: Dict[str, Any] = {}
+    for param in inspect.signature(fn).parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        if param.name in ("self", "cls"):
+            continue
+        annotation = hints.get(param.name, Any)
+        schema = _type_to_schema(annotation, fn.__name__, param.name, defs)
+        if param.name in param_docs:
+            schema["description"] = param_docs[param.name]
+        if param.default is param.empty:
+            required.append(param.name)
+        elif param.default is not None and _is_json_value(param.default):
+            schema["default"] = param.default
+        properties[param.name] = schema
+    json_schema: Dict[str, Any] = {
+        "type": "object",
+        "properties": properties,
+        "required": required,
+        "additionalProperties": False,
+    }
+    if defs:
+        json_schema["$defs"] = defs
+    return ToolSpec(
+        name=name or fn.__name__,
+        json_schema=json_schema,
+        description=description if description is not None else (summary or None),
+        idempotent=idempotent,
+        cache_ttl_s=cache_ttl_s,
+    )
+
+
+def tool(
+    fn: Optional[Callable[..., Any]] = None,
+    *,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    idempotent: bool = False,
+    cache_ttl_s: Optional[float] = None,
+) -> Any:
+    """
+    Decorator that derives a ToolSpec once, at definition time, and stores
+    it on the function as `tool_spec`. The function itself is unchanged.
+
+        @tool
+        def get_weather(city: str) -> dict: ...
+
+        @tool(idempotent=True, cache_ttl_s=60)
+        def lookup(customer_id: str) -> dict: ...
+    """
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        func.tool_spec = tool_spec_from_function(  # type: ignore[attr-defined]
+            func,
+            name=name,
+            description=description,
+            idempotent=idempotent,
+            cache_ttl_s=cache_ttl_s,
+        )
+        return func
+
+    if fn is not None:
+        return decorate(fn)
+    return decorate
+
+
+def _type_to_schema(
+    annotation: Any, fn_name: str, param_name: str, defs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    JSON Schema of one annotation. $defs of pydantic models are moved into
+    defs (the tool's root $defs), where their "#/$defs/..." refs resolve.
+    """
+    if annotation is Any or annotation is inspect.Parameter.empty:
+        return {}
+    if annotation in _PRIMITIVE_TYPES:
+        return {"type": _PRIMITIVE_TYPES[annotation]}
+    if inspect.isclass(annotation) and issubclass(annotation, enum.Enum):
+        return {"enum": [member.value for member in annotation]}
+    if hasattr(annotation, "model_json_schema"):
+        schema = dict(annotation.model_json_schema())
+        for def_name, definition in schema.pop("$defs", {}).items():
+            if defs.setdefault(def_name, definition) != definition:
+                raise InvalidToolSchemaError(
+                    detail=(
+                        f"Models used by {fn_name!r} define different schemas "
+                        f"named {def_name!r}"
+                    )
+                )
+        return schema
+    if annotation in (list, tuple, set):
+        return {"type": "array"}
+    if annotation is dict:
+        return {"type": "object"}
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Literal:
+        return {"enum": list(args)}
+    if origin is Union or _is_union_type(origin):
+        non_null = [a for a in args if a is not type(None)]
+        if len(non_null) == 1:
+            return _type_to_schema(non_null[0], fn_name, param_name, defs)
+        return {"anyOf": [_type_to_schema(a, fn_name, param_name, defs) for a in non_null]}
+    if origin in (list, set):
+        items = _type_to_schema(args[0], fn_name, param_name, defs) if args else {}
+        return {"type": "array", "items": items} if items else {"type": "array"}
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return {"type": "array", "items": _type_to_schema(args[0], fn_name, param_name, defs)}
+        return {"type": "array", "minItems": len(args), "maxItems": len(args)}
+    if origin is dict:
+        schema: Dict[str, Any] = {"type": "object"}
+        if len(args) == 2 and args[1] is not Any:
+            schema["additionalProperties"] = _type_to_schema(args[1], fn_name, param_name, defs)
+        return schema
+    raise InvalidToolSchemaError(
+        detail=(
+            f"Unsupported type {annotation!r} for parameter {param_name!r} "
+            f"of {fn_name!r}"
+        )
+    )
+
+
+def _is_union_type(origin: Any) -> bool:
+    union_type = getattr(types, "UnionType", None)
+    return union_type is not None and origin is union_type
+
+
+def _is_json_value(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool, list, dict))
+
+
+def _parse_docstring(doc: str) -> Tuple[str, Dict[str, str]]:
+    lines = doc.splitlines()
+    summary_lines: List[str] = []
+    for line in lines:
+        if not line.strip() or _ARGS_SECTION_RE.match(line) or _SPHINX_PARAM_RE.match(line):
+            break
+        summary_lines.append(line.strip())
+    params: Dict[str, str] = {}
+    in_args = False
+    current: Optional[str] = None
+    for line in lines:
+        sphinx = _SPHINX_PARAM_RE.match(line)
+        if sphinx:
+            current = sphinx.group(1)
+            params[current] = sphinx.group(2).strip()
+            in_args = False
+            continue
+        if _ARGS_SECTION_RE.match(line):
+            in_args = True
+            current = None
+            continue
+        if not in_args:
+            continue
+        if not line.strip():
+            continue
+        if _SECTION_RE.match(line) and not line.startswith((" ", "\t")):
+            in_args = False
+            continue
+        google = _GOOGLE_PARAM_RE.match(line)
+        if google and (current is None or _indent(line) <= _indent_of(lines, current)):
+            current = google.group(1).lstrip("*")
+            params[current] = google.group(2).strip()
+        elif current is not None:
+            params[current] = f"{params[current]} {line.strip()}".strip()
+    return " ".join(summary_lines), params
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def _indent_of(lines: List[str], param: str) -> int:
+    for line in lines:
+        match = _GOOGLE_PARAM_RE.match(line)
+        if match and match.group(1).lstrip("*") == param:
+            return _indent(line)
+    return 0
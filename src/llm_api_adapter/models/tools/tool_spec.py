@@ -10,7 +10,12 @@ class ToolSpec:
     Provider-agnostic tool/function specification.
 
     json_schema: JSON Schema object (dict). Validation is performed in adapters.
+    idempotent: the tool returns the same result for the same arguments, so
+        chat_with_tools() may serve repeated calls from a ToolResultCache.
+    cache_ttl_s: lifetime of cached results; None uses the cache default.
     """
     name: str
     json_schema: Dict[str, Any]
     description: Optional[str] = None
+    idempotent: bool = False
+    cache_ttl_s: Optional[float] = None
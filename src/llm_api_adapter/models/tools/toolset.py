@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from ...errors.llm_api_error import InvalidToolSchemaError
+from .tool_spec import ToolSpec
+
+
+@dataclass(frozen=True)
+class Toolset:
+    """
+    Immutable collection of tools that can be passed as `tools=` to chat().
+
+    Adapters validate a Toolset only once and cache the provider-specific
+    tool payloads on it, so reusing the same Toolset across calls avoids
+    re-validating and re-mapping every tool on each request. Tool schemas
+    must not be mutated after the Toolset is created.
+
+    handlers maps tool names to callables for chat_with_tools(); it is
+    filled automatically by from_functions().
+    """
+    tools: Tuple[ToolSpec, ...]
+    handlers: Mapping[str, Callable[..., Any]] = field(default_factory=dict)
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
+    _payloads: Dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tools", tuple(self.tools))
+        object.__setattr__(self, "handlers", dict(self.handlers))
+
+    @classmethod
+    def from_functions(cls, *functions: Callable[..., Any]) -> "Toolset":
+        """Build a Toolset from functions decorated with @tool."""
+        tools: List[ToolSpec] = []
+        handlers: Dict[str, Callable[..., Any]] = {}
+        for fn in functions:
+            spec = getattr(fn, "tool_spec", None)
+            if not isinstance(spec, ToolSpec):
+                raise InvalidToolSchemaError(
+                    detail=f"{getattr(fn, '__name__', fn)!r} is not decorated with @tool"
+                )
+            tools.append(spec)
+            handlers[spec.name] = fn
+        return cls(tools=tuple(tools), handlers=handlers)
+
+    @property
+    def is_validated(self) -> bool:
+        return self._validated
+
+    def mark_validated(self) -> None:
+        object.__setattr__(self, "_validated", True)
+
+    def payload(self, key: str, build: Callable[[Sequence[ToolSpec]], Any]) -> Any:
+        """Return the cached provider payload for key, building it on first use."""
+        if key not in self._payloads:
+            self._payloads[key] = build(self.tools)
+        return self._payloads[key]
+
+    def __iter__(self) -> Iterator[ToolSpec]:
+        return iter(self.tools)
+
+    def __len__(self) -> int:
+        return len(self.tools)
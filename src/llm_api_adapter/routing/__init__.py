@@ -0,0 +1,7 @@
+from .health import TargetHealth
+from .hedging import HedgingPolicy
+from .key_pool import KeyPool
+from .routed_adapter import RoutedAdapter, RouteTarget
+from .single_flight import SingleFlight
+
+__all__ = ["HedgingPolicy", "KeyPool", "RoutedAdapter", "RouteTarget", "SingleFlight", "TargetHealth"]
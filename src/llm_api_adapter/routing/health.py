@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Deque, Dict, Optional, Tuple
+
+
+@dataclass
+class TargetHealth:
+    """
+    Rolling health of one routing target.
+
+    Outcomes of the last window_s seconds give the error rate; latency is an
+    exponentially weighted moving average of successful calls. A target is
+    degraded while its error rate is at least error_threshold (with at least
+    min_samples outcomes in the window) and for cooldown_s seconds after any
+    failure, so a failing provider is routed around immediately and retried
+    once it recovers.
+    """
+    window_s: float = 30.0
+    error_threshold: float = 0.5
+    min_samples: int = 3
+    cooldown_s: float = 5.0
+    latency_alpha: float = 0.3
+    latency_s: Optional[float] = None
+    _outcomes: Deque[Tuple[float, bool]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    _cooldown_until: float = field(default=0.0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def record_success(self, latency_s: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._outcomes.append((now, True))
+            self._trim(now)
+            if self.latency_s is None:
+                self.latency_s = latency_s
+            else:
+                self.latency_s += self.latency_alpha * (latency_s - self.latency_s)
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._outcomes.append((now, False))
+            self._trim(now)
+            self._cooldown_until = now + self.cooldown_s
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            self._trim(time.monotonic())
+            if not self._outcomes:
+                return 0.0
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return failures / len(self._outcomes)
+
+    @property
+    def is_degraded(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now < self._cooldown_until:
+                return True
+            self._trim(now)
+            if len(self._outcomes) < self.min_samples:
+                return False
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return failures / len(self._outcomes) >= self.error_threshold
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "error_rate": self.error_rate,
+            "latency_s": self.latency_s,
+            "degraded": self.is_degraded,
+            "samples": len(self._outcomes),
+        }
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self.window_s
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
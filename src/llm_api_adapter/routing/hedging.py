@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..models.responses.chat_response import ChatResponse, HedgeInfo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgingPolicy:
+    """
+    Opt-in hedged requests for chat().
+
+    If the first attempt has not answered after delay_s(), a duplicate is
+    sent (to alternate when given, otherwise to the same model) and the
+    first successful response wins. The delay is the given percentile of
+    recently observed latencies, bounded by min_delay_s/max_delay_s, and
+    initial_delay_s until min_samples latencies have been seen.
+
+    A blocking HTTP call cannot be interrupted, so the losing attempt is
+    abandoned: its result is discarded and, when it completes, its cost is
+    added to the winner's hedge.extra_cost and to extra_cost_total.
+    The policy keeps state across calls; reuse one instance per workload.
+    """
+    percentile: float = 95.0
+    initial_delay_s: float = 1.0
+    min_delay_s: float = 0.0
+    max_delay_s: Optional[float] = None
+    min_samples: int = 20
+    window: int = 500
+    alternate: Optional[Any] = None
+    hedged_calls: int = field(default=0, init=False)
+    hedge_wins: int = field(default=0, init=False)
+    extra_cost_total: float = field(default=0.0, init=False)
+    _latencies: Deque[float] = field(default_factory=deque, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile <= 100:
+            raise ValueError("percentile must be in (0, 100]")
+        if self.initial_delay_s < 0 or self.min_delay_s < 0:
+            raise ValueError("delays must be >= 0")
+        self._latencies = deque(maxlen=self.window)
+
+    def delay_s(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            delay = self.initial_delay_s
+        else:
+            rank = max(0, math.ceil(self.percentile / 100 * len(samples)) - 1)
+            delay = samples[rank]
+        delay = max(delay, self.min_delay_s)
+        if self.max_delay_s is not None:
+            delay = min(delay, self.max_delay_s)
+        return delay
+
+    def record_latency(self, latency_s: float) -> None:
+        with self._lock:
+            self._latencies.append(latency_s)
+
+    def run(
+        self,
+        primary: Callable[..., ChatResponse],
+        kwargs: Dict[str, Any],
+        alternate: Optional[Callable[..., ChatResponse]] = None,
+    ) -> ChatResponse:
+        """Call primary(**kwargs), hedging with alternate (or primary) after delay_s()."""
+        if kwargs.get("on_stream") is not None:
+            raise ValueError("hedged requests cannot be streamed")
+        if alternate is None and self.alternate is not None:
+            alternate = self.alternate.chat
+        race = _HedgeRace(policy=self, delay_s=self.delay_s())
+        race.launch(primary, kwargs)
+        if not race.done.wait(race.delay_s):
+            if race.launch(alternate or primary, kwargs):
+                with self._lock:
+                    self.hedged_calls += 1
+                logger.info("No response after %.3fs, sending hedged request", race.delay_s)
+        race.done.wait()
+        return race.result()
+
+    def _add_extra_cost(self, cost: float) -> None:
+        with self._lock:
+            self.extra_cost_total += cost
+
+
+@dataclass
+class _HedgeRace:
+    policy: HedgingPolicy
+    delay_s: float
+    done: threading.Event = field(default_factory=threading.Event)
+    info: Optional[HedgeInfo] = None
+    winner: Optional[ChatResponse] = None
+    errors: List[BaseException] = field(default_factory=list)
+    launched: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def launch(self, chat: Callable[..., ChatResponse], kwargs: Dict[str, Any]) -> bool:
+        with self._lock:
+            if self.done.is_set():
+                return False
+            index = self.launched
+            self.launched += 1
+        threading.Thread(
+            target=self._attempt, args=(index, chat, kwargs), daemon=True
+        ).start()
+        return True
+
+    def _attempt(self, index: int, chat: Callable[..., ChatResponse], kwargs: Dict[str, Any]) -> None:
+        started = time.monotonic()
+        try:
+            response = chat(**kwargs)
+        except BaseException as e:
+            with self._lock:
+                self.errors.append(e)
+                if self.winner is None and len(self.errors) == self.launched:
+                    self.done.set()
+            return
+        self.policy.record_latency(time.monotonic() - started)
+        with self._lock:
+            if self.winner is None:
+                self.winner = response
+                self.info = HedgeInfo(
+                    winner=index, attempts=self.launched, delay_s=self.delay_s
+                )
+                self.done.set()
+                return
+            info = self.info
+        # A late loser: its tokens were still paid for.
+        cost = response.cost_total or 0.0
+        if cost:
+            with self._lock:
+                info.extra_cost += cost
+            self.policy._add_extra_cost(cost)
+
+    def result(self) -> ChatResponse:
+        with self._lock:
+            if self.winner is None:
+                raise self.errors[0]
+            if self.info.winner > 0:
+                with self.policy._lock:
+                    self.policy.hedge_wins += 1
+            self.info.attempts = self.launched
+            self.winner.hedge = self.info
+            return self.winner
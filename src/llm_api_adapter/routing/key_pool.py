@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..errors.llm_api_error import LLMAPIAuthorizationError, LLMAPIRateLimitError
+from ..llms.rate_limits import RATE_LIMITS
+from ..models.responses.chat_response import ChatResponse
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("round_robin", "least_loaded", "quota")
+
+
+@dataclass
+class KeyStats:
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_total: float = 0.0
+    benched_until: Optional[float] = None
+    bench_reason: Optional[str] = None
+
+
+@dataclass
+class KeyPool:
+    """
+    Spreads requests for one provider over several API keys.
+
+    strategy picks the key for each call:
+    - "round_robin": keys in turn;
+    - "least_loaded": fewest requests in flight;
+    - "quota": most remaining requests according to the provider's
+      rate-limit headers (keys without fresh headers are tried first).
+
+    A key that gets HTTP 429 is benched for the Retry-After time or
+    rate_limit_bench_s; a key that gets 401/403 is benched for auth_bench_s
+    (None: until reinstate()). The call is then retried on another key.
+    Usage and cost are tracked per key, see stats().
+    """
+    keys: Sequence[str]
+    strategy: str = "round_robin"
+    rate_limit_bench_s: float = 30.0
+    auth_bench_s: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}")
+        self.keys = list(dict.fromkeys(self.keys))
+        if not self.keys or not all(isinstance(k, str) and k for k in self.keys):
+            raise ValueError("keys must be a non-empty list of API keys")
+        self._stats = {key: KeyStats() for key in self.keys}
+        self._next = 0
+        self._lock = threading.Lock()
+        for key in self.keys:
+            RATE_LIMITS.watch(key)
+
+    def __repr__(self) -> str:
+        return f"KeyPool(keys={self._labels()}, strategy='{self.strategy}')"
+
+    def run(self, call: Callable[[str], ChatResponse]) -> ChatResponse:
+        """
+        Calls call(api_key) with a selected key, retrying on the next
+        available key when the provider rejects a key with 401/403/429.
+        """
+        tried: List[str] = []
+        while True:
+            key = self.acquire(exclude=tried)
+            tried.append(key)
+            try:
+                response = call(key)
+            except (LLMAPIRateLimitError, LLMAPIAuthorizationError) as e:
+                self.release(key, error=e)
+                if not self._has_available(tried):
+                    raise
+                continue
+            except Exception as e:
+                self.release(key, error=e)
+                raise
+            self.release(key, response=response)
+            return response
+
+    def acquire(self, exclude: Sequence[str] = ()) -> str:
+        """Selects a key and counts it as in flight; pair with release()."""
+        with self._lock:
+            now = time.monotonic()
+            available = [
+                key for key in self.keys
+                if key not in exclude and not self._is_benched(key, now)
+            ]
+            if not available:
+                wait = self._next_available_in(now)
+                error_message = "All API keys in the pool are benched"
+                if wait is not None:
+                    error_message += f"; next key available in {wait:.1f}s"
+                logger.error(error_message)
+                raise LLMAPIRateLimitError(detail=error_message)
+            key = self._select(available, now)
+            self._stats[key].in_flight += 1
+            return key
+
+    def release(
+        self,
+        key: str,
+        response: Optional[ChatResponse] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            stats = self._stats[key]
+            stats.in_flight -= 1
+            stats.requests += 1
+            if error is not None:
+                stats.errors += 1
+                self._bench_on(key, error)
+                return
+            if response is not None and response.usage is not None:
+                stats.input_tokens += response.usage.input_tokens
+                stats.output_tokens += response.usage.output_tokens
+            if response is not None and response.cost_total:
+                stats.cost_total += response.cost_total
+
+    def reinstate(self, key: str) -> None:
+        with self._lock:
+            self._stats[key].benched_until = None
+            self._stats[key].bench_reason = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests, errors, tokens, cost and bench state per (masked) key."""
+        now = time.monotonic()
+        result: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for key, label in zip(self.keys, self._labels()):
+                stats = self._stats[key]
+                benched = self._is_benched(key, now)
+                rate_limit = RATE_LIMITS.get(key)
+                result[label] = {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "in_flight": stats.in_flight,
+                    "input_tokens": stats.input_tokens,
+                    "output_tokens": stats.output_tokens,
+                    "cost_total": stats.cost_total,
+                    "benched": benched,
+                    "bench_reason": stats.bench_reason if benched else None,
+                    "remaining_requests": (
+                        rate_limit.remaining_requests if rate_limit else None
+                    ),
+                }
+        return result
+
+    def _labels(self) -> List[str]:
+        return [_mask(key, index) for index, key in enumerate(self.keys)]
+
+    def _select(self, available: List[str], now: float) -> str:
+        if self.strategy == "least_loaded":
+            key = min(available, key=lambda k: (self._stats[k].in_flight, self._order(k)))
+        elif self.strategy == "quota":
+            key = max(available, key=lambda k: (self._quota(k, now), -self._order(k)))
+        else:
+            key = min(available, key=self._order)
+        self._next = (self.keys.index(key) + 1) % len(self.keys)
+        return key
+
+    def _order(self, key: str) -> int:
+        """Position of key in round-robin order starting at the next key."""
+        return (self.keys.index(key) - self._next) % len(self.keys)
+
+    def _quota(self, key: str, now: float) -> float:
+        state = RATE_LIMITS.get(key)
+        if state is None or state.remaining_requests is None or not state.is_current(now):
+            return float("inf")
+        return state.remaining_requests - self._stats[key].in_flight
+
+    def _is_benched(self, key: str, now: float) -> bool:
+        stats = self._stats[key]
+        if stats.bench_reason is None:
+            return False
+        return stats.benched_until is None or now < stats.benched_until
+
+    def _next_available_in(self, now: float) -> Optional[float]:
+        until = [
+            self._stats[key].benched_until for key in self.keys
+            if self._stats[key].benched_until is not None
+        ]
+        return max(0.0, min(until) - now) if until else None
+
+    def _has_available(self, exclude: Sequence[str]) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            return any(
+                key not in exclude and not self._is_benched(key, now)
+                for key in self.keys
+            )
+
+    def _bench_on(self, key: str, error: BaseException) -> None:
+        if isinstance(error, LLMAPIRateLimitError):
+            state = RATE_LIMITS.get(key)
+            duration: Optional[float] = self.rate_limit_bench_s
+            if state is not None and state.retry_after_s is not None:
+                duration = state.retry_after_s
+            reason = "rate_limit"
+        elif isinstance(error, LLMAPIAuthorizationError):
+            duration = self.auth_bench_s
+            reason = "authorization"
+        else:
+            return
+        stats = self._stats[key]
+        stats.bench_reason = reason
+        stats.benched_until = None if duration is None else time.monotonic() + duration
+        logger.warning(
+            "Benching API key %s (%s) for %s",
+            _mask(key, self.keys.index(key)), reason, "good" if duration is None else f"{duration:.1f}s",
+        )
+
+
+def _mask(key: str, index: int) -> str:
+    return f"{key[:8]}...{key[-4:]}" if len(key) > 12 else f"key-{index}"
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from ..errors.llm_api_error import (
+    LLMAPIRateLimitError,
+    LLMAPIServerError,
+    LLMAPITimeoutError,
+)
+from ..models.responses.chat_response import ChatResponse, RouteInfo
+from ..models.responses.chat_stream import ChatStream, StreamEvent
+from ..tool_loop import ToolResultCache, run_tool_loop
+from ..utils.deadline import resolve_deadline
+from ..universal_adapter import UniversalLLMAPIAdapter
+from .health import TargetHealth
+from .hedging import HedgingPolicy
+from .key_pool import KeyPool
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAILOVER_ERRORS: Tuple[Type[Exception], ...] = (
+    LLMAPIServerError,
+    LLMAPIRateLimitError,
+    LLMAPITimeoutError,
+)
+
+
+@dataclass
+class RouteTarget:
+    organization: str
+    model: str
+    api_key: Optional[Union[str, KeyPool]] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.organization}:{self.model}"
+
+
+@dataclass
+class RoutedAdapter:
+    """
+    Sends chat() to the first healthy target of an ordered list and fails
+    over to the next one on server, rate-limit and timeout errors.
+
+    targets are RouteTarget instances or (organization, model[, api_key])
+    tuples; api_keys supplies the key per organization when a target has
+    none. A key may also be a KeyPool shared by the targets that use it.
+    Messages, tools and schemas are provider-neutral, so the same
+    arguments are sent to every target. Each target keeps a TargetHealth:
+    degraded targets are tried last, so traffic moves away from a failing
+    provider right after its first failure and returns after cooldown_s.
+    With strategy="latency" healthy targets are ordered by their average
+    latency instead of list order.
+    """
+    targets: Sequence[Any]
+    api_keys: Dict[str, Union[str, KeyPool]] = field(default_factory=dict)
+    strategy: str = "priority"
+    failover_on: Tuple[Type[Exception], ...] = DEFAULT_FAILOVER_ERRORS
+    window_s: float = 30.0
+    error_threshold: float = 0.5
+    cooldown_s: float = 5.0
+    single_flight: Optional[SingleFlight] = None
+
+    def __post_init__(self) -> None:
+        if self.strategy not in ("priority", "latency"):
+            raise ValueError("strategy must be 'priority' or 'latency'")
+        self.targets = [self._to_target(target) for target in self.targets]
+        if not self.targets:
+            raise ValueError("targets must not be empty")
+        self._adapters = [self._make_adapter(target) for target in self.targets]
+        self._health = [
+            TargetHealth(
+                window_s=self.window_s,
+                error_threshold=self.error_threshold,
+                cooldown_s=self.cooldown_s,
+            )
+            for _ in self.targets
+        ]
+
+    def __repr__(self) -> str:
+        labels = [target.label for target in self.targets]
+        return f"RoutedAdapter(targets={labels}, strategy='{self.strategy}')"
+
+    def chat(self, hedge: Optional[HedgingPolicy] = None, **kwargs: Any) -> ChatResponse:
+        """
+        Routes one chat() call. With hedge, a slow call is duplicated on the
+        next target in route order (same target when there is only one).
+        With single_flight, identical concurrent calls share one request.
+        deadline_s bounds the whole call, including failover and hedges.
+        """
+        kwargs = resolve_deadline(kwargs)
+        if self.single_flight is None:
+            return self._chat_once(hedge, kwargs)
+
+        def chat(**call_kwargs: Any) -> ChatResponse:
+            return self._chat_once(hedge, call_kwargs)
+
+        scope = "routed:" + ",".join(target.label for target in self.targets)
+        return self.single_flight.run(scope, chat, kwargs)
+
+    def _chat_once(self, hedge: Optional[HedgingPolicy], kwargs: Dict[str, Any]) -> ChatResponse:
+        order = self._route_order()
+        if hedge is None:
+            return self._chat_routed(order, kwargs)
+        rotated = order[1:] + order[:1]
+
+        def primary(**call_kwargs: Any) -> ChatResponse:
+            return self._chat_routed(order, call_kwargs)
+
+        def alternate(**call_kwargs: Any) -> ChatResponse:
+            return self._chat_routed(rotated, call_kwargs)
+
+        return hedge.run(primary, kwargs, alternate=alternate)
+
+    def _chat_routed(self, order: List[int], kwargs: Dict[str, Any]) -> ChatResponse:
+        previous = kwargs.get("previous_response")
+        on_stream = kwargs.get("on_stream")
+        errors: List[str] = []
+        last_error: Optional[Exception] = None
+        for attempt, index in enumerate(order, start=1):
+            target = self.targets[index]
+            call_kwargs = dict(kwargs)
+            if previous is not None and not self._served_by(previous, target):
+                call_kwargs["previous_response"] = None
+            streamed: List[bool] = []
+            if on_stream is not None:
+                call_kwargs["on_stream"] = self._track_stream(on_stream, streamed)
+            started = time.monotonic()
+            try:
+                response = self._adapters[index].chat(**call_kwargs)
+            except self.failover_on as e:
+                if getattr(e, "phase", None) == "deadline":
+                    # The caller's budget is spent; other targets would fail the same way.
+                    raise
+                self._health[index].record_failure()
+                errors.append(f"{target.label}: {e}")
+                logger.warning("Target %s failed, failing over: %s", target.label, e)
+                if streamed:
+                    # Events already reached the caller; a retry would duplicate them.
+                    raise
+                last_error = e
+                continue
+            self._health[index].record_success(time.monotonic() - started)
+            response.route = RouteInfo(
+                organization=target.organization,
+                model=target.model,
+                attempts=attempt,
+                errors=errors,
+            )
+            return response
+        logger.error("All routing targets failed: %s", errors)
+        raise last_error
+
+    def chat_with_tools(
+        self,
+        messages: Any,
+        tools: Any,
+        handlers: Optional[Dict[str, Callable[..., Any]]] = None,
+        max_steps: int = 10,
+        max_parallel: int = 8,
+        deadline_s: Optional[float] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+        **kwargs: Any,
+    ) -> ChatResponse:
+        """Tool loop over chat(); each step is routed independently."""
+        return run_tool_loop(
+            self.chat,
+            messages,
+            tools,
+            handlers=handlers,
+            max_steps=max_steps,
+            max_parallel=max_parallel,
+            deadline_s=deadline_s,
+            tool_cache=tool_cache,
+            **kwargs,
+        )
+
+    def chat_stream(self, **kwargs: Any) -> ChatStream:
+        return ChatStream(self.chat, **kwargs)
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Error rate, average latency and degraded flag per target."""
+        return {
+            target.label: health.snapshot()
+            for target, health in zip(self.targets, self._health)
+        }
+
+    def _route_order(self) -> List[int]:
+        def key(index: int) -> Tuple[bool, float, int]:
+            health = self._health[index]
+            latency = 0.0
+            if self.strategy == "latency" and health.latency_s is not None:
+                latency = health.latency_s
+            return health.is_degraded, latency, index
+
+        return sorted(range(len(self.targets)), key=key)
+
+    def _make_adapter(self, target: RouteTarget) -> UniversalLLMAPIAdapter:
+        key = target.api_key or self.api_keys.get(target.organization, "")
+        if isinstance(key, KeyPool):
+            return UniversalLLMAPIAdapter(
+                organization=target.organization, model=target.model, key_pool=key
+            )
+        return UniversalLLMAPIAdapter(
+            organization=target.organization, model=target.model, api_key=key
+        )
+
+    def _to_target(self, target: Any) -> RouteTarget:
+        if isinstance(target, RouteTarget):
+            return target
+        if isinstance(target, (tuple, list)) and len(target) in (2, 3):
+            return RouteTarget(*target)
+        raise ValueError(
+            "targets must be RouteTarget or (organization, model[, api_key]) tuples"
+        )
+
+    def _served_by(self, response: ChatResponse, target: RouteTarget) -> bool:
+        route = getattr(response, "route", None)
+        if route is None:
+            return True
+        return (route.organization, route.model) == (target.organization, target.model)
+
+    def _track_stream(
+        self, on_stream: Callable[[StreamEvent], None], streamed: List[bool]
+    ) -> Callable[[StreamEvent], None]:
+        def forward(event: StreamEvent) -> None:
+            if not streamed:
+                streamed.append(True)
+            on_stream(event)
+
+        return forward
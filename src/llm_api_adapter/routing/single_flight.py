@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from ..models.responses.chat_response import ChatResponse
+from ..utils.canonical import canonical_hash
+
+logger = logging.getLogger(__name__)
+
+
+# Per-call limits that do not change the request itself.
+_NOT_KEYED = ("deadline", "deadline_s", "timeout_s", "connect_timeout_s")
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    response: Optional[ChatResponse] = None
+    error: Optional[BaseException] = None
+    waiters: int = 0
+
+
+@dataclass
+class SingleFlight:
+    """
+    Opt-in coalescing of identical concurrent chat() calls.
+
+    Calls are keyed on the target (organization and model) and the
+    canonical JSON of their arguments. While a call is in flight, identical
+    calls wait for it instead of sending their own request, and all of them
+    get its result or its error. Each waiter receives a shallow copy of the
+    response; usage and cost are those of the single upstream request.
+    Nothing is kept once the call completes, so this is not a cache.
+    Streamed calls and calls with arguments that cannot be serialized
+    (e.g. callables) are never coalesced. Timeouts and deadlines are not
+    part of the key; a waiter gives up when its own deadline expires.
+    Share one instance between adapters to coalesce across them.
+    """
+    calls: int = field(default=0, init=False)
+    upstream_calls: int = field(default=0, init=False)
+    coalesced_calls: int = field(default=0, init=False)
+    _flights: Dict[str, _Flight] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def make_key(self, scope: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Key for a chat() call, or None when it must not be coalesced."""
+        if kwargs.get("on_stream") is not None:
+            return None
+        call = {k: v for k, v in kwargs.items() if k not in _NOT_KEYED}
+        previous = call.get("previous_response")
+        if previous is not None:
+            if previous.response_id is None:
+                return None
+            call["previous_response"] = previous.response_id
+        try:
+            return canonical_hash([scope, call])
+        except (TypeError, ValueError):
+            return None
+
+    def run(self, scope: str, chat: Callable[..., ChatResponse], kwargs: Dict[str, Any]) -> ChatResponse:
+        """Calls chat(**kwargs), or joins an identical call already in flight."""
+        key = self.make_key(scope, kwargs)
+        if key is None:
+            with self._lock:
+                self.calls += 1
+                self.upstream_calls += 1
+            return chat(**kwargs)
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.upstream_calls += 1
+                leader = True
+            else:
+                flight.waiters += 1
+                self.coalesced_calls += 1
+                leader = False
+        if not leader:
+            logger.debug("Coalescing chat() call with one in flight")
+            deadline = kwargs.get("deadline")
+            while not flight.done.wait(deadline.remaining() if deadline is not None else None):
+                deadline.check()
+            if flight.error is not None:
+                raise flight.error
+            return copy.copy(flight.response)
+        try:
+            flight.response = chat(**kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        if flight.waiters:
+            # Hand the caller its own copy too, so waiters never share state with it.
+            return copy.copy(flight.response)
+        return flight.response
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "upstream_calls": self.upstream_calls,
+                "coalesced_calls": self.coalesced_calls,
+                "in_flight": len(self._flights),
+            }
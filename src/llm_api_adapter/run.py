@@ -0,0 +1,98 @@
+"""
+Runs a JSONL file of chat requests against one model:
+
+    python -m llm_api_adapter.run input.jsonl --org anthropic \\
+        --model claude-haiku-4-5 --concurrency 64
+
+Each input line is a Chat Completions request body (or an OpenAI Batch
+API line with custom_id and body). Results and errors are appended to
+--output (default: input.out.jsonl) as they complete; rerunning the same
+command resumes from the checkpoint. A summary is printed as JSON.
+--processes shards the rows over worker processes, each with its own
+adapter, when one core cannot keep up with request building and parsing.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from .batch import AdapterChat, BatchRunner, RowProcessor
+from .gateway.__main__ import KEY_ENV
+from .gateway.mock import mock_adapter_factory
+from .gateway.server import DEFAULT_ANTHROPIC_MAX_TOKENS
+from .limits import RateLimiter, SQLiteStateStore
+
+
+def default_output_path(input_path: str) -> str:
+    root, _ = os.path.splitext(input_path)
+    return root + ".out.jsonl"
+
+
+def api_keys(organization: str, api_key: Optional[str] = None) -> List[str]:
+    """--api-key or the provider's environment variable; commas separate several keys."""
+    value = api_key or next(
+        (os.environ[name] for name in KEY_ENV.get(organization, ()) if os.environ.get(name)), ""
+    )
+    return [key.strip() for key in value.split(",") if key.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m llm_api_adapter.run")
+    parser.add_argument("input", help="JSONL file, one request per line")
+    parser.add_argument("--org", required=True, help="provider organization, e.g. openai")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--output", help="results JSONL (default: <input>.out.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight in total")
+    parser.add_argument("--processes", type=int, default=0, help="worker processes (0 = threads only)")
+    parser.add_argument("--api-key", help="defaults to the provider's environment variable")
+    parser.add_argument("--max-tokens", type=int, default=None, help="default for rows without one")
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--requests-per-minute", type=float, default=None)
+    parser.add_argument("--tokens-per-minute", type=float, default=None)
+    parser.add_argument(
+        "--state-db", help="SQLite file for the rate limits, shareable between jobs "
+        "(default: <output>.state.db)",
+    )
+    parser.add_argument("--checkpoint-every", type=int, default=100)
+    parser.add_argument("--restart", action="store_true", help="ignore and overwrite previous output")
+    parser.add_argument("--mock-latency-s", type=float, default=None, help="answer from MockAdapter")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+
+    output = args.output or default_output_path(args.input)
+    if args.mock_latency_s is not None:
+        chat = AdapterChat(args.org, args.model, adapter_factory=mock_adapter_factory(args.mock_latency_s))
+    else:
+        keys = api_keys(args.org, args.api_key)
+        if not keys:
+            parser.error(f"no API key for {args.org!r}; pass --api-key or set it in the environment")
+        rate_limiter = None
+        if args.requests_per_minute or args.tokens_per_minute:
+            rate_limiter = RateLimiter(
+                name=f"{args.org}:{args.model}",
+                requests_per_minute=args.requests_per_minute,
+                tokens_per_minute=args.tokens_per_minute,
+                store=SQLiteStateStore(args.state_db or output + ".state.db"),
+            )
+        chat = AdapterChat(args.org, args.model, api_keys=keys, rate_limiter=rate_limiter)
+    defaults: Dict[str, Any] = {}
+    if args.max_tokens is not None:
+        defaults["max_tokens"] = args.max_tokens
+    elif args.org == "anthropic":
+        defaults["max_tokens"] = DEFAULT_ANTHROPIC_MAX_TOKENS
+    runner = BatchRunner(
+        process=RowProcessor(chat, defaults=defaults, retries=args.retries),
+        concurrency=args.concurrency,
+        checkpoint_every=args.checkpoint_every,
+        processes=args.processes,
+    )
+    summary = runner.run(args.input, output, resume=not args.restart)
+    print(json.dumps({"output": output, **summary.to_dict()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+from .cost_estimate import CostEstimate
+from .image_tokens import IMAGE_TOKEN_FORMULAS
+from .token_counter import TOKEN_ESTIMATOR, TokenCount, TokenEstimator, estimate_text_tokens
+
+__all__ = [
+    "CostEstimate",
+    "IMAGE_TOKEN_FORMULAS",
+    "TOKEN_ESTIMATOR",
+    "TokenCount",
+    "TokenEstimator",
+    "estimate_text_tokens",
+]
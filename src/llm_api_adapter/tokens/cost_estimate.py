@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from ..llm_registry.llm_registry import Pricing
+
+
+@dataclass
+class CostEstimate:
+    """
+    Worst-case cost of a request before it is sent: estimated input tokens
+    at the input price plus max_output_tokens at the output price. Costs
+    are None when the model has no pricing.
+    """
+    input_tokens: int
+    max_output_tokens: int
+    currency: Optional[str] = None
+    cost_input: Optional[float] = None
+    cost_output: Optional[float] = None
+    cost_total: Optional[float] = None
+
+    @classmethod
+    def from_pricing(
+        cls, input_tokens: int, max_output_tokens: int, pricing: Optional[Pricing]
+    ) -> "CostEstimate":
+        if pricing is None:
+            return cls(input_tokens=input_tokens, max_output_tokens=max_output_tokens)
+        cost_input = input_tokens * pricing.in_per_token
+        cost_output = max_output_tokens * pricing.out_per_token
+        return cls(
+            input_tokens=input_tokens,
+            max_output_tokens=max_output_tokens,
+            currency=pricing.currency,
+            cost_input=cost_input,
+            cost_output=cost_output,
+            cost_total=cost_input + cost_output,
+        )
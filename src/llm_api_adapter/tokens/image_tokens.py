@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import base64
+import math
+import struct
+from typing import Optional, Tuple
+
+from ..models.messages.file_parts import FilePart
+
+# Assumed size of images whose dimensions cannot be read (remote URLs).
+DEFAULT_IMAGE_SIZE = (1024, 1024)
+
+
+def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """(width, height) from a PNG, GIF, WebP or JPEG header; None if unknown."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        return _webp_size(data)
+    if data[:2] == b"\xff\xd8":
+        return _jpeg_size(data)
+    return None
+
+
+def part_image_size(part: FilePart) -> Tuple[int, int]:
+    data = part.data
+    if data is None and part.url and part.url.startswith("data:"):
+        try:
+            data = base64.b64decode(part.url.split(",", 1)[1])
+        except (ValueError, IndexError):
+            data = None
+    return (image_size(data) if data else None) or DEFAULT_IMAGE_SIZE
+
+
+def openai_image_tokens(width: int, height: int, detail: str = "high") -> int:
+    """85 base tokens plus 170 per 512px tile after fitting 2048px and 768px short side."""
+    if detail == "low":
+        return 85
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def anthropic_image_tokens(width: int, height: int) -> int:
+    """width * height / 750 after fitting 1568px long edge and ~1.15 megapixels."""
+    scale = min(1.0, 1568 / max(width, height), math.sqrt(1_150_000 / (width * height)))
+    return math.ceil(width * height * scale * scale / 750)
+
+
+def google_image_tokens(width: int, height: int) -> int:
+    """258 tokens for images up to 384px, otherwise 258 per 768px tile."""
+    if width <= 384 and height <= 384:
+        return 258
+    return 258 * math.ceil(width / 768) * math.ceil(height / 768)
+
+
+IMAGE_TOKEN_FORMULAS = {
+    "openai": openai_image_tokens,
+    "anthropic": anthropic_image_tokens,
+    "google": google_image_tokens,
+}
+
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b"VP8X":
+        width = 1 + int.from_bytes(data[24:27], "little")
+        height = 1 + int.from_bytes(data[27:30], "little")
+        return width, height
+    if chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], "little")
+        return 1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF)
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    return None
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    pos = 2
+    while pos + 9 < len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        # SOF0..SOF15 except DHT (C4), JPG (C8) and DAC (CC) carry the frame size.
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None
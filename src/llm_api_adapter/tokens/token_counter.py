@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import math
+from typing import Any, Iterable, Optional, Tuple
+
+from ..models.messages.chat_message import AIMessage, Message, ToolMessage, UserMessage
+from ..models.messages.file_parts import ImagePart
+from ..models.tools import ToolSpec
+from ..utils.bounded_cache import BoundedCache
+from ..utils.canonical import canonical_hash
+from .image_tokens import IMAGE_TOKEN_FORMULAS, part_image_size
+
+# Approximate framing tokens per message and per request (role markers,
+# reply priming); they are not documented and vary slightly by model.
+MESSAGE_OVERHEAD = {"openai": 3, "anthropic": 3, "google": 2}
+REQUEST_OVERHEAD = {"openai": 3, "anthropic": 4, "google": 0}
+TOOL_OVERHEAD = 8
+
+
+@dataclass
+class TokenCount:
+    """
+    Input size of a request. source is "estimate" for the offline
+    estimator and "remote" for a provider count endpoint; a remote count
+    is a single total, so only input_tokens (and schema_tokens where the
+    schema had to be estimated separately) are filled in.
+    """
+    input_tokens: int = 0
+    message_tokens: int = 0
+    image_tokens: int = 0
+    tool_tokens: int = 0
+    schema_tokens: int = 0
+    source: str = "estimate"
+
+
+def estimate_text_tokens(text: Optional[str]) -> int:
+    """
+    ~4 ASCII characters per token, non-ASCII characters weighted higher
+    (CJK is close to one token per character). Errs on the high side.
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) * 0.75)
+
+
+def estimate_json_tokens(value: Any) -> int:
+    return estimate_text_tokens(
+        json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+    )
+
+
+@dataclass
+class TokenEstimator:
+    """
+    Offline input-token estimator. Per-message results are cached by the
+    message's content hash, so a growing conversation only estimates its
+    new messages.
+    """
+    max_entries: int = 4096
+    _cache: BoundedCache = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._cache = BoundedCache(max_entries=self.max_entries)
+
+    def estimate(
+        self,
+        provider: str,
+        messages: Iterable[Message],
+        tools: Optional[Iterable[ToolSpec]] = None,
+        json_schema: Optional[dict] = None,
+    ) -> TokenCount:
+        count = TokenCount(input_tokens=REQUEST_OVERHEAD.get(provider, 3))
+        for message in messages:
+            text_tokens, image_tokens = self.message_tokens(provider, message)
+            count.message_tokens += text_tokens
+            count.image_tokens += image_tokens
+        for tool in tools or []:
+            count.tool_tokens += TOOL_OVERHEAD + estimate_json_tokens(
+                {"name": tool.name, "description": tool.description, "parameters": tool.json_schema}
+            )
+        if json_schema is not None:
+            count.schema_tokens = estimate_json_tokens(json_schema)
+        count.input_tokens += (
+            count.message_tokens + count.image_tokens + count.tool_tokens + count.schema_tokens
+        )
+        return count
+
+    def message_tokens(self, provider: str, message: Message) -> Tuple[int, int]:
+        """(text tokens including framing, image tokens) for one message."""
+        try:
+            key: Any = (provider, canonical_hash(message))
+        except TypeError:
+            return self._message_tokens(provider, message)
+        return self._cache.get_or_create(key, lambda: self._message_tokens(provider, message))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _message_tokens(self, provider: str, message: Message) -> Tuple[int, int]:
+        text_tokens = MESSAGE_OVERHEAD.get(provider, 3) + estimate_text_tokens(message.content)
+        if isinstance(message, AIMessage) and message.tool_calls:
+            for tool_call in message.tool_calls:
+                text_tokens += TOOL_OVERHEAD + estimate_text_tokens(tool_call.name)
+                text_tokens += estimate_json_tokens(tool_call.arguments)
+        if isinstance(message, ToolMessage):
+            text_tokens += estimate_text_tokens(message.tool_call_id)
+        image_tokens = 0
+        if isinstance(message, UserMessage) and message.files:
+            formula = IMAGE_TOKEN_FORMULAS.get(provider, IMAGE_TOKEN_FORMULAS["openai"])
+            for part in message.files:
+                if isinstance(part, ImagePart):
+                    image_tokens += formula(*part_image_size(part))
+        return text_tokens, image_tokens
+
+
+def request_key(
+    provider: str,
+    model: str,
+    messages: Iterable[Message],
+    tools: Optional[Iterable[ToolSpec]] = None,
+    json_schema: Optional[dict] = None,
+) -> Optional[Tuple[Any, ...]]:
+    """Cache key of a remote count: per-message hashes plus tools and schema."""
+    try:
+        return (
+            provider,
+            model,
+            tuple(canonical_hash(message) for message in messages),
+            canonical_hash(list(tools or [])),
+            canonical_hash(json_schema),
+        )
+    except TypeError:
+        return None
+
+
+TOKEN_ESTIMATOR = TokenEstimator()
+REMOTE_TOKEN_COUNTS = BoundedCache(max_entries=4096)
@@ -0,0 +1,4 @@
+from .tool_cache import ToolResultCache
+from .tool_loop import ToolLoop, run_tool_loop
+
+__all__ = ["ToolLoop", "ToolResultCache", "run_tool_loop"]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..models.tools import ToolSpec
+
+CacheKey = Tuple[str, str]
+
+
+@dataclass
+class ToolResultCache:
+    """
+    Opt-in memoization of tool results for chat_with_tools().
+
+    Only tools marked ToolSpec(idempotent=True) are cached. Entries are keyed
+    on the tool name and the canonical JSON of its arguments, so argument
+    order and whitespace do not matter. ToolSpec.cache_ttl_s overrides
+    default_ttl_s per tool; None means entries never expire. The cache is
+    thread-safe and can be shared across conversations.
+    """
+    max_entries: int = 1024
+    default_ttl_s: Optional[float] = None
+    hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[CacheKey, Tuple[str, Optional[float]]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+    def is_cacheable(self, spec: Optional[ToolSpec]) -> bool:
+        return spec is not None and spec.idempotent
+
+    def make_key(self, name: str, arguments: Dict[str, Any]) -> CacheKey:
+        canonical = json.dumps(
+            arguments,
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return name, canonical
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: CacheKey, value: str, spec: ToolSpec) -> None:
+        ttl_s = spec.cache_ttl_s if spec.cache_ttl_s is not None else self.default_ttl_s
+        expires_at = time.monotonic() + ttl_s if ttl_s is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
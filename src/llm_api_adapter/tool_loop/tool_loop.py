@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+import inspect
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..errors.llm_api_error import LLMAPITimeoutError, ToolLoopError
+from ..models.messages.chat_message import AIMessage, Message, Messages, ToolMessage
+from ..models.responses.chat_response import ChatResponse, ToolLoopInfo, Usage
+from ..models.tools import ToolCall, ToolSpec
+from ..utils.deadline import Deadline
+from .tool_cache import CacheKey, ToolResultCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ToolJob:
+    tool_call: ToolCall
+    indexes: List[int]
+    spec: Optional[ToolSpec] = None
+    key: Optional[CacheKey] = None
+
+
+@dataclass
+class ToolLoop:
+    """
+    Runs the chat -> execute tools -> chat cycle until the model answers
+    without tool calls.
+
+    Tool calls from one turn are independent, so they are executed
+    concurrently: sync handlers in a thread pool, async handlers as tasks
+    on a single event loop. max_steps bounds the number of chat() calls,
+    deadline_s bounds the wall-clock time of the whole loop and is passed
+    to every chat() step as an absolute deadline (combined with one
+    inherited through the deadline keyword). With a cache,
+    repeated calls of idempotent tools are served without running the
+    handler again.
+    """
+    chat: Callable[..., ChatResponse]
+    handlers: Dict[str, Callable[..., Any]]
+    max_steps: int = 10
+    max_parallel: int = 8
+    deadline_s: Optional[float] = None
+    cache: Optional[ToolResultCache] = None
+
+    def __post_init__(self) -> None:
+        if self.max_steps < 1:
+            raise ValueError("max_steps must be >= 1")
+        if self.max_parallel < 1:
+            raise ValueError("max_parallel must be >= 1")
+        if self.deadline_s is not None and self.deadline_s <= 0:
+            raise ValueError("deadline_s must be > 0")
+
+    def run(
+        self,
+        messages: List[Message] | Messages,
+        tools: List[ToolSpec],
+        tool_choice: Any = None,
+        timeout_s: Optional[float] = None,
+        **chat_kwargs: Any,
+    ) -> ChatResponse:
+        deadline = Deadline.resolve(chat_kwargs.pop("deadline", None), self.deadline_s)
+        if deadline is not None:
+            chat_kwargs["deadline"] = deadline
+        history = self._copy_messages(messages)
+        responses: List[ChatResponse] = []
+        tool_calls_count = 0
+        cache_hits = 0
+        specs = {tool.name: tool for tool in tools or []}
+        previous: Optional[ChatResponse] = None
+        for step in range(self.max_steps):
+            remaining = self._remaining(deadline)
+            response = self.chat(
+                messages=history,
+                tools=tools,
+                tool_choice=tool_choice if step == 0 else None,
+                timeout_s=self._effective_timeout(timeout_s, remaining),
+                previous_response=previous,
+                **chat_kwargs,
+            )
+            responses.append(response)
+            if not response.tool_calls:
+                info = ToolLoopInfo(
+                    steps=len(responses),
+                    tool_calls=tool_calls_count,
+                    cache_hits=cache_hits,
+                    messages=history,
+                    responses=responses,
+                )
+                return self._aggregate(response, info)
+            history.append(
+                AIMessage(content=response.content or "", tool_calls=response.tool_calls)
+            )
+            results, hits = self._execute(
+                response.tool_calls, specs, self._remaining(deadline)
+            )
+            cache_hits += hits
+            for tool_call, result in zip(response.tool_calls, results):
+                history.append(
+                    ToolMessage(
+                        content=result,
+                        tool_call_id=tool_call.call_id or tool_call.name,
+                    )
+                )
+            tool_calls_count += len(response.tool_calls)
+            previous = response
+        error_message = (
+            f"max_steps={self.max_steps} reached while the model still requests tools"
+        )
+        logger.error(error_message)
+        raise ToolLoopError(detail=error_message)
+
+    def _copy_messages(self, messages: List[Message] | Messages) -> List[Message]:
+        if isinstance(messages, Messages):
+            return list(messages.items)
+        if isinstance(messages, list):
+            return list(Messages(messages).items)
+        raise TypeError("messages must be a list or Messages instance")
+
+    def _remaining(self, deadline: Optional[Deadline]) -> Optional[float]:
+        if deadline is None:
+            return None
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            error_message = f"tool loop deadline of {deadline.total_s}s exceeded"
+            logger.error(error_message)
+            raise LLMAPITimeoutError(detail=error_message, phase="deadline")
+        return remaining
+
+    def _effective_timeout(
+        self, timeout_s: Optional[float], remaining: Optional[float]
+    ) -> Optional[float]:
+        if remaining is None:
+            return timeout_s
+        if timeout_s is None:
+            return remaining
+        return min(timeout_s, remaining)
+
+    def _execute(
+        self,
+        tool_calls: List[ToolCall],
+        specs: Dict[str, ToolSpec],
+        remaining: Optional[float],
+    ) -> Tuple[List[str], int]:
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        jobs: List[_ToolJob] = []
+        jobs_by_key: Dict[CacheKey, _ToolJob] = {}
+        cache_hits = 0
+        for index, tool_call in enumerate(tool_calls):
+            handler = self.handlers.get(tool_call.name)
+            if handler is None:
+                results[index] = self._error_result(f"Unknown tool: {tool_call.name}")
+                continue
+            spec = specs.get(tool_call.name)
+            key: Optional[CacheKey] = None
+            if self.cache is not None and self.cache.is_cacheable(spec):
+                key = self.cache.make_key(tool_call.name, tool_call.arguments)
+                if key in jobs_by_key:
+                    jobs_by_key[key].indexes.append(index)
+                    cache_hits += 1
+                    continue
+                cached = self.cache.get(key)
+                if cached is not None:
+                    results[index] = cached
+                    cache_hits += 1
+                    continue
+            job = _ToolJob(tool_call=tool_call, indexes=[index], spec=spec, key=key)
+            jobs.append(job)
+            if key is not None:
+                jobs_by_key[key] = job
+        outcomes = self._run_jobs(jobs, remaining)
+        for job, (text, ok) in zip(jobs, outcomes):
+            for index in job.indexes:
+                results[index] = text
+            if ok and job.key is not None and self.cache is not None:
+                self.cache.set(job.key, text, job.spec)
+        return results, cache_hits
+
+    def _run_jobs(
+        self, jobs: List["_ToolJob"], remaining: Optional[float]
+    ) -> List[Tuple[str, bool]]:
+        outcomes: List[Optional[Tuple[str, bool]]] = [None] * len(jobs)
+        sync_positions: List[int] = []
+        async_positions: List[int] = []
+        for position, job in enumerate(jobs):
+            if inspect.iscoroutinefunction(self.handlers[job.tool_call.name]):
+                async_positions.append(position)
+            else:
+                sync_positions.append(position)
+        if not jobs:
+            return outcomes
+        if len(sync_positions) == 1 and not async_positions:
+            outcomes[0] = self._run_sync(jobs[0].tool_call)
+            return outcomes
+        workers = min(self.max_parallel, len(sync_positions) + bool(async_positions))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(self._run_sync, jobs[position].tool_call): [position]
+                for position in sync_positions
+            }
+            if async_positions:
+                batch = [jobs[position].tool_call for position in async_positions]
+                futures[executor.submit(self._run_async_batch, batch)] = async_positions
+            done, not_done = wait(futures, timeout=remaining)
+            if not_done:
+                error_message = "tool loop deadline exceeded while executing tools"
+                logger.error(error_message)
+                raise LLMAPITimeoutError(detail=error_message, phase="deadline")
+            for future in done:
+                positions = futures[future]
+                values = future.result()
+                if not isinstance(values, list):
+                    values = [values]
+                for position, value in zip(positions, values):
+                    outcomes[position] = value
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return outcomes
+
+    def _run_sync(self, tool_call: ToolCall) -> Tuple[str, bool]:
+        try:
+            result = self.handlers[tool_call.name](**tool_call.arguments)
+        except Exception as e:
+            logger.warning("Tool %r raised: %s", tool_call.name, e)
+            return self._error_result(f"{type(e).__name__}: {e}"), False
+        return self._serialize_result(result), True
+
+    def _run_async_batch(self, tool_calls: List[ToolCall]) -> List[Tuple[str, bool]]:
+        return asyncio.run(self._gather_async(tool_calls))
+
+    async def _gather_async(self, tool_calls: List[ToolCall]) -> List[Tuple[str, bool]]:
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def run_one(tool_call: ToolCall) -> Tuple[str, bool]:
+            async with semaphore:
+                try:
+                    result = await self.handlers[tool_call.name](**tool_call.arguments)
+                except Exception as e:
+                    logger.warning("Tool %r raised: %s", tool_call.name, e)
+                    return self._error_result(f"{type(e).__name__}: {e}"), False
+                return self._serialize_result(result), True
+
+        return list(await asyncio.gather(*(run_one(tc) for tc in tool_calls)))
+
+    def _serialize_result(self, result: Any) -> str:
+        if isinstance(result, str):
+            return result
+        return json.dumps(result, ensure_ascii=False, default=str)
+
+    def _error_result(self, error: str) -> str:
+        return json.dumps({"error": error}, ensure_ascii=False)
+
+    def _aggregate(self, final: ChatResponse, info: ToolLoopInfo) -> ChatResponse:
+        usages = [r.usage for r in info.responses if r.usage is not None]
+        usage = Usage(
+            input_tokens=sum(u.input_tokens for u in usages),
+            output_tokens=sum(u.output_tokens for u in usages),
+            total_tokens=sum(u.total_tokens for u in usages),
+            accepted_prediction_tokens=sum(u.accepted_prediction_tokens for u in usages),
+            rejected_prediction_tokens=sum(u.rejected_prediction_tokens for u in usages),
+        ) if usages else final.usage
+        priced = [r for r in info.responses if r.cost_total is not None]
+        if priced and len(priced) == len(info.responses):
+            cost_input = sum(r.cost_input or 0.0 for r in priced)
+            cost_output = sum(r.cost_output or 0.0 for r in priced)
+            cost_total = sum(r.cost_total for r in priced)
+        else:
+            cost_input, cost_output, cost_total = (
+                final.cost_input, final.cost_output, final.cost_total,
+            )
+        return replace(
+            final,
+            usage=usage,
+            cost_input=cost_input,
+            cost_output=cost_output,
+            cost_total=cost_total,
+            tool_loop=info,
+        )
+
+
+def run_tool_loop(
+    chat: Callable[..., ChatResponse],
+    messages: Any,
+    tools: Any,
+    handlers: Optional[Dict[str, Callable[..., Any]]] = None,
+    max_steps: int = 10,
+    max_parallel: int = 8,
+    deadline_s: Optional[float] = None,
+    tool_cache: Optional[ToolResultCache] = None,
+    **kwargs: Any,
+) -> ChatResponse:
+    """
+    Runs a ToolLoop over chat; shared by the adapters' chat_with_tools().
+    handlers defaults to Toolset.handlers when tools is a Toolset.
+    """
+    if handlers is None:
+        handlers = getattr(tools, "handlers", None)
+    if not handlers:
+        raise ValueError("handlers must map tool names to callables")
+    loop = ToolLoop(
+        chat=chat,
+        handlers=handlers,
+        max_steps=max_steps,
+        max_parallel=max_parallel,
+        deadline_s=deadline_s,
+        cache=tool_cache,
+    )
+    return loop.run(messages, tools, **kwargs)
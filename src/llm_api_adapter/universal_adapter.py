@@ -1,11 +1,25 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, fields
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 from .adapters.base_adapter import LLMAdapterBase
 from .adapters.anthropic_adapter import AnthropicAdapter
 from .adapters.openai_adapter import OpenAIAdapter
 from .adapters.google_adapter import GoogleAdapter
+from .budget import Budget, run_within_budgets
+from .errors.llm_api_error import LLMAPITimeoutError
+from .limits.rate_limiter import RateLimiter
+from .models.responses.chat_response import ChatResponse
+from .models.responses.chat_stream import ChatStream
+from .tool_loop import ToolResultCache, run_tool_loop
+from .utils.deadline import resolve_deadline
+
+if TYPE_CHECKING:
+    from .routing.hedging import HedgingPolicy
+    from .routing.key_pool import KeyPool
+    from .routing.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +28,15 @@ logger = logging.getLogger(__name__)
 class UniversalLLMAPIAdapter:
     organization: str
     model: str
-    api_key: str
+    api_key: str = ""
+    key_pool: Optional[KeyPool] = None
+    single_flight: Optional[SingleFlight] = None
+    budget: Optional[Budget] = None
+    rate_limiter: Optional[RateLimiter] = None
 
     def __repr__(self) -> str:
+        if self.key_pool is not None:
+            return f"UniversalLLMAPIAdapter(organization='{self.organization}', model='{self.model}', key_pool={self.key_pool!r})"
         masked = f"{self.api_key[:8]}...{self.api_key[-4:]}" if len(self.api_key) > 12 else "***"
         return f"UniversalLLMAPIAdapter(organization='{self.organization}', model='{self.model}', api_key='{masked}')"
 
@@ -25,10 +45,14 @@ class UniversalLLMAPIAdapter:
             raise ValueError("Invalid organization")
         if not self.model or not isinstance(self.model, str):
             raise ValueError("Invalid model")
+        if self.key_pool is not None and not self.api_key:
+            self.api_key = self.key_pool.keys[0]
         if not self.api_key or not isinstance(self.api_key, str):
             raise ValueError("Invalid API key")
         self.adapter = self._select_adapter(self.organization, self.model,
                                             self.api_key)
+        self._key_adapters: Dict[str, LLMAdapterBase] = {self.api_key: self.adapter}
+        self._downgrades: Dict[str, UniversalLLMAPIAdapter] = {}
 
     def _select_adapter(
         self, organization: str, model: str, api_key: str
@@ -48,6 +72,150 @@ class UniversalLLMAPIAdapter:
         logger.error(error_message)
         raise ValueError(error_message)
 
+    def chat(self, hedge: Optional[HedgingPolicy] = None, **kwargs: Any) -> ChatResponse:
+        """
+        Calls the provider adapter's chat(). With a HedgingPolicy, a call
+        that is slower than the policy's delay is duplicated (see
+        HedgingPolicy) and the first response wins. With a key_pool, each
+        call (and each hedge attempt) uses a key selected by the pool. With
+        single_flight, identical concurrent calls share one request.
+        deadline_s is turned into one absolute deadline shared by all of it.
+        The adapter's budget and a per-call budget= are both charged; see
+        Budget. A budget cannot be combined with hedge. With a
+        rate_limiter, every request sent (hedges included) first takes one
+        request and its estimated tokens (input estimate + max_tokens) from
+        it; unused tokens are returned after the response.
+        """
+        kwargs = resolve_deadline(kwargs)
+        if self.single_flight is None:
+            return self._chat_budgeted(hedge, kwargs)
+
+        def chat(**call_kwargs: Any) -> ChatResponse:
+            return self._chat_budgeted(hedge, call_kwargs)
+
+        scope = f"{self.organization}:{self.model}"
+        return self.single_flight.run(scope, chat, kwargs)
+
+    def _chat_budgeted(self, hedge: Optional[HedgingPolicy], kwargs: Dict[str, Any]) -> ChatResponse:
+        kwargs = dict(kwargs)
+        budgets = [b for b in (kwargs.pop("budget", None), self.budget) if b is not None]
+        if not budgets:
+            return self._chat_once(hedge, kwargs)
+        if hedge is not None:
+            # One reservation cannot cover racing attempts, and the loser's
+            # cost would never be charged.
+            raise ValueError("hedge cannot be combined with a budget")
+
+        def estimate(model: Optional[str]) -> float:
+            adapter = self.adapter if model is None else self._downgrade(model).adapter
+            cost = adapter.estimate_cost(
+                kwargs["messages"],
+                max_tokens=kwargs.get("max_tokens"),
+                tools=kwargs.get("tools"),
+                json_schema=kwargs.get("json_schema"),
+                response_model=kwargs.get("response_model"),
+                n=kwargs.get("n"),
+                service_tier=kwargs.get("service_tier"),
+            )
+            return cost.cost_total or 0.0
+
+        def call(model: Optional[str]) -> ChatResponse:
+            target = self if model is None else self._downgrade(model)
+            return target._chat_once(hedge, kwargs)
+
+        return run_within_budgets(budgets, estimate, call)
+
+    def _downgrade(self, model: str) -> "UniversalLLMAPIAdapter":
+        adapter = self._downgrades.get(model)
+        if adapter is None:
+            adapter = UniversalLLMAPIAdapter(
+                organization=self.organization,
+                model=model,
+                api_key=self.api_key,
+                key_pool=self.key_pool,
+                rate_limiter=self.rate_limiter,
+            )
+            self._downgrades[model] = adapter
+        return adapter
+
+    def _chat_once(self, hedge: Optional[HedgingPolicy], kwargs: Dict[str, Any]) -> ChatResponse:
+        chat = self.adapter.chat if self.key_pool is None else self._chat_pooled
+        if self.rate_limiter is not None:
+            chat = self._rate_limited(chat)
+        if hedge is None:
+            return chat(**kwargs)
+        return hedge.run(chat, kwargs)
+
+    def _rate_limited(self, chat: Callable[..., ChatResponse]) -> Callable[..., ChatResponse]:
+        limiter = self.rate_limiter
+
+        def call(**kwargs: Any) -> ChatResponse:
+            tokens = 0
+            if limiter.limits_tokens:
+                tokens = self.adapter.count_tokens(
+                    kwargs["messages"],
+                    tools=kwargs.get("tools"),
+                    json_schema=kwargs.get("json_schema"),
+                    response_model=kwargs.get("response_model"),
+                ).input_tokens
+                candidates = kwargs.get("n") or 1
+                if not self.adapter.supports_native_n:
+                    tokens *= candidates
+                tokens += (kwargs.get("max_tokens") or 0) * candidates
+            limiter.acquire(tokens, deadline=kwargs.get("deadline"))
+            try:
+                response = chat(**kwargs)
+            except LLMAPITimeoutError:
+                # The provider may have processed the request; keep the tokens.
+                raise
+            except Exception:
+                limiter.refund(tokens)
+                raise
+            if limiter.limits_tokens and response.usage is not None:
+                limiter.adjust(tokens - response.usage.total_tokens)
+            return response
+
+        return call
+
+    def _chat_pooled(self, **kwargs: Any) -> ChatResponse:
+        def call(api_key: str) -> ChatResponse:
+            return self._adapter_for_key(api_key).chat(**kwargs)
+
+        return self.key_pool.run(call)
+
+    def _adapter_for_key(self, api_key: str) -> LLMAdapterBase:
+        adapter = self._key_adapters.get(api_key)
+        if adapter is None:
+            adapter = self._select_adapter(self.organization, self.model, api_key)
+            self._key_adapters[api_key] = adapter
+        return adapter
+
+    def chat_with_tools(
+        self,
+        messages: Any,
+        tools: Any,
+        handlers: Optional[Dict[str, Callable[..., Any]]] = None,
+        max_steps: int = 10,
+        max_parallel: int = 8,
+        deadline_s: Optional[float] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+        **kwargs: Any,
+    ) -> ChatResponse:
+        return run_tool_loop(
+            self.chat,
+            messages,
+            tools,
+            handlers=handlers,
+            max_steps=max_steps,
+            max_parallel=max_parallel,
+            deadline_s=deadline_s,
+            tool_cache=tool_cache,
+            **kwargs,
+        )
+
+    def chat_stream(self, **kwargs: Any) -> ChatStream:
+        return ChatStream(self.chat, **kwargs)
+
     def __getattr__(self, name: str) -> Any:
         """
         Redirects method calls to the selected adapter.
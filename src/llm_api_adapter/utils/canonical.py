@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from enum import Enum
+import hashlib
+import json
+from typing import Any
+
+
+def to_canonical(value: Any) -> Any:
+    """
+    JSON-compatible form of value for hashing and comparison: dataclasses
+    become dicts tagged with their class name, bytes their SHA-256, and
+    classes their qualified name. Raises TypeError for anything else
+    (e.g. callables), which cannot be compared by value.
+    """
+    if isinstance(value, Enum):
+        value = value.value
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): to_canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_canonical(v) for v in value]
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, type):
+        return {"__type__": f"{value.__module__}.{value.__qualname__}"}
+    if is_dataclass(value):
+        data = {f.name: to_canonical(getattr(value, f.name)) for f in fields(value)}
+        data["__type__"] = type(value).__name__
+        return data
+    raise TypeError(f"Cannot canonicalize {type(value).__name__}")
+
+
+def canonical_hash(value: Any) -> str:
+    """SHA-256 of the canonical JSON of value; raises TypeError like to_canonical."""
+    canonical = json.dumps(
+        to_canonical(value),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
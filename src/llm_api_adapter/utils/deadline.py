@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from ..errors.llm_api_error import LLMAPITimeoutError
+
+logger = logging.getLogger(__name__)
+
+RequestTimeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+BODY_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Absolute end-to-end deadline (time.monotonic() based).
+
+    Created once at the outermost call from deadline_s and passed down as
+    the deadline keyword, so retries, failover, hedges and tool-loop steps
+    all draw on the same remaining budget instead of starting a new one.
+    """
+    expires_at: float
+    total_s: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        if seconds <= 0:
+            raise ValueError("deadline_s must be > 0")
+        return cls(expires_at=time.monotonic() + seconds, total_s=seconds)
+
+    @classmethod
+    def resolve(
+        cls, deadline: Optional["Deadline"] = None, deadline_s: Optional[float] = None
+    ) -> Optional["Deadline"]:
+        """The earlier of an inherited deadline and a new deadline_s."""
+        if deadline_s is None:
+            return deadline
+        new = cls.after(deadline_s)
+        if deadline is None or new.expires_at < deadline.expires_at:
+            return new
+        return deadline
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> float:
+        """Remaining seconds; raises LLMAPITimeoutError once expired."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            error_message = f"deadline of {self.total_s}s exceeded"
+            logger.error(error_message)
+            raise LLMAPITimeoutError(detail=error_message, phase="deadline")
+        return remaining
+
+
+def resolve_deadline(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replaces a deadline_s keyword by an absolute deadline keyword, so the
+    budget is shared by everything the call does from here on.
+    """
+    if kwargs.get("deadline_s") is None:
+        return kwargs
+    kwargs = dict(kwargs)
+    kwargs["deadline"] = Deadline.resolve(kwargs.get("deadline"), kwargs.pop("deadline_s"))
+    return kwargs
+
+
+def request_timeout(
+    timeout_s: Optional[float] = None,
+    connect_timeout_s: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+) -> RequestTimeout:
+    """
+    requests timeout for one HTTP call: timeout_s bounds each socket read
+    (and the connect, unless connect_timeout_s is given); both are capped by
+    the time left until the deadline.
+    """
+    read = timeout_s
+    connect = connect_timeout_s if connect_timeout_s is not None else timeout_s
+    if deadline is not None:
+        remaining = deadline.check()
+        read = remaining if read is None else min(read, remaining)
+        connect = remaining if connect is None else min(connect, remaining)
+    if connect == read:
+        return read
+    return connect, read
+
+
+def is_read_timeout(error: BaseException) -> bool:
+    """requests reports a read timeout while iterating a body as ConnectionError."""
+    if isinstance(error, requests.exceptions.ReadTimeout):
+        return True
+    return isinstance(error, requests.exceptions.ConnectionError) and any(
+        isinstance(arg, ReadTimeoutError) for arg in error.args
+    )
+
+
+def timeout_error(
+    error: BaseException, deadline: Optional[Deadline] = None
+) -> LLMAPITimeoutError:
+    """Maps a requests timeout to LLMAPITimeoutError with the expired phase."""
+    if deadline is not None and deadline.expired:
+        phase = "deadline"
+    elif isinstance(error, requests.exceptions.ConnectTimeout):
+        phase = "connect"
+    else:
+        phase = "read"
+    return LLMAPITimeoutError(detail=str(error), phase=phase)
+
+
+def read_body(response: Any, deadline: Deadline) -> None:
+    """
+    Reads a response opened with stream=True chunk by chunk, checking the
+    deadline between chunks, so a slowly trickling body cannot outlive it.
+    """
+    chunks = []
+    try:
+        for chunk in response.iter_content(BODY_CHUNK_SIZE):
+            chunks.append(chunk)
+            deadline.check()
+    except LLMAPITimeoutError:
+        response.close()
+        raise
+    except requests.exceptions.RequestException as e:
+        response.close()
+        if is_read_timeout(e):
+            logger.error("Response body read timed out: %s", e)
+            raise timeout_error(e, deadline)
+        raise
+    # Same as what requests does when .content is first accessed.
+    response._content = b"".join(chunks)
+
+
+def iter_until(items: Iterator[Any], deadline: Optional[Deadline]) -> Iterator[Any]:
+    """Yields from items, raising LLMAPITimeoutError once the deadline expires."""
+    if deadline is None:
+        yield from items
+        return
+    for item in items:
+        deadline.check()
+        yield item
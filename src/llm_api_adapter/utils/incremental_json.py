@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+from .json_tools import json_loads
+
+_OPENER_RE = re.compile(r"[{\[]")
+# Outside strings only quotes, brackets and commas change the parser state.
+_STRUCTURE_RE = re.compile(r'["{}\[\],]')
+_STRING_RE = re.compile(r'["\\]')
+
+JSONItem = Tuple[Any, Any]
+
+
+class IncrementalJSONParser:
+    """
+    Parses one JSON object or array that arrives in chunks.
+
+    feed() returns the top-level members completed by the chunk: object
+    fields as (name, value), array items as (index, value). Each character
+    is scanned once and each member is decoded once, when its closing
+    comma or bracket arrives. Text before the first opening bracket (a
+    code fence, a preamble) is skipped; text after the root closes is
+    ignored. A member that does not decode stops the parser (failed=True)
+    without raising, so the caller can fall back to parsing the full text.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[str] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member: List[str] = []
+        self._items: List[JSONItem] = []
+        self.done = False
+        self.failed = False
+
+    @property
+    def value(self) -> Any:
+        """The parsed root once done, None before that or after a failure."""
+        if not self.done or self.failed:
+            return None
+        if self._root == "{":
+            return dict(self._items)
+        return [value for _, value in self._items]
+
+    def feed(self, chunk: str) -> List[JSONItem]:
+        completed: List[JSONItem] = []
+        if self.done or self.failed or not chunk:
+            return completed
+        pos = 0
+        if self._root is None:
+            opener = _OPENER_RE.search(chunk)
+            if opener is None:
+                return completed
+            self._root = opener.group()
+            self._depth = 1
+            pos = opener.end()
+        segment_start = pos
+        size = len(chunk)
+        while pos < size:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_RE.search(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+            match = _STRUCTURE_RE.search(chunk, pos)
+            if match is None:
+                break
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._member.append(chunk[segment_start:match.start()])
+                    self._complete_member(completed)
+                    self.done = not self.failed
+                    return completed
+            elif self._depth == 1:
+                self._member.append(chunk[segment_start:match.start()])
+                self._complete_member(completed)
+                if self.failed:
+                    return completed
+                segment_start = pos
+        self._member.append(chunk[segment_start:])
+        return completed
+
+    def _complete_member(self, completed: List[JSONItem]) -> None:
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return
+        try:
+            if self._root == "{":
+                ((key, value),) = json_loads("{" + text + "}").items()
+            else:
+                key, value = len(self._items), json_loads(text)
+        except (json.JSONDecodeError, ValueError):
+            self.failed = True
+            return
+        item = (key, value)
+        self._items.append(item)
+        completed.append(item)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast backend
+    orjson = None
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*([\s\S]*?)\s*```$", re.IGNORECASE)
+_OPENERS_RE = {
+    None: re.compile(r"[{\[]"),
+    "object": re.compile(r"\{"),
+    "array": re.compile(r"\["),
+}
+# A complete string literal (skipped as a unit) or a single bracket.
+_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+_PAIRS = {"{": "}", "[": "]"}
+_ROOT_BRACKETS = {"object": "{", "array": "["}
+
+
+def json_loads(text: str | bytes) -> Any:
+    """json.loads with orjson as an optional fast backend."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (NaN, huge integers); defer to the stdlib.
+            pass
+    return json.loads(text)
+
+
+def iter_json_spans(text: str, root_type: Optional[str] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) of each top-level bracket-balanced span in text.
+
+    Single left-to-right pass: regex search skips prose between spans, and
+    string literals are consumed whole so brackets in strings are ignored.
+    root_type ("object" or "array") restricts the outermost bracket. When an
+    opener is never closed (or closed by the wrong bracket), the outermost
+    balanced spans nested inside it are yielded instead, so the scan stays
+    linear however much broken text precedes the JSON.
+    """
+    openers = _OPENERS_RE.get(root_type, _OPENERS_RE[None])
+    root = _ROOT_BRACKETS.get(root_type)
+    pos = 0
+    while True:
+        opener = openers.search(text, pos)
+        if opener is None:
+            return
+        stack: List[Tuple[str, int]] = [(opener.group(), opener.start())]
+        # Outermost balanced spans completed inside a still-open opener.
+        nested: List[Tuple[int, int]] = []
+        pos = opener.end()
+        while stack:
+            token = _TOKEN_RE.search(text, pos)
+            if token is None:
+                pos = len(text)
+                break
+            value = token.group()
+            pos = token.end()
+            if value in _PAIRS:
+                stack.append((value, token.start()))
+                continue
+            if value in ("}", "]"):
+                bracket, start = stack[-1]
+                if _PAIRS[bracket] != value:
+                    break
+                stack.pop()
+                if stack and (root_type is None or bracket == root):
+                    while nested and nested[-1][0] >= start:
+                        nested.pop()
+                    nested.append((start, pos))
+        if stack:
+            yield from nested
+            continue
+        yield start, pos
+
+
+def extract_json(text: str, root_type: Optional[str] = None) -> Any:
+    """
+    Parse the JSON document embedded in text: the whole text, the body of a
+    ```json fence, or the first balanced span that parses.
+    Raises json.JSONDecodeError when nothing parses.
+    """
+    stripped = text.strip()
+    fence = _FENCE_RE.match(stripped)
+    if fence:
+        stripped = fence.group(1).strip()
+    try:
+        return json_loads(stripped)
+    except json.JSONDecodeError as e:
+        first_error = e
+    for start, end in iter_json_spans(stripped, root_type):
+        try:
+            return json_loads(stripped[start:end])
+        except json.JSONDecodeError:
+            continue
+    raise first_error
+
+
+def locate_json_text(text: str) -> str:
+    """Return the fence body or the first balanced span of text, else text itself."""
+    stripped = text.strip()
+    fence = _FENCE_RE.match(stripped)
+    if fence:
+        return fence.group(1).strip()
+    for start, end in iter_json_spans(stripped):
+        return stripped[start:end]
+    return stripped
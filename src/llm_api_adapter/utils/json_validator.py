@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from .schema_cache import cached_schema_transform
+
+Validator = Callable[[Any, str], Optional[str]]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (
+        isinstance(v, int) and not isinstance(v, bool)
+    ) or (isinstance(v, float) and v.is_integer()),
+}
+
+
+class JSONValidationError(ValueError):
+    """Raised by validate_json() with the path of the first violation."""
+
+
+def validate_json(value: Any, schema: Dict[str, Any]) -> None:
+    """
+    Validate value against schema with a validator compiled once per schema
+    content (see compile_validator). Raises JSONValidationError.
+    """
+    validator = cached_schema_transform("validator", schema, compile_validator)
+    error = validator(value, "$")
+    if error is not None:
+        raise JSONValidationError(error)
+
+
+def compile_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Compile a JSON Schema into a tree of closures.
+
+    Covers the subset used for structured output: type, enum, const,
+    properties/required/additionalProperties, items/prefixItems, length and
+    numeric bounds, pattern, anyOf/oneOf/allOf, nullable and local $ref into
+    $defs/definitions. Unknown keywords are ignored.
+    """
+    defs = {**(schema.get("definitions") or {}), **(schema.get("$defs") or {})}
+    compiled_defs: Dict[str, Validator] = {}
+    # Every definition is compiled before the validator is returned, so the
+    # shared validator only ever reads compiled_defs.
+    for name, definition in defs.items():
+        compiled_defs[name] = _compile(definition, defs, compiled_defs)
+    return _compile(schema, defs, compiled_defs)
+
+
+def _compile(schema: Any, defs: Dict[str, Any], compiled_defs: Dict[str, Validator]) -> Validator:
+    if schema is True or schema == {}:
+        return _accept
+    if schema is False:
+        return lambda value, path: f"{path}: no value is allowed"
+    if not isinstance(schema, dict):
+        return _accept
+    checks: List[Validator] = []
+    ref = schema.get("$ref")
+    if isinstance(ref, str):
+        checks.append(_compile_ref(ref, defs, compiled_defs))
+    nullable = schema.get("nullable") is True
+    schema_type = schema.get("type")
+    if schema_type is not None:
+        checks.append(_compile_type(schema_type, nullable))
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        checks.append(
+            lambda value, path: None if value in allowed or (nullable and value is None)
+            else f"{path}: {value!r} is not one of {allowed!r}"
+        )
+    if "const" in schema:
+        const = schema["const"]
+        checks.append(
+            lambda value, path: None if value == const
+            else f"{path}: expected {const!r}, got {value!r}"
+        )
+    if any(k in schema for k in ("properties", "required", "additionalProperties")):
+        checks.append(_compile_object(schema, defs, compiled_defs))
+    if any(k in schema for k in ("items", "prefixItems", "minItems", "maxItems")):
+        checks.append(_compile_array(schema, defs, compiled_defs))
+    if any(k in schema for k in ("minLength", "maxLength", "pattern")):
+        checks.append(_compile_string(schema))
+    if any(k in schema for k in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum")):
+        checks.append(_compile_number(schema))
+    for key in ("anyOf", "oneOf"):
+        if isinstance(schema.get(key), list):
+            checks.append(_compile_any_of(key, schema[key], defs, compiled_defs, nullable))
+    if isinstance(schema.get("allOf"), list):
+        checks.extend(_compile(s, defs, compiled_defs) for s in schema["allOf"])
+    if not checks:
+        return _accept
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        for check in checks:
+            error = check(value, path)
+            if error is not None:
+                return error
+        return None
+
+    return validate
+
+
+def _accept(value: Any, path: str) -> Optional[str]:
+    return None
+
+
+def _compile_ref(ref: str, defs: Dict[str, Any], compiled_defs: Dict[str, Validator]) -> Validator:
+    name = ref.rsplit("/", 1)[-1]
+    if name not in defs:
+        return _accept
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        # Looked up at call time so recursive definitions compile.
+        return compiled_defs[name](value, path)
+
+    return validate
+
+
+def _compile_type(schema_type: Any, nullable: bool) -> Validator:
+    types = [schema_type] if isinstance(schema_type, str) else list(schema_type)
+    types = [t.lower() for t in types if isinstance(t, str)]
+    if nullable and "null" not in types:
+        types.append("null")
+    checks = [_TYPE_CHECKS[t] for t in types if t in _TYPE_CHECKS]
+    if not checks:
+        return _accept
+    expected = " or ".join(types)
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        for check in checks:
+            if check(value):
+                return None
+        return f"{path}: expected {expected}, got {type(value).__name__}"
+
+    return validate
+
+
+def _compile_object(schema: Dict[str, Any], defs: Dict[str, Any], compiled_defs: Dict[str, Validator]) -> Validator:
+    properties = {
+        name: _compile(sub, defs, compiled_defs)
+        for name, sub in (schema.get("properties") or {}).items()
+    }
+    required = list(schema.get("required") or [])
+    additional = schema.get("additionalProperties", True)
+    additional_validator = (
+        _compile(additional, defs, compiled_defs) if isinstance(additional, dict) else None
+    )
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        if not isinstance(value, dict):
+            return None
+        for name in required:
+            if name not in value:
+                return f"{path}: missing required property {name!r}"
+        for name, item in value.items():
+            validator = properties.get(name)
+            if validator is not None:
+                error = validator(item, f"{path}.{name}")
+            elif additional is False:
+                return f"{path}: unexpected property {name!r}"
+            elif additional_validator is not None:
+                error = additional_validator(item, f"{path}.{name}")
+            else:
+                continue
+            if error is not None:
+                return error
+        return None
+
+    return validate
+
+
+def _compile_array(schema: Dict[str, Any], defs: Dict[str, Any], compiled_defs: Dict[str, Validator]) -> Validator:
+    items = schema.get("items")
+    prefix = [_compile(s, defs, compiled_defs) for s in schema.get("prefixItems") or []]
+    items_validator = _compile(items, defs, compiled_defs) if isinstance(items, dict) else None
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        if not isinstance(value, list):
+            return None
+        if min_items is not None and len(value) < min_items:
+            return f"{path}: expected at least {min_items} items"
+        if max_items is not None and len(value) > max_items:
+            return f"{path}: expected at most {max_items} items"
+        for index, item in enumerate(value):
+            if index < len(prefix):
+                error = prefix[index](item, f"{path}[{index}]")
+            elif items_validator is not None:
+                error = items_validator(item, f"{path}[{index}]")
+            else:
+                continue
+            if error is not None:
+                return error
+        return None
+
+    return validate
+
+
+def _compile_string(schema: Dict[str, Any]) -> Validator:
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if isinstance(schema.get("pattern"), str) else None
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        if not isinstance(value, str):
+            return None
+        if min_length is not None and len(value) < min_length:
+            return f"{path}: shorter than {min_length} characters"
+        if max_length is not None and len(value) > max_length:
+            return f"{path}: longer than {max_length} characters"
+        if pattern is not None and not pattern.search(value):
+            return f"{path}: does not match pattern {pattern.pattern!r}"
+        return None
+
+    return validate
+
+
+def _compile_number(schema: Dict[str, Any]) -> Validator:
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+    exclusive_minimum = schema.get("exclusiveMinimum")
+    exclusive_maximum = schema.get("exclusiveMaximum")
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return None
+        if minimum is not None and value < minimum:
+            return f"{path}: {value} is less than {minimum}"
+        if maximum is not None and value > maximum:
+            return f"{path}: {value} is greater than {maximum}"
+        if exclusive_minimum is not None and value <= exclusive_minimum:
+            return f"{path}: {value} must be greater than {exclusive_minimum}"
+        if exclusive_maximum is not None and value >= exclusive_maximum:
+            return f"{path}: {value} must be less than {exclusive_maximum}"
+        return None
+
+    return validate
+
+
+def _compile_any_of(
+    key: str,
+    options: List[Any],
+    defs: Dict[str, Any],
+    compiled_defs: Dict[str, Validator],
+    nullable: bool,
+) -> Validator:
+    validators = [_compile(option, defs, compiled_defs) for option in options]
+
+    def validate(value: Any, path: str) -> Optional[str]:
+        if nullable and value is None:
+            return None
+        errors = [v(value, path) for v in validators]
+        matched = sum(1 for e in errors if e is None)
+        if key == "oneOf" and matched > 1:
+            return f"{path}: matches more than one oneOf option"
+        if matched:
+            return None
+        return f"{path}: does not match any {key} option ({errors[0]})"
+
+    return validate
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+from ..errors.llm_api_error import (
+    LLMAPICircuitOpenError,
+    LLMAPIRateLimitError,
+    LLMAPIServerError,
+    LLMAPITimeoutError,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_ERRORS = (LLMAPIRateLimitError, LLMAPIServerError, LLMAPITimeoutError)
+
+
+def call_with_retries(
+    call: Callable[[], T],
+    retries: int = 2,
+    backoff_s: float = 0.5,
+    on_retry: Optional[Callable[[Exception], None]] = None,
+) -> T:
+    """
+    Calls call(), retrying rate-limit, server and timeout errors up to
+    retries times with jittered exponential backoff. An open circuit
+    breaker or an expired deadline is not retried.
+    """
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except RETRYABLE_ERRORS as e:
+            if (
+                attempt >= retries
+                or isinstance(e, LLMAPICircuitOpenError)
+                or getattr(e, "phase", None) == "deadline"
+            ):
+                raise
+            delay = backoff_s * 2 ** attempt * random.uniform(0.5, 1.0)
+            logger.warning("Upstream error, retrying in %.2fs: %s", delay, e)
+            if on_retry is not None:
+                on_retry(e)
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Callable, Dict
+
+from .bounded_cache import BoundedCache
+
+# Shared by all adapters: transformed schemas are read-only once cached.
+SCHEMA_CACHE = BoundedCache(max_entries=512)
+
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    """Content hash of a JSON schema, independent of key order."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cached_schema_transform(
+    kind: str,
+    schema: Dict[str, Any],
+    transform: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Memoize transform(schema) per transform kind and schema content."""
+    key = (kind, schema_fingerprint(schema))
+    return SCHEMA_CACHE.get_or_create(key, lambda: transform(schema))
+
+
+def cached_model_schema(response_model: Any) -> Dict[str, Any]:
+    """Memoize response_model.model_json_schema() per model class."""
+    build = response_model.model_json_schema
+    try:
+        hash(response_model)
+    except TypeError:
+        return build()
+    return SCHEMA_CACHE.get_or_create(("model", response_model), build)
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+import requests_mock as requests_mock_module
+from pydantic import BaseModel
+
+from src.llm_api_adapter.errors.llm_api_error import LLMAPIServerError
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+from src.llm_api_adapter.models.tools import ToolSpec
+from src.llm_api_adapter.universal_adapter import UniversalLLMAPIAdapter
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+
+
+def sse(*payloads, done=False):
+    body = "".join(f"data: {json.dumps(p)}\n\n" for p in payloads)
+    if done:
+        body += "data: [DONE]\n\n"
+    return body
+
+
+@pytest.mark.integration
+def test_openai_chat_stream_emits_fields_and_sets_parsed_model():
+    body = sse(
+        {"id": "c1", "model": "gpt-4o", "choices": [{"index": 0, "delta": {"content": '{"name": "Al'}}]},
+        {"id": "c1", "choices": [{"index": 0, "delta": {"content": 'ice", "age": 30}'}, "finish_reason": "stop"}]},
+        {"id": "c1", "choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 7, "total_tokens": 12}},
+        done=True,
+    )
+    with requests_mock_module.Mocker() as mock:
+        mock.post("https://api.openai.com/v1/chat/completions", text=body)
+        adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", api_key="dummy_key")
+        stream = adapter.chat_stream(messages=[UserMessage("hi")], response_model=Person)
+        events = list(stream)
+        payload = mock.request_history[0].json()
+
+    assert payload["stream"] is True
+    assert payload["stream_options"] == {"include_usage": True}
+    assert [(e.key, e.value) for e in events if e.type == "json_item"] == [
+        ("name", "Alice"), ("age", 30),
+    ]
+    assert stream.response.parsed_json == {"name": "Alice", "age": 30}
+    assert stream.response.parsed_model == Person(name="Alice", age=30)
+    assert stream.response.usage.total_tokens == 12
+    assert stream.response.cost_total is not None
+
+
+@pytest.mark.integration
+def test_anthropic_stream_via_on_stream_callback():
+    body = "".join(
+        f"event: {p['type']}\ndata: {json.dumps(p)}\n\n"
+        for p in [
+            {"type": "message_start", "message": {"id": "m1", "model": "claude-sonnet-4-5",
+                                                  "usage": {"input_tokens": 4, "output_tokens": 1}}},
+            {"type": "content_block_start", "index": 0, "content_block": {
+                "type": "tool_use", "id": "tu_1", "name": "get_weather", "input": {}}},
+            {"type": "content_block_delta", "index": 0, "delta": {
+                "type": "input_json_delta", "partial_json": '{"city": "Paris"}'}},
+            {"type": "content_block_stop", "index": 0},
+            {"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 9}},
+            {"type": "message_stop"},
+        ]
+    )
+    tool = ToolSpec(
+        name="get_weather",
+        description="Weather",
+        json_schema={"type": "object", "properties": {"city": {"type": "string"}}},
+    )
+    events = []
+    with requests_mock_module.Mocker() as mock:
+        mock.post("https://api.anthropic.com/v1/messages", text=body)
+        adapter = UniversalLLMAPIAdapter(
+            organization="anthropic", model="claude-sonnet-4-5", api_key="dummy_key"
+        )
+        response = adapter.chat(
+            messages=[UserMessage("weather?")],
+            max_tokens=100,
+            tools=[tool],
+            on_stream=events.append,
+        )
+        assert mock.request_history[0].json()["stream"] is True
+
+    assert [(e.type, e.key, e.value) for e in events if e.type != "tool_call"] == [
+        ("tool_arguments_item", "city", "Paris"),
+    ]
+    assert response.tool_calls[0].arguments == {"city": "Paris"}
+    assert response.usage.output_tokens == 9
+
+
+@pytest.mark.integration
+def test_google_stream_uses_sse_endpoint():
+    body = sse(
+        {"candidates": [{"content": {"parts": [{"text": "[1, "}]}}]},
+        {"candidates": [{"content": {"parts": [{"text": "2]"}]}, "finishReason": "STOP"}],
+         "usageMetadata": {"promptTokenCount": 2, "candidatesTokenCount": 2, "totalTokenCount": 4}},
+    )
+    with requests_mock_module.Mocker() as mock:
+        mock.post(
+            "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-pro:streamGenerateContent?alt=sse",
+            text=body,
+        )
+        adapter = UniversalLLMAPIAdapter(
+            organization="google", model="gemini-2.5-pro", api_key="dummy_key"
+        )
+        stream = adapter.chat_stream(
+            messages=[UserMessage("numbers")],
+            json_schema={"type": "array", "items": {"type": "integer"}},
+        )
+        response = stream.result()
+
+    assert response.parsed_json == [1, 2]
+    assert response.usage.total_tokens == 4
+
+
+@pytest.mark.integration
+def test_chat_stream_reraises_errors():
+    with requests_mock_module.Mocker() as mock:
+        mock.post("https://api.openai.com/v1/chat/completions", status_code=500, json={"error": {"message": "down"}})
+        adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", api_key="dummy_key")
+        stream = adapter.chat_stream(messages=[UserMessage("hi")])
+        with pytest.raises(LLMAPIServerError, match="down"):
+            list(stream)
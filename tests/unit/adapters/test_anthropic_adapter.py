@@ -172,3 +172,66 @@ def test_chat_omits_output_config_when_json_schema_is_none(adapter):
 
     kwargs = mock_chat.call_args.kwargs
     assert "output_config" not in kwargs
+
+
+@pytest.mark.unit
+def test_n_runs_parallel_calls_and_sums_usage(adapter):
+    api_response = {
+        "content": [{"type": "text", "text": "hi"}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 10, "output_tokens": 2},
+    }
+    with patch.object(ClaudeSyncClient, "chat_completion", return_value=api_response) as chat_completion:
+        response = adapter.chat([UserMessage("hi")], max_tokens=10, n=2)
+    assert chat_completion.call_count == 2
+    assert len(response.candidates) == 2
+    assert response.usage.input_tokens == 20
+    assert adapter.estimate_cost([UserMessage("hi")], max_tokens=10, n=2).input_tokens == (
+        2 * adapter.count_tokens([UserMessage("hi")]).input_tokens
+    )
+
+
+@pytest.mark.unit
+def test_n_passes_every_argument_to_each_candidate_call(adapter):
+    api_response = {
+        "content": [{"type": "text", "text": "hi"}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 10, "output_tokens": 2},
+    }
+    with patch.object(ClaudeSyncClient, "chat_completion", return_value=api_response) as chat_completion:
+        response = adapter.chat([UserMessage("hi")], 10, 0.5, n=2, service_tier="priority", deadline_s=30)
+    assert len(response.candidates) == 2
+    calls = [call.kwargs for call in chat_completion.call_args_list]
+    assert all(c["max_tokens"] == 10 and c["temperature"] == 0.5 for c in calls)
+    assert all(c["service_tier"] == "auto" for c in calls)
+    assert calls[0]["deadline"] is calls[1]["deadline"] is not None
+
+@pytest.mark.unit
+def test_service_tier_maps_to_anthropic_options(adapter):
+    api_response = {
+        "content": [{"type": "text", "text": "hi"}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 10, "output_tokens": 2, "service_tier": "standard"},
+    }
+    with patch.object(ClaudeSyncClient, "chat_completion", return_value=api_response) as chat_completion:
+        response = adapter.chat([UserMessage("hi")], max_tokens=10, service_tier="priority")
+        assert chat_completion.call_args.kwargs["service_tier"] == "auto"
+        adapter.chat([UserMessage("hi")], max_tokens=10, service_tier="default")
+        assert chat_completion.call_args.kwargs["service_tier"] == "standard_only"
+        with pytest.warns(UserWarning, match="service_tier"):
+            adapter.chat([UserMessage("hi")], max_tokens=10, service_tier="flex")
+        assert "service_tier" not in chat_completion.call_args.kwargs
+    assert response.service_tier == "default"
+
+
+@pytest.mark.unit
+def test_prediction_is_ignored_with_a_warning(adapter):
+    api_response = {
+        "content": [{"type": "text", "text": "hi"}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 10, "output_tokens": 2},
+    }
+    with patch.object(ClaudeSyncClient, "chat_completion", return_value=api_response) as chat_completion:
+        with pytest.warns(UserWarning, match="predicted outputs"):
+            adapter.chat([UserMessage("hi")], max_tokens=10, prediction="hi")
+    assert "prediction" not in chat_completion.call_args.kwargs
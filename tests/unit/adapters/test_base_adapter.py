@@ -607,6 +607,38 @@ def test_parse_json_response_raises_on_invalid_json(adapter):
         adapter._parse_json_response("not json at all !!!", {"type": "object"})
 
 
+@pytest.mark.unit
+def test_parse_json_response_skips_invalid_blocks_before_json(adapter):
+    content = 'Draft {not json}. Final: {"name": "a } b"} and {"name": "other"}'
+    result = adapter._parse_json_response(content, {"type": "object"})
+    assert result == {"name": "a } b"}
+
+
+@pytest.mark.unit
+def test_parse_json_response_prefers_schema_root_type(adapter):
+    content = 'Steps [1, 2] then the answer {"name": "test"}'
+    result = adapter._parse_json_response(content, {"type": "object"})
+    assert result == {"name": "test"}
+
+
+@pytest.mark.unit
+def test_parse_json_response_validates_against_schema(adapter):
+    schema = {
+        "type": "object",
+        "properties": {"age": {"type": "integer"}},
+        "required": ["age"],
+    }
+    assert adapter._parse_json_response('{"age": 1}', schema, validate=True) == {"age": 1}
+    with pytest.raises(JSONSchemaError, match=r"does not match json_schema: \$\.age"):
+        adapter._parse_json_response('{"age": "one"}', schema, validate=True)
+
+
+@pytest.mark.unit
+def test_parse_json_response_skips_validation_by_default(adapter):
+    schema = {"type": "object", "required": ["age"]}
+    assert adapter._parse_json_response("{}", schema) == {}
+
+
 # ---------------------------
 # _parse_response_model
 # ---------------------------
@@ -633,3 +665,71 @@ def test_parse_response_model_returns_validated_instance(adapter):
 def test_parse_response_model_raises_on_invalid_data(adapter):
     with pytest.raises(JSONSchemaError, match="Pydantic validation"):
         adapter._parse_response_model({"name": 123, "age": "not-an-int"}, _Person)
+
+
+# ---------------------------------------------------------------------------
+# _enforce_strict_schema / _compile_schema
+# ---------------------------------------------------------------------------
+
+NESTED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "owner": {"$ref": "#/$defs/Person", "description": "Owner"},
+        "pets": {"type": "array", "items": {"$ref": "#/$defs/Pet"}},
+        "note": {"anyOf": [{"type": "object", "properties": {"t": {"type": "string"}}}, {"type": "null"}]},
+    },
+    "required": ["owner", "pets"],
+    "$defs": {
+        "Person": {"type": "object", "properties": {"name": {"type": "string"}}},
+        "Pet": {"type": "object", "properties": {"kind": {"type": "string"}}},
+        "Unused": {"type": "object", "properties": {}},
+    },
+}
+
+
+@pytest.mark.unit
+def test_enforce_strict_schema_handles_defs_any_of_and_refs(adapter):
+    result = adapter._enforce_strict_schema(NESTED_SCHEMA)
+    assert result["additionalProperties"] is False
+    assert result["properties"]["owner"] == {"$ref": "#/$defs/Person"}
+    assert result["properties"]["note"]["anyOf"][0]["additionalProperties"] is False
+    assert set(result["$defs"]) == {"Person", "Pet"}
+    assert result["$defs"]["Person"]["additionalProperties"] is False
+    assert result["$defs"]["Pet"]["additionalProperties"] is False
+    assert result["required"] == ["owner", "pets"]
+    assert "additionalProperties" not in NESTED_SCHEMA
+
+
+@pytest.mark.unit
+def test_enforce_strict_schema_require_all_makes_optional_fields_nullable(adapter):
+    schema = {
+        "type": "object",
+        "properties": {
+            "a": {"type": "string"},
+            "b": {"type": "integer"},
+            "c": {"$ref": "#/$defs/C"},
+        },
+        "required": ["a"],
+        "$defs": {"C": {"type": "object", "properties": {"x": {"type": "string"}}}},
+    }
+    result = adapter._enforce_strict_schema(schema, require_all=True)
+    assert result["required"] == ["a", "b", "c"]
+    assert result["properties"]["a"] == {"type": "string"}
+    assert result["properties"]["b"] == {"type": ["integer", "null"]}
+    assert result["properties"]["c"] == {"anyOf": [{"$ref": "#/$defs/C"}, {"type": "null"}]}
+    assert result["$defs"]["C"]["required"] == ["x"]
+
+
+@pytest.mark.unit
+def test_compile_schema_memoizes_transform(adapter):
+    calls = []
+
+    def transform(schema):
+        calls.append(schema)
+        return adapter._enforce_strict_schema(schema)
+
+    schema = {"type": "object", "properties": {"memo_test": {"type": "string"}}}
+    first = adapter._compile_schema("strict_test", schema, transform)
+    second = adapter._compile_schema("strict_test", dict(schema), transform)
+    assert first is second
+    assert len(calls) == 1
@@ -0,0 +1,105 @@
+from array import array
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.llm_api_adapter.adapters.anthropic_adapter import AnthropicAdapter
+from src.llm_api_adapter.adapters.google_adapter import GoogleAdapter
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.errors.llm_api_error import LLMAPIClientError, LLMAPIError
+from src.llm_api_adapter.llm_registry.llm_registry import LLM_REGISTRY
+from src.llm_api_adapter.llms.google.sync_client import GeminiSyncClient
+from src.llm_api_adapter.llms.openai.sync_client import OpenAISyncClient
+from src.llm_api_adapter.models.responses import embedding_response
+from src.llm_api_adapter.models.responses.embedding_response import float32_matrix
+
+
+def openai_embeddings(model, input, **kwargs):
+    data = [
+        {"index": index, "embedding": [float(text[-1]), 0.5, -1.0]}
+        for index, text in enumerate(input)
+    ]
+    return {"data": list(reversed(data)), "usage": {"prompt_tokens": 4 * len(input)}}
+
+
+@pytest.mark.unit
+def test_openai_embed_batches_and_keeps_input_order():
+    adapter = OpenAIAdapter(model="gpt-4o", api_key="k")
+    texts = [f"text {i}" for i in range(5)]
+    with patch.object(OpenAISyncClient, "embeddings", side_effect=openai_embeddings) as embeddings:
+        response = adapter.embed(texts, model="text-embedding-3-small", batch_size=2, dimensions=3)
+    assert embeddings.call_count == 3
+    assert all(call.kwargs["dimensions"] == 3 for call in embeddings.call_args_list)
+    assert (len(response), response.dimensions, response.batches) == (5, 3, 3)
+    assert [response.vector(i)[0] for i in range(5)] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert list(response.vector(-1)) == [4.0, 0.5, -1.0]
+    assert [usage.input_tokens for usage in response.batch_usage] == [8, 8, 4]
+    pricing = LLM_REGISTRY.providers["openai"].embedding_models["text-embedding-3-small"].pricing
+    assert response.usage.input_tokens == 20
+    assert response.cost_total == pytest.approx(20 * pricing.in_per_token)
+
+
+@pytest.mark.unit
+def test_embed_batches_share_the_adapter_session():
+    adapter = OpenAIAdapter(model="gpt-4o", api_key="k")
+
+    def post(session, url, json, **kwargs):
+        return Mock(headers={}, json=Mock(return_value=openai_embeddings(**json)))
+
+    with patch.object(requests.Session, "post", autospec=True, side_effect=post) as session_post:
+        response = adapter.embed([f"text {i}" for i in range(5)], batch_size=2)
+    assert len(response) == 5
+    assert [call.args[0] for call in session_post.call_args_list] == [adapter._session] * 3
+
+@pytest.mark.unit
+def test_batch_size_is_capped_at_the_model_maximum():
+    adapter = GoogleAdapter(model="gemini-2.5-flash", api_key="k")
+    texts = ["a"] * 150
+
+    def batch_embed_contents(model, texts, **kwargs):
+        return {"embeddings": [{"values": [1.0, 2.0]} for _ in texts]}
+
+    with patch.object(GeminiSyncClient, "batch_embed_contents", side_effect=batch_embed_contents) as embed:
+        response = adapter.embed(texts, batch_size=1000)
+    assert [len(call.kwargs["texts"]) for call in embed.call_args_list] == [100, 50]
+    assert response.model == "gemini-embedding-001"
+    assert (len(response), response.dimensions) == (150, 2)
+    assert response.usage.input_tokens > 0 and response.cost_total > 0
+
+
+@pytest.mark.unit
+def test_embed_is_not_available_without_an_embeddings_api(recwarn):
+    adapter = AnthropicAdapter(model="claude-sonnet-4-5", api_key="k")
+    with pytest.raises(LLMAPIClientError, match="no embeddings API"):
+        adapter.embed(["hi"])
+    with pytest.raises(LLMAPIClientError, match="no embeddings API"):
+        adapter.embed(["hi"], model="foo")
+    assert not [w for w in recwarn if "not verified" in str(w.message)]
+
+
+@pytest.mark.unit
+def test_embed_rejects_a_batch_with_missing_vectors():
+    adapter = OpenAIAdapter(model="gpt-4o", api_key="k")
+    response = {"data": [{"index": 0, "embedding": [1.0]}], "usage": {"prompt_tokens": 2}}
+    with patch.object(OpenAISyncClient, "embeddings", return_value=response):
+        with pytest.raises(LLMAPIError, match="1 embeddings for 2 inputs"):
+            adapter.embed(["a", "b"])
+
+
+@pytest.mark.unit
+def test_float32_matrix_without_numpy_is_a_flat_array():
+    with patch.object(embedding_response, "numpy", None):
+        matrix, rows, dimensions = float32_matrix([[[1.0, 2.0]], [[3.0, 4.0], [5.0, 6.0]]])
+    assert isinstance(matrix, array) and matrix.typecode == "f"
+    assert (rows, dimensions, list(matrix)) == (3, 2, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    with pytest.raises(ValueError):
+        float32_matrix([[[1.0, 2.0], [1.0]]])
+
+
+@pytest.mark.unit
+def test_float32_matrix_with_numpy():
+    numpy = pytest.importorskip("numpy")
+    matrix, rows, dimensions = float32_matrix([[[1.0, 2.0]], [[3.0, 4.0]]])
+    assert matrix.dtype == numpy.float32 and matrix.shape == (2, 2)
+    assert matrix.flags["C_CONTIGUOUS"]
@@ -201,3 +201,55 @@ def test_chat_omits_json_schema_fields_when_not_provided(adapter):
     gen_cfg = kwargs["generationConfig"]
     assert "responseMimeType" not in gen_cfg
     assert "responseSchema" not in gen_cfg
+
+
+@pytest.mark.unit
+def test_to_google_schema_inlines_refs_and_maps_nullable(adapter):
+    schema = {
+        "type": "object",
+        "properties": {
+            "owner": {"$ref": "#/$defs/Person"},
+            "nickname": {"anyOf": [{"type": "string"}, {"type": "null"}], "description": "Nick"},
+            "age": {"type": ["integer", "null"]},
+        },
+        "$defs": {
+            "Person": {
+                "type": "object",
+                "properties": {"name": {"type": "string"}, "parent": {"$ref": "#/$defs/Person"}},
+            }
+        },
+    }
+    result = adapter._to_google_schema(schema)
+    assert "$defs" not in result
+    owner = result["properties"]["owner"]
+    assert owner["type"] == "OBJECT"
+    assert owner["properties"]["name"]["type"] == "STRING"
+    assert owner["properties"]["parent"] == {"type": "OBJECT"}
+    assert result["properties"]["nickname"] == {"type": "STRING", "nullable": True, "description": "Nick"}
+    assert result["properties"]["age"] == {"type": "INTEGER", "nullable": True}
+
+
+@pytest.mark.unit
+def test_n_maps_to_candidate_count(adapter):
+    api_response = {
+        "candidates": [
+            {"content": {"parts": [{"text": "one"}]}, "finishReason": "STOP"},
+            {"content": {"parts": [{"text": "two"}]}, "finishReason": "STOP"},
+        ],
+        "usageMetadata": {"promptTokenCount": 10, "candidatesTokenCount": 6, "totalTokenCount": 16},
+    }
+    with patch.object(GeminiSyncClient, "chat_completion", return_value=api_response) as chat_completion:
+        response = adapter.chat([UserMessage("hi")], n=2)
+    assert chat_completion.call_args.kwargs["generationConfig"]["candidateCount"] == 2
+    assert [c.content for c in response.candidates] == ["one", "two"]
+    assert response.usage.input_tokens == 10 and response.usage.output_tokens == 6
+
+
+@pytest.mark.unit
+def test_service_tier_is_ignored_with_a_warning(adapter):
+    api_response = {"candidates": [{"content": {"parts": [{"text": "hi"}]}}]}
+    with patch.object(GeminiSyncClient, "chat_completion", return_value=api_response) as chat_completion:
+        with pytest.warns(UserWarning, match="service_tier"):
+            response = adapter.chat([UserMessage("hi")], service_tier="flex")
+    assert "service_tier" not in chat_completion.call_args.kwargs
+    assert response.service_tier is None
@@ -6,7 +6,7 @@ from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
 from src.llm_api_adapter.errors.llm_api_error import LLMAPIError
 from src.llm_api_adapter.llms.openai.sync_client import OpenAISyncClient
 from src.llm_api_adapter.models.messages.chat_message import Prompt, UserMessage
-from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse, LazyChatResponse
 from src.llm_api_adapter.models.tools import ToolSpec
 
 
@@ -619,3 +619,118 @@ def test_chat_legacy_api_passes_json_schema_in_response_format(legacy_adapter):
     assert rf["json_schema"]["strict"] is True
     assert "schema" in rf["json_schema"]
     assert result.parsed_json == {"name": "test"}
+
+
+@pytest.mark.unit
+def test_n_requests_candidates_in_one_call_with_shared_input(legacy_adapter):
+    api_response = {
+        "id": "c1",
+        "model": "gpt-4o",
+        "choices": [
+            {"index": 1, "message": {"content": "{\"a\": 2}"}, "finish_reason": "stop"},
+            {"index": 0, "message": {"content": "{\"a\": 1}"}, "finish_reason": "stop"},
+        ],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+    }
+    with patch.object(OpenAISyncClient, "complete", return_value=api_response) as complete:
+        response = legacy_adapter.chat([UserMessage("hi")], n=2, json_schema={"type": "object"})
+    complete.assert_called_once()
+    assert complete.call_args.kwargs["n"] == 2
+    assert [c.parsed_json for c in response.candidates] == [{"a": 1}, {"a": 2}]
+    assert response.content == "{\"a\": 1}" and response.usage.input_tokens == 100
+    assert all(c.usage is None for c in response.candidates)
+    pricing = legacy_adapter.pricing
+    assert response.cost_total == pytest.approx(100 * pricing.in_per_token + 20 * pricing.out_per_token)
+
+
+@pytest.mark.unit
+def test_n_falls_back_to_parallel_calls_on_responses_api(adapter):
+    api_response = {
+        "id": "r1",
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": "hi"}]}],
+        "usage": {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    }
+    with patch.object(OpenAISyncClient, "complete", return_value=api_response) as complete:
+        response = adapter.chat([UserMessage("hi")], n=3)
+    assert complete.call_count == 3
+    assert "n" not in complete.call_args.kwargs
+    assert len(response.candidates) == 3
+    assert (response.usage.input_tokens, response.usage.output_tokens) == (30, 15)
+    assert response.cost_total == pytest.approx(sum(c.cost_total for c in response.candidates))
+    assert adapter.estimate_cost([UserMessage("hi")], max_tokens=10, n=3).max_output_tokens == 30
+    with pytest.raises(ValueError):
+        adapter.chat([UserMessage("hi")], n=2, on_stream=lambda event: None)
+
+
+@pytest.mark.unit
+def test_service_tier_is_sent_and_priced_at_the_served_tier(adapter):
+    api_response = {
+        "id": "r1",
+        "service_tier": "flex",
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": "hi"}]}],
+        "usage": {"input_tokens": 1000, "output_tokens": 100, "total_tokens": 1100},
+    }
+    with patch.object(OpenAISyncClient, "complete", return_value=api_response) as complete:
+        response = adapter.chat([UserMessage("hi")], service_tier="flex")
+    assert complete.call_args.kwargs["service_tier"] == "flex"
+    assert response.service_tier == "flex"
+    flex = adapter.pricing.tiers["flex"]
+    assert response.cost_total == pytest.approx(1000 * flex.in_per_token + 100 * flex.out_per_token)
+    assert flex.in_per_token < adapter.pricing.in_per_token
+    standard = adapter.estimate_cost([UserMessage("hi")], max_tokens=10)
+    priority = adapter.estimate_cost([UserMessage("hi")], max_tokens=10, service_tier="priority")
+    assert priority.cost_total > standard.cost_total
+    with pytest.raises(ValueError):
+        adapter.chat([UserMessage("hi")], service_tier="economy")
+
+
+@pytest.mark.unit
+def test_prediction_is_forwarded_and_prediction_tokens_parsed(legacy_adapter):
+    api_response = {
+        "id": "c1",
+        "choices": [{"index": 0, "message": {"content": "x = 2"}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": 50,
+            "completion_tokens": 30,
+            "total_tokens": 80,
+            "completion_tokens_details": {
+                "accepted_prediction_tokens": 20,
+                "rejected_prediction_tokens": 6,
+            },
+        },
+    }
+    with patch.object(OpenAISyncClient, "complete", return_value=api_response) as complete:
+        response = legacy_adapter.chat([UserMessage("edit")], prediction="x = 1")
+    assert complete.call_args.kwargs["prediction"] == {"type": "content", "content": "x = 1"}
+    usage = response.usage
+    assert (usage.accepted_prediction_tokens, usage.rejected_prediction_tokens) == (20, 6)
+    pricing = legacy_adapter.pricing
+    assert response.cost_output == pytest.approx(30 * pricing.out_per_token)
+
+
+@pytest.mark.unit
+def test_prediction_is_ignored_with_a_warning_on_responses_api(adapter):
+    api_response = {
+        "id": "r1",
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": "hi"}]}],
+        "usage": {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    }
+    with patch.object(OpenAISyncClient, "complete", return_value=api_response) as complete:
+        with pytest.warns(UserWarning, match="predicted outputs"):
+            adapter.chat([UserMessage("hi")], prediction="hello")
+    assert "prediction" not in complete.call_args.kwargs
+
+
+@pytest.mark.unit
+def test_lazy_chat_defers_content_and_parsed_json(adapter):
+    api_response = {
+        "id": "r1",
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": "{\"a\": 1}"}]}],
+        "usage": {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    }
+    with patch.object(OpenAISyncClient, "complete", return_value=api_response):
+        response = adapter.chat([UserMessage("hi")], json_schema={"type": "object"}, lazy=True)
+    assert isinstance(response, LazyChatResponse)
+    assert response.cost_total is not None and not response.is_parsed
+    assert response.parsed_json == {"a": 1}
+    assert response.is_parsed
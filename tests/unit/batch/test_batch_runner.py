@@ -0,0 +1,155 @@
+import json
+import pickle
+import threading
+
+import pytest
+
+from src.llm_api_adapter.batch import AdapterChat, BatchRunner, RowProcessor
+from src.llm_api_adapter.errors.llm_api_error import LLMAPIClientError
+from src.llm_api_adapter.gateway.mock import mock_adapter_factory
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse, Usage
+from src.llm_api_adapter.run import main
+
+
+def write_rows(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"custom_id": f"r{i}", "body": {"messages": [{"role": "user", "content": f"q{i}"}]}}) + "\n")
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class CountingChat:
+    def __init__(self, fail_on=()):
+        self.calls = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def __call__(self, messages, **kwargs):
+        content = messages[-1].content
+        with self.lock:
+            self.calls.append(content)
+        if content in self.fail_on:
+            raise LLMAPIClientError(detail="bad request")
+        return ChatResponse(content=content.upper(), usage=Usage(3, 1, 4), cost_total=0.5, currency="USD")
+
+
+@pytest.mark.unit
+def test_runs_rows_and_writes_results_and_errors(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_rows(source, 5)
+    with open(source, "a") as f:
+        f.write("\nnot json\n")
+    chat = CountingChat(fail_on={"q2"})
+    runner = BatchRunner(RowProcessor(chat, defaults={"max_tokens": 10}, retries=0), concurrency=3)
+    summary = runner.run(str(source), str(output))
+    records = {r["line"]: r for r in read_records(output)}
+    assert sorted(records) == [1, 2, 3, 4, 5, 7]
+    assert records[1]["id"] == "r0" and records[1]["content"] == "Q0"
+    assert records[3]["status"] == "error" and records[3]["error_type"] == "LLMAPIClientError"
+    assert records[7]["status"] == "error" and records[7]["id"] == 7
+    assert (summary.succeeded, summary.failed) == (4, 2)
+    assert summary.input_tokens == 12 and summary.cost_total == 2.0 and summary.currency == "USD"
+
+
+@pytest.mark.unit
+def test_malformed_rows_become_error_records(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_rows(source, 1)
+    with open(source, "a") as f:
+        f.write(json.dumps({"custom_id": "null-body", "body": None}) + "\n")
+        f.write(json.dumps({"custom_id": "bad-messages", "body": {"messages": [None]}}) + "\n")
+    runner = BatchRunner(RowProcessor(CountingChat(), retries=0), concurrency=1)
+    summary = runner.run(str(source), str(output))
+    records = {r["line"]: r for r in read_records(output)}
+    assert records[1]["status"] == "ok"
+    assert records[2]["status"] == "error" and records[2]["id"] == "null-body"
+    assert records[3]["status"] == "error" and records[3]["id"] == "bad-messages"
+    assert (summary.succeeded, summary.failed) == (1, 2)
+
+
+@pytest.mark.unit
+def test_resume_skips_completed_rows_and_recovers_unsaved_ones(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_rows(source, 10)
+    first = CountingChat()
+    BatchRunner(RowProcessor(first), concurrency=1, checkpoint_every=3).run(str(source), str(output))
+    # Simulate a crash: drop the last rows and tear the final line.
+    lines = open(output).read().splitlines(keepends=True)
+    with open(output, "w") as f:
+        f.writelines(lines[:7])
+        f.write(lines[7][:10])
+    checkpoint = json.load(open(str(output) + ".checkpoint"))
+    checkpoint.update(watermark=3, done=[], output_offset=len("".join(lines[:3])))
+    checkpoint["summary"].update(succeeded=3, input_tokens=9, output_tokens=3, cost_total=1.5)
+    json.dump(checkpoint, open(str(output) + ".checkpoint", "w"))
+
+    second = CountingChat()
+    summary = BatchRunner(RowProcessor(second), concurrency=2).run(str(source), str(output))
+    assert len(second.calls) == 3
+    assert sorted(r["line"] for r in read_records(output)) == list(range(1, 11))
+    assert summary.succeeded == 10 and summary.cost_total == 5.0
+
+
+@pytest.mark.unit
+def test_restart_overwrites_previous_output(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_rows(source, 4)
+    BatchRunner(RowProcessor(CountingChat())).run(str(source), str(output))
+    chat = CountingChat()
+    BatchRunner(RowProcessor(chat)).run(str(source), str(output))
+    assert chat.calls == []
+    BatchRunner(RowProcessor(chat)).run(str(source), str(output), resume=False)
+    assert len(chat.calls) == 4 and len(read_records(output)) == 4
+
+
+@pytest.mark.unit
+def test_cli_runs_against_mock_adapter(tmp_path, capsys):
+    source = tmp_path / "prompts.jsonl"
+    write_rows(source, 6)
+    main([str(source), "--org", "openai", "--model", "echo", "--concurrency", "4", "--mock-latency-s", "0"])
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["output"] == str(tmp_path / "prompts.out.jsonl")
+    assert summary["succeeded"] == 6 and summary["failed"] == 0
+    assert {r["content"] for r in read_records(tmp_path / "prompts.out.jsonl")} == {f"q{i}" for i in range(6)}
+
+
+@pytest.mark.unit
+def test_adapter_chat_builds_one_adapter_per_copy():
+    chat = AdapterChat("openai", "echo", adapter_factory=mock_adapter_factory())
+    assert chat(messages=[{"role": "user", "content": "hi"}]).content == "hi"
+    copy = pickle.loads(pickle.dumps(chat))
+    assert copy._adapter is None
+    assert copy(messages=[{"role": "user", "content": "yo"}]).content == "yo"
+    assert copy.adapter is not chat.adapter
+
+
+@pytest.mark.unit
+def test_pickled_adapter_chat_opens_its_own_connections():
+    chat = AdapterChat("openai", "gpt-4o", api_keys=["k"])
+    parent_session = chat.adapter.adapter._session
+    copy = pickle.loads(pickle.dumps(chat))
+    assert copy.adapter.adapter._session is not parent_session
+    data = pickle.dumps(chat.adapter.adapter)
+    assert b"requests.sessions" not in data
+    adapter = pickle.loads(data)
+    assert adapter._session is not parent_session and adapter.api_key == "k"
+
+@pytest.mark.unit
+def test_process_pool_mode_aggregates_worker_chunks(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_rows(source, 25)
+    with open(source, "a") as f:
+        f.write("[1]\n")
+    chat = AdapterChat("openai", "echo", adapter_factory=mock_adapter_factory())
+    runner = BatchRunner(RowProcessor(chat), concurrency=6, processes=2, checkpoint_every=5)
+    assert runner.chunk_size == 3
+    summary = runner.run(str(source), str(output))
+    records = read_records(output)
+    assert sorted(r["line"] for r in records) == list(range(1, 27))
+    assert (summary.succeeded, summary.failed) == (25, 1)
+    assert summary.output_tokens == sum(r["usage"]["output_tokens"] for r in records if r["status"] == "ok")
+    assert not json.load(open(str(output) + ".checkpoint"))["done"]
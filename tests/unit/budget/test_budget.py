@@ -0,0 +1,121 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.budget import Budget, run_within_budgets
+from src.llm_api_adapter.errors import LLMAPIBudgetExceededError
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+from src.llm_api_adapter.routing import HedgingPolicy
+from src.llm_api_adapter.universal_adapter import UniversalLLMAPIAdapter
+
+
+def priced(model, cost):
+    return ChatResponse(content=model, model=model, cost_total=cost, currency="USD")
+
+
+@pytest.mark.unit
+def test_estimate_cost_is_worst_case_input_plus_max_tokens():
+    adapter = OpenAIAdapter(model="gpt-4o", api_key="k")
+    estimate = adapter.estimate_cost([UserMessage("abcd" * 100)], max_tokens=1000)
+    assert estimate.input_tokens >= 100
+    assert estimate.cost_output == pytest.approx(1000 * 10.0 / 1_000_000)
+    assert estimate.cost_total == pytest.approx(estimate.cost_input + estimate.cost_output)
+    assert estimate.currency == "USD"
+
+
+@pytest.mark.unit
+def test_reservations_are_settled_with_actual_cost():
+    budget = Budget(limit=1.0)
+    response = run_within_budgets([budget], lambda model: 0.6, lambda model: priced("m", 0.25))
+    assert response.cost_total == 0.25
+    assert budget.snapshot()["spent"] == 0.25 and budget.snapshot()["reserved"] == 0.0
+    with pytest.raises(LLMAPIBudgetExceededError) as exc_info:
+        run_within_budgets([budget], lambda model: 0.8, lambda model: priced("m", 0.1))
+    assert exc_info.value.required == 0.8 and exc_info.value.spent == 0.25
+
+
+@pytest.mark.unit
+def test_failed_call_releases_its_reservation():
+    budget = Budget(limit=1.0)
+
+    def fail(model):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_within_budgets([budget], lambda model: 0.9, fail)
+    assert budget.remaining == 1.0
+
+
+@pytest.mark.unit
+def test_concurrent_calls_cannot_overrun_the_limit():
+    budget = Budget(limit=1.0)
+    release = threading.Event()
+    outcomes = []
+
+    def call(model):
+        release.wait(2)
+        return priced("m", 0.3)
+
+    def worker():
+        try:
+            outcomes.append(run_within_budgets([budget], lambda model: 0.3, call))
+        except LLMAPIBudgetExceededError as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    while sum(isinstance(o, LLMAPIBudgetExceededError) for o in outcomes) < 2:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert sum(isinstance(o, ChatResponse) for o in outcomes) == 3
+    assert budget.snapshot()["spent"] == pytest.approx(0.9)
+
+
+@pytest.mark.unit
+def test_adapter_downgrades_when_budget_is_exhausted():
+    budget = Budget(limit=0.01, downgrade_to="gpt-4o-mini", hard_limit=0.02)
+    seen = []
+
+    def chat(self, **kwargs):
+        seen.append(self.model)
+        return priced(self.model, 0.0095)
+
+    with patch.object(OpenAIAdapter, "chat", autospec=True, side_effect=chat):
+        adapter = UniversalLLMAPIAdapter(
+            organization="openai", model="gpt-4o", api_key="k", budget=budget
+        )
+        messages = [UserMessage("hi")]
+        adapter.chat(messages=messages, max_tokens=100)
+        adapter.chat(messages=messages, max_tokens=100)
+        adapter.chat(messages=messages, max_tokens=100)
+        with pytest.raises(LLMAPIBudgetExceededError):
+            adapter.chat(messages=messages, max_tokens=100)
+    assert seen == ["gpt-4o", "gpt-4o-mini", "gpt-4o-mini"]
+
+
+@pytest.mark.unit
+def test_per_call_budget_is_charged_with_adapter_budget():
+    tenant, shared = Budget(limit=1.0, name="tenant"), Budget(limit=5.0, name="global")
+    with patch.object(OpenAIAdapter, "chat", return_value=priced("gpt-4o", 0.4)):
+        adapter = UniversalLLMAPIAdapter(
+            organization="openai", model="gpt-4o", api_key="k", budget=shared
+        )
+        adapter.chat(messages=[UserMessage("hi")], budget=tenant)
+        adapter.chat(messages=[UserMessage("hi")])
+    assert tenant.snapshot()["spent"] == pytest.approx(0.4)
+    assert shared.snapshot()["spent"] == pytest.approx(0.8)
+
+
+@pytest.mark.unit
+def test_budgeted_call_cannot_be_hedged():
+    adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", api_key="k")
+    with patch.object(OpenAIAdapter, "chat") as chat:
+        with pytest.raises(ValueError, match="hedge"):
+            adapter.chat(messages=[UserMessage("hi")], budget=Budget(limit=1.0), hedge=HedgingPolicy())
+    chat.assert_not_called()
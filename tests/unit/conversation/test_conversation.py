@@ -0,0 +1,183 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.conversation import Conversation
+from src.llm_api_adapter.errors.llm_api_error import LLMAPIClientError, LLMAPITokenLimitError
+from src.llm_api_adapter.llm_registry.llm_registry import LLM_REGISTRY
+from src.llm_api_adapter.llms.openai.sync_client import OpenAISyncClient
+from src.llm_api_adapter.models.messages.chat_message import (
+    AIMessage,
+    Prompt,
+    ToolMessage,
+    UserMessage,
+)
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+from src.llm_api_adapter.models.tools import ToolCall
+from src.llm_api_adapter.universal_adapter import UniversalLLMAPIAdapter
+
+TEXT = "word " * 400  # ~500 estimated tokens
+
+
+@pytest.fixture
+def adapter():
+    return OpenAIAdapter(model="gpt-4o", api_key="k")
+
+
+def history():
+    return [
+        Prompt("Be brief."),
+        UserMessage(TEXT),
+        AIMessage("", tool_calls=[ToolCall(name="search", arguments={"q": "a"}, call_id="c1")]),
+        ToolMessage(TEXT, tool_call_id="c1"),
+        AIMessage("first answer"),
+        UserMessage(TEXT),
+        AIMessage("second answer"),
+        UserMessage("latest question"),
+    ]
+
+
+@pytest.mark.unit
+def test_registry_and_adapter_expose_context_window_and_max_output(adapter):
+    spec = LLM_REGISTRY.providers["openai"].models["gpt-4o"]
+    assert (spec.context_window, spec.max_output) == (128000, 16384)
+    assert (adapter.context_window, adapter.max_output) == (128000, 16384)
+    assert all(
+        model.context_window and model.max_output
+        for provider in LLM_REGISTRY.providers.values()
+        for model in provider.models.values()
+    )
+
+
+@pytest.mark.unit
+def test_everything_is_sent_when_it_fits(adapter):
+    conversation = Conversation(adapter, history())
+    assert conversation.fit(max_tokens=100) == conversation.messages
+
+
+@pytest.mark.unit
+def test_oldest_turns_are_dropped_with_their_tool_results(adapter):
+    conversation = Conversation(adapter, history(), context_window=1200, headroom=0)
+    sent = conversation.fit(max_tokens=100)
+    assert sent[0] == Prompt("Be brief.")
+    assert sent[1:] == history()[5:]
+    assert not any(isinstance(m, ToolMessage) for m in sent)
+    assert len(conversation.messages) == 8
+
+
+@pytest.mark.unit
+def test_latest_turn_that_cannot_fit_raises_before_sending(adapter):
+    conversation = Conversation(adapter, [UserMessage(TEXT)], context_window=300, headroom=0)
+    with pytest.raises(LLMAPITokenLimitError):
+        conversation.fit(max_tokens=10)
+
+
+@pytest.mark.unit
+def test_dropped_turns_are_summarized_once(adapter):
+    calls = []
+
+    def summarize(messages, previous):
+        calls.append((len(messages), previous))
+        return "user searched for a"
+
+    conversation = Conversation(
+        adapter, history(), context_window=1400, headroom=0, summarize=summarize, summary_tokens=50
+    )
+    sent = conversation.fit(max_tokens=100)
+    assert sent[0].content.startswith("Be brief.")
+    assert "user searched for a" in sent[0].content
+    assert sent[-1] == UserMessage("latest question")
+    assert calls == [(4, None)]
+    conversation.fit(max_tokens=100)
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_chat_sends_trimmed_history_and_records_reply():
+    with patch.object(OpenAIAdapter, "chat", return_value=ChatResponse(content="hello")) as chat:
+        adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", api_key="k")
+        conversation = Conversation(adapter, [Prompt("Be brief.")])
+        response = conversation.chat("hi", max_tokens=50)
+    assert response.content == "hello"
+    assert chat.call_args.kwargs["messages"] == [Prompt("Be brief."), UserMessage("hi")]
+    assert conversation.messages[-1] == AIMessage("hello")
+
+
+def responses_reply(response_id, text):
+    return {
+        "id": response_id,
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}],
+        "usage": {"input_tokens": 10, "output_tokens": 2, "total_tokens": 12},
+    }
+
+
+@pytest.mark.unit
+def test_stateful_conversation_sends_only_new_turns():
+    adapter = OpenAIAdapter(model="gpt-5", api_key="k")
+    conversation = Conversation(adapter, [Prompt("Be brief.")], stateful=True)
+    replies = [responses_reply("resp_1", "one"), responses_reply("resp_2", "two")]
+    with patch.object(OpenAISyncClient, "complete", side_effect=replies) as complete:
+        conversation.chat("first", max_tokens=50)
+        conversation.chat("second", max_tokens=50)
+    first, second = (call.kwargs for call in complete.call_args_list)
+    assert "previous_response_id" not in first and len(first["input"]) == 1
+    assert second["previous_response_id"] == "resp_1"
+    assert second["instructions"] == "Be brief."
+    assert len(second["input"]) == 1 and "second" in str(second["input"])
+    assert len(conversation.messages) == 5
+
+
+@pytest.mark.unit
+def test_stateful_conversation_resends_history_when_the_response_expired():
+    adapter = OpenAIAdapter(model="gpt-5", api_key="k")
+    conversation = Conversation(adapter, stateful=True)
+    replies = [
+        responses_reply("resp_1", "one"),
+        LLMAPIClientError(detail="Previous response with id 'resp_1' not found."),
+        responses_reply("resp_2", "two"),
+        responses_reply("resp_3", "three"),
+    ]
+    with patch.object(OpenAISyncClient, "complete", side_effect=replies) as complete:
+        conversation.chat("first", max_tokens=50)
+        conversation.chat("second", max_tokens=50)
+        conversation.chat("third", max_tokens=50)
+    calls = [call.kwargs for call in complete.call_args_list]
+    assert calls[1]["previous_response_id"] == "resp_1"
+    assert "previous_response_id" not in calls[2] and len(calls[2]["input"]) == 3
+    assert calls[3]["previous_response_id"] == "resp_2" and len(calls[3]["input"]) == 1
+
+
+@pytest.mark.unit
+def test_stateful_conversation_resends_history_without_server_state_or_when_trimmed(adapter):
+    with patch.object(OpenAIAdapter, "chat", return_value=ChatResponse(response_id="c1", content="ok")) as chat:
+        conversation = Conversation(adapter, stateful=True)
+        conversation.chat("first", max_tokens=50)
+        conversation.chat("second", max_tokens=50)
+    assert "previous_response" not in chat.call_args.kwargs
+    assert len(chat.call_args.kwargs["messages"]) == 3
+    stateful = OpenAIAdapter(model="gpt-5", api_key="k")
+    with patch.object(OpenAIAdapter, "chat", return_value=ChatResponse(response_id="r1", content="ok")) as chat:
+        conversation = Conversation(stateful, context_window=1100, headroom=0, stateful=True)
+        conversation.chat(TEXT, max_tokens=100)
+        conversation.chat(TEXT, max_tokens=100)
+    assert "previous_response" not in chat.call_args.kwargs
+    assert chat.call_args.kwargs["messages"] == [UserMessage(TEXT)]
+
+
+@pytest.mark.unit
+def test_stateful_conversation_continues_the_chain_after_a_trimmed_resend():
+    adapter = OpenAIAdapter(model="gpt-5", api_key="k")
+    replies = [ChatResponse(response_id=f"r{i}", content="ok") for i in range(1, 5)]
+    with patch.object(OpenAIAdapter, "chat", side_effect=replies) as chat:
+        conversation = Conversation(adapter, context_window=1100, headroom=0, stateful=True)
+        conversation.chat(TEXT, max_tokens=100)
+        conversation.chat(TEXT, max_tokens=100)
+        conversation.chat("short", max_tokens=100)
+        conversation.chat("shorter", max_tokens=100)
+    calls = [call.kwargs for call in chat.call_args_list]
+    assert "previous_response" not in calls[1] and calls[1]["messages"] == [UserMessage(TEXT)]
+    assert calls[2]["previous_response"].response_id == "r2"
+    assert calls[2]["messages"] == [UserMessage("short")]
+    assert calls[3]["previous_response"].response_id == "r3"
+    assert calls[3]["messages"] == [UserMessage("shorter")]
@@ -0,0 +1,236 @@
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.anthropic_adapter import AnthropicAdapter
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.errors.llm_api_error import (
+    LLMAPIAuthorizationError,
+    LLMAPIServerError,
+)
+from src.llm_api_adapter.gateway import Gateway, MockAdapter, mock_adapter_factory
+from src.llm_api_adapter.gateway.__main__ import rate_limiters_from_args
+from src.llm_api_adapter.limits.rate_limiter import RateLimiter
+from src.llm_api_adapter.models.messages.chat_message import (
+    AIMessage,
+    Prompt,
+    ToolMessage,
+    UserMessage,
+)
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse, Usage
+from src.llm_api_adapter.models.tools import ToolCall
+from src.llm_api_adapter.utils.bounded_cache import BoundedCache
+
+
+def post(gateway, path, body, headers=None):
+    return gateway.handle("POST", path, headers or {}, json.dumps(body).encode())
+
+
+def reply(**kwargs):
+    return ChatResponse(usage=Usage(5, 2, 7), response_id="r1", **kwargs)
+
+
+@pytest.mark.unit
+def test_chat_completions_dispatches_through_universal_adapter():
+    gateway = Gateway(api_keys={"openai": "k"})
+    body = {
+        "model": "gpt-4o",
+        "messages": [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "hi"}],
+        "max_tokens": 20,
+        "tools": [{"type": "function", "function": {"name": "lookup", "parameters": {"type": "object"}}}],
+        "tool_choice": "required",
+    }
+    response = reply(tool_calls=[ToolCall(name="lookup", arguments={"q": 1}, call_id="c1")])
+    with patch.object(OpenAIAdapter, "chat", return_value=response) as chat:
+        status, _, payload = post(gateway, "/v1/chat/completions", body)
+    assert status == 200
+    kwargs = chat.call_args.kwargs
+    assert kwargs["messages"] == [Prompt("Be brief."), UserMessage("hi")]
+    assert kwargs["max_tokens"] == 20 and kwargs["tool_choice"] == "any"
+    assert kwargs["tools"][0].name == "lookup"
+    choice = payload["choices"][0]
+    assert choice["finish_reason"] == "tool_calls"
+    assert json.loads(choice["message"]["tool_calls"][0]["function"]["arguments"]) == {"q": 1}
+    assert payload["usage"] == {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+
+
+@pytest.mark.unit
+def test_responses_input_items_and_defaults():
+    gateway = Gateway(api_keys={"anthropic": "k"})
+    body = {
+        "model": "anthropic/claude-sonnet-4-5",
+        "instructions": "Be brief.",
+        "input": [
+            {"role": "user", "content": [{"type": "input_text", "text": "weather?"}]},
+            {"type": "function_call", "call_id": "c1", "name": "weather", "arguments": "{\"city\": \"Oslo\"}"},
+            {"type": "function_call_output", "call_id": "c1", "output": "rain"},
+        ],
+        "text": {"format": {"type": "json_schema", "schema": {"type": "object"}}},
+    }
+    with patch.object(AnthropicAdapter, "chat", return_value=reply(content="Rain.", finish_reason="end_turn")) as chat:
+        status, _, payload = post(gateway, "/v1/responses", body)
+    assert status == 200
+    kwargs = chat.call_args.kwargs
+    assert kwargs["messages"] == [
+        Prompt("Be brief."),
+        UserMessage("weather?"),
+        AIMessage("", tool_calls=[ToolCall(name="weather", arguments={"city": "Oslo"}, call_id="c1")]),
+        ToolMessage("rain", tool_call_id="c1"),
+    ]
+    assert kwargs["max_tokens"] == 4096
+    assert kwargs["json_schema"] == {"type": "object"}
+    assert payload["object"] == "response" and payload["status"] == "completed"
+    assert payload["output_text"] == "Rain."
+    assert payload["output"][0]["content"][0]["text"] == "Rain."
+
+
+@pytest.mark.unit
+def test_errors_map_to_openai_error_responses():
+    gateway = Gateway(api_keys={"openai": "k"}, retries=0)
+    body = {"model": "openai/gpt-4o", "messages": [{"role": "user", "content": "hi"}]}
+    with patch.object(OpenAIAdapter, "chat", side_effect=LLMAPIAuthorizationError(detail="bad key")):
+        status, _, payload = post(gateway, "/v1/chat/completions", body)
+    assert status == 401 and payload["error"]["type"] == "authentication_error"
+    assert post(gateway, "/v1/chat/completions", {"model": "nope", "messages": []})[0] == 400
+    assert post(gateway, "/v1/chat/completions", {**body, "model": "google/gemini-2.5-flash"})[0] == 400
+    assert gateway.handle("POST", "/v1/other", {}, b"{}")[0] == 404
+    assert gateway.handle("POST", "/v1/chat/completions", {}, b"not json")[0] == 400
+
+
+@pytest.mark.unit
+def test_retries_upstream_errors_and_caches_identical_requests():
+    gateway = Gateway(api_keys={"openai": "k"}, retry_backoff_s=0, cache=BoundedCache())
+    body = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]}
+    outcomes = [LLMAPIServerError(detail="503"), reply(content="ok")]
+
+    def chat(**kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with patch.object(OpenAIAdapter, "chat", side_effect=chat):
+        assert post(gateway, "/v1/chat/completions", body)[2]["choices"][0]["message"]["content"] == "ok"
+        assert post(gateway, "/v1/chat/completions", body)[0] == 200
+    assert gateway.stats()["retries"] == 1
+    assert gateway.stats()["cache_hits"] == 1
+
+
+@pytest.mark.unit
+def test_auth_tokens_and_in_flight_limit():
+    release = threading.Event()
+
+    class SlowAdapter(MockAdapter):
+        def chat(self, messages, **kwargs):
+            release.wait(2)
+            return super().chat(messages, **kwargs)
+
+    gateway = Gateway(
+        auth_tokens=["secret"], max_in_flight=1, adapter_factory=lambda org, model: SlowAdapter(model)
+    )
+    body = {"model": "mock/echo", "messages": [{"role": "user", "content": "hi"}]}
+    headers = {"Authorization": "Bearer secret"}
+    assert post(gateway, "/v1/chat/completions", body)[0] == 401
+    first = threading.Thread(target=post, args=(gateway, "/v1/chat/completions", body, headers))
+    first.start()
+    while gateway.stats()["requests"] < 1:
+        threading.Event().wait(0.01)
+    status, headers_out, _ = post(gateway, "/v1/chat/completions", body, headers)
+    release.set()
+    first.join()
+    assert status == 429 and headers_out["Retry-After"] == "1"
+
+
+@pytest.mark.unit
+def test_rate_limiters_apply_per_provider_across_requests():
+    limiter = RateLimiter("openai", requests_per_minute=1, max_wait_s=0)
+    gateway = Gateway(api_keys={"openai": "k", "anthropic": "k"}, retries=0, rate_limiters={"openai": limiter})
+    messages = [{"role": "user", "content": "hi"}]
+    with patch.object(OpenAIAdapter, "chat", return_value=reply(content="ok")) as chat:
+        assert post(gateway, "/v1/chat/completions", {"model": "gpt-4o", "messages": messages})[0] == 200
+        status, _, payload = post(gateway, "/v1/chat/completions", {"model": "gpt-4o-mini", "messages": messages})
+    assert (status, payload["error"]["type"]) == (429, "rate_limit_exceeded")
+    assert chat.call_count == 1
+    assert gateway.adapter("anthropic", "claude-sonnet-4-5").rate_limiter is None
+    limiters = rate_limiters_from_args(["openai=500:200000", "google=:1000"])
+    assert (limiters["openai"].requests_per_minute, limiters["openai"].tokens_per_minute) == (500, 200000)
+    assert (limiters["google"].requests_per_minute, limiters["google"].tokens_per_minute) == (None, 1000)
+    with pytest.raises(ValueError):
+        rate_limiters_from_args(["openai"])
+
+@pytest.mark.unit
+def test_auth_tokens_are_compared_as_bytes():
+    gateway = Gateway(auth_tokens=["first", "second"], adapter_factory=mock_adapter_factory())
+    body = {"model": "mock/echo", "messages": [{"role": "user", "content": "hi"}]}
+    for token, status in (("second", 200), ("secon", 401), ("s\u00e9cond", 401)):
+        assert post(gateway, "/v1/chat/completions", body, {"Authorization": f"Bearer {token}"})[0] == status
+
+@pytest.mark.unit
+def test_http_server_against_mock_provider():
+    gateway = Gateway(adapter_factory=mock_adapter_factory())
+    server = gateway.make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = "http://127.0.0.1:%d/v1/chat/completions" % server.server_address[1]
+        data = json.dumps({"model": "mock/echo", "messages": [{"role": "user", "content": "ping"}]})
+        request = urllib.request.Request(url, data=data.encode(), headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            payload = json.loads(response.read())
+        assert payload["choices"][0]["message"]["content"] == "ping"
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(url.replace("chat/completions", "missing"), data=b"{}", timeout=5)
+        assert exc_info.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("length", ["-1", "abc"])
+def test_http_server_rejects_invalid_content_length(length):
+    gateway = Gateway(adapter_factory=mock_adapter_factory())
+    server = gateway.make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        connection.putrequest("POST", "/v1/chat/completions")
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read())["error"]["message"] == "Invalid Content-Length"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@pytest.mark.unit
+def test_n_candidates_become_choices():
+    gateway = Gateway(api_keys={"openai": "k"})
+    body = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}], "n": 2}
+    response = ChatResponse.from_candidates([reply(content="a"), reply(content="b")])
+    with patch.object(OpenAIAdapter, "chat", return_value=response) as chat:
+        _, _, payload = post(gateway, "/v1/chat/completions", body)
+    assert chat.call_args.kwargs["n"] == 2
+    assert [c["message"]["content"] for c in payload["choices"]] == ["a", "b"]
+    assert [c["index"] for c in payload["choices"]] == [0, 1]
+
+
+@pytest.mark.unit
+def test_prediction_is_passed_through():
+    gateway = Gateway(api_keys={"openai": "k"})
+    prediction = {"type": "content", "content": "x = 1"}
+    body = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}], "prediction": prediction}
+    response = reply(content="x = 2")
+    response.usage.accepted_prediction_tokens = 4
+    with patch.object(OpenAIAdapter, "chat", return_value=response) as chat:
+        _, _, payload = post(gateway, "/v1/chat/completions", body)
+    assert chat.call_args.kwargs["prediction"] == prediction
+    assert payload["usage"]["completion_tokens_details"]["accepted_prediction_tokens"] == 4
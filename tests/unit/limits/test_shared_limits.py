@@ -0,0 +1,135 @@
+import multiprocessing
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.budget import Budget
+from src.llm_api_adapter.errors.llm_api_error import LLMAPIRateLimitError
+from src.llm_api_adapter.limits import (
+    Bucket,
+    MemoryStateStore,
+    RateLimiter,
+    SQLiteStateStore,
+)
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse, Usage
+from src.llm_api_adapter.universal_adapter import UniversalLLMAPIAdapter
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStateStore()
+    return SQLiteStateStore(str(tmp_path / "state.db"))
+
+
+def reserve_loop(path, attempts, granted):
+    budget = Budget(limit=5.0, name="shared", store=SQLiteStateStore(path))
+    count = 0
+    for _ in range(attempts):
+        if budget.reserve(0.125):
+            budget.settle(0.125, 0.125)
+            count += 1
+    granted.put(count)
+
+
+@pytest.mark.unit
+def test_bucket_grants_all_or_nothing_and_reports_wait(store):
+    buckets = [Bucket("r", 1, 2, 1.0), Bucket("t", 50, 100, 10.0)]
+    assert store.acquire_buckets(buckets) == 0.0
+    assert store.acquire_buckets(buckets) == 0.0
+    wait_s = store.acquire_buckets(buckets)
+    assert 4.9 < wait_s <= 5.0
+    assert store.acquire_buckets([Bucket("t", 1, 100, 10.0)]) > 0
+    assert store.acquire_buckets([Bucket("t", -30, 100, 10.0)]) == 0.0
+    assert store.acquire_buckets([Bucket("t", 30, 100, 10.0)]) == 0.0
+
+
+@pytest.mark.unit
+def test_budget_totals_are_shared_through_the_store(store):
+    first = Budget(limit=1.0, name="team", store=store)
+    second = Budget(limit=1.0, name="team", store=store)
+    assert first.reserve(0.6)
+    assert not second.reserve(0.6)
+    first.settle(0.6, 0.5)
+    assert second.snapshot()["spent"] == 0.5 and second.remaining == 0.5
+    assert second.reserve(0.5)
+    assert first.exceeded_error(0.1).spent == 0.5
+    second.reset()
+    assert first.remaining == 1.0 and first.spent == 0.0
+
+
+@pytest.mark.unit
+def test_sqlite_budget_is_never_overrun_by_concurrent_processes(tmp_path):
+    path = str(tmp_path / "state.db")
+    SQLiteStateStore(path)
+    context = multiprocessing.get_context("fork")
+    granted = context.Queue()
+    workers = [context.Process(target=reserve_loop, args=(path, 40, granted)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    assert sum(granted.get(timeout=5) for _ in workers) == 40
+    assert Budget(limit=5.0, name="shared", store=SQLiteStateStore(path)).snapshot()["reserved"] == 0
+
+
+@pytest.mark.unit
+def test_sqlite_transaction_keeps_the_error_when_sqlite_already_rolled_back(tmp_path):
+    store = SQLiteStateStore(str(tmp_path / "state.db"))
+    with pytest.raises(ValueError, match="original"):
+        with store._transaction() as cursor:
+            cursor.execute("ROLLBACK")
+            raise ValueError("original")
+    assert store.budget_totals("b") == (0.0, 0.0)
+
+@pytest.mark.unit
+def test_sqlite_store_pickles_as_its_path(tmp_path):
+    store = SQLiteStateStore(str(tmp_path / "state.db"))
+    store.reserve_budget("b", 1.0, 10.0)
+    copy = pickle.loads(pickle.dumps(store))
+    assert copy.budget_totals("b") == (0.0, 1.0)
+
+
+@pytest.mark.unit
+def test_rate_limiter_waits_and_gives_up_after_max_wait():
+    limiter = RateLimiter("p", requests_per_minute=600, max_wait_s=0.5)
+    for _ in range(600):
+        limiter.acquire()
+    assert 0.05 < limiter.acquire() < 0.5
+    slow = RateLimiter("q", requests_per_minute=1, max_wait_s=0.1)
+    slow.acquire()
+    with pytest.raises(LLMAPIRateLimitError):
+        slow.acquire()
+
+
+@pytest.mark.unit
+def test_universal_adapter_takes_estimated_tokens_and_refunds_unused():
+    store = MemoryStateStore()
+    limiter = RateLimiter("openai", requests_per_minute=60, tokens_per_minute=6000, store=store)
+    response = ChatResponse(content="ok", usage=Usage(20, 10, 30))
+    with patch.object(OpenAIAdapter, "chat", return_value=response):
+        adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", api_key="k", rate_limiter=limiter)
+        adapter.chat(messages=[UserMessage("hello")], max_tokens=500)
+    level, _ = store._buckets["openai:tokens"]
+    assert 5969 < level <= 5971
+    assert store._buckets["openai:requests"][0] == pytest.approx(59, abs=0.01)
+
+
+@pytest.mark.unit
+def test_universal_adapter_debits_usage_over_the_estimate_and_refunds_failures():
+    store = MemoryStateStore()
+    limiter = RateLimiter("openai", tokens_per_minute=6000, store=store)
+    response = ChatResponse(content="ok", usage=Usage(20, 980, 1000))
+    with patch.object(OpenAIAdapter, "chat", return_value=response):
+        adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", api_key="k", rate_limiter=limiter)
+        adapter.chat(messages=[UserMessage("hello")])
+    assert 4999 < store._buckets["openai:tokens"][0] <= 5001
+    with patch.object(OpenAIAdapter, "chat", side_effect=LLMAPIRateLimitError(detail="429")):
+        with pytest.raises(LLMAPIRateLimitError):
+            adapter.chat(messages=[UserMessage("hello")], max_tokens=500)
+    assert 4999 < store._buckets["openai:tokens"][0] <= 5002
+    limiter.adjust(-6000)
+    assert store._buckets["openai:tokens"][0] < 0
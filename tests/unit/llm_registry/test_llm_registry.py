@@ -30,6 +30,19 @@ def test_model_and_provider_from_dict():
     assert "gpt-test" in provider.models
     assert isinstance(provider.models["gpt-test"], ModelSpec)
 
+@pytest.mark.unit
+def test_pricing_tiers_from_dict():
+    pricing = Pricing.from_dict({
+        "in_per_1m": 2.0, "out_per_1m": 8.0,
+        "tiers": {"flex": {"in_per_1m": 1.0, "out_per_1m": 4.0}},
+    })
+    pricing.set_currency("EUR")
+    flex = pricing.for_tier("flex")
+    assert pytest.approx(flex.out_per_token, rel=1e-9) == 4.0 / 1_000_000
+    assert flex.currency == "EUR"
+    assert pricing.for_tier("priority") is pricing
+    assert pricing.for_tier(None) is pricing
+
 @pytest.mark.unit
 def test_registry_reads_json_and_module_loads_llm_registry(tmp_path):
     content = {
@@ -0,0 +1,135 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.llm_api_adapter.errors.llm_api_error import (
+    LLMAPICircuitOpenError,
+    LLMAPIClientError,
+    LLMAPIServerError,
+)
+from src.llm_api_adapter.llms.circuit_breaker import (
+    CIRCUIT_BREAKERS,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+from src.llm_api_adapter.llms.openai.sync_client import OpenAISyncClient
+
+
+@pytest.fixture
+def breakers():
+    CIRCUIT_BREAKERS.enable(window_size=4, min_calls=4, open_duration_s=60)
+    yield CIRCUIT_BREAKERS
+    CIRCUIT_BREAKERS.disable()
+
+
+def http_error(status_code):
+    response = Mock(status_code=status_code)
+    response.json.return_value = {"error": {"message": "boom"}}
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+        f"{status_code} error", response=response
+    )
+    return response
+
+
+@pytest.mark.unit
+def test_opens_on_failure_rate_and_fails_fast():
+    breaker = CircuitBreaker(endpoint="e", window_size=4, min_calls=4, failure_rate_threshold=0.5)
+    for failed in (False, True, False):
+        breaker.before_call()
+        breaker.record(0.1, failed)
+    assert breaker.state == "closed"
+    breaker.record(0.1, True)
+    assert breaker.state == "open"
+    with pytest.raises(LLMAPICircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert isinstance(exc_info.value, LLMAPIServerError)
+    assert exc_info.value.endpoint == "e"
+    assert 0 < exc_info.value.retry_after_s <= 30
+
+
+@pytest.mark.unit
+def test_opens_on_slow_call_rate():
+    breaker = CircuitBreaker(
+        min_calls=2, window_size=2, slow_call_duration_s=1.0, slow_call_rate_threshold=1.0
+    )
+    breaker.record(0.5, False)
+    breaker.record(2.0, False)
+    assert breaker.state == "closed"
+    breaker.record(3.0, False)
+    assert breaker.state == "open"
+
+
+@pytest.mark.unit
+def test_half_open_closes_after_trial_successes_and_reopens_on_failure():
+    breaker = CircuitBreaker(min_calls=1, window_size=1, open_duration_s=10, half_open_max_calls=2)
+    with patch("src.llm_api_adapter.llms.circuit_breaker.time.monotonic") as clock:
+        clock.return_value = 100.0
+        breaker.record(0.1, True)
+        assert breaker.state == "open"
+        clock.return_value = 111.0
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        breaker.before_call()
+        with pytest.raises(LLMAPICircuitOpenError):
+            breaker.before_call()
+        breaker.record(0.1, False)
+        breaker.record(0.1, False)
+        assert breaker.state == "closed"
+
+        breaker.record(0.1, True)
+        clock.return_value = 122.0
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        breaker.record(0.1, True)
+        assert breaker.state == "open"
+
+
+@pytest.mark.unit
+def test_registry_is_disabled_by_default_and_keys_by_endpoint():
+    registry = CircuitBreakerRegistry()
+    assert registry.get("https://x/v1/a") is None
+    registry.enable(min_calls=1, window_size=1)
+    assert registry.get("https://x/v1/a?key=1") is registry.get("https://x/v1/a?key=2")
+    assert registry.get("https://x/v1/a") is not registry.get("https://x/v1/b")
+    assert registry.states()["https://x/v1/a"]["state"] == "closed"
+    with pytest.raises(ValueError):
+        registry.enable(window_size=1, min_calls=5)
+
+
+@pytest.mark.unit
+def test_client_server_errors_open_circuit_and_skip_requests(breakers):
+    client = OpenAISyncClient(api_key="k")
+    with patch(
+        "src.llm_api_adapter.llms.openai.sync_client.requests.post",
+        return_value=http_error(503),
+    ) as post:
+        for _ in range(4):
+            with pytest.raises(LLMAPIServerError):
+                client.chat_completion("gpt-4", messages=[])
+        with pytest.raises(LLMAPICircuitOpenError):
+            client.chat_completion("gpt-4", messages=[])
+    assert post.call_count == 4
+    states = breakers.states()
+    assert states[OpenAISyncClient.endpoint + "/chat/completions"]["state"] == "open"
+
+
+@pytest.mark.unit
+def test_client_errors_do_not_count_but_connection_errors_do(breakers):
+    client = OpenAISyncClient(api_key="k")
+    with patch(
+        "src.llm_api_adapter.llms.openai.sync_client.requests.post",
+        return_value=http_error(400),
+    ):
+        for _ in range(4):
+            with pytest.raises(LLMAPIClientError):
+                client.chat_completion("gpt-4", messages=[])
+    assert list(breakers.states().values())[0]["failure_rate"] == 0.0
+    with patch(
+        "src.llm_api_adapter.llms.openai.sync_client.requests.post",
+        side_effect=requests.exceptions.ConnectionError("refused"),
+    ):
+        for _ in range(2):
+            with pytest.raises(LLMAPIClientError):
+                client.chat_completion("gpt-4", messages=[])
+    assert list(breakers.states().values())[0]["state"] == "open"
@@ -0,0 +1,44 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.llm_api_adapter.adapters.anthropic_adapter import AnthropicAdapter
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.llms.http_session import POOL_MAXSIZE, new_session
+from src.llm_api_adapter.llms.openai.sync_client import OpenAISyncClient
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+
+
+def ok_response(payload):
+    response = Mock(headers={})
+    response.json.return_value = payload
+    return response
+
+
+@pytest.mark.unit
+def test_new_session_keeps_a_pool_per_host():
+    session = new_session()
+    assert session.get_adapter("https://api.openai.com")._pool_maxsize == POOL_MAXSIZE
+
+
+@pytest.mark.unit
+def test_client_posts_through_its_session():
+    session = Mock()
+    session.post.return_value = ok_response({"choices": []})
+    client = OpenAISyncClient(api_key="k", session=session)
+    with patch("src.llm_api_adapter.llms.openai.sync_client.requests.post") as post:
+        client.chat_completion("gpt-4o", messages=[])
+    post.assert_not_called()
+    session.post.assert_called_once()
+
+
+@pytest.mark.unit
+def test_adapter_sends_every_request_through_one_session():
+    adapter = OpenAIAdapter(model="gpt-4o", api_key="k")
+    reply = {"choices": [{"message": {"content": "ok"}}]}
+    with patch.object(requests.Session, "post", autospec=True, return_value=ok_response(reply)) as post:
+        adapter.chat([UserMessage("a")])
+        adapter.chat([UserMessage("b")])
+    assert [call.args[0] for call in post.call_args_list] == [adapter._session] * 2
+    assert AnthropicAdapter(model="claude-sonnet-4-5", api_key="k")._session is not adapter._session
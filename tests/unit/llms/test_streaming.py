@@ -0,0 +1,224 @@
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from src.llm_api_adapter.errors.llm_api_error import (
+    LLMAPIClientError,
+    LLMAPIServerError,
+)
+from src.llm_api_adapter.llms.anthropic.stream import AnthropicStreamAccumulator
+from src.llm_api_adapter.llms.google.stream import GoogleStreamAccumulator
+from src.llm_api_adapter.llms.openai.stream import (
+    OpenAIChatStreamAccumulator,
+    OpenAIResponsesStreamAccumulator,
+)
+from src.llm_api_adapter.llms.streaming import iter_sse_events
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+
+
+def sse_response(lines):
+    response = Mock()
+    response.iter_lines.return_value = [line.encode("utf-8") for line in lines]
+    return response
+
+
+def json_items(events):
+    return [(e.key, e.value) for e in events if e.type == "json_item"]
+
+
+# ---------------------------
+# iter_sse_events
+# ---------------------------
+
+@pytest.mark.unit
+def test_iter_sse_events_parses_data_lines_and_stops_at_done():
+    response = sse_response([
+        ": keep-alive",
+        "event: message",
+        'data: {"a": 1}',
+        "",
+        'data: {"b":',
+        "data: 2}",
+        "",
+        "data: [DONE]",
+        "",
+        'data: {"ignored": true}',
+        "",
+    ])
+    assert list(iter_sse_events(response)) == [{"a": 1}, {"b": 2}]
+    response.close.assert_called_once()
+
+
+@pytest.mark.unit
+def test_iter_sse_events_maps_read_errors():
+    response = Mock()
+    response.iter_lines.side_effect = requests.exceptions.ChunkedEncodingError("reset")
+    with pytest.raises(LLMAPIClientError):
+        list(iter_sse_events(response))
+
+
+# ---------------------------
+# OpenAI Chat Completions
+# ---------------------------
+
+@pytest.mark.unit
+def test_openai_chat_accumulator_rebuilds_completion_and_emits_items():
+    events = []
+    acc = OpenAIChatStreamAccumulator(events.append, parse_json=True)
+    chunks = [
+        {"id": "c1", "model": "gpt-4o", "created": 1,
+         "choices": [{"index": 0, "delta": {"role": "assistant", "content": '{"name": '}}]},
+        {"id": "c1", "choices": [{"index": 0, "delta": {"content": '"Alice", "age"'}}]},
+        {"id": "c1", "choices": [{"index": 0, "delta": {"content": ": 30}"}, "finish_reason": "stop"}]},
+        {"id": "c1", "choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 7, "total_tokens": 12}},
+    ]
+    raw = acc.consume(iter(chunks))
+    assert json_items(events) == [("name", "Alice"), ("age", 30)]
+    response = ChatResponse.from_openai_response(raw)
+    assert response.content == '{"name": "Alice", "age": 30}'
+    assert response.response_id == "c1"
+    assert response.finish_reason == "stop"
+    assert response.usage.total_tokens == 12
+
+
+@pytest.mark.unit
+def test_openai_chat_accumulator_streams_tool_call_arguments():
+    events = []
+    acc = OpenAIChatStreamAccumulator(events.append)
+    chunks = [
+        {"choices": [{"index": 0, "delta": {"tool_calls": [
+            {"index": 0, "id": "call_1", "function": {"name": "search", "arguments": '{"query": "a"'}}
+        ]}}]},
+        {"choices": [{"index": 0, "delta": {"tool_calls": [
+            {"index": 0, "function": {"arguments": ', "limit": 3}'}}
+        ]}, "finish_reason": "tool_calls"}]},
+    ]
+    raw = acc.consume(iter(chunks))
+    assert [e.type for e in events] == ["tool_call", "tool_arguments_item", "tool_arguments_item"]
+    assert events[0].tool_name == "search" and events[0].call_id == "call_1"
+    assert [(e.key, e.value) for e in events[1:]] == [("query", "a"), ("limit", 3)]
+    response = ChatResponse.from_openai_response(raw)
+    assert response.tool_calls[0].arguments == {"query": "a", "limit": 3}
+    assert response.tool_calls[0].call_id == "call_1"
+
+
+@pytest.mark.unit
+def test_openai_chat_accumulator_raises_on_error_chunk():
+    acc = OpenAIChatStreamAccumulator(lambda e: None)
+    with pytest.raises(LLMAPIServerError):
+        acc.feed({"error": {"message": "boom"}})
+
+
+# ---------------------------
+# OpenAI Responses API
+# ---------------------------
+
+@pytest.mark.unit
+def test_openai_responses_accumulator_returns_completed_response():
+    events = []
+    acc = OpenAIResponsesStreamAccumulator(events.append, parse_json=True)
+    final = {
+        "id": "resp_1",
+        "status": "completed",
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": "[1, 2]"}]}],
+        "usage": {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3},
+    }
+    raw = acc.consume(iter([
+        {"type": "response.created", "response": {"id": "resp_1"}},
+        {"type": "response.output_text.delta", "delta": "[1,"},
+        {"type": "response.output_text.delta", "delta": " 2]"},
+        {"type": "response.completed", "response": final},
+    ]))
+    assert raw is final
+    assert json_items(events) == [(0, 1), (1, 2)]
+
+
+@pytest.mark.unit
+def test_openai_responses_accumulator_streams_function_arguments():
+    events = []
+    acc = OpenAIResponsesStreamAccumulator(events.append)
+    acc.feed({"type": "response.output_item.added", "output_index": 1,
+              "item": {"type": "function_call", "name": "lookup", "call_id": "call_9"}})
+    acc.feed({"type": "response.function_call_arguments.delta", "output_index": 1, "delta": '{"id": 7}'})
+    assert [(e.type, e.index, e.tool_name) for e in events] == [
+        ("tool_call", 1, "lookup"),
+        ("tool_arguments_item", 1, "lookup"),
+    ]
+    assert events[1].value == 7
+
+
+@pytest.mark.unit
+def test_openai_responses_accumulator_requires_completed_event():
+    acc = OpenAIResponsesStreamAccumulator(lambda e: None)
+    with pytest.raises(LLMAPIServerError):
+        acc.result()
+    with pytest.raises(LLMAPIServerError, match="overloaded"):
+        acc.feed({"type": "response.failed", "response": {"error": {"message": "overloaded"}}})
+
+
+# ---------------------------
+# Anthropic
+# ---------------------------
+
+@pytest.mark.unit
+def test_anthropic_accumulator_rebuilds_message():
+    events = []
+    acc = AnthropicStreamAccumulator(events.append, parse_json=True)
+    raw = acc.consume(iter([
+        {"type": "message_start", "message": {
+            "id": "msg_1", "model": "claude-sonnet-4-5", "content": [],
+            "usage": {"input_tokens": 10, "output_tokens": 1}}},
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": '{"a": 1, '}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": '"b": 2}'}},
+        {"type": "content_block_stop", "index": 0},
+        {"type": "content_block_start", "index": 1, "content_block": {
+            "type": "tool_use", "id": "tu_1", "name": "calc", "input": {}}},
+        {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": '{"x": '}},
+        {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": "5}"}},
+        {"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 20}},
+        {"type": "message_stop"},
+    ]))
+    assert json_items(events) == [("a", 1), ("b", 2)]
+    args = [(e.key, e.value) for e in events if e.type == "tool_arguments_item"]
+    assert args == [("x", 5)]
+    response = ChatResponse.from_anthropic_response(raw)
+    assert response.content == '{"a": 1, "b": 2}'
+    assert response.tool_calls[0].arguments == {"x": 5}
+    assert response.finish_reason == "tool_use"
+    assert response.usage.input_tokens == 10
+    assert response.usage.output_tokens == 20
+
+
+@pytest.mark.unit
+def test_anthropic_accumulator_raises_on_error_event():
+    acc = AnthropicStreamAccumulator(lambda e: None)
+    with pytest.raises(LLMAPIServerError, match="Overloaded"):
+        acc.feed({"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}})
+
+
+# ---------------------------
+# Google
+# ---------------------------
+
+@pytest.mark.unit
+def test_google_accumulator_joins_text_and_keeps_function_calls():
+    events = []
+    acc = GoogleStreamAccumulator(events.append, parse_json=True)
+    raw = acc.consume(iter([
+        {"candidates": [{"content": {"parts": [{"text": '{"city": "Pa'}]}}]},
+        {"candidates": [{"content": {"parts": [
+            {"text": "thinking", "thought": True},
+            {"text": 'ris"}'},
+            {"functionCall": {"name": "weather", "args": {"city": "Paris"}}, "thoughtSignature": "sig"},
+        ]}, "finishReason": "STOP"}],
+         "usageMetadata": {"promptTokenCount": 3, "candidatesTokenCount": 4, "totalTokenCount": 7}},
+    ]))
+    assert json_items(events) == [("city", "Paris")]
+    assert [(e.key, e.value) for e in events if e.type == "tool_arguments_item"] == [("city", "Paris")]
+    response = ChatResponse.from_google_response(raw)
+    assert response.content == '{"city": "Paris"}'
+    assert response.tool_calls[0].provider_data == {"thoughtSignature": "sig"}
+    assert response.finish_reason == "STOP"
+    assert response.usage.total_tokens == 7
@@ -4,7 +4,13 @@ from src.llm_api_adapter.errors.llm_api_error import (
     InvalidToolArgumentsError,
     LLMAPIError,
 )
-from src.llm_api_adapter.models.responses.chat_response import ChatResponse, Usage
+from unittest.mock import patch
+
+from src.llm_api_adapter.models.responses.chat_response import (
+    ChatResponse,
+    LazyChatResponse,
+    Usage,
+)
 from src.llm_api_adapter.models.tools import ToolCall
 
 
@@ -813,3 +819,44 @@ def test_apply_pricing_without_usage_does_nothing():
     assert response.cost_input is None
     assert response.cost_output is None
     assert response.cost_total is None
+
+
+def responses_payload(arguments='{"q": "a"}'):
+    return {
+        "id": "resp_1",
+        "model": "gpt-5",
+        "status": "completed",
+        "output": [
+            {"type": "message", "content": [{"type": "output_text", "text": "{\"a\": 1}"}]},
+            {"type": "function_call", "name": "search", "arguments": arguments, "call_id": "c1"},
+        ],
+        "usage": {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    }
+
+
+@pytest.mark.unit
+def test_lazy_response_parses_body_on_first_access():
+    with patch.object(
+        ChatResponse, "_openai_responses_body", wraps=ChatResponse._openai_responses_body
+    ) as parse_body:
+        response = LazyChatResponse.from_openai_responses_response(responses_payload())
+        assert response.usage.total_tokens == 15 and response.response_id == "resp_1"
+        assert not response.is_parsed and parse_body.call_count == 0
+        assert response.content == "{\"a\": 1}"
+        assert response.tool_calls == [ToolCall(name="search", arguments={"q": "a"}, call_id="c1")]
+    assert parse_body.call_count == 1 and response.is_parsed
+    eager = ChatResponse.from_openai_responses_response(responses_payload())
+    assert (eager.content, eager.tool_calls) == (response.content, response.tool_calls)
+
+
+@pytest.mark.unit
+def test_lazy_response_defers_errors_and_json_and_allows_assignment():
+    response = LazyChatResponse.from_openai_responses_response(responses_payload("{bad"))
+    with pytest.raises(InvalidToolArgumentsError):
+        response.tool_calls
+    response.defer_parsed_json(lambda content: {"from": content})
+    response.content = "override"
+    assert response.parsed_json == {"from": "override"}
+    response.parsed_json = {"set": True}
+    assert response.parsed_json == {"set": True}
+    assert LazyChatResponse(content="plain").content == "plain"
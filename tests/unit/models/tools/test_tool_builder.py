@@ -0,0 +1,137 @@
+import enum
+from typing import Dict, List, Literal, Optional
+
+import pytest
+from pydantic import BaseModel, create_model
+
+from src.llm_api_adapter.errors.llm_api_error import InvalidToolSchemaError
+from src.llm_api_adapter.models.tools import ToolSpec, tool, tool_spec_from_function
+from src.llm_api_adapter.utils.json_validator import JSONValidationError, validate_json
+
+
+class Unit(enum.Enum):
+    C = "celsius"
+    F = "fahrenheit"
+
+
+class Address(BaseModel):
+    city: str
+
+
+@pytest.mark.unit
+def test_google_style_docstring_and_type_hints():
+    def get_weather(city: str, days: int = 1, unit: Optional[Unit] = None) -> dict:
+        """Get the weather forecast for a city.
+
+        Args:
+            city: City name,
+                e.g. "Paris".
+            days: Number of days.
+            unit (Unit): Temperature unit.
+
+        Returns:
+            Forecast dict.
+        """
+
+    spec = tool_spec_from_function(get_weather)
+    assert isinstance(spec, ToolSpec)
+    assert spec.name == "get_weather"
+    assert spec.description == "Get the weather forecast for a city."
+    assert spec.json_schema == {
+        "type": "object",
+        "properties": {
+            "city": {"type": "string", "description": 'City name, e.g. "Paris".'},
+            "days": {"type": "integer", "description": "Number of days.", "default": 1},
+            "unit": {"enum": ["celsius", "fahrenheit"], "description": "Temperature unit."},
+        },
+        "required": ["city"],
+        "additionalProperties": False,
+    }
+
+
+@pytest.mark.unit
+def test_sphinx_docstring_and_container_types():
+    def search(
+        tags: List[str],
+        filters: Dict[str, float],
+        mode: Literal["fast", "exact"] = "fast",
+        address: Optional[Address] = None,
+    ):
+        """Search items.
+
+        :param tags: Tags to match.
+        :param mode: Search mode.
+        """
+
+    spec = tool_spec_from_function(search, name="item_search", idempotent=True)
+    props = spec.json_schema["properties"]
+    assert spec.name == "item_search"
+    assert spec.idempotent is True
+    assert spec.description == "Search items."
+    assert props["tags"] == {"type": "array", "items": {"type": "string"}, "description": "Tags to match."}
+    assert props["filters"] == {"type": "object", "additionalProperties": {"type": "number"}}
+    assert props["mode"] == {"enum": ["fast", "exact"], "description": "Search mode.", "default": "fast"}
+    assert props["address"]["properties"]["city"]["type"] == "string"
+    assert spec.json_schema["required"] == ["tags", "filters"]
+
+
+@pytest.mark.unit
+def test_decorator_attaches_spec_once_and_keeps_function():
+    @tool
+    def add(a: int, b: int) -> int:
+        """Add two numbers."""
+        return a + b
+
+    @tool(name="mul", description="Multiply.", cache_ttl_s=5)
+    def multiply(a: float, b: float) -> float:
+        return a * b
+
+    assert add(2, 3) == 5
+    assert add.tool_spec.name == "add"
+    assert add.tool_spec.description == "Add two numbers."
+    assert multiply.tool_spec.name == "mul"
+    assert multiply.tool_spec.description == "Multiply."
+    assert multiply.tool_spec.cache_ttl_s == 5
+
+
+@pytest.mark.unit
+def test_unsupported_type_raises():
+    def bad(value: complex):
+        pass
+
+    with pytest.raises(InvalidToolSchemaError):
+        tool_spec_from_function(bad)
+
+
+class Inner(BaseModel):
+    x: int
+
+
+class Outer(BaseModel):
+    inner: Inner
+
+
+@pytest.mark.unit
+def test_nested_model_defs_are_hoisted_to_the_root():
+    def save(o: Outer, extra: Optional[List[Inner]] = None) -> None:
+        """Save."""
+
+    schema = tool_spec_from_function(save).json_schema
+    assert schema["$defs"] == {"Inner": Inner.model_json_schema()}
+    assert "$defs" not in schema["properties"]["o"]
+    assert schema["properties"]["o"]["properties"]["inner"] == {"$ref": "#/$defs/Inner"}
+    validate_json({"o": {"inner": {"x": 1}}}, schema)
+    with pytest.raises(JSONValidationError):
+        validate_json({"o": {"inner": {"x": "notint"}}}, schema)
+
+
+@pytest.mark.unit
+def test_clashing_model_def_names_are_rejected():
+    other_inner = create_model("Inner", y=(str, ...))
+    other = create_model("Other", inner=(other_inner, ...))
+
+    def save(o: Outer, p: other) -> None:
+        """Save."""
+
+    with pytest.raises(InvalidToolSchemaError):
+        tool_spec_from_function(save)
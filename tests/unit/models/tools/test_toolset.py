@@ -0,0 +1,71 @@
+import pytest
+
+from src.llm_api_adapter.adapters.anthropic_adapter import AnthropicAdapter
+from src.llm_api_adapter.errors.llm_api_error import InvalidToolSchemaError
+from src.llm_api_adapter.models.tools import ToolSpec, Toolset, tool
+
+
+@tool
+def get_weather(city: str) -> dict:
+    """Get the weather."""
+    return {"city": city}
+
+
+@tool(idempotent=True)
+def get_time(zone: str) -> str:
+    """Get the time."""
+    return "12:00"
+
+
+@pytest.mark.unit
+def test_from_functions_collects_specs_and_handlers():
+    toolset = Toolset.from_functions(get_weather, get_time)
+    assert [t.name for t in toolset] == ["get_weather", "get_time"]
+    assert len(toolset) == 2
+    assert toolset.handlers["get_time"] is get_time
+
+
+@pytest.mark.unit
+def test_from_functions_rejects_undecorated_function():
+    def plain(x: int):
+        pass
+
+    with pytest.raises(InvalidToolSchemaError):
+        Toolset.from_functions(plain)
+
+
+@pytest.mark.unit
+def test_toolset_is_frozen():
+    toolset = Toolset.from_functions(get_weather)
+    with pytest.raises(Exception):
+        toolset.tools = ()
+
+
+@pytest.mark.unit
+def test_validation_and_payload_are_cached():
+    adapter = AnthropicAdapter(api_key="key", model="claude-sonnet-4-5")
+    toolset = Toolset.from_functions(get_weather, get_time)
+    adapter._validate_tools(toolset)
+    assert toolset.is_validated
+
+    calls = []
+
+    def mapper(tools):
+        calls.append(tools)
+        return adapter._map_tools_to_anthropic(tools)
+
+    first = adapter._map_tools(toolset, "anthropic", mapper)
+    second = adapter._map_tools(toolset, "anthropic", mapper)
+    assert first is second
+    assert len(calls) == 1
+    assert first[0]["name"] == "get_weather"
+
+
+@pytest.mark.unit
+def test_invalid_toolset_fails_validation():
+    spec = ToolSpec(name="bad name", json_schema={})
+    toolset = Toolset(tools=(spec, spec))
+    adapter = AnthropicAdapter(api_key="key", model="claude-sonnet-4-5")
+    with pytest.raises(InvalidToolSchemaError):
+        adapter._validate_tools(toolset)
+    assert not toolset.is_validated
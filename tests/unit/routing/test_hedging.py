@@ -0,0 +1,152 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.anthropic_adapter import AnthropicAdapter
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.errors.llm_api_error import LLMAPIServerError
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+from src.llm_api_adapter.routing import HedgingPolicy, RoutedAdapter
+from src.llm_api_adapter.universal_adapter import UniversalLLMAPIAdapter
+
+
+def priced(content, cost=0.5):
+    return ChatResponse(content=content, cost_total=cost)
+
+
+@pytest.mark.unit
+def test_delay_uses_initial_value_then_percentile():
+    policy = HedgingPolicy(percentile=90, initial_delay_s=2.0, min_samples=10)
+    assert policy.delay_s() == 2.0
+    for i in range(1, 11):
+        policy.record_latency(i / 10)
+    assert policy.delay_s() == pytest.approx(0.9)
+    bounded = HedgingPolicy(min_samples=1, min_delay_s=0.2, max_delay_s=0.5)
+    bounded.record_latency(0.01)
+    assert bounded.delay_s() == 0.2
+    bounded.record_latency(5.0)
+    bounded.record_latency(5.0)
+    assert bounded.delay_s() == 0.5
+
+
+@pytest.mark.unit
+def test_fast_primary_is_not_hedged():
+    policy = HedgingPolicy(initial_delay_s=1.0)
+    calls = []
+
+    def chat(**kwargs):
+        calls.append(kwargs)
+        return priced("fast")
+
+    response = policy.run(chat, {"messages": []})
+    assert response.content == "fast"
+    assert response.hedge.winner == 0
+    assert response.hedge.attempts == 1
+    assert len(calls) == 1
+    assert policy.hedged_calls == 0
+
+
+@pytest.mark.unit
+def test_slow_primary_is_hedged_and_loser_cost_recorded():
+    policy = HedgingPolicy(initial_delay_s=0.05)
+    release = threading.Event()
+    loser_done = threading.Event()
+
+    def slow(**kwargs):
+        release.wait(2)
+        try:
+            return priced("slow", cost=0.25)
+        finally:
+            loser_done.set()
+
+    def fast(**kwargs):
+        return priced("hedge")
+
+    response = policy.run(slow, {}, alternate=fast)
+    assert response.content == "hedge"
+    assert response.hedge.winner == 1
+    assert response.hedge.attempts == 2
+    assert response.hedge.delay_s == 0.05
+    assert policy.hedged_calls == 1
+    assert policy.hedge_wins == 1
+    release.set()
+    loser_done.wait(2)
+    time.sleep(0.05)
+    assert response.hedge.extra_cost == pytest.approx(0.25)
+    assert policy.extra_cost_total == pytest.approx(0.25)
+
+
+@pytest.mark.unit
+def test_error_of_first_finisher_waits_for_other_attempt():
+    policy = HedgingPolicy(initial_delay_s=0.01)
+    state = {"calls": 0}
+    lock = threading.Lock()
+
+    def chat(**kwargs):
+        with lock:
+            state["calls"] += 1
+            call = state["calls"]
+        if call == 1:
+            time.sleep(0.1)
+            raise LLMAPIServerError(detail="primary failed")
+        time.sleep(0.2)
+        return priced("second")
+
+    assert policy.run(chat, {}).content == "second"
+
+
+@pytest.mark.unit
+def test_primary_error_before_delay_is_raised():
+    policy = HedgingPolicy(initial_delay_s=1.0)
+
+    def chat(**kwargs):
+        raise LLMAPIServerError(detail="boom")
+
+    with pytest.raises(LLMAPIServerError, match="boom"):
+        policy.run(chat, {})
+    assert policy.hedged_calls == 0
+
+
+@pytest.mark.unit
+def test_streaming_is_rejected():
+    with pytest.raises(ValueError):
+        HedgingPolicy().run(lambda **kw: None, {"on_stream": print})
+
+
+@pytest.mark.unit
+def test_universal_adapter_hedges_to_same_model():
+    adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", api_key="k")
+    policy = HedgingPolicy(initial_delay_s=0.02)
+    calls = []
+
+    def chat(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            time.sleep(0.3)
+            return priced("first")
+        return priced("second")
+
+    with patch.object(OpenAIAdapter, "chat", side_effect=chat):
+        response = adapter.chat(messages=[], hedge=policy)
+    assert response.content == "second"
+    assert calls[0] == calls[1] == {"messages": []}
+
+
+@pytest.mark.unit
+def test_routed_adapter_hedges_to_next_target():
+    router = RoutedAdapter(
+        targets=[("anthropic", "claude-sonnet-4-5", "a"), ("openai", "gpt-4o", "o")],
+    )
+
+    def slow(**kwargs):
+        time.sleep(0.3)
+        return priced("anthropic")
+
+    with patch.object(AnthropicAdapter, "chat", side_effect=slow), \
+         patch.object(OpenAIAdapter, "chat", side_effect=lambda **kw: priced("openai")):
+        response = router.chat(messages=[], max_tokens=5, hedge=HedgingPolicy(initial_delay_s=0.02))
+    assert response.content == "openai"
+    assert response.route.organization == "openai"
+    assert response.hedge.winner == 1
@@ -0,0 +1,187 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests_mock as requests_mock_module
+
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.errors.llm_api_error import (
+    LLMAPIAuthorizationError,
+    LLMAPIRateLimitError,
+    LLMAPIServerError,
+)
+from src.llm_api_adapter.llms.rate_limits import RATE_LIMITS, RateLimitTracker
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse, Usage
+from src.llm_api_adapter.routing import KeyPool, RoutedAdapter
+from src.llm_api_adapter.universal_adapter import UniversalLLMAPIAdapter
+
+KEYS = ["key-a", "key-b", "key-c"]
+
+
+def ok(cost=0.25):
+    return ChatResponse(content="ok", usage=Usage(2, 3, 5), cost_total=cost)
+
+
+@pytest.mark.unit
+def test_round_robin_spreads_calls_and_tracks_usage():
+    pool = KeyPool(KEYS)
+    used = []
+    for _ in range(4):
+        pool.run(lambda key: used.append(key) or ok())
+    assert used == ["key-a", "key-b", "key-c", "key-a"]
+    stats = pool.stats()
+    assert stats["key-0"]["requests"] == 2
+    assert stats["key-0"]["input_tokens"] == 4
+    assert stats["key-0"]["cost_total"] == pytest.approx(0.5)
+    assert stats["key-2"]["output_tokens"] == 3
+
+
+@pytest.mark.unit
+def test_least_loaded_avoids_keys_in_flight():
+    pool = KeyPool(KEYS, strategy="least_loaded")
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first, second} == {"key-a", "key-b"}
+    assert pool.acquire() == "key-c"
+    pool.release(first, response=ok())
+    assert pool.acquire() == first
+
+
+@pytest.mark.unit
+def test_quota_strategy_prefers_most_remaining_requests():
+    pool = KeyPool(KEYS, strategy="quota")
+    RATE_LIMITS.update("key-a", {"x-ratelimit-remaining-requests": "3"})
+    RATE_LIMITS.update("key-b", {"x-ratelimit-remaining-requests": "50"})
+    RATE_LIMITS.update("key-c", {"anthropic-ratelimit-requests-remaining": "10"})
+    assert pool.acquire() == "key-b"
+    RATE_LIMITS.update("key-b", {"x-ratelimit-remaining-requests": "1"})
+    assert pool.acquire() == "key-c"
+
+
+@pytest.mark.unit
+def test_rate_limited_key_is_benched_and_call_retried():
+    pool = KeyPool(KEYS, rate_limit_bench_s=60)
+    RATE_LIMITS.update("key-a", {"retry-after": "5"})
+    used = []
+
+    def call(key):
+        used.append(key)
+        if key == "key-a":
+            raise LLMAPIRateLimitError(detail="429")
+        return ok()
+
+    assert pool.run(call).content == "ok"
+    assert used == ["key-a", "key-b"]
+    stats = pool.stats()
+    assert stats["key-0"]["benched"] is True
+    assert stats["key-0"]["bench_reason"] == "rate_limit"
+    assert stats["key-0"]["errors"] == 1
+    assert [pool.acquire() for _ in range(3)] == ["key-c", "key-b", "key-c"]
+
+
+@pytest.mark.unit
+def test_auth_error_benches_until_reinstated_and_exhaustion_raises():
+    pool = KeyPool(["key-a", "key-b"])
+
+    def call(key):
+        raise LLMAPIAuthorizationError(detail="401")
+
+    with pytest.raises(LLMAPIAuthorizationError):
+        pool.run(call)
+    with pytest.raises(LLMAPIRateLimitError, match="All API keys"):
+        pool.acquire()
+    pool.reinstate("key-b")
+    assert pool.acquire() == "key-b"
+
+
+@pytest.mark.unit
+def test_other_errors_propagate_without_benching():
+    pool = KeyPool(KEYS)
+
+    def call(key):
+        raise LLMAPIServerError(detail="500")
+
+    with pytest.raises(LLMAPIServerError):
+        pool.run(call)
+    stats = pool.stats()["key-0"]
+    assert stats["errors"] == 1 and stats["benched"] is False and stats["in_flight"] == 0
+
+
+@pytest.mark.unit
+def test_pool_is_thread_safe():
+    pool = KeyPool(KEYS, strategy="least_loaded")
+    barrier = threading.Barrier(6)
+
+    def worker():
+        barrier.wait()
+        for _ in range(50):
+            pool.run(lambda key: ok(cost=0.01))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = pool.stats().values()
+    assert sum(s["requests"] for s in stats) == 300
+    assert all(s["in_flight"] == 0 for s in stats)
+
+
+@pytest.mark.unit
+def test_rate_limit_tracker_parses_resets_and_ignores_unwatched_keys():
+    tracker = RateLimitTracker()
+    tracker.update("k", {"x-ratelimit-remaining-requests": "1"})
+    assert tracker.get("k") is None
+    tracker.watch("k")
+    tracker.update("k", {
+        "X-RateLimit-Remaining-Requests": "9",
+        "x-ratelimit-remaining-tokens": "1000",
+        "x-ratelimit-reset-requests": "1m30s",
+        "retry-after-ms": "1500",
+    })
+    state = tracker.get("k")
+    assert (state.remaining_requests, state.remaining_tokens) == (9, 1000)
+    assert state.retry_after_s == 1.5
+    assert state.reset_at - state.updated_at == pytest.approx(90)
+    assert state.is_current()
+    assert not state.is_current(state.updated_at + 91)
+
+
+@pytest.mark.unit
+def test_universal_adapter_uses_pool_keys_and_headers():
+    pool = KeyPool(["sk-first-key-000000", "sk-second-key-11111"])
+    adapter = UniversalLLMAPIAdapter(organization="openai", model="gpt-4o", key_pool=pool)
+    body = {
+        "id": "c1", "model": "gpt-4o",
+        "choices": [{"message": {"content": "hi"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+    with requests_mock_module.Mocker() as mock:
+        mock.post(
+            "https://api.openai.com/v1/chat/completions",
+            [
+                {"status_code": 429, "json": {"error": {"message": "slow down"}},
+                 "headers": {"retry-after": "20"}},
+                {"json": body, "headers": {"x-ratelimit-remaining-requests": "99"}},
+            ],
+        )
+        response = adapter.chat(messages=[UserMessage("hi")])
+        auth = [r.headers["Authorization"] for r in mock.request_history]
+    assert response.content == "hi"
+    assert auth == ["Bearer sk-first-key-000000", "Bearer sk-second-key-11111"]
+    stats = pool.stats()
+    assert stats["sk-first...0000"]["bench_reason"] == "rate_limit"
+    assert stats["sk-secon...1111"]["remaining_requests"] == 99
+    assert stats["sk-secon...1111"]["cost_total"] == pytest.approx(response.cost_total)
+    assert "key_pool=KeyPool" in repr(adapter)
+
+
+@pytest.mark.unit
+def test_routed_adapter_accepts_key_pool():
+    pool = KeyPool(["k1", "k2"])
+    with patch.object(OpenAIAdapter, "chat", side_effect=lambda **kw: ok()):
+        routed = RoutedAdapter(targets=[("openai", "gpt-4o")], api_keys={"openai": pool})
+        routed.chat(messages=[])
+        routed.chat(messages=[])
+    assert [s["requests"] for s in pool.stats().values()] == [1, 1]
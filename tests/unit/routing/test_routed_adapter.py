@@ -0,0 +1,130 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.anthropic_adapter import AnthropicAdapter
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.errors.llm_api_error import (
+    LLMAPIClientError,
+    LLMAPIRateLimitError,
+    LLMAPIServerError,
+)
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse, RouteInfo
+from src.llm_api_adapter.models.responses.chat_stream import StreamEvent
+from src.llm_api_adapter.routing import RoutedAdapter, RouteTarget, TargetHealth
+
+MESSAGES = [UserMessage("hi")]
+
+
+@pytest.fixture
+def router():
+    return RoutedAdapter(
+        targets=[("anthropic", "claude-sonnet-4-5"), ("openai", "gpt-4o")],
+        api_keys={"anthropic": "ant-key", "openai": "oai-key"},
+        cooldown_s=60,
+    )
+
+
+@pytest.mark.unit
+def test_first_target_serves_when_healthy(router):
+    with patch.object(AnthropicAdapter, "chat", return_value=ChatResponse(content="a")) as ant, \
+         patch.object(OpenAIAdapter, "chat") as oai:
+        response = router.chat(messages=MESSAGES, max_tokens=10)
+    assert response.content == "a"
+    assert response.route == RouteInfo(organization="anthropic", model="claude-sonnet-4-5")
+    ant.assert_called_once_with(messages=MESSAGES, max_tokens=10)
+    oai.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("error", [LLMAPIServerError, LLMAPIRateLimitError])
+def test_fails_over_and_routes_away_from_degraded_target(router, error):
+    with patch.object(AnthropicAdapter, "chat", side_effect=error(detail="Overloaded")) as ant, \
+         patch.object(OpenAIAdapter, "chat", side_effect=lambda **kw: ChatResponse(content="o")) as oai:
+        first = router.chat(messages=MESSAGES, max_tokens=10)
+        second = router.chat(messages=MESSAGES, max_tokens=10)
+    assert first.content == "o"
+    assert first.route.attempts == 2
+    assert "anthropic:claude-sonnet-4-5" in first.route.errors[0]
+    # The degraded target is skipped on the next call.
+    assert second.route.attempts == 1
+    assert ant.call_count == 1
+    assert oai.call_count == 2
+    assert router.health()["anthropic:claude-sonnet-4-5"]["degraded"] is True
+
+
+@pytest.mark.unit
+def test_client_errors_are_not_failed_over(router):
+    with patch.object(AnthropicAdapter, "chat", side_effect=LLMAPIClientError(detail="bad")), \
+         patch.object(OpenAIAdapter, "chat") as oai:
+        with pytest.raises(LLMAPIClientError):
+            router.chat(messages=MESSAGES, max_tokens=10)
+    oai.assert_not_called()
+
+
+@pytest.mark.unit
+def test_raises_last_error_when_all_targets_fail(router):
+    with patch.object(AnthropicAdapter, "chat", side_effect=LLMAPIServerError(detail="a")), \
+         patch.object(OpenAIAdapter, "chat", side_effect=LLMAPIServerError(detail="o")):
+        with pytest.raises(LLMAPIServerError, match="o"):
+            router.chat(messages=MESSAGES, max_tokens=10)
+
+
+@pytest.mark.unit
+def test_previous_response_only_sent_to_the_target_that_produced_it(router):
+    previous = ChatResponse(
+        response_id="r1", route=RouteInfo(organization="openai", model="gpt-4o")
+    )
+    with patch.object(AnthropicAdapter, "chat", return_value=ChatResponse()) as ant:
+        router.chat(messages=MESSAGES, max_tokens=10, previous_response=previous)
+    assert ant.call_args.kwargs["previous_response"] is None
+
+
+@pytest.mark.unit
+def test_no_failover_after_stream_events_were_delivered(router):
+    def partial_stream(**kwargs):
+        kwargs["on_stream"](StreamEvent(type="text", text="par"))
+        raise LLMAPIServerError(detail="dropped")
+
+    events = []
+    with patch.object(AnthropicAdapter, "chat", side_effect=partial_stream), \
+         patch.object(OpenAIAdapter, "chat") as oai:
+        with pytest.raises(LLMAPIServerError):
+            router.chat(messages=MESSAGES, max_tokens=10, on_stream=events.append)
+    assert [e.text for e in events] == ["par"]
+    oai.assert_not_called()
+
+
+@pytest.mark.unit
+def test_latency_strategy_prefers_faster_target():
+    router = RoutedAdapter(
+        targets=[RouteTarget("anthropic", "claude-sonnet-4-5", "k1"), ("openai", "gpt-4o", "k2")],
+        strategy="latency",
+    )
+    router._health[0].record_success(2.0)
+    router._health[1].record_success(0.5)
+    assert router._route_order() == [1, 0]
+
+
+@pytest.mark.unit
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        RoutedAdapter(targets=[])
+    with pytest.raises(ValueError):
+        RoutedAdapter(targets=[("openai", "gpt-4o", "k")], strategy="random")
+    with pytest.raises(ValueError):
+        RoutedAdapter(targets=["openai"])
+
+
+@pytest.mark.unit
+def test_target_health_error_rate_threshold():
+    health = TargetHealth(min_samples=4, error_threshold=0.5, cooldown_s=0)
+    for _ in range(3):
+        health.record_success(0.1)
+    health.record_failure()
+    assert health.error_rate == 0.25
+    assert health.is_degraded is False
+    health.record_failure()
+    health.record_failure()
+    assert health.is_degraded is True
@@ -0,0 +1,129 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.errors.llm_api_error import LLMAPIServerError
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+from src.llm_api_adapter.routing import RoutedAdapter, SingleFlight
+from src.llm_api_adapter.universal_adapter import UniversalLLMAPIAdapter
+
+
+def run_concurrently(n, fn):
+    results, errors = [None] * n, [None] * n
+
+    def worker(i):
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+@pytest.mark.unit
+def test_make_key_is_canonical_and_skips_uncoalescable_calls():
+    sf = SingleFlight()
+    a = sf.make_key("openai:gpt-4o", {"messages": [UserMessage("hi")], "max_tokens": 5, "temperature": 0})
+    b = sf.make_key("openai:gpt-4o", {"temperature": 0, "max_tokens": 5, "messages": [UserMessage("hi")]})
+    assert a == b
+    assert a != sf.make_key("openai:gpt-4o", {"messages": [UserMessage("hey")], "max_tokens": 5, "temperature": 0})
+    assert a != sf.make_key("anthropic:claude", {"messages": [UserMessage("hi")], "max_tokens": 5, "temperature": 0})
+    assert sf.make_key("s", {"messages": [], "on_stream": print}) is None
+    assert sf.make_key("s", {"messages": [], "handler": lambda: None}) is None
+    assert sf.make_key("s", {"previous_response": ChatResponse()}) is None
+    assert sf.make_key("s", {"previous_response": ChatResponse(response_id="r1")}) is not None
+
+
+@pytest.mark.unit
+def test_identical_concurrent_calls_share_one_request():
+    sf = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def chat(**kwargs):
+        calls.append(kwargs)
+        release.wait(2)
+        return ChatResponse(content="shared", cost_total=1.0)
+
+    threads, results, errors = run_concurrently(
+        5, lambda i: sf.run("scope", chat, {"messages": [UserMessage("hi")]})
+    )
+    while sf.stats()["coalesced_calls"] < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert errors == [None] * 5
+    assert all(r.content == "shared" for r in results)
+    assert len({id(r) for r in results}) == 5
+    assert sf.stats() == {"calls": 5, "upstream_calls": 1, "coalesced_calls": 4, "in_flight": 0}
+
+
+@pytest.mark.unit
+def test_error_is_delivered_to_all_waiters_and_flight_is_cleared():
+    sf = SingleFlight()
+    release = threading.Event()
+
+    def failing(**kwargs):
+        release.wait(2)
+        raise LLMAPIServerError(detail="boom")
+
+    threads, results, errors = run_concurrently(3, lambda i: sf.run("scope", failing, {"messages": []}))
+    while sf.stats()["coalesced_calls"] < 2:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert all(isinstance(e, LLMAPIServerError) for e in errors)
+    response = sf.run("scope", lambda **kw: ChatResponse(content="later"), {"messages": []})
+    assert response.content == "later"
+    assert sf.stats()["upstream_calls"] == 2
+
+
+@pytest.mark.unit
+def test_different_calls_are_not_coalesced():
+    sf = SingleFlight()
+    for content in ("a", "b"):
+        sf.run("scope", lambda **kw: ChatResponse(content=kw["messages"][0].content),
+               {"messages": [UserMessage(content)]})
+    assert sf.stats()["coalesced_calls"] == 0
+    assert sf.stats()["upstream_calls"] == 2
+
+
+@pytest.mark.unit
+def test_universal_and_routed_adapters_coalesce():
+    sf = SingleFlight()
+    release = threading.Event()
+    upstream = []
+
+    def chat(**kwargs):
+        upstream.append(kwargs)
+        release.wait(2)
+        return ChatResponse(content="ok")
+
+    with patch.object(OpenAIAdapter, "chat", side_effect=chat):
+        adapter = UniversalLLMAPIAdapter(
+            organization="openai", model="gpt-4o", api_key="k", single_flight=sf
+        )
+        routed = RoutedAdapter(
+            targets=[("openai", "gpt-4o")], api_keys={"openai": "k"}, single_flight=sf
+        )
+        threads, results, errors = run_concurrently(
+            4,
+            lambda i: (adapter if i % 2 else routed).chat(messages=[UserMessage("same")]),
+        )
+        while sf.stats()["coalesced_calls"] < 2:
+            threading.Event().wait(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+    assert errors == [None] * 4
+    assert len(upstream) == 2
+    assert results[0].route is not None
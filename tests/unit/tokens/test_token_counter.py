@@ -0,0 +1,125 @@
+import struct
+import warnings
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.llm_api_adapter.adapters.anthropic_adapter import AnthropicAdapter
+from src.llm_api_adapter.adapters.google_adapter import GoogleAdapter
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.llms.anthropic.sync_client import ClaudeSyncClient
+from src.llm_api_adapter.llms.google.sync_client import GeminiSyncClient
+from src.llm_api_adapter.models.messages.chat_message import AIMessage, Prompt, UserMessage
+from src.llm_api_adapter.models.messages.file_parts import ImagePart
+from src.llm_api_adapter.models.tools import ToolCall, ToolSpec
+from src.llm_api_adapter.tokens.image_tokens import (
+    anthropic_image_tokens,
+    google_image_tokens,
+    image_size,
+    openai_image_tokens,
+)
+from src.llm_api_adapter.tokens.token_counter import (
+    REMOTE_TOKEN_COUNTS,
+    TokenEstimator,
+    estimate_text_tokens,
+)
+from src.llm_api_adapter.utils.canonical import canonical_hash
+
+
+def png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\rIHDR" + struct.pack(">II", width, height) + b"\x08\x02"
+
+
+@pytest.fixture(autouse=True)
+def clear_remote_counts():
+    REMOTE_TOKEN_COUNTS.clear()
+    yield
+    REMOTE_TOKEN_COUNTS.clear()
+
+
+@pytest.mark.unit
+def test_estimate_text_tokens():
+    assert estimate_text_tokens("") == 0
+    assert estimate_text_tokens("abcd" * 10) == 10
+    assert estimate_text_tokens("日本語") == 3
+
+
+@pytest.mark.unit
+def test_image_token_formulas():
+    assert openai_image_tokens(1024, 1024) == 765
+    assert openai_image_tokens(4096, 4096, detail="low") == 85
+    assert anthropic_image_tokens(1000, 1000) == 1334
+    assert anthropic_image_tokens(4000, 4000) == 1534
+    assert google_image_tokens(300, 300) == 258
+    assert google_image_tokens(1000, 1000) == 1032
+    assert image_size(png(640, 480)) == (640, 480)
+    assert image_size(b"not an image") is None
+
+
+@pytest.mark.unit
+def test_estimate_counts_messages_images_tools_and_schema():
+    estimator = TokenEstimator()
+    messages = [
+        Prompt("You are terse."),
+        UserMessage("Describe this", files=[ImagePart(data=png(1024, 1024), media_type="image/png")]),
+        AIMessage("", tool_calls=[ToolCall(name="lookup", arguments={"q": "x"}, call_id="1")]),
+    ]
+    tools = [ToolSpec(name="lookup", description="Look up", json_schema={"type": "object"})]
+    count = estimator.estimate("openai", messages, tools, json_schema={"type": "object"})
+    assert count.image_tokens == 765
+    assert count.tool_tokens > 0 and count.schema_tokens > 0
+    assert count.input_tokens == (
+        3 + count.message_tokens + count.image_tokens + count.tool_tokens + count.schema_tokens
+    )
+    assert estimator.estimate("google", messages).image_tokens == 1032
+
+
+@pytest.mark.unit
+def test_estimates_are_cached_per_message():
+    estimator = TokenEstimator()
+    history = [UserMessage("first"), AIMessage("reply")]
+    estimator.estimate("openai", history)
+    estimator.estimate("openai", history + [UserMessage("second")])
+    assert estimator._cache.hits == 2
+    assert estimator._cache.misses == 3
+    assert canonical_hash(UserMessage("a")) != canonical_hash(AIMessage("a"))
+
+
+@pytest.mark.unit
+def test_anthropic_remote_count_is_cached_per_request():
+    adapter = AnthropicAdapter(model="claude-sonnet-4-5", api_key="k")
+    messages = [Prompt("sys"), UserMessage("hi")]
+    with patch.object(ClaudeSyncClient, "count_tokens", return_value=42) as count_tokens:
+        first = adapter.count_tokens(messages, remote=True)
+        second = adapter.count_tokens(list(messages), remote=True)
+    assert first.input_tokens == second.input_tokens == 42
+    assert first.source == "remote" and first is not second
+    count_tokens.assert_called_once()
+    kwargs = count_tokens.call_args.kwargs
+    assert kwargs["system"] == "sys"
+    assert kwargs["messages"] == [{"role": "user", "content": "hi"}]
+
+
+@pytest.mark.unit
+def test_google_remote_count_posts_generate_content_request():
+    adapter = GoogleAdapter(model="gemini-2.5-flash", api_key="k")
+    response = Mock()
+    response.json.return_value = {"totalTokens": 17}
+    with patch.object(GeminiSyncClient, "_send_request", return_value=response) as send:
+        count = adapter.count_tokens([UserMessage("hi")], json_schema={"type": "object"}, remote=True)
+    assert count.input_tokens == 17
+    url, payload = send.call_args.args[:2]
+    assert url.endswith("/models/gemini-2.5-flash:countTokens")
+    request = payload["generateContentRequest"]
+    assert request["model"] == "models/gemini-2.5-flash"
+    assert request["generationConfig"]["responseMimeType"] == "application/json"
+
+
+@pytest.mark.unit
+def test_openai_remote_count_falls_back_to_estimate():
+    adapter = OpenAIAdapter(model="gpt-4o", api_key="k")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        count = adapter.count_tokens([UserMessage("hello there")], remote=True)
+    assert count.source == "estimate" and count.input_tokens > 0
+    assert any("no token counting endpoint" in str(w.message) for w in caught)
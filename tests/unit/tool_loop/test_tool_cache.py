@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from src.llm_api_adapter.models.messages.chat_message import ToolMessage, UserMessage
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+from src.llm_api_adapter.models.tools import ToolCall, ToolSpec
+from src.llm_api_adapter.tool_loop import ToolLoop, ToolResultCache
+
+
+SCHEMA = {"type": "object", "properties": {"q": {"type": "string"}}}
+LOOKUP = ToolSpec(name="lookup", json_schema=SCHEMA, idempotent=True)
+NOW = ToolSpec(name="now", json_schema=SCHEMA)
+
+
+class ScriptedChat:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def __call__(self, **kwargs):
+        return self.responses.pop(0)
+
+
+def calls(*items):
+    return ChatResponse(
+        tool_calls=[
+            ToolCall(name=name, arguments=args, call_id=f"c{i}")
+            for i, (name, args) in enumerate(items)
+        ]
+    )
+
+
+class CountingHandler:
+    def __init__(self, result="value"):
+        self.result = result
+        self.count = 0
+
+    def __call__(self, **kwargs):
+        self.count += 1
+        return self.result
+
+
+@pytest.mark.unit
+def test_make_key_is_canonical():
+    cache = ToolResultCache()
+    assert cache.make_key("t", {"a": 1, "b": [1, 2]}) == cache.make_key("t", {"b": [1, 2], "a": 1})
+    assert cache.make_key("t", {"a": 1}) != cache.make_key("u", {"a": 1})
+
+
+@pytest.mark.unit
+def test_idempotent_tool_is_served_from_cache_across_steps_and_turns():
+    handler = CountingHandler()
+    cache = ToolResultCache()
+    chat = ScriptedChat([
+        calls(("lookup", {"q": "x"}), ("lookup", {"q": "x"})),
+        calls(("lookup", {"q": "x"})),
+        ChatResponse(content="done"),
+    ])
+    response = ToolLoop(chat=chat, handlers={"lookup": handler}, cache=cache).run(
+        [UserMessage("x")], [LOOKUP]
+    )
+    assert handler.count == 1
+    assert response.tool_loop.cache_hits == 2
+    results = [m.content for m in response.tool_loop.messages if isinstance(m, ToolMessage)]
+    assert results == ["value", "value", "value"]
+
+    second = ToolLoop(
+        chat=ScriptedChat([calls(("lookup", {"q": "x"})), ChatResponse(content="ok")]),
+        handlers={"lookup": handler},
+        cache=cache,
+    ).run([UserMessage("y")], [LOOKUP])
+    assert handler.count == 1
+    assert second.tool_loop.cache_hits == 1
+    assert cache.hits == 2
+
+
+@pytest.mark.unit
+def test_non_idempotent_tools_and_disabled_cache_always_run():
+    handler = CountingHandler()
+    chat = ScriptedChat([calls(("now", {}), ("now", {})), ChatResponse(content="done")])
+    response = ToolLoop(chat=chat, handlers={"now": handler}, cache=ToolResultCache()).run(
+        [UserMessage("x")], [NOW]
+    )
+    assert handler.count == 2
+    assert response.tool_loop.cache_hits == 0
+
+    handler = CountingHandler()
+    chat = ScriptedChat([calls(("lookup", {}), ("lookup", {})), ChatResponse(content="done")])
+    ToolLoop(chat=chat, handlers={"lookup": handler}).run([UserMessage("x")], [LOOKUP])
+    assert handler.count == 2
+
+
+@pytest.mark.unit
+def test_errors_are_not_cached():
+    def failing(**kwargs):
+        raise RuntimeError("down")
+
+    cache = ToolResultCache()
+    chat = ScriptedChat([calls(("lookup", {"q": "x"})), ChatResponse(content="done")])
+    ToolLoop(chat=chat, handlers={"lookup": failing}, cache=cache).run(
+        [UserMessage("x")], [LOOKUP]
+    )
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_per_tool_ttl_expires_entries():
+    cache = ToolResultCache(default_ttl_s=100)
+    spec = ToolSpec(name="lookup", json_schema=SCHEMA, idempotent=True, cache_ttl_s=0.01)
+    key = cache.make_key("lookup", {})
+    cache.set(key, "v", spec)
+    assert cache.get(key) == "v"
+    time.sleep(0.02)
+    assert cache.get(key) is None
+    assert cache.misses == 1
+
+
+@pytest.mark.unit
+def test_lru_bound():
+    cache = ToolResultCache(max_entries=2)
+    for i in range(3):
+        cache.set(cache.make_key("lookup", {"i": i}), str(i), LOOKUP)
+    assert len(cache) == 2
+    assert cache.get(cache.make_key("lookup", {"i": 0})) is None
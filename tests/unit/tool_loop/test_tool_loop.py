@@ -0,0 +1,205 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.llm_api_adapter.errors.llm_api_error import LLMAPITimeoutError, ToolLoopError
+from src.llm_api_adapter.models.messages.chat_message import (
+    AIMessage,
+    ToolMessage,
+    UserMessage,
+)
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse, Usage
+from src.llm_api_adapter.models.tools import ToolCall, ToolSpec
+from src.llm_api_adapter.tool_loop import ToolLoop
+
+
+TOOLS = [
+    ToolSpec(
+        name="get_weather",
+        json_schema={"type": "object", "properties": {"city": {"type": "string"}}},
+    )
+]
+
+
+class ScriptedChat:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.responses.pop(0)
+
+
+def tool_response(*calls, cost=0.5):
+    return ChatResponse(
+        usage=Usage(input_tokens=10, output_tokens=5, total_tokens=15),
+        cost_input=cost / 2,
+        cost_output=cost / 2,
+        cost_total=cost,
+        currency="USD",
+        tool_calls=[
+            ToolCall(name=name, arguments=args, call_id=f"call_{i}")
+            for i, (name, args) in enumerate(calls)
+        ],
+    )
+
+
+def final_response(content="done", cost=0.5):
+    return ChatResponse(
+        usage=Usage(input_tokens=20, output_tokens=7, total_tokens=27),
+        cost_input=cost / 2,
+        cost_output=cost / 2,
+        cost_total=cost,
+        currency="USD",
+        content=content,
+    )
+
+
+@pytest.mark.unit
+def test_runs_tools_and_aggregates_usage_and_cost():
+    first = tool_response(("get_weather", {"city": "Paris"}))
+    chat = ScriptedChat([first, final_response("22C in Paris")])
+    loop = ToolLoop(chat=chat, handlers={"get_weather": lambda city: {"t": 22, "city": city}})
+
+    response = loop.run([UserMessage("weather?")], TOOLS, tool_choice="any", max_tokens=100)
+
+    assert response.content == "22C in Paris"
+    assert response.usage.input_tokens == 30
+    assert response.usage.output_tokens == 12
+    assert response.usage.total_tokens == 42
+    assert response.cost_total == pytest.approx(1.0)
+    assert response.tool_loop.steps == 2
+    assert response.tool_loop.tool_calls == 1
+    history = response.tool_loop.messages
+    assert isinstance(history[1], AIMessage)
+    assert isinstance(history[2], ToolMessage)
+    assert history[2].tool_call_id == "call_0"
+    assert json.loads(history[2].content) == {"t": 22, "city": "Paris"}
+    assert chat.calls[0]["tool_choice"] == "any"
+    assert chat.calls[1]["tool_choice"] is None
+    assert chat.calls[1]["previous_response"] is first
+    assert chat.calls[0]["max_tokens"] == 100
+
+
+@pytest.mark.unit
+def test_does_not_mutate_caller_messages():
+    messages = [UserMessage("weather?")]
+    chat = ScriptedChat([
+        tool_response(("get_weather", {"city": "Paris"})),
+        final_response(),
+    ])
+    ToolLoop(chat=chat, handlers={"get_weather": lambda city: "sunny"}).run(messages, TOOLS)
+    assert len(messages) == 1
+
+
+@pytest.mark.unit
+def test_sync_handlers_run_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def handler(city):
+        barrier.wait()
+        return city
+
+    chat = ScriptedChat([
+        tool_response(
+            ("get_weather", {"city": "A"}),
+            ("get_weather", {"city": "B"}),
+            ("get_weather", {"city": "C"}),
+        ),
+        final_response(),
+    ])
+    response = ToolLoop(chat=chat, handlers={"get_weather": handler}).run(
+        [UserMessage("x")], TOOLS
+    )
+    results = [m.content for m in response.tool_loop.messages if isinstance(m, ToolMessage)]
+    assert results == ["A", "B", "C"]
+
+
+@pytest.mark.unit
+def test_async_handlers_are_gathered():
+    async def handler(city):
+        await asyncio.sleep(0.05)
+        return {"city": city}
+
+    chat = ScriptedChat([
+        tool_response(*[("get_weather", {"city": str(i)}) for i in range(5)]),
+        final_response(),
+    ])
+    started = time.monotonic()
+    response = ToolLoop(chat=chat, handlers={"get_weather": handler}).run(
+        [UserMessage("x")], TOOLS
+    )
+    assert time.monotonic() - started < 0.2
+    results = [m.content for m in response.tool_loop.messages if isinstance(m, ToolMessage)]
+    assert [json.loads(r)["city"] for r in results] == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.unit
+def test_handler_errors_and_unknown_tools_are_reported_to_the_model():
+    def boom(city):
+        raise RuntimeError("backend down")
+
+    chat = ScriptedChat([
+        tool_response(("get_weather", {"city": "A"}), ("missing", {})),
+        final_response(),
+    ])
+    response = ToolLoop(chat=chat, handlers={"get_weather": boom}).run(
+        [UserMessage("x")], TOOLS
+    )
+    results = [
+        json.loads(m.content)
+        for m in response.tool_loop.messages
+        if isinstance(m, ToolMessage)
+    ]
+    assert results == [
+        {"error": "RuntimeError: backend down"},
+        {"error": "Unknown tool: missing"},
+    ]
+
+
+@pytest.mark.unit
+def test_max_steps_raises_tool_loop_error():
+    chat = ScriptedChat([
+        tool_response(("get_weather", {"city": "A"})),
+        tool_response(("get_weather", {"city": "B"})),
+    ])
+    loop = ToolLoop(chat=chat, handlers={"get_weather": lambda city: city}, max_steps=2)
+    with pytest.raises(ToolLoopError):
+        loop.run([UserMessage("x")], TOOLS)
+
+
+@pytest.mark.unit
+def test_deadline_limits_chat_timeout_and_tool_execution():
+    def slow(city):
+        time.sleep(0.5)
+        return city
+
+    chat = ScriptedChat([tool_response(("get_weather", {"city": "A"}), ("get_weather", {"city": "B"}))])
+    loop = ToolLoop(chat=chat, handlers={"get_weather": slow}, deadline_s=0.1)
+    with pytest.raises(LLMAPITimeoutError):
+        loop.run([UserMessage("x")], TOOLS, timeout_s=30)
+    assert chat.calls[0]["timeout_s"] <= 0.1
+
+
+@pytest.mark.unit
+def test_partial_pricing_keeps_final_cost():
+    chat = ScriptedChat([
+        ChatResponse(tool_calls=[ToolCall(name="get_weather", arguments={}, call_id="c")]),
+        final_response(cost=0.3),
+    ])
+    response = ToolLoop(chat=chat, handlers={"get_weather": lambda: "ok"}).run(
+        [UserMessage("x")], TOOLS
+    )
+    assert response.cost_total == pytest.approx(0.3)
+    assert response.usage.total_tokens == 27
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("kwargs", [{"max_steps": 0}, {"max_parallel": 0}, {"deadline_s": 0}])
+def test_invalid_limits_raise(kwargs):
+    with pytest.raises(ValueError):
+        ToolLoop(chat=ScriptedChat([]), handlers={}, **kwargs)
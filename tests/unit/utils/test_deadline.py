@@ -0,0 +1,158 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from src.llm_api_adapter.adapters.openai_adapter import OpenAIAdapter
+from src.llm_api_adapter.errors.llm_api_error import LLMAPITimeoutError
+from src.llm_api_adapter.llms.openai.sync_client import OpenAISyncClient
+from src.llm_api_adapter.models.messages.chat_message import UserMessage
+from src.llm_api_adapter.models.responses.chat_response import ChatResponse
+from src.llm_api_adapter.models.tools import ToolCall
+from src.llm_api_adapter.routing import RoutedAdapter
+from src.llm_api_adapter.tool_loop import ToolLoop
+from src.llm_api_adapter.utils.deadline import (
+    Deadline,
+    request_timeout,
+    resolve_deadline,
+    timeout_error,
+)
+
+POST = "src.llm_api_adapter.llms.openai.sync_client.requests.post"
+
+
+@pytest.mark.unit
+def test_deadline_resolve_keeps_the_earlier_deadline():
+    outer = Deadline.after(10)
+    assert Deadline.resolve(outer, None) is outer
+    inner = Deadline.resolve(outer, 1)
+    assert inner is not outer and inner.total_s == 1
+    assert Deadline.resolve(inner, 30) is inner
+    kwargs = resolve_deadline({"messages": [], "deadline_s": 5})
+    assert "deadline_s" not in kwargs and 4.9 < kwargs["deadline"].remaining() <= 5
+    with pytest.raises(ValueError):
+        Deadline.after(0)
+
+
+@pytest.mark.unit
+def test_expired_deadline_raises_with_deadline_phase():
+    deadline = Deadline(expires_at=time.monotonic() - 1, total_s=2)
+    with pytest.raises(LLMAPITimeoutError) as exc_info:
+        deadline.check()
+    assert exc_info.value.phase == "deadline"
+
+
+@pytest.mark.unit
+def test_request_timeout_splits_connect_and_read_and_caps_by_deadline():
+    assert request_timeout() is None
+    assert request_timeout(30) == 30
+    assert request_timeout(30, connect_timeout_s=3) == (3, 30)
+    connect, read = request_timeout(30, 3, Deadline.after(5))
+    assert connect == 3 and read <= 5
+    capped = request_timeout(30, 3, Deadline.after(1))
+    assert capped <= 1
+    assert request_timeout(None, None, Deadline.after(2)) <= 2
+
+
+@pytest.mark.unit
+def test_timeout_error_reports_phase():
+    assert timeout_error(requests.exceptions.ConnectTimeout("c")).phase == "connect"
+    assert timeout_error(requests.exceptions.ReadTimeout("r")).phase == "read"
+    expired = Deadline(expires_at=time.monotonic() - 1, total_s=1)
+    assert timeout_error(requests.exceptions.ReadTimeout("r"), expired).phase == "deadline"
+
+
+@pytest.mark.unit
+def test_client_maps_connect_timeout_phase():
+    client = OpenAISyncClient(api_key="k")
+    with patch(POST, side_effect=requests.exceptions.ConnectTimeout("connect")):
+        with pytest.raises(LLMAPITimeoutError) as exc_info:
+            client.chat_completion("gpt-4o", timeout=(1, 10), messages=[])
+    assert exc_info.value.phase == "connect"
+
+
+@pytest.mark.unit
+def test_client_deadline_bounds_a_trickling_body():
+    def trickle(chunk_size):
+        for chunk in (b'{"choices"', b": [", b"]}"):
+            time.sleep(0.05)
+            yield chunk
+
+    response = Mock(headers={})
+    response.iter_content.side_effect = trickle
+    client = OpenAISyncClient(api_key="k")
+    with patch(POST, return_value=response) as post:
+        with pytest.raises(LLMAPITimeoutError) as exc_info:
+            client.chat_completion("gpt-4o", messages=[], deadline=Deadline.after(0.08))
+    assert exc_info.value.phase == "deadline"
+    assert post.call_args.kwargs["stream"] is True
+    response.close.assert_called_once()
+
+
+@pytest.mark.unit
+def test_client_reads_body_within_deadline_and_maps_body_read_timeout():
+    response = Mock(headers={})
+    response.iter_content.return_value = iter([b'{"ok": ', b"true}"])
+    response.json.side_effect = lambda: {"ok": response._content == b'{"ok": true}'}
+    client = OpenAISyncClient(api_key="k")
+    with patch(POST, return_value=response):
+        assert client.chat_completion("gpt-4o", messages=[], deadline=Deadline.after(5)) == {"ok": True}
+
+    stalled = Mock(headers={})
+    stalled.iter_content.side_effect = requests.exceptions.ConnectionError(
+        ReadTimeoutError(None, None, "Read timed out.")
+    )
+    with patch(POST, return_value=stalled):
+        with pytest.raises(LLMAPITimeoutError) as exc_info:
+            client.chat_completion("gpt-4o", messages=[], deadline=Deadline.after(5))
+    assert exc_info.value.phase == "read"
+
+
+@pytest.mark.unit
+def test_adapter_passes_connect_read_timeouts_and_deadline():
+    adapter = OpenAIAdapter(model="gpt-4o", api_key="k")
+    with patch.object(OpenAISyncClient, "complete", return_value={"choices": [{"message": {"content": "x"}}]}) as complete:
+        adapter.chat([UserMessage("hi")], timeout_s=20, connect_timeout_s=2, deadline_s=60)
+    kwargs = complete.call_args.kwargs
+    assert kwargs["timeout"] == (2, 20)
+    assert isinstance(kwargs["deadline"], Deadline)
+    assert kwargs["deadline"].total_s == 60
+
+
+@pytest.mark.unit
+def test_tool_loop_passes_one_deadline_to_every_step():
+    steps = [
+        ChatResponse(tool_calls=[ToolCall(name="t", arguments={}, call_id="1")]),
+        ChatResponse(content="done"),
+    ]
+    seen = []
+
+    def chat(**kwargs):
+        seen.append(kwargs.get("deadline"))
+        return steps.pop(0)
+
+    outer = Deadline.after(30)
+    ToolLoop(chat=chat, handlers={"t": lambda: "ok"}, deadline_s=60).run(
+        [UserMessage("x")], [], deadline=outer
+    )
+    assert seen == [outer, outer]
+
+
+@pytest.mark.unit
+def test_routed_adapter_does_not_fail_over_when_deadline_expired():
+    calls = []
+
+    def expired(**kwargs):
+        calls.append(kwargs["deadline"])
+        raise LLMAPITimeoutError(detail="late", phase="deadline")
+
+    with patch.object(OpenAIAdapter, "chat", side_effect=expired):
+        routed = RoutedAdapter(
+            targets=[("openai", "gpt-4o"), ("openai", "gpt-4o-mini")], api_keys={"openai": "k"}
+        )
+        with pytest.raises(LLMAPITimeoutError):
+            routed.chat(messages=[], deadline_s=5)
+    assert len(calls) == 1
+    assert calls[0].total_s == 5
@@ -0,0 +1,61 @@
+import pytest
+
+from src.llm_api_adapter.utils.incremental_json import IncrementalJSONParser
+
+
+def feed_all(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+
+@pytest.mark.unit
+def test_object_fields_are_emitted_as_they_close():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"name": "Al') == []
+    assert parser.feed('ice", "tags": ["a", ') == [("name", "Alice")]
+    assert parser.feed('"b"], "age": 30') == [("tags", ["a", "b"])]
+    assert parser.feed("}") == [("age", 30)]
+    assert parser.done
+    assert parser.value == {"name": "Alice", "tags": ["a", "b"], "age": 30}
+
+
+@pytest.mark.unit
+def test_array_items_are_emitted_with_index():
+    parser = IncrementalJSONParser()
+    items = feed_all(parser, ['[{"id": 1}', ', {"id"', ": 2}]"])
+    assert items == [(0, {"id": 1}), (1, {"id": 2})]
+    assert parser.value == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.unit
+def test_one_character_chunks_with_escapes_and_brackets_in_strings():
+    text = '{"a": "x, } \\" ]", "b": {"c": [1, 2]}, "d": "\\\\"}'
+    parser = IncrementalJSONParser()
+    items = feed_all(parser, list(text))
+    assert items == [("a", 'x, } " ]'), ("b", {"c": [1, 2]}), ("d", "\\")]
+
+
+@pytest.mark.unit
+def test_text_before_root_and_after_close_is_ignored():
+    parser = IncrementalJSONParser()
+    items = feed_all(parser, ["```json\n", '{"a": 1}', "\n```"])
+    assert items == [("a", 1)]
+    assert parser.done
+
+
+@pytest.mark.unit
+def test_empty_containers():
+    parser = IncrementalJSONParser()
+    assert parser.feed("{}") == []
+    assert parser.value == {}
+
+
+@pytest.mark.unit
+def test_invalid_member_marks_parser_failed():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"a": nope, "b": 1}') == []
+    assert parser.failed
+    assert parser.value is None
+    assert parser.feed('"more"') == []
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from src.llm_api_adapter.utils.json_tools import (
+    extract_json,
+    iter_json_spans,
+    json_loads,
+    locate_json_text,
+)
+
+
+@pytest.mark.unit
+def test_json_loads_parses_text_and_bytes():
+    assert json_loads('{"a": 1}') == {"a": 1}
+    assert json_loads(b"[1, 2]") == [1, 2]
+
+
+@pytest.mark.unit
+def test_iter_json_spans_yields_top_level_spans_only():
+    text = 'a {"x": {"y": [1]}} b [2, 3] c'
+    spans = [text[s:e] for s, e in iter_json_spans(text)]
+    assert spans == ['{"x": {"y": [1]}}', "[2, 3]"]
+
+
+@pytest.mark.unit
+def test_iter_json_spans_ignores_brackets_inside_strings():
+    text = 'note {"text": "a } b { c ] \\" {"} tail'
+    spans = [text[s:e] for s, e in iter_json_spans(text)]
+    assert spans == ['{"text": "a } b { c ] \\" {"}']
+
+
+@pytest.mark.unit
+def test_iter_json_spans_skips_unbalanced_opener():
+    text = 'broken { here and then {"ok": true}'
+    spans = [text[s:e] for s, e in iter_json_spans(text)]
+    assert spans == ['{"ok": true}']
+
+
+@pytest.mark.unit
+def test_iter_json_spans_restricts_root_type():
+    text = '[1] {"a": 1}'
+    spans = [text[s:e] for s, e in iter_json_spans(text, root_type="object")]
+    assert spans == ['{"a": 1}']
+
+
+@pytest.mark.unit
+def test_extract_json_picks_first_parsable_span():
+    text = 'Options: {not json} and {"name": "x"} or {"name": "y"}'
+    assert extract_json(text) == {"name": "x"}
+
+
+@pytest.mark.unit
+def test_extract_json_reads_fence_body():
+    assert extract_json('```json\n{"a": [1, 2]}\n```') == {"a": [1, 2]}
+
+
+@pytest.mark.unit
+def test_extract_json_raises_when_nothing_parses():
+    with pytest.raises(json.JSONDecodeError):
+        extract_json("no json {here")
+
+
+@pytest.mark.unit
+def test_extract_json_is_linear_on_many_unmatched_openers():
+    text = "{" * 20000 + '{"a": 1}'
+    assert extract_json(text, root_type="object") == {"a": 1}
+
+
+@pytest.mark.unit
+def test_locate_json_text_falls_back_to_stripped_text():
+    assert locate_json_text("  plain  ") == "plain"
+    assert locate_json_text('x {"a": 1} y') == '{"a": 1}'
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.llm_api_adapter.utils.json_validator import (
+    JSONValidationError,
+    compile_validator,
+    validate_json,
+)
+from src.llm_api_adapter.utils.schema_cache import SCHEMA_CACHE
+
+PERSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 1},
+        "age": {"type": "integer", "minimum": 0},
+        "role": {"enum": ["admin", "user"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2},
+        "address": {"$ref": "#/$defs/Address"},
+    },
+    "required": ["name", "age"],
+    "additionalProperties": False,
+    "$defs": {
+        "Address": {
+            "type": "object",
+            "properties": {"city": {"type": "string"}},
+            "required": ["city"],
+        }
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    SCHEMA_CACHE.clear()
+    yield
+    SCHEMA_CACHE.clear()
+
+
+@pytest.mark.unit
+def test_validate_json_accepts_matching_value():
+    validate_json(
+        {"name": "Ann", "age": 3, "role": "user", "tags": ["a"], "address": {"city": "X"}},
+        PERSON_SCHEMA,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ({"age": 3}, "missing required property 'name'"),
+        ({"name": "Ann", "age": "3"}, r"\$\.age: expected integer"),
+        ({"name": "Ann", "age": True}, r"\$\.age: expected integer"),
+        ({"name": "Ann", "age": -1}, "less than 0"),
+        ({"name": "", "age": 1}, "shorter than 1"),
+        ({"name": "Ann", "age": 1, "role": "root"}, "is not one of"),
+        ({"name": "Ann", "age": 1, "tags": ["a", 1]}, r"\$\.tags\[1\]"),
+        ({"name": "Ann", "age": 1, "tags": ["a", "b", "c"]}, "at most 2 items"),
+        ({"name": "Ann", "age": 1, "extra": 1}, "unexpected property 'extra'"),
+        ({"name": "Ann", "age": 1, "address": {}}, r"\$\.address: missing required property 'city'"),
+    ],
+)
+def test_validate_json_reports_path_of_first_violation(value, message):
+    with pytest.raises(JSONValidationError, match=message):
+        validate_json(value, PERSON_SCHEMA)
+
+
+@pytest.mark.unit
+def test_validate_json_handles_nullable_and_any_of():
+    schema = {
+        "type": "object",
+        "properties": {
+            "a": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+            "b": {"type": "integer", "nullable": True},
+            "c": {"type": ["number", "null"]},
+        },
+    }
+    validate_json({"a": None, "b": None, "c": 1.5}, schema)
+    with pytest.raises(JSONValidationError, match="does not match any anyOf option"):
+        validate_json({"a": 1}, schema)
+
+
+@pytest.mark.unit
+def test_validate_json_supports_recursive_refs():
+    schema = {
+        "$ref": "#/$defs/Node",
+        "$defs": {
+            "Node": {
+                "type": "object",
+                "properties": {"children": {"type": "array", "items": {"$ref": "#/$defs/Node"}}},
+            }
+        },
+    }
+    validate_json({"children": [{"children": []}]}, schema)
+    with pytest.raises(JSONValidationError, match=r"\$\.children\[0\]"):
+        validate_json({"children": [1]}, schema)
+
+
+@pytest.mark.unit
+def test_compiled_validator_is_safe_to_share_between_threads():
+    validator = compile_validator({
+        "$ref": "#/$defs/Node",
+        "$defs": {
+            "Node": {
+                "type": "object",
+                "properties": {"children": {"type": "array", "items": {"$ref": "#/$defs/Node"}}},
+            }
+        },
+    })
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        errors = list(pool.map(lambda _: validator({"children": [{"children": [1]}]}, "$"), range(64)))
+    assert errors == ["$.children[0].children[0]: expected object, got int"] * 64
+
+@pytest.mark.unit
+def test_validate_json_compiles_once_per_schema():
+    validate_json({"name": "Ann", "age": 1}, PERSON_SCHEMA)
+    validate_json({"name": "Bob", "age": 2}, dict(PERSON_SCHEMA))
+    assert SCHEMA_CACHE.misses == 1
+    assert SCHEMA_CACHE.hits == 1
+
+
+@pytest.mark.unit
+def test_compile_validator_returns_none_for_valid_value():
+    validator = compile_validator({"type": "array", "prefixItems": [{"type": "string"}]})
+    assert validator(["x", 1], "$") is None
+    assert validator([1], "$") == "$[0]: expected string, got int"
@@ -0,0 +1,71 @@
+from unittest.mock import Mock
+
+import pytest
+from pydantic import BaseModel
+
+from src.llm_api_adapter.utils.bounded_cache import BoundedCache
+from src.llm_api_adapter.utils.schema_cache import (
+    SCHEMA_CACHE,
+    cached_model_schema,
+    cached_schema_transform,
+    schema_fingerprint,
+)
+
+
+class Item(BaseModel):
+    name: str
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    SCHEMA_CACHE.clear()
+    yield
+    SCHEMA_CACHE.clear()
+
+
+@pytest.mark.unit
+def test_bounded_cache_evicts_least_recently_used():
+    cache = BoundedCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+@pytest.mark.unit
+def test_get_or_create_calls_factory_once():
+    cache = BoundedCache()
+    factory = Mock(return_value="v")
+    assert cache.get_or_create("k", factory) == "v"
+    assert cache.get_or_create("k", factory) == "v"
+    factory.assert_called_once()
+
+
+@pytest.mark.unit
+def test_fingerprint_ignores_key_order():
+    assert schema_fingerprint({"a": 1, "b": {"c": 2}}) == schema_fingerprint({"b": {"c": 2}, "a": 1})
+    assert schema_fingerprint({"a": 1}) != schema_fingerprint({"a": 2})
+
+
+@pytest.mark.unit
+def test_transform_is_memoized_per_kind_and_content():
+    transform = Mock(side_effect=lambda s: {**s, "x": True})
+    first = cached_schema_transform("k", {"type": "object"}, transform)
+    second = cached_schema_transform("k", {"type": "object"}, transform)
+    assert first is second
+    transform.assert_called_once()
+    cached_schema_transform("other", {"type": "object"}, transform)
+    cached_schema_transform("k", {"type": "string"}, transform)
+    assert transform.call_count == 3
+
+
+@pytest.mark.unit
+def test_model_schema_is_memoized_per_class():
+    first = cached_model_schema(Item)
+    assert first == Item.model_json_schema()
+    assert cached_model_schema(Item) is first